@@ -0,0 +1,191 @@
+"""
+性能基准 — 逐个生成函数计时，记录分阶段耗时、峰值 RSS 与图元/实体数量，并与基线比较
+
+  python bench.py                                  # 全部用例，standard 质量，每例 3 次
+  python bench.py --quality draft --repeat 5 -k floor perspective
+  python bench.py --save-baseline bench_baseline.json
+  python bench.py -k floor plumbing electrical --backend native   # 平面类图纸改用 native 后端
+  python bench.py --baseline bench_baseline.json --threshold 0.15   # 超阈值退出码 1
+
+用例与 serve.py 的图纸清单一致（generate_all 每个 gen_*，两个 3D 透视）。
+每次运行前固定 random / numpy 与 3D 渲染种子并清空 3D 背景缓存与成品渲染缓存，输出写入内存 sink（不含磁盘 I/O），
+编码器（raster.agg / raster.pillow / encode.png / encode.svg / encode.dxf）耗时单独汇总。
+报告为 JSON（默认 bench_report.json），可长期追踪。
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import generate_render_3d
+import metrics
+import native_plot
+import output_sink
+import perf
+import render_quality
+from serve import DRAWINGS
+
+ENCODER_STAGES = ("raster.agg", "raster.pillow", "encode.png", "encode.svg", "encode.dxf", "encode.pdf")
+
+
+def run_case(name, seed):
+    """运行一次用例，返回耗时、峰值 RSS、计数器与分阶段耗时"""
+    mod, fn = DRAWINGS[name]
+    random.seed(seed)
+    np.random.seed(seed)
+    generate_render_3d.set_seed(seed)
+    generate_render_3d.BG_CACHE.clear()
+    generate_render_3d.RENDER_CACHE.clear()
+    output_sink.set_sink(output_sink.MemorySink())
+    metrics.reset_peak_rss()
+    rec = perf.start()
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(mod, fn)()
+    finally:
+        seconds = time.perf_counter() - t0
+        perf.stop()
+    sink = output_sink.get_sink()
+    return {
+        "seconds": seconds,
+        "peak_rss_mb": round(metrics.peak_rss_bytes() / 2**20, 1),
+        "bytes": sum(len(v) for v in sink.files.values()),
+        "files": len(sink.files),
+        "artists": rec.counters.get("artists", 0),
+        "entities": rec.counters.get("entities", 0),
+        "stages": rec.stages(),
+    }
+
+
+def run_suite(names, repeat, seed):
+    cases = {}
+    for name in names:
+        runs = [run_case(name, seed) for _ in range(repeat)]
+        secs = [r["seconds"] for r in runs]
+        last = runs[-1]
+        cases[name] = {
+            "function": DRAWINGS[name][1],
+            "seconds": round(statistics.median(secs), 4),
+            "min_seconds": round(min(secs), 4),
+            "runs": [round(s, 4) for s in secs],
+            "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+            "files": last["files"], "bytes": last["bytes"],
+            "artists": last["artists"], "entities": last["entities"],
+            # 分阶段耗时取中位数那次运行
+            "stages": sorted(runs, key=lambda r: r["seconds"])[len(runs) // 2]["stages"],
+        }
+        print(f"  {name:24s} {cases[name]['seconds']:7.3f}s  "
+              f"RSS {cases[name]['peak_rss_mb']:7.1f}MB  "
+              f"artists {cases[name]['artists']:6d}  entities {cases[name]['entities']:5d}")
+    encoders = {}
+    for c in cases.values():
+        for stage in ENCODER_STAGES:
+            if stage in c["stages"]:
+                e = encoders.setdefault(stage, {"seconds": 0.0, "count": 0})
+                e["seconds"] = round(e["seconds"] + c["stages"][stage]["seconds"], 6)
+                e["count"] += c["stages"][stage]["count"]
+    return cases, encoders
+
+
+def compare(report, baseline, threshold, rss_threshold, min_delta):
+    """与基线比较：耗时或峰值 RSS 超出阈值记为回归，图元/实体数量变化单独列出"""
+    regressions, changes = [], []
+    for name, cur in report["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            continue
+        d = cur["seconds"] - base["seconds"]
+        if d > min_delta and d > base["seconds"] * threshold:
+            regressions.append({"case": name, "metric": "seconds", "baseline": base["seconds"],
+                                "current": cur["seconds"], "ratio": round(cur["seconds"] / base["seconds"], 3)})
+        for stage, s in cur["stages"].items():
+            b = base.get("stages", {}).get(stage)
+            if b and s["seconds"] - b["seconds"] > max(min_delta, b["seconds"] * threshold):
+                regressions.append({"case": name, "metric": f"stage:{stage}", "baseline": b["seconds"],
+                                    "current": s["seconds"], "ratio": round(s["seconds"] / b["seconds"], 3)})
+        if cur["peak_rss_mb"] > base["peak_rss_mb"] * (1 + rss_threshold):
+            regressions.append({"case": name, "metric": "peak_rss_mb", "baseline": base["peak_rss_mb"],
+                                "current": cur["peak_rss_mb"],
+                                "ratio": round(cur["peak_rss_mb"] / base["peak_rss_mb"], 3)})
+        for key in ("artists", "entities", "files"):
+            if cur[key] != base.get(key):
+                changes.append({"case": name, "metric": key, "baseline": base.get(key), "current": cur[key]})
+    return regressions, changes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="图纸生成性能基准")
+    render_quality.add_quality_argument(parser)
+    native_plot.add_backend_argument(parser)
+    parser.add_argument("-k", nargs="*", metavar="PATTERN", help="只运行名称包含任一关键字的用例")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", default="bench_report.json", help="报告输出路径")
+    parser.add_argument("--baseline", help="与该基线报告比较")
+    parser.add_argument("--save-baseline", metavar="PATH", help="把本次结果保存为基线")
+    parser.add_argument("--threshold", type=float, default=0.15, help="耗时回归阈值（相对基线，默认 15%%）")
+    parser.add_argument("--rss-threshold", type=float, default=0.20, help="峰值 RSS 回归阈值（默认 20%%）")
+    parser.add_argument("--min-delta", type=float, default=0.02, help="小于该秒数的变化视为噪声")
+    args = parser.parse_args(argv)
+    render_quality.set_quality(args.quality)
+    native_plot.set_backend(args.backend)
+
+    names = [n for n in DRAWINGS if not args.k or any(p in n for p in args.k)]
+    print("=" * 60)
+    print(f"  性能基准  [{args.quality} / {args.backend}]  repeat={args.repeat}  seed={args.seed}")
+    print("=" * 60)
+    cases, encoders = run_suite(names, args.repeat, args.seed)
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quality": args.quality, "backend": args.backend, "repeat": args.repeat, "seed": args.seed,
+        },
+        "cases": cases,
+        "encoders": encoders,
+        "total_seconds": round(sum(c["seconds"] for c in cases.values()), 4),
+    }
+    print("\n  编码器：" + "  ".join(f"{k} {v['seconds']:.3f}s×{v['count']}" for k, v in encoders.items()))
+    print(f"  合计 {report['total_seconds']:.3f}s")
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("quality") != args.quality:
+            print(f"  ⚠ 基线质量预设为 {baseline.get('meta', {}).get('quality')}，与本次不同")
+        report["regressions"], report["changes"] = compare(
+            report, baseline, args.threshold, args.rss_threshold, args.min_delta)
+        for r in report["regressions"]:
+            print(f"  ✗ {r['case']} {r['metric']}: {r['baseline']} → {r['current']} (×{r['ratio']})")
+        for c in report["changes"]:
+            print(f"  ~ {c['case']} {c['metric']}: {c['baseline']} → {c['current']}")
+        if report["regressions"]:
+            status = 1
+        else:
+            print("  ✓ 无性能回归")
+
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"  报告: {args.json}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+采光分析 — 由平面几何建占用网格，逐格向外窗投射视线，给出各房间窗地面积比与采光系数热图
+
+  python daylight.py                          # 当前方案：各房间窗地比、平均 / 最低采光系数
+  python daylight.py --spec '{"F1_Y0": 2400}' # 分析一个 spec 覆盖项（JSON 字符串或文件路径）
+  python daylight.py --png --out /tmp/site    # 另出 docs/images/一层采光分析.png、二层采光分析.png
+  python daylight.py --cell 50 --json         # 5 cm 网格，结果以 JSON 输出
+
+计算口径（不出图时只依赖 NumPy，10 cm 网格两层合计约 0.2 s）：
+  占用网格    CELL 见方的格子；floor_layout.rooms 的墙内皮矩形为空，其余（外墙、隔墙）为实；
+              衣柜等高家具（TALL）也为实，格内不计入房间统计
+  外窗        SOUTH_WIN … WEST_WIN 按 validate.window_rooms 归属房间，窗洞从房间内皮一直开到外墙外皮
+              （二层南窗越过阳台）；窗沿立面每 WINDOW_STEP 取一个采样点，放在外皮上
+  视线        房间内每格到本房间每个采样点的线段全程不碰实格才算可见：从采样点向 RAYS 个方向放射，
+              按半格步长查占用网格得到各方向的畅通距离，再按格心的方向与距离一次查表；
+              窗洞侧壁（墙厚）、高家具的遮挡都由此得到
+  天空分量    均匀天空下，工作面一点经竖直窗带 (宽 ds) 看到的天空对水平照度的贡献
+                ds·p/2·[1/(r²+zb²) − 1/(r²+zt²)] / π
+              p 为到外皮的垂直距离，r 为到采样点的水平距离，zb / zt 为外皮处可见窗带相对工作面的
+              下、上沿：窗台、窗顶按视线从内皮投到外皮，阳台窗外沿另受栏杆与阳台顶板限制
+  内反射分量  BRE 分流公式 τ·W / (A(1−R)) · (C·R_fw + 5·R_cw)，每个房间一个常数
+  采光系数    DF = τ × 天空分量 + 内反射分量（%）；房间平均值与窗地比按 STANDARDS 的要求判定
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import building_config
+import floor_layout
+import spec as spec_mod
+import validate
+
+CELL = 100                  # 网格边长 mm
+WINDOW_STEP = 250           # 窗户采样间距 mm
+RAYS = 720                  # 每个采样点的视线方向数（0.5°，10 m 处横向偏差 < 1 格）
+WORK_PLANE = 0.85           # 工作面高度 m
+RAILING = 1.1               # 阳台栏杆高度 m（按不透光计）
+TRANSMITTANCE = 0.7         # 玻璃透射比 × 窗框系数
+REFLECTANCE = (0.5, 0.4, 0.7)   # 室内平均 R、地面与下半墙 R_fw、顶棚与上半墙 R_cw
+SKY_C = 39                  # 分流公式的天空系数（无室外遮挡）
+TALL = ("wardrobe",)        # 遮挡视线的高家具
+LEVELS = {"一层": ("F1_FL", "F1_CL"), "二层": ("F2_FL", "F2_CL")}
+# 采光要求（按房间名关键字，先匹配先用）：(最低平均采光系数 %, 最低窗地比)
+STANDARDS = (
+    (("卧", "客厅", "起居", "LDK", "厨房", "多功能"), (2.0, 1 / 7)),
+    (("卫", "楼梯", "走廊", "玄关"), (1.0, 1 / 12)),
+)
+
+
+def standard(name):
+    """房间的采光要求 (DF_MIN %, WFR_MIN)；阳台、留空区等无要求返回 None"""
+    for keys, req in STANDARDS:
+        if any(k in name for k in keys):
+            return req
+    return None
+
+
+# ══════════════════════════════════════════════
+#  占用网格与窗洞
+# ══════════════════════════════════════════════
+
+def occupancy(p, floor, cell=CELL):
+    """(房间名列表, 房间编号网格 (ny, nx)，墙为 -1)；网格原点在外墙外皮左下角，按格心归属"""
+    nx, ny = int(np.ceil(p["BW"] / cell)), int(np.ceil(p["BH"] / cell))
+    xc, yc = (np.arange(nx) + 0.5) * cell, (np.arange(ny) + 0.5) * cell
+    rooms = floor_layout.rooms(p, floor)
+    label = np.full((ny, nx), -1, dtype=np.int16)
+    for i, (_, x, y, w, h) in enumerate(rooms):
+        label[np.ix_((y <= yc) & (yc < y + h), (x <= xc) & (xc < x + w))] = i
+    return [r[0] for r in rooms], label
+
+
+def tall_furniture(p, floor, shape, cell=CELL):
+    """高家具（TALL）占据的格子 (ny, nx) bool"""
+    yc, xc = ((np.arange(n) + 0.5) * cell for n in shape)
+    out = np.zeros(shape, dtype=bool)
+    for item in floor_layout.furniture(p, floor):
+        if item[0] in TALL:
+            x0, y0, x1, y1 = floor_layout.footprint(item)
+            out[np.ix_((y0 <= yc) & (yc < y1), (x0 <= xc) & (xc < x1))] = True
+    return out
+
+
+def openings(p, floor, names, label, cell=CELL):
+    """本层外窗：[(立面, 房间编号, 窗左 mm, 窗右 mm, 内皮 zb, zt, 外皮 zb, zt)]，z 为相对工作面的 m
+
+    窗洞从房间内皮一直开到外墙外皮，这些格子在 label 上改记为所属房间（原地修改）。
+    """
+    table = dict(zip(names, floor_layout.rooms(p, floor)))
+    fl, cl = (p[k] for k in LEVELS[floor])
+    wins = [w for f in validate.FACADES for w in p[f]]      # 与 window_rooms 的顺序一致
+    open_ids = [i for i, n in enumerate(names) if n in validate.OPEN_ROOMS]
+    yc, xc = ((np.arange(n) + 0.5) * cell for n in label.shape)
+    out = []
+    for (facade, wfloor, room, lo, hi, _), win in zip(validate.window_rooms(p), wins):
+        if wfloor != floor or room is None:
+            continue
+        _, x, y, w, h = table[room]
+        along = xc if facade in ("SOUTH_WIN", "NORTH_WIN") else yc
+        across = {"SOUTH_WIN": yc < y, "NORTH_WIN": yc >= y + h,
+                  "WEST_WIN": xc < x, "EAST_WIN": xc >= x + w}[facade]
+        span = (lo <= along) & (along < hi)
+        path = np.ix_(across, span) if facade in ("SOUTH_WIN", "NORTH_WIN") else np.ix_(span, across)
+        balcony = np.isin(label[path], open_ids).any()
+        label[path] = names.index(room)
+        zb, zt = win[1] - fl - WORK_PLANE, win[1] + win[3] - fl - WORK_PLANE
+        outer = (RAILING - WORK_PLANE, cl - fl - WORK_PLANE) if balcony else (zb, zt)
+        out.append((facade, names.index(room), lo, hi, zb, zt) + outer)
+    return out
+
+
+# ══════════════════════════════════════════════
+#  视线与采光系数
+# ══════════════════════════════════════════════
+
+def visible(solid, cell, src, dst, rays=RAYS):
+    """格心 src (n, 2) 与窗上采样点 dst (m, 2)（mm）之间是否通视 → (n, m) bool
+
+    视线对称，从采样点放射：每个采样点向 rays 个方向（只算用得到的方向）按半格步长查占用网格，
+    记下首个实格的距离；格心距离小于它所在方向的畅通距离即可见。
+    """
+    d = src[:, None, :] - dst[None, :, :]
+    dist = np.hypot(d[..., 0], d[..., 1])
+    bins = ((np.arctan2(d[..., 1], d[..., 0]) + np.pi) / (2 * np.pi) * rays).astype(np.int32) % rays
+    used = np.unique(bins)
+    theta = (used + 0.5) / rays * 2 * np.pi - np.pi
+    step = cell / 2
+    r = (np.arange(int(np.ceil(dist.max() / step)) + 1, dtype=np.float32) + 0.5) * step
+    ny, nx = solid.shape
+    o = (dst / cell).astype(np.float32)[:, None, None, :]
+    u = (r / cell)[None, None, :]
+    ix = np.clip((o[..., 0] + np.cos(theta).astype(np.float32)[None, :, None] * u).astype(np.int32), 0, nx - 1)
+    iy = np.clip((o[..., 1] + np.sin(theta).astype(np.float32)[None, :, None] * u).astype(np.int32), 0, ny - 1)
+    hit = solid.ravel()[iy * nx + ix]                            # (m, 方向, 步)
+    free = np.where(hit.any(axis=2), r[hit.argmax(axis=2)], np.inf)
+    return dist < free[np.arange(len(dst))[None, :], np.searchsorted(used, bins)]
+
+
+def _frame(p, facade, room, cx, cy):
+    """立面局部坐标：(到外皮距离 p_out, 到内皮距离 p_in, 沿立面坐标)，单位 m"""
+    _, x, y, w, h = room
+    if facade == "SOUTH_WIN":
+        return cy, cy - y, cx
+    if facade == "NORTH_WIN":
+        return p["BH"] - cy, y + h - cy, cx
+    if facade == "WEST_WIN":
+        return cx, cx - x, cy
+    return p["BW"] - cx, x + w - cx, cy
+
+
+def _exterior(p, facade, s):
+    """外皮上的采样点 (m, 2) mm"""
+    edge = {"SOUTH_WIN": 0.0, "NORTH_WIN": p["BH"], "WEST_WIN": 0.0, "EAST_WIN": p["BW"]}[facade]
+    e = np.full_like(s, edge)
+    return np.column_stack([s, e] if facade in ("SOUTH_WIN", "NORTH_WIN") else [e, s])
+
+
+def sky_component(p, facade, room, src, samples, ds, z):
+    """src 各格经一扇窗（采样点 samples）的天空分量 (n, m)，未乘透射比、未判可见"""
+    p_out, p_in, a = (v / 1000 for v in _frame(p, facade, room, src[:, 0], src[:, 1]))
+    zb, zt, zb_out, zt_out = z
+    ratio = (p_out / np.maximum(p_in, 1e-3))[:, None]           # 内皮窗沿沿视线投到外皮
+    top = np.minimum(zt_out, zt * ratio)
+    bot = np.maximum(np.maximum(zb_out, zb * ratio), 0.0)
+    r2 = p_out[:, None] ** 2 + (samples[None, :] / 1000 - a[:, None]) ** 2
+    c = ds / 1000 * p_out[:, None] / 2 * (1 / (r2 + bot ** 2) - 1 / (r2 + top ** 2)) / np.pi
+    return np.where(top > bot, c, 0.0)
+
+
+def analyse_floor(p, floor, cell=CELL):
+    """一层的采光：{"names", "df" (ny, nx，非房间格为 NaN), "rooms": [各房间一行]}"""
+    names, label = occupancy(p, floor, cell)
+    rooms_grid = label.copy()                            # 开窗洞之前：只有房间内的格子
+    wins = openings(p, floor, names, label, cell)
+    tall = tall_furniture(p, floor, label.shape, cell)
+    solid = (label < 0) | tall
+    open_ids = [i for i, n in enumerate(names) if n in validate.OPEN_ROOMS]
+    floor_cells = (rooms_grid >= 0) & ~np.isin(rooms_grid, open_ids) & ~tall
+    rooms = floor_layout.rooms(p, floor)
+    sky = np.zeros(label.shape)
+    for facade, i, lo, hi, *z in wins:
+        n = max(int(np.ceil((hi - lo) / WINDOW_STEP)), 1)
+        ds = (hi - lo) / n
+        s = lo + (np.arange(n) + 0.5) * ds
+        iy, ix = np.nonzero(floor_cells & (rooms_grid == i))
+        if not len(iy):
+            continue
+        src = np.column_stack([(ix + 0.5) * cell, (iy + 0.5) * cell])
+        vis = visible(solid, cell, src, _exterior(p, facade, s))
+        sky[iy, ix] += (sky_component(p, facade, rooms[i], src, s, ds, z) * vis).sum(axis=1)
+
+    fl, cl = (p[k] for k in LEVELS[floor])
+    R, R_fw, R_cw = REFLECTANCE
+    glazing = dict.fromkeys(range(len(rooms)), 0.0)
+    for facade, i, lo, hi, zb, zt, *_ in wins:
+        glazing[i] += (hi - lo) / 1000 * (zt - zb)
+    df = np.full(label.shape, np.nan)
+    out = []
+    for i, (name, x, y, w, h) in enumerate(rooms):
+        if i in open_ids:
+            continue
+        area = w * h / 1e6
+        surfaces = 2 * area + 2 * (w + h) / 1000 * (cl - fl)
+        irc = TRANSMITTANCE * glazing[i] / (surfaces * (1 - R)) * (SKY_C * R_fw + 5 * R_cw)
+        cells = floor_cells & (rooms_grid == i)
+        df[cells] = 100 * TRANSMITTANCE * sky[cells] + irc
+        values = df[cells]
+        req = standard(name)
+        wfr = glazing[i] / area
+        row = {"floor": floor, "room": name, "area_m2": round(area, 2), "glazing_m2": round(glazing[i], 2),
+               "wfr": round(wfr, 3), "df_mean": round(float(values.mean()), 2) if values.size else 0.0,
+               "df_min": round(float(values.min()), 2) if values.size else 0.0}
+        if req:
+            row["df_target"], row["wfr_target"] = req[0], round(req[1], 3)
+            row["ok"] = bool(row["df_mean"] >= req[0] and wfr >= req[1])
+        out.append(row)
+    return {"names": names, "df": df, "rooms": out}
+
+
+def analyse(p=None, cell=CELL):
+    """各层采光 {层名: analyse_floor 结果}；p 默认 building_config 当前方案"""
+    p = vars(building_config) if p is None else p
+    return {floor: analyse_floor(p, floor, cell) for floor in floor_layout.FLOORS}
+
+
+def report(result):
+    print(f"  {'房间':<12}{'面积m²':>8}{'窗m²':>7}{'窗地比':>8}{'平均DF%':>9}{'最低DF%':>9}  要求")
+    for floor, r in result.items():
+        print(f"  ── {floor}")
+        for row in r["rooms"]:
+            req = ""
+            if "ok" in row:
+                mark = "✓" if row["ok"] else "✗ 采光不足"
+                req = f"DF≥{row['df_target']:g} 窗地比≥1/{1 / row['wfr_target']:.0f}  {mark}"
+            print(f"  {row['room']:<12}{row['area_m2']:>8.1f}{row['glazing_m2']:>7.1f}{row['wfr']:>8.3f}"
+                  f"{row['df_mean']:>9.2f}{row['df_min']:>9.2f}  {req}")
+
+
+# ══════════════════════════════════════════════
+#  热图叠加到平面图
+# ══════════════════════════════════════════════
+
+def overlay(result, floor, png_path, vmax=5.0):
+    """平面图显示列表回放到 matplotlib，墙体之下叠加采光系数热图与各房间 窗地比 / 平均 DF"""
+    import generate_all
+    fp = {"一层": generate_all.floor1_plan, "二层": generate_all.floor2_plan}[floor]()
+    fp.fit()
+    r = result[floor]
+    with generate_all._figure(fp.figsize) as (fig, ax):
+        ax.set_facecolor(generate_all.C_BG); ax.set_aspect("equal"); ax.axis("off")
+        title = {"一层": "一层天然光  Ground Floor Daylight", "二层": "二层天然光  Second Floor Daylight"}[floor]
+        ax.set_title(title, fontsize=16, fontweight="bold", color=generate_all.C_TEXT, pad=fp.title_pad)
+        fp.to_axes(ax)
+        ny, nx = r["df"].shape
+        im = ax.imshow(np.ma.masked_invalid(r["df"]), origin="lower", cmap="RdYlGn", vmin=0, vmax=vmax,
+                       alpha=0.6, interpolation="nearest", zorder=2,
+                       extent=(0, fp.W / 1000, 0, fp.H / 1000))
+        rects = {name: rect for name, *rect in floor_layout.rooms(vars(building_config), floor)}
+        for row in r["rooms"]:
+            x, y, w, h = rects[row["room"]]
+            color = "#1B5E20" if row.get("ok", True) else "#B71C1C"
+            ax.text((x + w / 2) / 1000, (y + h / 2 - 750) / 1000,
+                    f"WFR {row['wfr']:.2f}  DF {row['df_mean']:.1f}%", fontsize=6.5, color=color,
+                    ha="center", va="center", zorder=11,
+                    bbox={"boxstyle": "round,pad=0.2", "fc": "white", "ec": color, "lw": 0.5, "alpha": 0.85})
+        fig.colorbar(im, ax=ax, shrink=0.35, pad=0.01, label="DF (%)")
+        xlim, ylim = fp.limits()
+        ax.set_xlim(*xlim); ax.set_ylim(*ylim)
+        generate_all._save_figure(fig, png_path)
+
+
+def _load_spec(text):
+    if os.path.exists(text):
+        with open(text, encoding="utf-8") as f:
+            return json.load(f)
+    return json.loads(text)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="各房间窗地面积比与采光系数（网格视线法），可出平面热图")
+    ap.add_argument("--spec", metavar="JSON|PATH", help="spec 覆盖项（默认 building_config 当前方案）")
+    ap.add_argument("--cell", type=float, default=CELL, help=f"网格边长 mm（默认 {CELL}）")
+    ap.add_argument("--json", action="store_true", help="各房间结果以 JSON 输出")
+    ap.add_argument("--png", action="store_true", help="另出 docs/images/<层>采光分析.png（叠加在平面图上）")
+    ap.add_argument("--out", default=os.getcwd(), help="--png 的输出根目录（默认当前目录）")
+    args = ap.parse_args(argv)
+
+    overrides = _load_spec(args.spec) if args.spec else None
+    p = spec_mod.resolve(overrides) if overrides else vars(building_config)
+    t0 = time.perf_counter()
+    result = analyse(p, args.cell)
+    ms = (time.perf_counter() - t0) * 1000
+
+    if args.json:
+        print(json.dumps([row for r in result.values() for row in r["rooms"]], ensure_ascii=False, indent=2))
+    else:
+        report(result)
+        print(f"  {args.cell:g} mm 网格，计算 {ms:.0f} ms")
+    if args.png:
+        import generate_all
+        import output_sink
+        if overrides:
+            spec_mod.apply_spec(overrides)
+        output_sink.set_sink(output_sink.DirectorySink(args.out))
+        for floor in result:
+            path = f"{generate_all.IMG_DIR}/{floor}采光分析.png"
+            overlay(result, floor, path)
+            print(f"  ✓ {path}")
+        output_sink.get_sink().close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+"""
+显示列表 — 每张图纸的内容只构建一次，回放到 DXF、matplotlib 或 native_plot（SVG / Pillow 光栅）
+
+  dl = DisplayList("一层平面图  Ground Floor Plan", figsize=(16, 13))
+  dl.rect(0, 0, BW, OW, "WALL", fill=C_WALL, color=C_WALL, lw=0.5)
+  dl.text(x, y, "客厅", "TEXT", size=11, weight="bold")
+  dl.dim(0, X1, 0, "h")
+  with dl.define("LIGHT-MAIN") as sym: sym.circle(0, 0, 150, "ELEC-LIGHT", color="#FFC107")
+  dl.insert("LIGHT-MAIN", x, y, "ELEC-LIGHT")
+  dl.to_dxf(doc, msp, text_style="CJK")      # generate_all._render 同时回放 DXF 与 PNG/SVG
+  dl.to_axes(ax)                             # matplotlib Axes 或 native_plot.Axes
+
+坐标为模型毫米；线宽与字号为出图 pt，DXF 的字高与线宽按 1:100 出图比例换算（1 pt → 35.28 mm）。
+图元：rect / polyline / arc（整圆、椭圆、圆弧，带填充的圆弧为扇形）/ text / dim / arrow / insert。
+符号用 define(name) 录制一次：DXF 写成 BLOCK + INSERT，绘图后端按平移、缩放、旋转展开。
+define(name, shared=块名) 的符号是共享块的替身（如设备图的灰色底图）：合并图纸集（to_dxf(shared=True)）
+中改为直接引用已写入的共享块，单张 DXF 与绘图后端仍用替身自己的图元。
+only="dxf" / "plot" 的图元只出现在一种输出里（DXF 中的标题文字；PNG 的标题由 set_title 绘制）。
+几何只在构建显示列表时计算一次，导出几种格式都不再重复。
+"""
+
+import math
+from contextlib import contextmanager
+
+PT_MM = 25.4 / 72 * 100             # 1 pt 在 1:100 出图时对应的模型毫米
+ARROW_HEAD_PT = (4.0, 2.0)          # DXF 箭头长、半宽（pt），与 native_plot / matplotlib 默认一致
+DXF_LINEWEIGHTS = (0, 5, 9, 13, 15, 18, 20, 25, 30, 35, 40, 50, 53, 60, 70, 80, 90, 100,
+                   106, 120, 140, 158, 200, 211)
+
+# 图层默认绘制次序（matplotlib zorder）；图元可用 z= 覆盖
+LAYER_Z = {
+    "ROOM-FILL": 1, "GROUND": 1, "HATCH": 2, "FURNITURE": 4, "STAIRS": 4, "FIXTURE": 4,
+    "WALL-FILL": 5, "WALL": 5, "SECTION": 5, "DOOR": 6, "WINDOW": 6, "GLASS": 6,
+    "PIPE-SUPPLY": 7, "PIPE-DRAIN": 7, "PIPE-HOT": 7, "ELEC-WIRE": 4,
+    "ELEC-LIGHT": 8, "ELEC-SOCKET": 8, "ELEC-SWITCH": 8, "DIM": 8, "TEXT": 10, "INFO": 10, "TITLE": 10,
+}
+
+_DXF_ALIGN = {
+    ("left", "bottom"): "BOTTOM_LEFT", ("center", "bottom"): "BOTTOM_CENTER", ("right", "bottom"): "BOTTOM_RIGHT",
+    ("left", "center"): "MIDDLE_LEFT", ("center", "center"): "MIDDLE_CENTER", ("right", "center"): "MIDDLE_RIGHT",
+    ("left", "top"): "TOP_LEFT", ("center", "top"): "TOP_CENTER", ("right", "top"): "TOP_RIGHT",
+    ("left", "baseline"): "LEFT", ("center", "baseline"): "CENTER", ("right", "baseline"): "RIGHT",
+}
+_MTEXT_ATTACH = {("left", "top"): 1, ("center", "top"): 2, ("right", "top"): 3,
+                 ("left", "center"): 4, ("center", "center"): 5, ("right", "center"): 6,
+                 ("left", "bottom"): 7, ("center", "bottom"): 8, ("right", "bottom"): 9}
+
+
+class DisplayList:
+    """一张图纸的图元序列；item = (类型, 图层, zorder, 几何, 样式, only)"""
+
+    def __init__(self, title=None, figsize=(16, 13), title_pad=12):
+        self.title = title
+        self.figsize = figsize
+        self.title_pad = title_pad
+        self.xlim = self.ylim = None    # 毫米
+        self.items = []
+        self.symbols = {}
+        self.shared = None              # 作为替身符号时对应的共享块名
+
+    def __len__(self):
+        return len(self.items)
+
+    def _add(self, kind, layer, geom, style, z, only):
+        self.items.append((kind, layer, LAYER_Z.get(layer, 3) if z is None else z, geom, style, only))
+
+    def set_limits(self, xlim, ylim):
+        self.xlim, self.ylim = xlim, ylim
+
+    # ── 图元 ──
+
+    def rect(self, x, y, w, h, layer, fill=None, color=None, lw=1.0, dashed=False, alpha=None, z=None, only=None):
+        self._add("rect", layer, (x, y, w, h), _style(fill, color, lw, dashed, alpha), z, only)
+
+    def polyline(self, pts, layer, closed=False, fill=None, color=None, lw=1.0, dashed=False, alpha=None,
+                 z=None, only=None):
+        self._add("polyline", layer, (tuple(map(tuple, pts)), closed),
+                  _style(fill, color, lw, dashed, alpha), z, only)
+
+    def line(self, x1, y1, x2, y2, layer, color=None, lw=1.0, dashed=False, alpha=None, z=None, only=None):
+        self.polyline([(x1, y1), (x2, y2)], layer, color=color, lw=lw, dashed=dashed, alpha=alpha, z=z, only=only)
+
+    def arc(self, cx, cy, rx, ry, start, end, layer, fill=None, color=None, lw=1.0, alpha=None, z=None, only=None):
+        """start/end 为度；(0, 360) 为整圆/椭圆；带 fill 的圆弧按扇形绘制"""
+        self._add("arc", layer, (cx, cy, rx, ry, start, end), _style(fill, color, lw, False, alpha), z, only)
+
+    def circle(self, cx, cy, r, layer, **style):
+        self.arc(cx, cy, r, r, 0, 360, layer, **style)
+
+    def ellipse(self, cx, cy, rx, ry, layer, **style):
+        self.arc(cx, cy, rx, ry, 0, 360, layer, **style)
+
+    def text(self, x, y, s, layer, size=10, weight="normal", color="black", ha="center", va="center",
+             rotation=0, alpha=None, box=None, z=None, only=None):
+        """box：白底圆角衬框的内边距（字号的倍数），仅绘图后端"""
+        self._add("text", layer, (x, y, str(s)),
+                  {"size": size, "weight": weight, "color": color, "ha": ha, "va": va,
+                   "rotation": rotation, "alpha": alpha, "box": box}, z, only)
+
+    def dim(self, a, b, at, axis, layer="DIM", offset=-700, color="#CC0000", lw=0.6, size=6.5, weight="normal",
+            ext=80, gap=60, z=None, only=None):
+        """尺寸标注：axis="h" 量 x 方向 a→b（基线 y=at），"v" 量 y 方向（基线 x=at）；
+        标注线在基线外 offset 处，界线越过标注线 ext，文字距标注线 gap"""
+        self._add("dim", layer, (a, b, at, axis, offset),
+                  {"color": color, "lw": lw, "size": size, "weight": weight, "ext": ext, "gap": gap}, z, only)
+
+    def arrow(self, x1, y1, x2, y2, layer, style="->", color="black", lw=1.0, z=None, only=None):
+        """(x1, y1) → (x2, y2)；style 为 "->"（开口）或 "-|>"（实心）"""
+        self._add("arrow", layer, ((x1, y1), (x2, y2)), {"style": style, "color": color, "lw": lw}, z, only)
+
+    def insert(self, name, x, y, layer, scale=1.0, rotation=0.0, z=None, only=None):
+        if name not in self.symbols:
+            raise KeyError(f"未定义的符号: {name}")
+        self._add("insert", layer, (name, x, y, scale, rotation), {}, z, only)
+
+    @contextmanager
+    def define(self, name, shared=None):
+        """录制符号（原点为插入点）；同名符号重复定义时覆盖"""
+        sym = DisplayList()
+        sym.symbols = self.symbols
+        sym.shared = shared
+        yield sym
+        self.symbols[name] = sym
+
+    def has_symbol(self, name):
+        return name in self.symbols
+
+    # ── 回放：DXF ──
+
+    def to_dxf(self, doc, layout, text_style="Standard", pt=PT_MM, shared=False):
+        """按 zorder 回放到 DXF 布局（模型空间、图纸空间或块）；符号在首次用到时写成 BLOCK
+
+        pt：1 pt 对应的图形单位（模型空间按 1:100 为 PT_MM，图纸空间为 25.4/72 mm）；
+        shared=True 时替身符号改为引用文档中已有的共享块。
+        """
+        for kind, layer, _, geom, style, only in sorted(self.items, key=lambda it: it[2]):
+            if only == "plot":
+                continue
+            if kind == "insert":
+                name, x, y, scale, rot = geom
+                sym = self.symbols[name]
+                if shared and sym.shared and sym.shared in doc.blocks:
+                    name = sym.shared
+                elif name not in doc.blocks:
+                    sym.to_dxf(doc, doc.blocks.new(name), text_style, pt, shared)
+                layout.add_blockref(name, (x, y), dxfattribs={
+                    "layer": layer, "xscale": scale, "yscale": scale, "rotation": rot})
+            else:
+                _DXF[kind](layout, layer, geom, style, text_style, pt)
+
+    # ── 回放：matplotlib / native_plot ──
+
+    def to_axes(self, ax, unit=0.001):
+        """回放到 Axes（毫米 × unit → 绘图坐标），只用 native_plot.Axes 也实现的调用"""
+        for item in self._expand((0.0, 0.0, 1.0, 0.0)):
+            _AXES[item[0]](ax, unit, *item[1:])
+
+    def limits(self, unit=0.001):
+        return tuple(v * unit for v in self.xlim), tuple(v * unit for v in self.ylim)
+
+    def _expand(self, tf):
+        """展开符号实例，产出 (类型, 几何, 样式, zorder)；tf = (dx, dy, 缩放, 旋转角)
+        符号内的图元保留各自的 zorder（插入点的 zorder 只决定 DXF 中的写出次序）"""
+        for kind, layer, zz, geom, style, only in self.items:
+            if only == "dxf":
+                continue
+            if kind == "insert":
+                name, x, y, scale, rot = geom
+                (px, py), = _apply(tf, [(x, y)])
+                yield from self.symbols[name]._expand((px, py, tf[2] * scale, tf[3] + rot))
+            else:
+                if kind == "rect" and tf[3]:     # 旋转后的矩形按闭合折线绘制
+                    x, y, w, h = geom
+                    kind, geom = "polyline", (((x, y), (x + w, y), (x + w, y + h), (x, y + h)), True)
+                yield (kind,) + _transform(kind, geom, style, tf) + (zz,)
+
+
+def _style(fill, color, lw, dashed, alpha):
+    return {"fill": fill, "color": color, "lw": lw, "dashed": dashed, "alpha": alpha}
+
+
+# ── 几何变换（符号展开） ──
+
+def _apply(tf, pts):
+    dx, dy, s, rot = tf
+    if not rot:
+        return [(dx + x * s, dy + y * s) for x, y in pts]
+    c, n = math.cos(math.radians(rot)), math.sin(math.radians(rot))
+    return [(dx + (x * c - y * n) * s, dy + (x * n + y * c) * s) for x, y in pts]
+
+
+def _transform(kind, geom, style, tf):
+    if tf == (0.0, 0.0, 1.0, 0.0):
+        return geom, style
+    s, rot = tf[2], tf[3]
+    if kind == "rect":
+        (px, py), = _apply(tf, [geom[:2]])
+        return (px, py, geom[2] * s, geom[3] * s), style
+    if kind == "polyline":
+        return (tuple(_apply(tf, geom[0])), geom[1]), style
+    if kind == "arc":
+        cx, cy, rx, ry, a0, a1 = geom
+        (px, py), = _apply(tf, [(cx, cy)])
+        if rx != ry and rot % 90:        # 图元不带轴向角：椭圆只能转 90° 的整数倍
+            raise ValueError(f"椭圆弧不支持旋转 {rot}°（只支持 90° 的整数倍）")
+        if rx != ry and rot % 180:       # 转 90° / 270°：长短轴互换
+            rx, ry = ry, rx
+        if (a0, a1) != (0, 360):
+            a0, a1 = a0 + rot, a1 + rot
+        return (px, py, rx * s, ry * s, a0, a1), style
+    if kind == "text":
+        (px, py), = _apply(tf, [geom[:2]])
+        return (px, py, geom[2]), {**style, "size": style["size"] * s,
+                                   "rotation": (style["rotation"] + rot) % 360}
+    if kind == "dim":
+        a, b, at, axis, off = geom
+        pts = _apply(tf, [(a, at), (b, at)] if axis == "h" else [(at, a), (at, b)])
+        if axis == "h":
+            return (pts[0][0], pts[1][0], pts[0][1], axis, off * s), style
+        return (pts[0][1], pts[1][1], pts[0][0], axis, off * s), style
+    if kind == "arrow":
+        return tuple(_apply(tf, geom)), style
+    raise ValueError(kind)
+
+
+# ── DXF 图元 ──
+
+def _lineweight(lw):
+    mm100 = lw * 25.4 / 72 * 100
+    return min(DXF_LINEWEIGHTS, key=lambda v: abs(v - mm100))
+
+
+def _rgb(color):
+    from matplotlib.colors import to_rgb
+    return tuple(round(c * 255) for c in to_rgb(color))
+
+
+def _stroke_attrs(layer, style):
+    attrs = {"layer": layer, "lineweight": _lineweight(style["lw"])}
+    if style.get("dashed"):
+        attrs["linetype"] = "DASHED"
+    return attrs
+
+
+def _hatch(layout, layer, pts, style):
+    """实心填充：真彩色取填充色；白色衬底（遮挡用）在 CAD 中没有意义，跳过"""
+    fill = style.get("fill")
+    if fill is None or str(fill).lower() == "none" or _rgb(fill) == (255, 255, 255):
+        return
+    h = layout.add_hatch(dxfattribs={"layer": layer})
+    h.rgb = _rgb(fill)
+    if style.get("alpha") is not None:
+        h.transparency = 1 - style["alpha"]
+    h.paths.add_polyline_path(pts, is_closed=True)
+
+
+def _dxf_rect(layout, layer, geom, style, text_style, pt):
+    x, y, w, h = geom
+    pts = [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+    _hatch(layout, layer, pts, style)
+    if style["color"] is not None:
+        layout.add_lwpolyline(pts, close=True, dxfattribs=_stroke_attrs(layer, style))
+
+
+def _dxf_polyline(layout, layer, geom, style, text_style, pt):
+    pts, closed = geom
+    if closed:
+        _hatch(layout, layer, pts, style)
+    if style["color"] is None:
+        return
+    if len(pts) == 2 and not closed:
+        layout.add_line(*pts, dxfattribs=_stroke_attrs(layer, style))
+    else:
+        layout.add_lwpolyline(pts, close=closed, dxfattribs=_stroke_attrs(layer, style))
+
+
+def _arc_points(cx, cy, rx, ry, a0, a1, n=48):
+    span = (a1 - a0) % 360 or 360
+    k = max(4, int(n * span / 360))
+    return [(cx + rx * math.cos(math.radians(a0 + span * i / k)),
+             cy + ry * math.sin(math.radians(a0 + span * i / k))) for i in range(k + 1)]
+
+
+def _dxf_arc(layout, layer, geom, style, text_style, pt):
+    cx, cy, rx, ry, a0, a1 = geom
+    full = (a0, a1) == (0, 360)
+    if style.get("fill") is not None:
+        pts = _arc_points(cx, cy, rx, ry, a0, a1)
+        _hatch(layout, layer, pts if full else [(cx, cy)] + pts, style)
+    if style["color"] is None:
+        return
+    attrs = _stroke_attrs(layer, style)
+    if rx == ry:
+        if full:
+            layout.add_circle((cx, cy), rx, dxfattribs=attrs)
+        else:
+            layout.add_arc((cx, cy), rx, a0, a1, dxfattribs=attrs)
+    else:
+        major, ratio = ((rx, 0, 0), ry / rx) if rx >= ry else ((0, ry, 0), rx / ry)
+        start, end = (0, math.tau) if full else (math.radians(a0), math.radians(a1))
+        if rx < ry and not full:   # 长轴沿 y 时参数角从 y 轴量起
+            start, end = start - math.pi / 2, end - math.pi / 2
+        layout.add_ellipse((cx, cy), major_axis=major, ratio=ratio, start_param=start, end_param=end,
+                           dxfattribs=attrs)
+    if not full and style.get("fill") is not None:
+        for a in (a0, a1):
+            layout.add_line((cx, cy), (cx + rx * math.cos(math.radians(a)), cy + ry * math.sin(math.radians(a))),
+                            dxfattribs=attrs)
+
+
+def _dxf_text(layout, layer, geom, style, text_style, pt):
+    from ezdxf.enums import TextEntityAlignment
+    x, y, s = geom
+    height = style["size"] * pt
+    va = "center" if style["va"] in ("center", "center_baseline") else style["va"]
+    if "\n" in s:
+        layout.add_mtext(s.replace("\n", "\\P"), dxfattribs={
+            "layer": layer, "style": text_style, "char_height": height, "insert": (x, y),
+            "rotation": style["rotation"],
+            "attachment_point": _MTEXT_ATTACH.get((style["ha"], "bottom" if va == "baseline" else va), 5)})
+        return
+    align = getattr(TextEntityAlignment, _DXF_ALIGN[(style["ha"], va)])
+    layout.add_text(s, height=height, rotation=style["rotation"],
+                    dxfattribs={"layer": layer, "style": text_style}).set_placement((x, y), align=align)
+
+
+def _dim_geometry(geom, style):
+    """标注线、两条界线与文字位置（模型毫米）"""
+    a, b, at, axis, off = geom
+    o, ext, gap = at + off, math.copysign(style["ext"], off), style["gap"]
+    if axis == "h":
+        lines = [((a, o), (b, o)), ((a, at), (a, o + ext)), ((b, at), (b, o + ext))]
+        return lines, ((a + b) / 2, o + gap), ("center", "bottom", 0)
+    lines = [((o, a), (o, b)), ((at, a), (o + ext, a)), ((at, b), (o + ext, b))]
+    return lines, (o + gap, (a + b) / 2), ("left", "center", 90)
+
+
+def _dxf_dim(layout, layer, geom, style, text_style, pt):
+    lines, (tx, ty), (ha, va, rot) = _dim_geometry(geom, style)
+    attrs = _stroke_attrs(layer, {"lw": style["lw"]})
+    for p, q in lines:
+        layout.add_line(p, q, dxfattribs=attrs)
+    _dxf_text(layout, layer, (tx, ty, f"{abs(geom[1] - geom[0]):.0f}"),
+              {"size": style["size"], "ha": ha, "va": va, "rotation": rot}, text_style, pt)
+
+
+def _dxf_arrow(layout, layer, geom, style, text_style, pt):
+    (x1, y1), (x2, y2) = geom
+    n = math.hypot(x2 - x1, y2 - y1) or 1.0
+    ux, uy = (x2 - x1) / n, (y2 - y1) / n
+    hl, hw = ARROW_HEAD_PT[0] * pt, ARROW_HEAD_PT[1] * pt
+    bx, by = x2 - ux * hl, y2 - uy * hl
+    wing = [(bx - uy * hw, by + ux * hw), (x2, y2), (bx + uy * hw, by - ux * hw)]
+    attrs = _stroke_attrs(layer, {"lw": style["lw"]})
+    if style["style"] == "-|>":
+        layout.add_line((x1, y1), (bx, by), dxfattribs=attrs)
+        h = layout.add_hatch(dxfattribs={"layer": layer})
+        h.paths.add_polyline_path(wing, is_closed=True)
+    else:
+        layout.add_line((x1, y1), (x2, y2), dxfattribs=attrs)
+        layout.add_lwpolyline(wing, dxfattribs=attrs)
+
+
+_DXF = {"rect": _dxf_rect, "polyline": _dxf_polyline, "arc": _dxf_arc, "text": _dxf_text,
+        "dim": _dxf_dim, "arrow": _dxf_arrow}
+
+
+# ── 绘图后端图元（matplotlib Axes / native_plot.Axes） ──
+
+def _none(c):
+    return "none" if c is None else c
+
+
+def _ls(style):
+    return "--" if style.get("dashed") else "-"
+
+
+def _axes_rect(ax, u, geom, style, z):
+    from matplotlib import patches
+    x, y, w, h = geom
+    ax.add_patch(patches.Rectangle((x * u, y * u), w * u, h * u, facecolor=_none(style["fill"]),
+                                   edgecolor=_none(style["color"]), linewidth=style["lw"],
+                                   linestyle=_ls(style), alpha=style["alpha"], zorder=z))
+
+
+def _axes_polyline(ax, u, geom, style, z):
+    from matplotlib import patches
+    pts, closed = geom
+    if closed:
+        ax.add_patch(patches.Polygon([(x * u, y * u) for x, y in pts], closed=True,
+                                     facecolor=_none(style["fill"]), edgecolor=_none(style["color"]),
+                                     linewidth=style["lw"], linestyle=_ls(style), alpha=style["alpha"], zorder=z))
+    else:
+        ax.plot([x * u for x, _ in pts], [y * u for _, y in pts], color=style["color"], linewidth=style["lw"],
+                linestyle=_ls(style), alpha=style["alpha"], zorder=z)
+
+
+def _axes_arc(ax, u, geom, style, z):
+    from matplotlib import patches
+    cx, cy, rx, ry, a0, a1 = geom
+    common = dict(edgecolor=_none(style["color"]), linewidth=style["lw"], alpha=style["alpha"], zorder=z)
+    if (a0, a1) == (0, 360):
+        ax.add_patch(patches.Ellipse((cx * u, cy * u), 2 * rx * u, 2 * ry * u, facecolor=_none(style["fill"]),
+                                     **common))
+    elif style["fill"] is not None:
+        ax.add_patch(patches.Wedge((cx * u, cy * u), rx * u, a0, a1, facecolor=style["fill"], **common))
+    else:
+        ax.add_patch(patches.Arc((cx * u, cy * u), 2 * rx * u, 2 * ry * u, theta1=a0, theta2=a1,
+                                 color=_none(style["color"]), linewidth=style["lw"], alpha=style["alpha"], zorder=z))
+
+
+def _axes_text(ax, u, geom, style, z):
+    x, y, s = geom
+    kw = {}
+    if style["box"] is not None:
+        kw["bbox"] = dict(boxstyle=f"round,pad={style['box']}", facecolor="white", edgecolor="none")
+    ax.text(x * u, y * u, s, ha=style["ha"], va=style["va"], fontsize=style["size"], fontweight=style["weight"],
+            color=style["color"], rotation=style["rotation"], alpha=style["alpha"], zorder=z, **kw)
+
+
+def _axes_dim(ax, u, geom, style, z):
+    lines, (tx, ty), (ha, va, rot) = _dim_geometry(geom, style)
+    for i, (p, q) in enumerate(lines):
+        ax.plot([p[0] * u, q[0] * u], [p[1] * u, q[1] * u], color=style["color"],
+                linewidth=style["lw"] if i == 0 else 0.4, zorder=z)
+    ax.text(tx * u, ty * u, f"{abs(geom[1] - geom[0]):.0f}", ha=ha, va=va, fontsize=style["size"],
+            fontweight=style["weight"], color=style["color"], rotation=rot, zorder=z)
+
+
+def _axes_arrow(ax, u, geom, style, z):
+    (x1, y1), (x2, y2) = geom
+    ax.annotate("", xy=(x2 * u, y2 * u), xytext=(x1 * u, y1 * u),
+                arrowprops=dict(arrowstyle=style["style"], color=style["color"], lw=style["lw"]), zorder=z)
+
+
+_AXES = {"rect": _axes_rect, "polyline": _axes_polyline, "arc": _axes_arc, "text": _axes_text,
+         "dim": _axes_dim, "arrow": _axes_arrow}
@@ -0,0 +1,609 @@
+"""
+DXF 差异 — 比较两次出图的 图纸/ 目录（或两个 DXF 文件），逐文件列出新增 / 删除 / 移动的图元
+
+  python dxf_diff.py 旧/图纸 图纸                           # 改 building_config.py 前后两次出图
+  python dxf_diff.py 旧/图纸 图纸 --overlay diff/ --json diff.json
+  python dxf_diff.py 旧.dxf 新.dxf --quantum 5              # 单个文件，5 mm 以内的偏差视为相同
+
+有差异时退出码 1（可直接放进发布前检查）。
+
+  - 读取：ezdxf iterdxf 流式解析 BLOCKS 与模型空间实体，INSERT 按块展开到模型空间坐标，
+    因此“块内改动”与“块外改动”、合并 DXF 与单张 DXF 的比较方式相同；图纸空间（布局）不参与比较
+  - 规范化：每个图元化为 (类型, 图层, 几何, 文字) 元组 —— 坐标按 --quantum 取整，角度取 0.01°，
+    LINE 与两点 LWPOLYLINE 同为 LINE，折线取与方向 / 起点无关的顺序，TEXT 与 MTEXT 同为 TEXT；
+    颜色、线型、句柄等不影响出图几何的属性不参与
+  - 哈希：每个图元 64 位 blake2b，图层摘要为图元摘要之和（与图元顺序无关）。两侧图层摘要相同即
+    跳过该图层，只有摘要不同的图层才逐图元求差；字节相同的文件连解析都省掉
+  - 移动：删除与新增中形状相同（几何减去锚点后相同）的图元配对为“移动”，按位移向量汇总
+  - --overlay DIR：每个有差异的文件输出一张叠加 DXF（同名），未变图元为灰色 DIFF-SAME，
+    新增 DIFF-ADDED（绿）、删除 DIFF-REMOVED（红）、移动后 DIFF-MOVED（蓝）、
+    移动前 DIFF-MOVED-FROM（浅灰），并以 DIFF-MOVED 上的短线连接移动前后的锚点
+  - 多个文件用 --jobs 个进程并行比较
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing as mp
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from ezdxf.addons import iterdxf
+
+QUANTUM = 1.0                   # 坐标取整步长（mm）
+ANGLE_STEP = 0.01               # 角度取整步长（度）
+PAIR_LIMIT = 4096               # 同形状删除 × 新增组合数不超过此值时按最近距离配对，否则按坐标顺序配对
+TYPES = ("LINE", "LWPOLYLINE", "CIRCLE", "ARC", "ELLIPSE", "TEXT", "MTEXT", "HATCH", "POINT", "INSERT")
+OVERLAY_LAYERS = [("DIFF-SAME", 8), ("DIFF-ADDED", 3), ("DIFF-REMOVED", 1),
+                  ("DIFF-MOVED", 5), ("DIFF-MOVED-FROM", 9)]
+_LINKED = ("VERTEX", "SEQEND", "ATTRIB")   # 附属于前一实体，不单独比较
+_IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+# ══════════════════════════════════════════════
+#  流式读取
+# ══════════════════════════════════════════════
+
+def _edge_point(edge):
+    """边界边的代表点：直线取起点，圆弧 / 椭圆弧取圆心，样条取首个控制点"""
+    if hasattr(edge, "start"):
+        return tuple(edge.start)[:2]
+    if hasattr(edge, "center"):
+        return tuple(edge.center)[:2]
+    return tuple(edge.control_points[0])[:2] if getattr(edge, "control_points", None) else None
+
+
+def _hatch_paths(e):
+    paths = []
+    for path in e.paths:
+        if hasattr(path, "vertices"):
+            paths.append([(v[0], v[1]) for v in path.vertices])
+        else:
+            paths.append([p for p in map(_edge_point, path.edges) if p])
+    return [p for p in paths if p]
+
+
+def _record(e, unsupported):
+    """ezdxf 实体 → 轻量元组（块内坐标）"""
+    t, layer = e.dxftype(), e.dxf.layer
+    if t == "LWPOLYLINE":
+        return ("poly", layer, [(x, y) for x, y in e.get_points("xy")], bool(e.closed))
+    if t == "LINE":
+        return ("poly", layer, [tuple(e.dxf.start)[:2], tuple(e.dxf.end)[:2]], False)
+    if t == "CIRCLE":
+        return ("arc", layer, tuple(e.dxf.center)[:2], e.dxf.radius, None, None)
+    if t == "ARC":
+        return ("arc", layer, tuple(e.dxf.center)[:2], e.dxf.radius, e.dxf.start_angle, e.dxf.end_angle)
+    if t == "ELLIPSE":
+        return ("ellipse", layer, tuple(e.dxf.center)[:2], tuple(e.dxf.major_axis)[:2], e.dxf.ratio,
+                e.dxf.start_param, e.dxf.end_param)
+    if t == "TEXT":
+        aligned = e.dxf.get("halign", 0) or e.dxf.get("valign", 0)
+        p = e.dxf.get("align_point") if aligned and e.dxf.hasattr("align_point") else e.dxf.insert
+        return ("text", layer, tuple(p)[:2], e.dxf.height, e.dxf.get("rotation", 0.0), e.dxf.text)
+    if t == "MTEXT":
+        return ("text", layer, tuple(e.dxf.insert)[:2], e.dxf.char_height, e.dxf.get("rotation", 0.0),
+                e.plain_text())
+    if t == "HATCH":
+        return ("hatch", layer, _hatch_paths(e), "SOLID" if e.dxf.solid_fill else e.dxf.pattern_name)
+    if t == "POINT":
+        return ("point", layer, tuple(e.dxf.location)[:2])
+    if t == "INSERT":
+        return ("insert", layer, e.dxf.name, tuple(e.dxf.insert)[:2],
+                e.dxf.get("xscale", 1.0), e.dxf.get("yscale", 1.0), e.dxf.get("rotation", 0.0))
+    unsupported[t] += 1
+    return None
+
+
+def _stream(path):
+    """ezdxf iterdxf 逐个实体解析（二进制 DXF、R2004 及更早版本走这里）"""
+    unsupported = Counter()
+    dxf = iterdxf.opendxf(path)
+    try:
+        blocks, current = {}, None
+        for e in dxf.load_entities(dxf.sections["BLOCKS"] + 1, set(TYPES) | {"BLOCK", "ENDBLK"}):
+            t = e.dxftype()
+            if t == "BLOCK":
+                current = None if e.dxf.name.startswith("*") else blocks.setdefault(e.dxf.name, [])
+            elif t == "ENDBLK":
+                current = None
+            elif current is not None:
+                r = _record(e, unsupported)
+                if r:
+                    current.append(r)
+        entities = [r for r in (_record(e, unsupported) for e in dxf.modelspace()) if r]
+    finally:
+        dxf.close()
+    return entities, blocks, unsupported
+
+
+def _quick(t, tags):
+    """简单实体直接由组码取值 → 轻量元组（与 _record 相同）；其余类型返回 None"""
+    first = {}
+    for c, v in tags:
+        first.setdefault(c, v)
+    layer, f = first.get(8, "0").strip(), lambda c, d=0.0: float(first.get(c, d))
+    if t == "LINE":
+        return ("poly", layer, [(f(10), f(20)), (f(11), f(21))], False)
+    if t == "LWPOLYLINE":
+        xs = [float(v) for c, v in tags if c == 10]
+        ys = [float(v) for c, v in tags if c == 20]
+        return ("poly", layer, list(zip(xs, ys)), bool(int(first.get(70, 0)) & 1))
+    if t == "CIRCLE":
+        return ("arc", layer, (f(10), f(20)), f(40), None, None)
+    if t == "ARC":
+        return ("arc", layer, (f(10), f(20)), f(40), f(50), f(51))
+    if t == "TEXT":
+        aligned = int(first.get(72, 0)) or int(first.get(73, 0))
+        p = (f(11), f(21)) if aligned and 11 in first else (f(10), f(20))
+        return ("text", layer, p, f(40), f(50), first.get(1, ""))
+    if t == "POINT":
+        return ("point", layer, (f(10), f(20)))
+    if t == "INSERT":
+        return ("insert", layer, first[2].strip(), (f(10), f(20)), f(41, 1.0), f(42, 1.0), f(50))
+    return None
+
+
+def _scan(path):
+    """ASCII DXF（R2007+，UTF-8）按组码直接扫描，不构建 ezdxf 实体；非 ASCII 或更早版本返回 None
+
+    LINE / LWPOLYLINE / CIRCLE / ARC / TEXT / POINT / INSERT 直接取组码值，
+    HATCH / MTEXT / ELLIPSE 仍交给 ezdxf 的实体加载（与 iterdxf 相同的 ExtendedTags 路径）。
+    """
+    with open(path, "rb") as fb:
+        if fb.read(22).startswith(b"AutoCAD Binary DXF"):
+            return None
+    with open(path, encoding="utf-8", errors="surrogateescape") as fp:
+        lines = fp.read().splitlines()
+    codes, values = list(map(int, lines[0::2])), lines[1::2]
+    version = next((values[i + 1].strip() for i, v in enumerate(values[:200]) if v.strip() == "$ACADVER"), "")
+    if version < "AC1021":
+        return None
+    from ezdxf.entities import factory
+    from ezdxf.lldxf.extendedtags import ExtendedTags
+
+    unsupported, blocks, entities = Counter(), {}, []
+    starts = [i for i, c in enumerate(codes) if c == 0] + [len(codes)]
+    section, current = None, None
+    for s, e in zip(starts, starts[1:]):
+        t = values[s].strip()
+        if t == "SECTION":
+            section = values[s + 1].strip()
+            continue
+        if t in ("ENDSEC", "EOF") or section not in ("BLOCKS", "ENTITIES"):
+            continue
+        if t == "BLOCK":
+            name = next(v.strip() for c, v in zip(codes[s + 1:e], values[s + 1:e]) if c == 2)
+            current = None if name.startswith("*") else blocks.setdefault(name, [])
+            continue
+        if t == "ENDBLK":
+            current = None
+            continue
+        if (section == "BLOCKS" and current is None) or t in _LINKED:
+            continue
+        tags = list(zip(codes[s + 1:e], values[s + 1:e]))
+        if section == "ENTITIES" and 67 in codes[s + 1:e] and values[codes.index(67, s + 1, e)].strip() == "1":
+            continue                                    # 图纸空间
+        if t not in TYPES:
+            unsupported[t] += 1
+            continue
+        r = _quick(t, tags)
+        if r is None:
+            text = "\n".join(f"{c}\n{v}" for c, v in zip(codes[s:e], values[s:e])) + "\n"
+            r = _record(factory.load(ExtendedTags.from_text(text)), unsupported)
+        if r:
+            (current if section == "BLOCKS" else entities).append(r)
+    return entities, blocks, unsupported
+
+
+def read(path):
+    """读取一个 DXF → (模型空间图元元组, 块定义, 未支持的实体类型计数)"""
+    return _scan(path) or _stream(path)
+
+
+# ══════════════════════════════════════════════
+#  块展开 + 规范化
+# ══════════════════════════════════════════════
+# 变换为仿射矩阵 (a, b, c, d, e, f)：x' = a·x + b·y + e，y' = c·x + d·y + f
+
+def _compose(tf, p, sx, sy, rot):
+    a, b, c, d, e, f = tf
+    cos, sin = math.cos(math.radians(rot)), math.sin(math.radians(rot))
+    la, lb, lc, ld = cos * sx, -sin * sy, sin * sx, cos * sy       # 插入：先缩放再旋转
+    return (a * la + b * lc, a * lb + b * ld, c * la + d * lc, c * lb + d * ld,
+            a * p[0] + b * p[1] + e, c * p[0] + d * p[1] + f)
+
+
+def _angle(tf, deg):
+    """方向角经变换后的角度"""
+    a, b, c, d = tf[:4]
+    x, y = math.cos(math.radians(deg)), math.sin(math.radians(deg))
+    return math.degrees(math.atan2(c * x + d * y, a * x + b * y))
+
+
+class Canon:
+    """图元 → 规范化键 (类型, 图层, 几何…)；几何为整数网格坐标（× quantum 即毫米）"""
+
+    def __init__(self, quantum=QUANTUM):
+        self.quantum = quantum
+
+    def q(self, v):
+        return round(v / self.quantum)
+
+    def pt(self, tf, p):
+        a, b, c, d, e, f = tf
+        return (self.q(a * p[0] + b * p[1] + e), self.q(c * p[0] + d * p[1] + f))
+
+    @staticmethod
+    def deg(v):
+        return round((v % 360.0) / ANGLE_STEP) % round(360 / ANGLE_STEP)
+
+    @staticmethod
+    def _ring(pts):
+        """闭合折线：去掉重复终点，从最小顶点起、取两个方向中较小者"""
+        if len(pts) > 1 and pts[0] == pts[-1]:
+            pts = pts[:-1]
+        i = pts.index(min(pts))
+        fwd = pts[i:] + pts[:i]
+        rev = [fwd[0]] + fwd[:0:-1]
+        return tuple(min(fwd, rev))
+
+    def key(self, r, tf):
+        kind, layer = r[0], r[1]
+        if kind == "poly":
+            pts = [self.pt(tf, p) for p in r[2]]
+            pts = [p for i, p in enumerate(pts) if i == 0 or p != pts[i - 1]]
+            if r[3] and len(pts) > 2:
+                return ("POLYLINE", layer, self._ring(pts), True)
+            if len(pts) == 2 and not r[3]:
+                return ("LINE", layer, tuple(min(pts, pts[::-1])))
+            return ("POLYLINE", layer, tuple(min(pts, pts[::-1])), bool(r[3]))
+        if kind == "arc":
+            scale = math.sqrt(abs(tf[0] * tf[3] - tf[1] * tf[2]))
+            c, radius = self.pt(tf, r[2]), self.q(r[3] * scale)
+            if r[4] is None:
+                return ("CIRCLE", layer, c, radius)
+            a0, a1 = _angle(tf, r[4]), _angle(tf, r[5])
+            if tf[0] * tf[3] - tf[1] * tf[2] < 0:        # 镜像：圆弧方向反转
+                a0, a1 = a1, a0
+            return ("ARC", layer, c, radius, self.deg(a0), self.deg(a1))
+        if kind == "ellipse":
+            (mx, my), (s, e) = r[3], r[5:7]
+            a, b, c, d = tf[:4]
+            major = (self.q(a * mx + b * my), self.q(c * mx + d * my))
+            if a * d - b * c < 0:
+                s, e = -e, -s
+            return ("ELLIPSE", layer, self.pt(tf, r[2]), major, round(r[4], 4),
+                    self.deg(math.degrees(s)), self.deg(math.degrees(e)))
+        if kind == "text":
+            scale = math.sqrt(abs(tf[0] * tf[3] - tf[1] * tf[2]))
+            return ("TEXT", layer, self.pt(tf, r[2]), self.q(r[3] * scale),
+                    self.deg(_angle(tf, r[4])), r[5].strip())
+        if kind == "hatch":
+            rings = sorted(self._ring([self.pt(tf, p) for p in path]) for path in r[2])
+            return ("HATCH", layer, tuple(rings), r[3])
+        return ("POINT", layer, self.pt(tf, r[2]))
+
+    def flatten(self, items, blocks, tf=_IDENTITY, parent_layer=None, out=None, depth=0):
+        """展开 INSERT，规范化键按图层收集（0 图层图元继承插入图层）"""
+        if out is None:
+            out = defaultdict(list)
+        if depth > 16:
+            raise ValueError("块嵌套过深（循环引用？）")
+        for r in items:
+            layer = r[1]
+            if layer == "0" and parent_layer:
+                r = (r[0], parent_layer) + r[2:]
+                layer = parent_layer
+            if r[0] == "insert":
+                _, _, name, p, sx, sy, rot = r
+                if name in blocks:
+                    self.flatten(blocks[name], blocks, _compose(tf, p, sx, sy, rot), layer, out, depth + 1)
+            else:
+                out[layer].append(self.key(r, tf))
+        return out
+
+
+def canonical(path, quantum=QUANTUM):
+    """DXF → ({图层: [规范化键]}, 未支持的实体类型计数)"""
+    entities, blocks, unsupported = read(path)
+    return Canon(quantum).flatten(entities, blocks), unsupported
+
+
+# ══════════════════════════════════════════════
+#  哈希 + 差异
+# ══════════════════════════════════════════════
+
+def digest(key):
+    """图元的 64 位摘要（跨进程、跨次运行稳定）"""
+    return int.from_bytes(hashlib.blake2b(repr(key).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def layer_digests(layers):
+    """{图层: 摘要}：图元摘要之和 mod 2^64，与图元顺序无关、保留重复图元"""
+    return {layer: sum(map(digest, keys)) & 0xFFFFFFFFFFFFFFFF for layer, keys in layers.items()}
+
+
+def _anchor(key):
+    """(锚点, 形状)：形状为几何减去锚点，平移前后形状相同"""
+    kind, geom = key[0], key[2]
+    if kind in ("LINE", "POLYLINE"):
+        (x, y) = geom[0]
+        return (x, y), (kind, key[1], tuple((px - x, py - y) for px, py in geom)) + key[3:]
+    if kind == "HATCH":
+        (x, y) = geom[0][0]
+        return (x, y), (kind, key[1], tuple(tuple((px - x, py - y) for px, py in ring) for ring in geom), key[3])
+    return geom, (kind, key[1]) + key[3:]
+
+
+def _pair(olds, news):
+    """同形状的删除 / 新增锚点配对：组合数小时按最近距离贪心，否则按坐标顺序"""
+    if len(olds) * len(news) <= PAIR_LIMIT:
+        cand = sorted((math.dist(o, n), i, j) for i, o in enumerate(olds) for j, n in enumerate(news))
+        used_o, used_n, pairs = set(), set(), []
+        for _, i, j in cand:
+            if i not in used_o and j not in used_n:
+                used_o.add(i); used_n.add(j)
+                pairs.append((i, j))
+        return pairs
+    oi = sorted(range(len(olds)), key=olds.__getitem__)
+    ni = sorted(range(len(news)), key=news.__getitem__)
+    return list(zip(oi, ni))
+
+
+def diff_layer(old_keys, new_keys):
+    """→ (删除键, 新增键, 移动 [(旧键, 新键)])"""
+    old_c, new_c = Counter(old_keys), Counter(new_keys)
+    removed = list((old_c - new_c).elements())
+    added = list((new_c - old_c).elements())
+    groups = defaultdict(lambda: ([], []))
+    for side, keys in ((0, removed), (1, added)):
+        for k in keys:
+            anchor, shape = _anchor(k)
+            groups[shape][side].append((anchor, k))
+    moved, gone, new = [], [], []
+    for olds, news in groups.values():
+        pairs = _pair([a for a, _ in olds], [a for a, _ in news]) if olds and news else []
+        po, pn = {i for i, _ in pairs}, {j for _, j in pairs}
+        moved.extend((olds[i][1], news[j][1]) for i, j in pairs)
+        gone.extend(k for i, (_, k) in enumerate(olds) if i not in po)
+        new.extend(k for j, (_, k) in enumerate(news) if j not in pn)
+    return gone, new, moved
+
+
+def describe(key, quantum=QUANTUM):
+    """规范化键 → 一行可读说明（坐标为毫米）"""
+    kind, layer, geom = key[0], key[1], key[2]
+
+    def mm(p):
+        return f"({p[0] * quantum:g}, {p[1] * quantum:g})"
+    if kind == "LINE":
+        return f"{layer} LINE {mm(geom[0])}-{mm(geom[1])}"
+    if kind == "POLYLINE":
+        return f"{layer} POLYLINE {len(geom)} 点 {mm(geom[0])}{' 闭合' if key[3] else ''}"
+    if kind == "HATCH":
+        return f"{layer} HATCH {key[3]} {len(geom)} 环 {mm(geom[0][0])}"
+    if kind == "TEXT":
+        return f"{layer} TEXT {key[5]!r} {mm(geom)}"
+    return f"{layer} {kind} {mm(geom)}"
+
+
+def _same_bytes(a, b):
+    if os.path.getsize(a) != os.path.getsize(b):
+        return False
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        while True:
+            x, y = fa.read(1 << 20), fb.read(1 << 20)
+            if x != y:
+                return False
+            if not x:
+                return True
+
+
+def diff_file(old_path, new_path, quantum=QUANTUM, overlay=None):
+    """比较两个 DXF → 结果 dict；overlay 给出路径且有差异时写叠加 DXF"""
+    t0 = time.perf_counter()
+    result = {"status": "same", "layers": {}, "added": [], "removed": [], "moved": [], "unsupported": {}}
+    if _same_bytes(old_path, new_path):
+        result["seconds"] = round(time.perf_counter() - t0, 3)
+        return result
+    (old, old_u), (new, new_u) = canonical(old_path, quantum), canonical(new_path, quantum)
+    result["unsupported"] = dict(old_u + new_u)
+    old_d, new_d = layer_digests(old), layer_digests(new)
+    changes = {}
+    for layer in sorted(set(old_d) | set(new_d)):
+        if old_d.get(layer) == new_d.get(layer):
+            continue
+        gone, added, moved = diff_layer(old.get(layer, ()), new.get(layer, ()))
+        if not (gone or added or moved):
+            continue
+        changes[layer] = (gone, added, moved)
+        result["layers"][layer] = {"added": len(added), "removed": len(gone), "moved": len(moved),
+                                   "old_digest": f"{old_d.get(layer, 0):016x}",
+                                   "new_digest": f"{new_d.get(layer, 0):016x}"}
+        result["added"] += [describe(k, quantum) for k in added]
+        result["removed"] += [describe(k, quantum) for k in gone]
+        vectors = Counter()
+        for a, b in moved:
+            (ax, ay), _ = _anchor(a)
+            (bx, by), _ = _anchor(b)
+            vectors[(bx - ax, by - ay)] += 1
+        result["moved"] += [{"layer": layer, "dx": dx * quantum, "dy": dy * quantum, "count": n}
+                            for (dx, dy), n in vectors.most_common()]
+    if changes:
+        result["status"] = "changed"
+        if overlay:
+            write_overlay(overlay, new, changes, quantum)
+    result["seconds"] = round(time.perf_counter() - t0, 3)
+    return result
+
+
+# ══════════════════════════════════════════════
+#  叠加 DXF
+# ══════════════════════════════════════════════
+
+def _draw(msp, key, layer, quantum, text_style):
+    """规范化键 → 模型空间图元（颜色随图层）"""
+    kind, geom = key[0], key[2]
+
+    def mm(p):
+        return (p[0] * quantum, p[1] * quantum)
+    attrs = {"layer": layer}
+    if kind == "LINE":
+        msp.add_line(mm(geom[0]), mm(geom[1]), dxfattribs=attrs)
+    elif kind == "POLYLINE":
+        msp.add_lwpolyline([mm(p) for p in geom], close=key[3], dxfattribs=attrs)
+    elif kind == "HATCH":
+        for ring in geom:
+            msp.add_lwpolyline([mm(p) for p in ring], close=True, dxfattribs=attrs)
+    elif kind == "CIRCLE":
+        msp.add_circle(mm(geom), key[3] * quantum, dxfattribs=attrs)
+    elif kind == "ARC":
+        msp.add_arc(mm(geom), key[3] * quantum, key[4] * ANGLE_STEP, key[5] * ANGLE_STEP, dxfattribs=attrs)
+    elif kind == "ELLIPSE":
+        msp.add_ellipse(mm(geom), major_axis=mm(key[3]), ratio=key[4],
+                        start_param=math.radians(key[5] * ANGLE_STEP),
+                        end_param=math.radians(key[6] * ANGLE_STEP), dxfattribs=attrs)
+    elif kind == "TEXT":
+        msp.add_text(key[5], height=max(key[3] * quantum, quantum), rotation=key[4] * ANGLE_STEP,
+                     dxfattribs={**attrs, "style": text_style}).set_placement(mm(geom))
+    else:
+        msp.add_point(mm(geom), dxfattribs=attrs)
+
+
+def write_overlay(path, new, changes, quantum=QUANTUM):
+    """新图为底（未变图元灰色），在其上标出新增 / 删除 / 移动"""
+    import ezdxf
+    from ezdxf import units
+    import generate_all                 # 与出图相同的 CJK 文字样式与图层表
+
+    doc = ezdxf.new("R2010")
+    doc.units = units.MM
+    generate_all.setup_layers(doc)
+    for name, color in OVERLAY_LAYERS:
+        doc.layers.add(name, color=color)
+    style, msp = generate_all._DXF_STYLE, doc.modelspace()
+    for layer, keys in new.items():
+        skip = Counter()
+        if layer in changes:
+            _, added, moved = changes[layer]
+            skip = Counter(added) + Counter(b for _, b in moved)
+        for k in keys:
+            if skip[k]:
+                skip[k] -= 1
+            else:
+                _draw(msp, k, "DIFF-SAME", quantum, style)
+    for gone, added, moved in changes.values():
+        for k in gone:
+            _draw(msp, k, "DIFF-REMOVED", quantum, style)
+        for k in added:
+            _draw(msp, k, "DIFF-ADDED", quantum, style)
+        for a, b in moved:
+            _draw(msp, a, "DIFF-MOVED-FROM", quantum, style)
+            _draw(msp, b, "DIFF-MOVED", quantum, style)
+            (ax, ay), _ = _anchor(a)
+            (bx, by), _ = _anchor(b)
+            msp.add_line((ax * quantum, ay * quantum), (bx * quantum, by * quantum), dxfattribs={"layer": "DIFF-MOVED"})
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    doc.saveas(path)
+
+
+# ══════════════════════════════════════════════
+#  目录比较
+# ══════════════════════════════════════════════
+
+def _pairs(old, new):
+    """→ [(相对路径, 旧路径或 None, 新路径或 None)]；两个参数都是文件时比较这一对"""
+    if os.path.isfile(old) and os.path.isfile(new):
+        return [(os.path.basename(new), old, new)]
+
+    def scan(root):
+        found = {}
+        for d, _, files in os.walk(root):
+            for f in files:
+                if f.lower().endswith(".dxf"):
+                    p = os.path.join(d, f)
+                    found[os.path.relpath(p, root)] = p
+        return found
+    a, b = scan(old), scan(new)
+    return [(rel, a.get(rel), b.get(rel)) for rel in sorted(set(a) | set(b))]
+
+
+def _job(args):
+    rel, old, new, quantum, overlay = args
+    return rel, diff_file(old, new, quantum, overlay and os.path.join(overlay, rel))
+
+
+def diff_trees(old, new, quantum=QUANTUM, overlay=None, jobs=None):
+    """比较两个 图纸/ 目录 → {相对路径: 结果}"""
+    results, work = {}, []
+    for rel, a, b in _pairs(old, new):
+        if a is None or b is None:
+            results[rel] = {"status": "added" if a is None else "removed"}
+        else:
+            work.append((rel, a, b, quantum, overlay))
+    jobs = min(jobs or os.cpu_count() or 1, len(work))
+    if jobs > 1:
+        methods = mp.get_all_start_methods()
+        ctx = mp.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(jobs, mp_context=ctx) as pool:
+            results.update(pool.map(_job, work))
+    else:
+        results.update(map(_job, work))
+    return dict(sorted(results.items()))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="比较两次出图的 DXF（目录或单个文件），列出新增 / 删除 / 移动的图元")
+    ap.add_argument("old", help="旧 图纸/ 目录或 DXF 文件")
+    ap.add_argument("new", help="新 图纸/ 目录或 DXF 文件")
+    ap.add_argument("--quantum", type=float, default=QUANTUM,
+                    help=f"坐标取整步长（mm），小于此值的偏差视为相同（默认 {QUANTUM:g}）")
+    ap.add_argument("--overlay", metavar="DIR", help="有差异的文件各输出一张叠加 DXF 到 DIR（保持相对路径）")
+    ap.add_argument("--json", metavar="PATH", help="完整结果另存为 JSON")
+    ap.add_argument("--jobs", type=int, default=None, help="并行进程数（默认 CPU 核数）")
+    ap.add_argument("--limit", type=int, default=10, help="每个文件最多列出多少条新增 / 删除（默认 10）")
+    args = ap.parse_args(argv)
+    for p in (args.old, args.new):
+        if not os.path.exists(p):
+            ap.error(f"路径不存在: {p}")
+
+    t0 = time.perf_counter()
+    results = diff_trees(args.old, args.new, args.quantum, args.overlay, args.jobs)
+    changed = 0
+    for rel, r in results.items():
+        if r["status"] == "same":
+            continue
+        changed += 1
+        if r["status"] != "changed":
+            print(f"  {'+' if r['status'] == 'added' else '-'} {rel}（{'新增' if r['status'] == 'added' else '删除'}文件）")
+            continue
+        print(f"  ~ {rel}")
+        for layer, c in r["layers"].items():
+            print(f"      {layer}: +{c['added']} -{c['removed']} 移动 {c['moved']}")
+        for m in r["moved"]:
+            print(f"      ↔ {m['layer']} {m['count']} 个图元移动 ({m['dx']:g}, {m['dy']:g})")
+        for sign, items in (("+", r["added"]), ("-", r["removed"])):
+            for line in items[:args.limit]:
+                print(f"      {sign} {line}")
+            if len(items) > args.limit:
+                print(f"      {sign} …另 {len(items) - args.limit} 条")
+        if r["unsupported"]:
+            print(f"      ⚠ 未比较的实体类型: {', '.join(f'{t}×{n}' for t, n in r['unsupported'].items())}")
+    seconds = round(time.perf_counter() - t0, 2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"files": results, "changed": changed, "seconds": seconds}, f, ensure_ascii=False, indent=2)
+    if changed:
+        print(f"  ✗ {changed} / {len(results)} 个文件有差异（{seconds} s）")
+        return 1
+    print(f"  ✓ {len(results)} 个文件无差异（{seconds} s）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
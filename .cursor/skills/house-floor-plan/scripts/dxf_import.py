@@ -0,0 +1,570 @@
+"""
+DXF 导入 — 从 CAD 中改过的平面图 DXF 反推建筑参数，输出更新后的 spec
+
+  python dxf_import.py 图纸/01-建筑设计/平面图/一层平面图.dxf 图纸/01-建筑设计/平面图/二层平面图.dxf -o spec.json
+  python dxf_import.py 一层平面图.dxf --base old.json --tolerance 30     # 在已有方案上叠加修改
+
+输入为 gen_floor1 / gen_floor2 生成（再经绘图员修改）的平面图：墙体为 WALL / WALL-FILL 图层上的
+闭合矩形，窗为 WINDOW 图层上的矩形，门为 DOOR 图层上的开启弧线，房间名为 TEXT 图层文字；
+块（ARCH-F1 / OUTLINE 等）按 INSERT 展开。楼层由 INFO 文字“楼层：一层”识别（其次看文件名）。
+
+  - 读取：ezdxf iterdxf 逐个实体流式解析 BLOCKS 与 ENTITIES 段，只保留所需图元的坐标元组，
+    不构建完整文档，内存与文件大小无关
+  - 墙体：外包框 → BW / BH，外墙厚 → OW，内墙厚 → IW；同一轴线上的内墙段合并为一条分隔墙，
+    按方向、位置与覆盖范围对应到 F1_X1 / F2_NX3 等参数
+  - 门窗与房间：墙体登记进网格空间索引，门的铰点、窗的中线吸附到所在墙体；房间名向四个方向
+    射线求最近墙面得到房间范围。每次查询只看附近几个网格，密集的多户平面也是线性时间
+  - 窗按朝向与楼层对应到 SOUTH_WIN / NORTH_WIN / EAST_WIN / WEST_WIN（立面横坐标即平面上沿墙的
+    坐标），南向外门对应 SOUTH_DOOR；窗与 floor_layout.plan_windows、外门与 floor_layout.doors 画出的
+    位置比较，偏差不超过 --tolerance 的保持原值，超过的按差值修改，未修改的平面图导回得到空 spec。
+    某层一樘窗（或一扇门）都没识别到时给出警告并保留原门窗表
+
+输出 JSON：spec（相对默认方案的覆盖项，可直接作为 serve.py 请求的 "spec" 或交给 spec.apply_spec）、
+floors（各层墙体、房间、门窗）、changes（逐项修改说明）与 warnings。
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+from ezdxf.addons import iterdxf
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import floor_layout
+import spec as spec_mod
+
+SNAP = 10                       # 坐标吸附网格（mm）
+TOLERANCE = 50                  # 门窗与现有参数相差不超过此值（mm）时保持原值
+MATCH = 1500                    # 平面门窗与 spec 中门窗配对的最大起点偏差（mm）
+CELL = 2000                     # 空间索引网格边长（mm）
+WALL_LAYERS = ("WALL", "WALL-FILL")
+TYPES = ("LWPOLYLINE", "LINE", "ARC", "TEXT", "MTEXT", "INSERT")
+
+# 分隔墙参数：(参数名, 方向 h/v, 覆盖范围的起止参数)；位置为墙体矩形的 x0（竖墙）或 y0（横墙）
+PARTITIONS = {
+    "一层": [("F1_Y0", "h", ("OW", "BW")), ("F1_Y1", "h", ("OW", "BW")),
+             ("F1_X1", "v", ("OW", "F1_Y1")), ("F1_NX1", "v", ("F1_Y1", "BH")), ("F1_NX2", "v", ("F1_Y1", "BH"))],
+    "二层": [("F2_Y0", "h", ("OW", "BW")), ("F2_Y1", "h", ("OW", "BW")), ("F2_Y2", "h", ("OW", "BW")),
+             ("F2_X1", "v", ("F2_Y0", "F2_Y1")), ("F2_NX1", "v", ("F2_Y2", "BH")),
+             ("F2_NX2", "v", ("F2_Y2", "BH")), ("F2_NX3", "v", ("F2_Y2", "BH"))],
+}
+FLOOR_LEVEL = {"一层": "F1_FL", "二层": "F2_FL"}
+WINDOWS = {"S": "SOUTH_WIN", "N": "NORTH_WIN", "E": "EAST_WIN", "W": "WEST_WIN"}
+DOORS = {"S": "SOUTH_DOOR"}
+FACADE_NAMES = {"S": "南", "N": "北", "E": "东", "W": "西"}
+
+
+# ══════════════════════════════════════════════
+#  流式读取
+# ══════════════════════════════════════════════
+
+def _record(e):
+    """ezdxf 实体 → 轻量元组（坐标为 DXF 单位），不需要的返回 None"""
+    t, layer = e.dxftype(), e.dxf.layer
+    if t == "LWPOLYLINE":
+        return ("poly", layer, [(x, y) for x, y in e.get_points("xy")], bool(e.closed))
+    if t == "LINE":
+        return ("poly", layer, [tuple(e.dxf.start)[:2], tuple(e.dxf.end)[:2]], False)
+    if t == "ARC":
+        return ("arc", layer, tuple(e.dxf.center)[:2], e.dxf.radius, e.dxf.start_angle, e.dxf.end_angle)
+    if t == "TEXT":
+        aligned = e.dxf.get("halign", 0) or e.dxf.get("valign", 0)
+        p = e.dxf.get("align_point") if aligned and e.dxf.hasattr("align_point") else e.dxf.insert
+        return ("text", layer, tuple(p)[:2], e.dxf.height, e.dxf.text)
+    if t == "MTEXT":
+        return ("text", layer, tuple(e.dxf.insert)[:2], e.dxf.char_height, e.plain_text())
+    if t == "INSERT":
+        return ("insert", layer, e.dxf.name, tuple(e.dxf.insert)[:2],
+                e.dxf.get("xscale", 1.0), e.dxf.get("yscale", 1.0), e.dxf.get("rotation", 0.0))
+    return None
+
+
+def read(path):
+    """流式读取一个 DXF → 展开块后的图元元组列表"""
+    dxf = iterdxf.opendxf(path)
+    try:
+        blocks, current = {}, None
+        for e in dxf.load_entities(dxf.sections["BLOCKS"] + 1, set(TYPES) | {"BLOCK", "ENDBLK"}):
+            t = e.dxftype()
+            if t == "BLOCK":
+                current = None if e.dxf.name.startswith("*") else blocks.setdefault(e.dxf.name, [])
+            elif t == "ENDBLK":
+                current = None
+            elif current is not None:
+                r = _record(e)
+                if r:
+                    current.append(r)
+        entities = [r for r in map(_record, dxf.modelspace(TYPES)) if r]
+    finally:
+        dxf.close()
+    out = []
+    _flatten(entities, blocks, (0.0, 0.0, 1.0, 1.0, 0.0), None, out, 0)
+    return out
+
+
+def _xf(tf, p):
+    dx, dy, sx, sy, rot = tf
+    x, y = p[0] * sx, p[1] * sy
+    if rot:
+        c, s = math.cos(math.radians(rot)), math.sin(math.radians(rot))
+        x, y = x * c - y * s, x * s + y * c
+    return (dx + x, dy + y)
+
+
+def _flatten(items, blocks, tf, parent_layer, out, depth):
+    """按 INSERT 展开块（嵌套块逐层叠加变换；0 图层图元继承插入图层）"""
+    if depth > 16:
+        raise ValueError("块嵌套过深（循环引用？）")
+    for r in items:
+        kind, layer = r[0], r[1]
+        if layer == "0" and parent_layer:
+            layer = parent_layer
+        if kind == "insert":
+            _, _, name, p, sx, sy, rot = r
+            if name in blocks:
+                (px, py), = [_xf(tf, p)]
+                _flatten(blocks[name], blocks, (px, py, tf[2] * sx, tf[3] * sy, tf[4] + rot), layer, out, depth + 1)
+        elif kind == "poly":
+            out.append(("poly", layer, [_xf(tf, p) for p in r[2]], r[3]))
+        elif kind == "arc":
+            out.append(("arc", layer, _xf(tf, r[2]), r[3] * abs(tf[2]), r[4] + tf[4], r[5] + tf[4]))
+        else:
+            out.append(("text", layer, _xf(tf, r[2]), r[3] * abs(tf[3]), r[4]))
+
+
+# ══════════════════════════════════════════════
+#  空间索引
+# ══════════════════════════════════════════════
+
+class GridIndex:
+    """均匀网格空间索引：按包围盒登记编号，矩形查询返回候选编号（再由调用方精确判断）"""
+
+    def __init__(self, cell=CELL):
+        self.cell = cell
+        self.cells = {}
+
+    def _keys(self, box):
+        c = self.cell
+        for i in range(math.floor(box[0] / c), math.floor(box[2] / c) + 1):
+            for j in range(math.floor(box[1] / c), math.floor(box[3] / c) + 1):
+                yield (i, j)
+
+    def insert(self, i, box):
+        for k in self._keys(box):
+            self.cells.setdefault(k, []).append(i)
+
+    def query(self, box):
+        found = set()
+        for k in self._keys(box):
+            found.update(self.cells.get(k, ()))
+        return found
+
+    def march(self, x, y, dx, dy, length):
+        """沿坐标轴方向逐格前进 → (该格编号列表, 射线离开该格时走过的距离)，由近及远"""
+        c = self.cell
+        i, j = math.floor(x / c), math.floor(y / c)
+        for n in range(int(length / c) + 2):
+            ci, cj = i + dx * n, j + dy * n
+            exit_ = (ci + (dx > 0)) * c - x if dx else (cj + (dy > 0)) * c - y
+            yield self.cells.get((ci, cj), ()), abs(exit_)
+
+
+# ══════════════════════════════════════════════
+#  几何识别
+# ══════════════════════════════════════════════
+
+def _snap(v):
+    return int(round(v / SNAP) * SNAP)
+
+
+def _box(pts):
+    """闭合的轴对齐四边形 → (x0, y0, x1, y1)，否则 None"""
+    if len(pts) == 5 and pts[0] == pts[-1]:
+        pts = pts[:4]
+    if len(pts) != 4:
+        return None
+    xs, ys = sorted({_snap(x) for x, _ in pts}), sorted({_snap(y) for _, y in pts})
+    if len(xs) != 2 or len(ys) != 2:
+        return None
+    return (xs[0], ys[0], xs[1], ys[1])
+
+
+def _rects(prims, layers):
+    return sorted({b for k, layer, *g in prims
+                   if k == "poly" and layer in layers and g[1] and (b := _box(g[0]))})
+
+
+def _overlap(a0, a1, b0, b1):
+    return max(0, min(a1, b1) - max(a0, b0))
+
+
+def _mode(values):
+    return Counter(values).most_common(1)[0][0] if values else None
+
+
+class Plan:
+    """一层平面图的识别结果（毫米，原点为外墙西南角）"""
+
+    def __init__(self, prims):
+        walls = _rects(prims, WALL_LAYERS)
+        if not walls:
+            raise ValueError("WALL / WALL-FILL 图层上没有闭合矩形墙体")
+        ox, oy = min(w[0] for w in walls), min(w[1] for w in walls)
+        self.origin = (ox, oy)
+        self.walls = [(x0 - ox, y0 - oy, x1 - ox, y1 - oy) for x0, y0, x1, y1 in walls]
+        self.BW = max(w[2] for w in self.walls)
+        self.BH = max(w[3] for w in self.walls)
+        self.index = GridIndex()
+        for i, w in enumerate(self.walls):
+            self.index.insert(i, w)
+        self.outer = [i for i, w in enumerate(self.walls) if self._is_outer(w)]
+        self.OW = _mode([min(w[2] - w[0], w[3] - w[1]) for w in (self.walls[i] for i in self.outer)])
+        outer = set(self.outer)
+        self.inner = [i for i in range(len(self.walls)) if i not in outer]
+        self.IW = _mode([min(w[2] - w[0], w[3] - w[1]) for w in (self.walls[i] for i in self.inner)])
+        self.partitions = self._partitions()
+        shift = lambda p: (p[0] - ox, p[1] - oy)
+        self.windows = [self._window(b) for b in _rects(
+            [(k, l, [shift(p) for p in g[0]], g[1]) for k, l, *g in prims if k == "poly" and l == "WINDOW"],
+            ("WINDOW",))]
+        self.windows = [w for w in self.windows if w]
+        self.doors = [d for d in (self._door(shift(r[2]), r[3], r[4], r[5])
+                                  for r in prims if r[0] == "arc" and r[1] == "DOOR") if d]
+        self.rooms = self._rooms([(shift(r[2]), r[3], r[4]) for r in prims if r[0] == "text" and r[1] == "TEXT"])
+        self.unmapped = []
+        self.floor = next((m.group(1) for r in prims if r[0] == "text" and r[1] == "INFO"
+                           for m in [re.search(r"楼层[：:]\s*(\S+)", r[4])] if m), None)
+
+    def _is_outer(self, w):
+        x0, y0, x1, y1 = w
+        horizontal = x1 - x0 >= y1 - y0
+        if horizontal:
+            return (y0 == 0 or y1 == self.BH) and x1 - x0 > self.BW / 2
+        return (x0 == 0 or x1 == self.BW) and y1 - y0 > self.BH / 2
+
+    # ── 分隔墙 ──
+
+    def _partitions(self):
+        """同一轴线上的内墙段合并：[(方向, 位置, 厚度, [(起, 止), ...]), ...]"""
+        lines = {}
+        for i in self.inner:
+            x0, y0, x1, y1 = self.walls[i]
+            if x1 - x0 >= y1 - y0:
+                lines.setdefault(("h", y0, y1 - y0), []).append((x0, x1))
+            else:
+                lines.setdefault(("v", x0, x1 - x0), []).append((y0, y1))
+        return [(o, pos, t, sorted(spans)) for (o, pos, t), spans in sorted(lines.items())]
+
+    # ── 墙体吸附 ──
+
+    def walls_near(self, x, y, r=SNAP * 3):
+        """包含点 (x, y)（外扩 r）的墙体编号"""
+        return [i for i in self.index.query((x - r, y - r, x + r, y + r))
+                if self.walls[i][0] - r <= x <= self.walls[i][2] + r
+                and self.walls[i][1] - r <= y <= self.walls[i][3] + r]
+
+    def _host(self, x, y, orient):
+        """吸附到方向一致的墙体：返回 (墙体编号, 是否外墙)；找不到返回 (None, False)"""
+        for i in sorted(self.walls_near(x, y)):
+            x0, y0, x1, y1 = self.walls[i]
+            if ("h" if x1 - x0 >= y1 - y0 else "v") == orient:
+                return i, i in self.outer
+        return None, False
+
+    def _facade(self, orient, pos):
+        if orient == "h":
+            return "S" if pos < self.BH / 2 else "N"
+        return "W" if pos < self.BW / 2 else "E"
+
+    def _window(self, b):
+        x0, y0, x1, y1 = b
+        orient = "h" if x1 - x0 >= y1 - y0 else "v"
+        a, z, pos = (x0, x1, (y0 + y1) / 2) if orient == "h" else (y0, y1, (x0 + x1) / 2)
+        host, exterior = self._host(*(((a + z) / 2, pos) if orient == "h" else (pos, (a + z) / 2)), orient)
+        if host is None:
+            return None
+        return {"facade": self._facade(orient, pos), "start": a, "width": z - a, "at": _snap(pos),
+                "exterior": exterior}
+
+    def _door(self, c, r, a0, a1):
+        """开启弧线 → 门洞：铰点吸附到所在墙体，门洞沿墙轴线从铰点延伸 r"""
+        ends = [(c[0] + r * math.cos(math.radians(a)), c[1] + r * math.sin(math.radians(a))) for a in (a0, a1)]
+        for orient in ("h", "v"):
+            k = 1 if orient == "h" else 0          # 沿墙方向上另一坐标不变
+            for ex, ey in ends:
+                if abs((ex, ey)[k] - c[k]) < SNAP:
+                    host, exterior = self._host(c[0], c[1], orient)
+                    if host is None:
+                        continue
+                    lo, hi = sorted((c[1 - k], (ex, ey)[1 - k]))
+                    return {"facade": self._facade(orient, c[k]) if exterior else None, "orient": orient,
+                            "start": _snap(lo), "width": _snap(hi - lo), "at": _snap(c[k]), "exterior": exterior}
+        return None
+
+    # ── 房间 ──
+
+    def _ray(self, x, y, dx, dy):
+        """从 (x, y) 沿坐标轴方向找最近墙面的坐标（逐格前进，命中后不再看更远的格）"""
+        best = None
+        for ids, reach in self.index.march(x, y, dx, dy, max(self.BW, self.BH)):
+            for i in ids:
+                x0, y0, x1, y1 = self.walls[i]
+                if dx and y0 <= y <= y1:
+                    face = x0 if dx > 0 else x1
+                    if (face - x) * dx >= 0 and (best is None or abs(face - x) < abs(best - x)):
+                        best = face
+                if dy and x0 <= x <= x1:
+                    face = y0 if dy > 0 else y1
+                    if (face - y) * dy >= 0 and (best is None or abs(face - y) < abs(best - y)):
+                        best = face
+            if best is not None and abs(best - (x if dx else y)) <= reach:
+                break
+        return best
+
+    def _rooms(self, texts):
+        """房间名文字 → 房间：同一房间内字高最大的为中文名，其次为英文名"""
+        cells = {}
+        for (x, y), h, s in texts:
+            if not (0 < x < self.BW and 0 < y < self.BH):
+                continue
+            box = (self._ray(x, y, -1, 0), self._ray(x, y, 0, -1), self._ray(x, y, 1, 0), self._ray(x, y, 0, 1))
+            if None not in box:
+                cells.setdefault(box, []).append((-h, -y, s))
+        rooms = []
+        for box, labels in sorted(cells.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+            names = [s for _, _, s in sorted(labels)]
+            w, h = box[2] - box[0], box[3] - box[1]
+            rooms.append({"name": names[0], "en": names[1] if len(names) > 1 else "",
+                          "box": list(box), "size": f"{w / 1000:.1f}m×{h / 1000:.1f}m",
+                          "area_m2": round(w * h / 1e6, 2)})
+        return rooms
+
+    def summary(self):
+        return {
+            "origin": list(self.origin), "BW": self.BW, "BH": self.BH, "OW": self.OW, "IW": self.IW,
+            "partitions": [{"orient": o, "at": p, "thickness": t, "spans": [list(s) for s in spans],
+                            "param": (o, p) not in self.unmapped} for o, p, t, spans in self.partitions],
+            "rooms": self.rooms,
+            "windows": self.windows,
+            "doors": self.doors,
+        }
+
+
+# ══════════════════════════════════════════════
+#  参数更新
+# ══════════════════════════════════════════════
+
+def _assign(plan, floor, cfg):
+    """分隔墙 → 参数：方向一致、覆盖范围重叠过半的墙线中取位置最近的（每条墙线只用一次）"""
+    pairs = []
+    for param, orient, (lo, hi) in PARTITIONS[floor]:
+        a, b = cfg[lo], cfg[hi]
+        for j, (o, pos, _, spans) in enumerate(plan.partitions):
+            covered = sum(_overlap(a, b, s0, s1) for s0, s1 in spans)
+            extent = spans[-1][1] - spans[0][0]
+            if o == orient and covered >= 0.5 * min(b - a, extent):
+                pairs.append((abs(pos - cfg[param]), param, j))
+    found, used = {}, set()
+    for _, param, j in sorted(pairs):
+        if param not in found and j not in used:
+            found[param] = plan.partitions[j][1]
+            used.add(j)
+    return found, [plan.partitions[j] for j in range(len(plan.partitions)) if j not in used]
+
+
+def _match(entries, items, start_of):
+    """spec 门窗条目与平面门窗按起点就近配对 → ({条目下标: 平面门窗}, 未配对的平面门窗)"""
+    pairs = sorted((abs(it["start"] - start_of(e)), i, k) for i, e in entries for k, it in enumerate(items)
+                   if abs(it["start"] - start_of(e)) <= MATCH)
+    matched, used = {}, set()
+    for _, i, k in pairs:
+        if i not in matched and k not in used:
+            matched[i] = items[k]
+            used.add(k)
+    return matched, [it for k, it in enumerate(items) if k not in used]
+
+
+def _drawn(drawn, mine):
+    """spec 门窗条目 → 平面图上画出的位置 {条目下标: (起点, 宽) mm}
+
+    drawn 为该立面上平面图画出的 [(起点, 宽)]；每个条目取与之重叠最多的一个。
+    未修改的平面图与这些位置比较，平面与 spec 之间原有的偏差不会被当成修改。
+    """
+    out = {}
+    for i, e in mine:
+        lo, hi = e[0] * 1000, (e[0] + e[2]) * 1000
+        best = max(drawn, key=lambda d: min(hi, d[0] + d[1]) - max(lo, d[0]), default=None)
+        if best is not None and min(hi, best[0] + best[1]) - max(lo, best[0]) > 0:
+            out[i] = best
+    return out
+
+
+def _drawn_windows(cfg, floor, key, mine):
+    """窗户条目在平面图上的位置（平面图按 floor_layout.plan_windows 出图）"""
+    facade = next(f for f, k in WINDOWS.items() if k == key)
+    drawn = []
+    for x, y, length, axis, _ in floor_layout.plan_windows(cfg, floor):
+        if axis == "h":
+            f, start = ("N" if y >= cfg["BH"] else "S"), x
+        else:
+            f, start = ("W" if x <= 0 else "E"), y
+        if f == facade:
+            drawn.append((start, length))
+    return _drawn(drawn, mine)
+
+
+def _drawn_doors(cfg, floor, key, mine):
+    """外门条目在平面图上的位置（平面图按 floor_layout.doors 出图，铰点在外墙内皮上，
+    如大门画在 F1_X1+IW+1200 处，不读 SOUTH_DOOR）"""
+    facade = next(f for f, k in DOORS.items() if k == key)
+    OW, BW, BH = cfg["OW"], cfg["BW"], cfg["BH"]
+    drawn = []
+    for x, y, w, axis, _, _ in floor_layout.doors(cfg, floor):
+        if axis == "h":
+            f, start = ("S" if y <= OW else "N" if y >= BH - OW else None), x
+        else:
+            f, start = ("W" if x <= OW else "E" if x >= BW - OW else None), y
+        if f == facade:
+            drawn.append((start, w))
+    return _drawn(drawn, mine)
+
+
+def _openings(cfg, key, floor, items, tol, changes, new_entry, drawn=None):
+    """更新某立面门窗表中属于该层的条目（其他楼层的条目不动）
+
+    drawn 为 {条目下标: (起点, 宽) mm}，即条目在平面图上画出的位置（默认取 spec 中的位置）；
+    识别到的门窗与之比较，超过 tol 时按差值修改 spec 条目。
+    """
+    level_hi = cfg["F2_FL"] if floor == "一层" else math.inf
+    level_lo = cfg["F2_FL"] if floor == "二层" else -math.inf
+    entries = [list(e) for e in cfg[key]]
+    mine = [(i, e) for i, e in enumerate(entries) if level_lo <= e[1] < level_hi]
+    drawn = {i: (e[0] * 1000, e[2] * 1000) for i, e in mine} | (drawn(mine) if drawn else {})
+    matched, extra = _match([(i, drawn[i]) for i, _ in mine], items, lambda d: d[0])
+    out = []
+    for i, e in enumerate(entries):
+        if not any(i == j for j, _ in mine):
+            out.append(e)
+        elif i in matched:
+            it = matched[i]
+            d0, d1 = it["start"] - drawn[i][0], it["width"] - drawn[i][1]
+            if abs(d0) > tol or abs(d1) > tol:
+                new = [round(e[0] + d0 / 1000, 2), e[1], round(e[2] + d1 / 1000, 2)] + e[3:]
+                diff = [f"{label} {e[k]} → {new[k]}" for k, label in ((0, "x"), (2, "宽")) if e[k] != new[k]]
+                changes.append(f"{key}[{i}]（{floor}）: {', '.join(diff)}")
+                e = new
+            out.append(e)
+        else:
+            changes.append(f"{key}[{i}]（{floor}）: 平面中已删除，移除 {e}")
+    for it in sorted(extra, key=lambda it: it["start"]):
+        e = new_entry(it)
+        changes.append(f"{key}（{floor}）: 新增 {e}")
+        out.append(e)
+    cfg[key] = out
+
+
+def update_spec(plans, base=None, tol=TOLERANCE):
+    """识别结果 → (spec 覆盖项, 修改说明, 警告)；base 为已有覆盖项"""
+    cfg = spec_mod.resolve(base)
+    before = json.loads(json.dumps(cfg))
+    changes, warnings = [], []
+    for name in ("BW", "BH", "OW", "IW"):
+        values = {p.floor: getattr(p, name) for p in plans if getattr(p, name) is not None}
+        if len(set(values.values())) > 1:
+            warnings.append(f"{name} 各层不一致 {values}，取 {next(iter(values.values()))}")
+        if values:
+            cfg[name] = next(iter(values.values()))
+    for p in plans:
+        if p.origin != (0, 0):
+            warnings.append(f"{p.floor}: 外墙西南角不在原点，已平移 {p.origin}")
+        found, rest = _assign(p, p.floor, cfg)
+        for param, _, _ in PARTITIONS[p.floor]:
+            if param in found:
+                cfg[param] = found[param]
+            else:
+                warnings.append(f"{p.floor}: 没有找到 {param} 对应的分隔墙，保持 {cfg[param]}")
+        p.unmapped = [(o, pos) for o, pos, _, _ in rest]
+        level = cfg[FLOOR_LEVEL[p.floor]]
+        # 一樘都没识别到时多半是图层改名或门窗被炸开，不能当作全部删除
+        if not p.windows:
+            warnings.append(f"{p.floor}: WINDOW 图层上没有识别到窗户，各立面窗表保持原值")
+        else:
+            for f, key in WINDOWS.items():
+                _openings(cfg, key, p.floor, [w for w in p.windows if w["facade"] == f], tol, changes,
+                          lambda it: [round(it["start"] / 1000, 2), round(level + cfg["SILL_STD"], 3),
+                                      round(it["width"] / 1000, 2), 1.5, max(1, round(it["width"] / 1200))],
+                          drawn=lambda mine, key=key: _drawn_windows(cfg, p.floor, key, mine))
+        if not p.doors:
+            warnings.append(f"{p.floor}: DOOR 图层上没有识别到门，外门表保持原值")
+        else:
+            for f, key in DOORS.items():
+                _openings(cfg, key, p.floor, [d for d in p.doors if d["exterior"] and d["facade"] == f], tol,
+                          changes, lambda it: [round(it["start"] / 1000, 2), level, round(it["width"] / 1000, 2), 2.4],
+                          drawn=lambda mine, key=key: _drawn_doors(cfg, p.floor, key, mine))
+        for d in p.doors:
+            if d["exterior"] and d["facade"] not in DOORS:
+                warnings.append(f"{p.floor}: {FACADE_NAMES[d['facade']]}向外门没有对应的门表（仅记录在 floors）")
+    sizes = ["BW", "BH", "OW", "IW"] + [q for fl in PARTITIONS.values() for q, _, _ in fl]
+    changes[:0] = [f"{n}: {before[n]} → {cfg[n]}" for n in sizes if cfg[n] != before[n]]
+    defaults = spec_mod.resolve()
+    overrides = {n: cfg[n] for n in spec_mod.default_spec() if cfg[n] != defaults[n]}
+    spec_mod.resolve(overrides)     # 校验
+    return overrides, changes, warnings
+
+
+def _floor_of(plan, path):
+    if plan.floor in PARTITIONS:
+        return plan.floor
+    for name in PARTITIONS:
+        if name in os.path.basename(path):
+            return name
+    raise ValueError(f"{path}: 无法识别楼层（INFO 图层“楼层：一层”或文件名中的一层/二层）")
+
+
+def import_plans(paths, base=None, tol=TOLERANCE):
+    """读取若干平面图 DXF → 结果字典（spec / floors / changes / warnings / seconds）"""
+    t0 = time.perf_counter()
+    plans = []
+    for path in paths:
+        plan = Plan(read(path))
+        plan.floor = _floor_of(plan, path)
+        plans.append(plan)
+    overrides, changes, warnings = update_spec(plans, base, tol)
+    return {"spec": overrides, "floors": {p.floor: p.summary() for p in plans},
+            "changes": changes, "warnings": warnings, "seconds": round(time.perf_counter() - t0, 3)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="从平面图 DXF 反推建筑参数，输出更新后的 spec")
+    ap.add_argument("dxf", nargs="+", help="gen_floor1 / gen_floor2 生成（可经 CAD 修改）的平面图 DXF")
+    ap.add_argument("-o", "--output", metavar="PATH", help="结果 JSON 另存到 PATH（默认输出到 stdout）")
+    ap.add_argument("--base", metavar="PATH", help="已有方案（spec 覆盖项 JSON，或本工具的输出），在其上叠加修改")
+    ap.add_argument("--tolerance", type=float, default=TOLERANCE,
+                    help=f"门窗位置/宽度偏差不超过此值（mm）时保持原值（默认 {TOLERANCE}）")
+    args = ap.parse_args(argv)
+    base = None
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+        base = base.get("spec", base) if "floors" in base else base
+    result = import_plans(args.dxf, base, args.tolerance)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        for line in result["changes"] or ["（无修改）"]:
+            print(f"  {line}")
+        for line in result["warnings"]:
+            print(f"  ⚠ {line}")
+        print(f"  ✓ {len(args.dxf)} 张平面图 → {args.output}（{result['seconds']} s）")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
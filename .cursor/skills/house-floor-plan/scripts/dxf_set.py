@@ -0,0 +1,146 @@
+"""
+合并图纸集 DXF — 全部二维图纸写进一个 DXF：模型空间放几何，图纸空间每张图一个布局
+
+  python generate_all.py --dxf-set            # 图纸/图纸集_A1.dxf
+  python generate_all.py --dxf-set A3         # A3 图幅布局
+
+generate_all._render 在出图的同时把每张图纸的显示列表交给 collect()；全部图纸生成后 write()：
+  - 块只写一份：各层建筑（ARCH-F1 / ARCH-F2：墙体、门窗、楼梯）、外墙轮廓 OUTLINE、
+    灯具插座开关与给排水符号；同名符号在不同图纸中内容必须一致
+  - 给排水、电气图的灰色底图是建筑块的替身，这里改为 INSERT 该层建筑块，
+    插在各自专业的图层上（P-ARCH / E-ARCH），CAD 中冻结该图层即隐藏底图
+  - 模型空间按专业分行排列各图（建筑 / 给排水 / 电气各一行）
+  - 图纸空间：第 1 个布局为图纸目录，其余每张图纸一个布局（图框、标题栏、比例尺与 PDF 图纸集
+    相同，见 sheet_set），视口按标准比例显示模型空间中对应的图，视口锁定
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import perf
+import sheet_set
+
+PAPER_PT = 25.4 / 72            # 图纸空间 1 pt 对应的图纸 mm
+ROW_GAP = 6000                  # 模型空间中相邻两图的间距（毫米）
+_VSF_LOCK_ZOOM = 0x4000         # VIEWPORT 状态位：锁定显示比例
+
+_format = None                  # None：不输出合并 DXF
+_drawings = {}
+
+
+def set_format(fmt):
+    global _format
+    if fmt is not None and fmt not in sheet_set.FORMATS:
+        raise ValueError(f"未知图幅: {fmt!r}（可选 {' / '.join(sheet_set.FORMATS)}）")
+    _format = fmt
+    _drawings.clear()
+
+
+def get_format():
+    return _format
+
+
+def collect(name, dl):
+    """记录一张图纸的显示列表（未启用合并 DXF 时不保留）"""
+    if _format is not None:
+        _drawings[name] = dl
+
+
+# ── 块 ──
+
+def _symbols():
+    """全部图纸的符号合并为一张表；替身符号不单独成块"""
+    table = {}
+    for name, dl in _drawings.items():
+        for sym_name, sym in dl.symbols.items():
+            if sym.shared:
+                continue
+            first = table.setdefault(sym_name, sym)
+            if first is not sym and first.items != sym.items:
+                raise ValueError(f"符号 {sym_name} 在不同图纸中内容不同，无法共用一个块（{name}）")
+    return table
+
+
+# ── 模型空间 ──
+
+def _origins(sheets):
+    """每张图在模型空间中的平移量：同一专业（图号首字母）一行，行间自上而下"""
+    rows = {}
+    for code, _, _, cells in sheets:
+        rows.setdefault(code[0], []).extend(name for name, *_ in cells)
+    origins, top = {}, 0.0
+    for names in rows.values():
+        height = max(_drawings[n].ylim[1] - _drawings[n].ylim[0] for n in names)
+        x = 0.0
+        for n in names:
+            (a, b), (c, _) = _drawings[n].xlim, _drawings[n].ylim
+            origins[n] = (x - a, top - height - c)
+            x += b - a + ROW_GAP
+        top -= height + ROW_GAP
+    return origins
+
+
+def _place(doc, msp, dl, offset, text_style):
+    """显示列表写入模型空间并整体平移到 offset（替身符号改为引用共享块）"""
+    start = len(msp)
+    dl.to_dxf(doc, msp, text_style, shared=True)
+    dx, dy = offset
+    for e in msp[start:]:
+        e.translate(dx, dy, 0)
+
+
+# ── 图纸空间 ──
+
+def _layout(doc, name, fmt):
+    psp = doc.layouts.new(name)
+    w, h = sheet_set.FORMATS[fmt][:2]
+    psp.page_setup(size=(w, h), margins=(0, 0, 0, 0), units="mm")
+    return psp
+
+
+def _viewport(psp, cell, dl, origin):
+    """按比例显示模型空间中的一张图：视口高 / 模型高 = 1 / 比例分母"""
+    _, x, y, cw, ch = cell
+    (a, b), (c, d) = dl.xlim, dl.ylim
+    vp = psp.add_viewport(center=(x + cw / 2, y + ch / 2), size=(cw, ch),
+                          view_center_point=(origin[0] + (a + b) / 2, origin[1] + (c + d) / 2),
+                          view_height=d - c, dxfattribs={"layer": "TITLE"})
+    vp.dxf.flags = vp.dxf.flags | _VSF_LOCK_ZOOM
+
+
+def write(doc, text_style="Standard"):
+    """把已收集的图纸写入 doc（模型空间 + 块 + 布局）；返回布局数"""
+    fmt = _format
+    msp = doc.modelspace()
+    doc.header["$PSLTSCALE"] = 0        # 虚线按模型单位（1:100 图案），不随视口比例缩放
+    with perf.span("dxf-set"):
+        sheets = sheet_set.paginate(fmt, _drawings)
+        pages = len(sheets) + 1
+        symbols = _symbols()
+        for name, sym in symbols.items():
+            if name not in doc.blocks:
+                sym.to_dxf(doc, doc.blocks.new(name), text_style, shared=True)
+        origins = _origins(sheets)
+        for name, origin in origins.items():
+            _place(doc, msp, _drawings[name], origin, text_style)
+
+        psp = _layout(doc, "G-00 图纸目录", fmt)
+        index = sheet_set.frame(fmt, "G-00", "图纸目录", None, 1, pages)
+        sheet_set.index_table(index, fmt, [(code, title, n) for code, title, n, _ in sheets])
+        index.to_dxf(doc, psp, text_style, pt=PAPER_PT)
+        for i, (code, title, n, cells) in enumerate(sheets):
+            psp = _layout(doc, f"{code} {title}", fmt)
+            sheet_set.frame(fmt, code, title, n, i + 2, pages,
+                            sheet_set.labels(cells, _drawings)).to_dxf(doc, psp, text_style, pt=PAPER_PT)
+            for cell in cells:
+                _viewport(psp, cell, _drawings[cell[0]], origins[cell[0]])
+        if "Layout1" in doc.layouts:
+            doc.layouts.delete("Layout1")
+    print(f"  ✓ 合并图纸集 DXF（{fmt} × {pages} 个布局，{len(symbols)} 个共享块）")
+    return pages
+
+
+def add_dxf_argument(parser):
+    parser.add_argument("--dxf-set", nargs="?", const="A1", choices=tuple(sheet_set.FORMATS),
+                        help="另外输出一个合并 DXF：共享建筑块、设备图 INSERT 底图、每张图一个图纸空间布局（默认 A1）")
@@ -0,0 +1,307 @@
+"""
+各层平面布局 — 房间、内隔墙与设备点位表，只依赖建筑参数（不依赖绘图后端）
+
+  rooms(p, floor)     [(房间名, x, y, 宽, 深)]   房间净尺寸矩形（墙内皮，mm）
+  walls(p, floor)     ([(x, y, 长)] 横墙, [(x, y, 长)] 竖墙)   内隔墙（厚 IW，起点为墙体左下角）
+  furniture(p, floor) [(FloorPlan 方法名, 参数…)]   平面图家具与洁具；footprint() 给出外包矩形
+  doors(p, floor)     [(x, y, 宽, "h"/"v", 开向, 说明)]   门的铰点与开启方向（与 FloorPlan.door_h/door_v 参数一致）
+  plan_windows(p, floor)  [(x, y, 长, "h"/"v", 说明)]   平面图上的窗户（外墙中线上的起点与长度，
+                      由立面窗表 SOUTH_WIN … WEST_WIN 推导，不随隔墙移动）
+  ELECTRICAL / PLUMBING   各层灯具、插座、开关与给排水点位（绝对坐标，不随参数变化）
+
+p 为参数映射：vars(building_config)（出图，apply_spec 之后即当前方案）或 spec.resolve() 的结果。
+公式只用四则运算，参数值为 NumPy 数组时逐元素计算一批方案（takeoff.py）。
+"""
+
+import numpy as np
+
+FLOORS = ("一层", "二层")
+# 湿区房间（上下层对位：二层湿区应尽量压在一层湿区上方）
+WET_ROOMS = {"一层": ("厨房", "公共卫浴"), "二层": ("主卫2", "公卫")}
+MIN_STACK = 0.15      # 二层湿区压在一层湿区上方的最小面积占比
+
+
+def f2_stair_split(p):
+    """二层公卫 | 楼梯间分隔墙的 y（东北角房间进深对半分）"""
+    return p["F2_Y2"] + p["IW"] + (p["BH"] - p["OW"] - p["F2_Y2"] - p["IW"]) // 2
+
+
+def rooms(p, floor):
+    BW, BH, OW, IW = p["BW"], p["BH"], p["OW"], p["IW"]
+    if floor == "一层":
+        X1, Y0, Y1, NX1, NX2 = p["F1_X1"], p["F1_Y0"], p["F1_Y1"], p["F1_NX1"], p["F1_NX2"]
+        return [
+            ("客厅", OW, OW, X1-OW, Y0-OW),
+            ("玄关", X1+IW, OW, BW-OW-X1-IW, Y0-OW),
+            ("客餐厅 LDK", OW, Y0+IW, X1-OW, Y1-Y0-IW),
+            ("主卧室1", X1+IW, Y0+IW, BW-OW-X1-IW, Y1-Y0-IW),         # 无独立卫浴
+            ("厨房", OW, Y1+IW, NX1-OW, BH-OW-Y1-IW),
+            ("公共卫浴", NX1+IW, Y1+IW, NX2-NX1-IW, BH-OW-Y1-IW),
+            ("楼梯间", NX2+IW, Y1+IW, BW-OW-NX2-IW, BH-OW-Y1-IW),
+        ]
+    X1, Y0, Y1, Y2 = p["F2_X1"], p["F2_Y0"], p["F2_Y1"], p["F2_Y2"]
+    NX1, NX2, NX3 = p["F2_NX1"], p["F2_NX2"], p["F2_NX3"]
+    half = (BH-OW-Y2-IW) // 2
+    return [
+        ("南向大阳台", OW, OW, BW-2*OW, Y0-OW),
+        ("次卧室", OW, Y0+IW, X1-OW, Y1-Y0-IW),
+        ("多功能区", X1+IW, Y0+IW, BW-OW-X1-IW, Y1-Y0-IW),
+        ("走廊/起居厅", OW, Y1+IW, BW-2*OW, Y2-Y1-IW),
+        ("主卧室2", OW, Y2+IW, NX1-OW, BH-OW-Y2-IW),
+        ("主卫2", NX1+IW, Y2+IW, NX2-NX1-IW, BH-OW-Y2-IW),
+        ("留空区", NX2+IW, Y2+IW, NX3-NX2-IW, BH-OW-Y2-IW),
+        ("公卫", NX3+IW, Y2+IW, BW-OW-NX3-IW, half),
+        ("楼梯间", NX3+IW, Y2+IW+half+IW, BW-OW-NX3-IW, half-IW),
+    ]
+
+
+def walls(p, floor):
+    BW, BH, OW, IW = p["BW"], p["BH"], p["OW"], p["IW"]
+    if floor == "一层":
+        X1, Y0, Y1, NX1, NX2 = p["F1_X1"], p["F1_Y0"], p["F1_Y1"], p["F1_NX1"], p["F1_NX2"]
+        hwalls = [
+            (OW, Y0, X1-OW),                                   # 客厅|LDK 顶墙
+            (X1+IW, Y0, BW-OW-X1-IW),                          # 玄关|主卧 顶墙
+            (OW, Y1, BW-2*OW),                                 # LDK|厨房 北侧带底墙
+        ]
+        vwalls = [
+            (X1, OW, Y1-OW),                                   # 公共区 | 私密区
+            (NX1, Y1+IW, BH-OW-Y1-IW),                         # 厨房 | 公共卫浴
+            (NX2, Y1+IW, BH-OW-Y1-IW),                         # 公共卫浴 | 楼梯间
+        ]
+        return hwalls, vwalls
+    X1, Y0, Y1, Y2 = p["F2_X1"], p["F2_Y0"], p["F2_Y1"], p["F2_Y2"]
+    NX1, NX2, NX3 = p["F2_NX1"], p["F2_NX2"], p["F2_NX3"]
+    hwalls = [
+        (OW, Y0, BW-2*OW),                                     # 阳台顶墙
+        (OW, Y1, BW-2*OW),                                     # 走廊底墙
+        (OW, Y2, BW-2*OW),                                     # 主卧区底墙
+        (NX3+IW, f2_stair_split(p), BW-OW-NX3-IW),             # 公卫|楼梯
+    ]
+    vwalls = [
+        (X1, Y0+IW, Y1-Y0-IW),                                 # 次卧|多功能区
+        (NX1, Y2+IW, BH-OW-Y2-IW),                             # 主卧2|主卫2
+        (NX2, Y2+IW, BH-OW-Y2-IW),                             # 主卫2|留空区
+        (NX3, Y2+IW, BH-OW-Y2-IW),                             # 留空区|公卫+楼梯
+    ]
+    return hwalls, vwalls
+
+
+def room_table(p):
+    """{(层, 房间名): (x, y, 宽, 深)}"""
+    return {(floor, r[0]): r[1:] for floor in FLOORS for r in rooms(p, floor)}
+
+
+def overlap(a, b):
+    """两个 (x, y, 宽, 深) 矩形的重叠面积 (mm²)"""
+    ox = np.minimum(a[0] + a[2], b[0] + b[2]) - np.maximum(a[0], b[0])
+    oy = np.minimum(a[1] + a[3], b[1] + b[3]) - np.maximum(a[1], b[1])
+    return np.maximum(ox, 0) * np.maximum(oy, 0)
+
+
+def wet_stack(table):
+    """二层湿区压在一层湿区上方的面积占比（table 为 room_table 的结果）"""
+    wet2 = sum(table["二层", n][2] * table["二层", n][3] for n in WET_ROOMS["二层"])
+    stacked = sum(overlap(table["二层", a], table["一层", b])
+                  for a in WET_ROOMS["二层"] for b in WET_ROOMS["一层"])
+    return stacked / wet2
+
+
+# ══════════════════════════════════════════════
+#  家具、门与平面窗户 (mm)
+# ══════════════════════════════════════════════
+
+def furniture(p, floor):
+    BW, BH, OW, IW = p["BW"], p["BH"], p["OW"], p["IW"]
+    if floor == "一层":
+        X1, Y0, Y1, NX1, NX2 = p["F1_X1"], p["F1_Y0"], p["F1_Y1"], p["F1_NX1"], p["F1_NX2"]
+        return [
+            ("sofa_L", 800, 3000),
+            ("tv_wall", 1000, Y0+IW+200, 2500),
+            ("dining_round", 5500, 4800),
+            ("kitchen_L", OW+100, Y1+IW+100, 4300, BH-OW-Y1-IW-200, 550),
+            ("bed_double", X1+IW+800, Y0+IW+1200, 1800, 2000),
+            ("wardrobe", X1+IW+200, Y1-700, BW-OW-X1-IW-400, 500),
+            ("toilet", NX1+IW+400, Y1+IW+500),
+            ("sink", NX1+IW+300, BH-OW-600),
+            ("stairs", NX2+IW+400, Y1+IW+300, 2800, 3000, 14, "up"),
+        ]
+    X1, Y2 = p["F2_X1"], p["F2_Y2"]
+    Y0, NX1, NX3 = p["F2_Y0"], p["F2_NX1"], p["F2_NX3"]
+    YM = f2_stair_split(p)
+    return [
+        ("bed_double", 1500, 7800, 1800, 2000), ("wardrobe", 400, 10100, 5000, 500),
+        ("toilet", NX1+IW+500, 8000), ("sink", NX1+IW+400, 9600), ("shower_room", NX1+IW+200, 7500, 900),
+        ("bed_single", 1200, Y0+IW+300, 1200, 2000),
+        ("desk_chair", 1200, Y0+IW+2800, 1400, 550),
+        ("toilet", NX3+IW+400, Y2+IW+400), ("sink", NX3+IW+300, YM-500),
+        ("stairs", NX3+IW+200, YM+IW+200, 2200, BH-OW-YM-IW-400, 13, "down"),
+    ]
+
+
+def footprint(item):
+    """家具 / 洁具的外包矩形 (x0, y0, x1, y1)，与 FloorPlan 对应方法画出的图形一致"""
+    kind, x, y, *a = item
+    if kind == "sofa_L":
+        return x, y-100, x+3500, y+700
+    if kind == "dining_round":
+        r = a[0] if a else 550
+        return x-r-320, y-r-320, x+r+320, y+r+320              # 椅子圆心在 r+200，半径 120
+    if kind == "toilet":
+        return x-170, y-200, x+170, y+120
+    if kind == "tv_wall":
+        return x, y, x+a[0], y+120
+    if kind == "shower_room":
+        return x, y, x+a[0], y+a[0]
+    if kind == "desk_chair":
+        w, h = a
+        return x, y-480, x+w, y+h                                # 椅子圆心在桌下 300，半径 180
+    w, h = a[:2] if kind != "sink" else (a or (450, 350))
+    return x, y, x+w, y+h                                        # 床、衣柜、橱柜、楼梯等：(x, y, 宽, 深)
+
+
+def doors(p, floor):
+    OW, IW = p["OW"], p["IW"]
+    if floor == "一层":
+        X1, Y0, Y1, NX1, NX2 = p["F1_X1"], p["F1_Y0"], p["F1_Y1"], p["F1_NX1"], p["F1_NX2"]
+        return [
+            (X1+IW+1200, OW, 1200, "h", True, "大门（南面玄关石材门）"),
+            (3500, Y0, 900, "h", False, "客厅→LDK"),
+            (X1+IW, Y0+IW+500, 900, "v", True, "玄关→主卧1"),
+            (2500, Y1+IW, 900, "h", True, "LDK→厨房"),
+            (NX1+IW+200, Y1, 700, "h", False, "卫浴→LDK"),
+            (NX2+IW+500, Y1, 900, "h", False, "楼梯间→LDK"),
+        ]
+    X1, Y1, Y2 = p["F2_X1"], p["F2_Y1"], p["F2_Y2"]
+    NX1, NX2, NX3 = p["F2_NX1"], p["F2_NX2"], p["F2_NX3"]
+    YM = f2_stair_split(p)
+    return [
+        (2000, Y1, 800, "h", False, "次卧→走廊"),
+        (X1+IW+2000, Y1, 800, "h", False, "多功能区→走廊"),
+        (2500, Y2+IW, 900, "h", True, "走廊→主卧2"),
+        (NX1+IW, 8800, 800, "v", True, "主卫2→主卧2"),
+        (NX2+IW+500, Y2+IW, 900, "h", True, "走廊→留空区"),
+        (NX3+IW, Y2+IW+500, 700, "v", False, "公卫→走廊"),
+        (NX3+IW+500, YM, 700, "h", True, "楼梯间门"),
+    ]
+
+
+def door_swing(door):
+    """门扇扫过的四分之一圆所在的方框 (x0, y0, x1, y1) 与铰点、半径"""
+    x, y, w, axis, flag, _ = door
+    if axis == "h":
+        box = (x, y, x+w, y+w) if flag else (x, y-w, x+w, y)
+    else:
+        box = (x, y, x+w, y+w) if flag else (x-w, y, x, y+w)
+    return box, (x, y), w
+
+
+# 立面窗表 → 平面图上所在的外墙：(名称, 画在横墙 "h" / 竖墙 "v")
+WINDOW_FACADES = {"SOUTH_WIN": ("南", "h"), "NORTH_WIN": ("北", "h"), "EAST_WIN": ("东", "v"), "WEST_WIN": ("西", "v")}
+
+
+def window_floor(p, sill):
+    """立面窗台标高 (m) 所在楼层：不低于二层地面即为二层"""
+    return "二层" if sill >= p["F2_FL"] - 1e-9 else "一层"
+
+
+def plan_windows(p, floor):
+    """由 SOUTH_WIN … WEST_WIN 推导：立面横坐标即平面上沿墙的坐标（南北立面为 x，东西立面为 y），
+    按窗台标高分层；二层南窗开在阳台内侧墙（y = F2_Y0）上"""
+    BW, BH = p["BW"], p["BH"]
+    south = 0 if floor == "一层" else p["F2_Y0"]
+    wall = {"SOUTH_WIN": south, "NORTH_WIN": BH, "WEST_WIN": 0, "EAST_WIN": BW}
+    out = []
+    for key, (name, axis) in WINDOW_FACADES.items():
+        for x, sill, width, *_ in p[key]:
+            if window_floor(p, sill) != floor:
+                continue
+            at, length = round(x * 1000), round(width * 1000)
+            label = f"{name}面窗 {x:g}~{x + width:g} m"
+            out.append((at, wall[key], length, "h", label) if axis == "h" else (wall[key], at, length, "v", label))
+    return out
+
+
+# ══════════════════════════════════════════════
+#  设备点位 (x, y, 说明)
+# ══════════════════════════════════════════════
+
+ELECTRICAL = {
+    "一层": {
+        "lights": [
+            (11000,1200,"玄关筒灯"),(4000,1200,"客厅筒灯"),
+            (4000,4700,"LDK主灯"),(5500,4200,"餐厅灯"),
+            (2500,9000,"厨房主灯"),(5700,9000,"卫浴灯"),
+            (10500,4700,"主卧1主灯"),
+            (10500,9000,"楼梯灯"),
+        ],
+        "sockets": [
+            (800,8000,"冰箱"),(2000,10500,"油烟机16A"),(3500,10500,"微波炉"),(4200,10500,"小家电"),
+            (800,10200,"净水器"),(5400,10200,"吹风机"),
+            (500,3500,"电视"),(500,4200,"路由器"),
+            (500,5500,"沙发USB"),(3500,5500,"沙发USB"),(7500,6500,"空调16A"),
+            (8800,3500,"床头L"),(8800,4200,"USB充电L"),(12000,3500,"床头R"),(12000,4200,"USB充电R"),
+            (8800,6800,"空调16A"),
+        ],
+        "switches": [
+            (2800,7400,"厨房灯"),(5000,7400,"卫浴灯"),(10500,500,"玄关"),
+            (7500,2400,"客厅(门口)"),(4000,4500,"LDK(沙发)"),(5500,4500,"餐厅"),
+            (8800,2800,"主卧(门口)"),(12000,2800,"主卧(床头)"),
+            (7500,7400,"楼梯↑"),
+        ],
+    },
+    "二层": {
+        "lights": [
+            (3000,8800,"主卧2主灯"),(6900,8500,"主卫2灯"),
+            (12200,7800,"公卫灯"),(2000,3500,"次卧灯"),
+            (7500,3500,"多功能区灯"),
+            (2000,6200,"走廊灯1"),(5000,6200,"走廊灯2"),(8000,6200,"走廊灯3"),
+            (12200,9500,"楼梯灯"),(3000,800,"阳台灯1"),(7000,800,"阳台灯2"),(12000,800,"阳台灯3"),
+        ],
+        "sockets": [
+            (600,8000,"床头USB L"),(600,8600,"床头L"),(4500,8000,"床头USB R"),(4500,8600,"床头R"),
+            (600,10500,"空调16A"),
+            (600,2000,"床头"),(600,2600,"USB"),(3500,2500,"书桌"),(600,4600,"空调16A"),
+            (5200,2000,"预留"),(5200,2600,"预留"),(5200,4600,"空调16A"),
+            (12000,7500,"吹风机"),(6500,10000,"吹风机"),
+            (5000,500,"阳台"),(9000,500,"洗衣机"),
+        ],
+        "switches": [
+            (2800,7200,"主卧2(门口)"),(600,7600,"主卧2(床头)"),
+            (6200,7200,"主卫2"),(11500,7200,"公卫"),
+            (2000,5000,"次卧(门口)"),(600,1800,"次卧(床头)"),
+            (5500,5000,"多功能区"),
+            (2000,5500,"走廊(次卧侧)"),(8000,7000,"走廊(主卧侧)"),
+            (11800,7200,"楼梯↓"),(3000,1700,"阳台"),
+        ],
+    },
+}
+
+# 给排水点位 (x, y, 说明, "supply" / "drain")
+PLUMBING = {
+    "一层": [(2500,8000,"厨房给水","supply"),(5200,9500,"卫浴给水","supply"),
+             (2000,9000,"厨房排水","drain"),(5500,9500,"卫浴排水","drain")],
+    "二层": [(6200,9500,"主卫2给水","supply"),(11800,7000,"公卫给水","supply"),
+             (5900,9000,"主卫2排水","drain"),(12000,7200,"公卫排水","drain")],
+}
+
+
+def light_symbol(label):
+    return "DOWNLIGHT" if "筒灯" in label or "射灯" in label else "LIGHT-MAIN"
+
+
+def socket_symbol(label):
+    return "SOCKET-16A" if "16A" in label or "空调" in label or "油烟机" in label else "SOCKET-10A"
+
+
+def switch_symbol(label):
+    return "SWITCH-2WAY" if "床头" in label else "SWITCH"
+
+
+def plumbing_symbol(label):
+    if "主卫" in label and "给水" in label:
+        return "SHOWER"
+    return "FLOOR-DRAIN" if "排水" in label else "FAUCET"
+
+
+SYMBOLS = {"lights": light_symbol, "sockets": socket_symbol, "switches": switch_symbol}
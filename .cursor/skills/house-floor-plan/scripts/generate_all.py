@@ -7,15 +7,18 @@
 确保平面图↔立面图↔剖面图↔效果图的结构、尺寸、窗户位置严格一致。
 """
 
+import io
 import os
 import sys
 import math
 import ezdxf
 from ezdxf import units
-from ezdxf.enums import TextEntityAlignment
+import threading
+from contextlib import contextmanager
 import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
+from matplotlib.transforms import Bbox
 import matplotlib.patches as patches
 from matplotlib.patches import Arc
 import numpy as np
@@ -30,6 +33,20 @@ from building_config import (
     SOUTH_WIN, SOUTH_DOOR, NORTH_WIN, EAST_WIN, WEST_WIN,
     SILL_STD, DARK_STONE_X,
 )
+import render_quality
+import output_sink
+import memory_budget
+import metrics
+import perf
+import svg_compact
+import native_plot
+import sheet_set
+import dxf_set
+import building_config
+import floor_layout
+import validate
+from display_list import DisplayList
+import tiles
 
 W_m = BW_M; D_m = BD_M
 
@@ -41,11 +58,61 @@ _FONT_BOLD = os.path.join(_FONT_DIR, "NotoSansSC-Subset-Bold.ttf")
 for _fp in [_FONT_REGULAR, _FONT_BOLD]:
     if os.path.exists(_fp):
         fm.fontManager.addfont(_fp)
-plt.rcParams["font.sans-serif"] = ["Noto Sans CJK SC"]
-plt.rcParams["axes.unicode_minus"] = False
 
-BASE = os.path.join(os.getcwd(), "图纸")
-IMG_DIR = os.path.join(os.getcwd(), "docs", "images")
+# 图纸样式：只在 _figure() 作用域内生效，不在模块级修改全局 rcParams。
+# 文字的字体族在创建时即固定到 FontProperties，绘制/保存阶段不再依赖 rcParams。
+_MPL_STYLE = {
+    "font.family": ["Noto Sans CJK SC", "sans-serif"],
+    "axes.unicode_minus": False,
+}
+_style_lock = threading.Lock()
+_style_depth = 0
+_style_saved = {}
+
+
+@contextmanager
+def _mpl_style():
+    """引用计数的样式作用域：多个线程同时作图时，最后一个退出者才恢复 rcParams"""
+    global _style_depth
+    with _style_lock:
+        if _style_depth == 0:
+            _style_saved.update({k: matplotlib.rcParams[k] for k in _MPL_STYLE})
+            matplotlib.rcParams.update(_MPL_STYLE)
+        _style_depth += 1
+    try:
+        yield
+    finally:
+        with _style_lock:
+            _style_depth -= 1
+            if _style_depth == 0:
+                matplotlib.rcParams.update(_style_saved)
+                _style_saved.clear()
+
+
+@contextmanager
+def _figure(figsize, dpi=150, facecolor=None, plan=False):
+    """调用方持有的 Figure + 单个 Axes（不经 pyplot 全局图形管理器）；退出时清空并释放
+
+    plan=True（显示列表回放的图纸）在 native 后端下改用 native_plot 的 Figure / Axes（绘图调用相同）。
+    """
+    if plan and native_plot.get_backend() == "native":
+        fig = native_plot.Figure(figsize, facecolor=facecolor or C_BG)
+        with perf.span("native"):
+            yield fig, fig.ax
+        return
+    with _mpl_style():
+        fig = Figure(figsize=figsize, dpi=dpi, facecolor=facecolor or C_BG)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+        try:
+            with perf.span("matplotlib"):
+                yield fig, ax
+        finally:
+            fig.clear()
+
+# 输出路径均为相对路径，实际写到哪里由 output_sink 当前 sink 决定
+BASE = "图纸"
+IMG_DIR = "docs/images"
 DIRS = {
     "平面图": f"{BASE}/01-建筑设计/平面图",
     "立面图": f"{BASE}/01-建筑设计/立面图",
@@ -55,8 +122,6 @@ DIRS = {
     "电气":   f"{BASE}/03-电气设计",
     "效果图": f"{BASE}/04-效果图",
 }
-for d in list(DIRS.values()) + [IMG_DIR]:
-    os.makedirs(d, exist_ok=True)
 
 # ── 颜色 ──
 BLACK = 250; WHITE = 7; LIGHT_FILL = 150; RED = 1; GRAY = 8; BLUE = 4
@@ -73,6 +138,118 @@ def _s(v):
     return v / 1000.0
 
 
+_PNG_SOFTWARE = f"Matplotlib version{matplotlib.__version__}, https://matplotlib.org/"
+
+
+def _save_figure(fig, png_path, dpi=150, facecolor=C_BG, pad_inches=0.3):
+    """保存 PNG（dpi 按当前质量预设缩放）+ 同名 SVG（draft 预设跳过），写入当前 sink
+
+    Agg 光栅化必须在调用方线程完成；PNG 压缩与写出通过 sink.submit 交出，
+    在 BackgroundWriter 下与下一张图纸的绘制重叠。
+    """
+    sink = output_sink.get_sink()
+    dpi = render_quality.dpi(dpi)
+    if isinstance(fig, native_plot.Figure):
+        _save_native(fig, png_path, sink, dpi, facecolor, pad_inches)
+        return
+    if perf.enabled():
+        perf.count("artists", len(fig.findobj()))
+    if not _save_strips(fig, png_path, sink, dpi, facecolor, pad_inches):
+        _save_whole(fig, png_path, sink, dpi, facecolor, pad_inches)
+    if render_quality.want_svg():
+        with sink.open(png_path[:-4] + ".svg") as f, perf.span("encode.svg"):
+            svg_compact.savefig(fig, f, pad_inches=0.3, facecolor=facecolor)
+
+
+def _save_native(fig, png_path, sink, dpi, facecolor, pad_inches):
+    """native 后端：Pillow 光栅化后交给 sink 编码；SVG 直接由图元写出"""
+    if perf.enabled():
+        perf.count("artists", len(fig.ax.items))
+    with perf.span("raster.pillow"):
+        mode, size, raw = fig.to_raw(dpi, facecolor, pad_inches)
+    sink.submit(png_path, lambda: output_sink.encode_png(mode, size, raw, dpi, native_plot.SOFTWARE))
+    if render_quality.want_svg():
+        with perf.span("encode.svg"):
+            sink.write(png_path[:-4] + ".svg", fig.to_svg(facecolor, pad_inches=0.3))
+
+
+def _save_whole(fig, png_path, sink, dpi, facecolor, pad_inches):
+    buf = io.BytesIO()
+    with perf.span("raster.agg"):
+        fig.savefig(buf, format="rgba", bbox_inches="tight", pad_inches=pad_inches,
+                    dpi=dpi, facecolor=facecolor)
+    r = fig.canvas.renderer   # tight bbox 下实际输出的画布尺寸
+    raw, size = buf.getvalue(), (int(r.width), int(r.height))
+    if len(raw) != size[0] * size[1] * 4:
+        raise RuntimeError(f"{png_path}: Agg 输出尺寸与渲染器不一致")
+    sink.submit(png_path, lambda: output_sink.encode_png("RGBA", size, raw, dpi, _PNG_SOFTWARE))
+
+
+def _save_strips(fig, png_path, sink, dpi, facecolor, pad_inches):
+    """内存预算模式下的大画布：条带光栅化到 memmap，PNG 逐条带流式编码；不适用时返回 False"""
+    if not memory_budget.active():
+        return False
+    bbox = _tight_bbox(fig, pad_inches)
+    size = int(bbox.width * dpi), int(bbox.height * dpi)
+    if not memory_budget.should_strip(size[0] * size[1] * 4):
+        return False
+    with perf.span("raster.agg"):
+        arr = _raster_strips(fig, bbox, size, dpi, facecolor)
+    rows = memory_budget.strip_rows(size[0], 4, size[1])
+    sink.submit(png_path, lambda: output_sink.encode_png_rows(
+        "RGBA", size, (arr[y:y + rows] for y in range(0, size[1], rows)), dpi, _PNG_SOFTWARE))
+    return True
+
+
+def _tight_bbox(fig, pad_inches):
+    """用 100 dpi 的小画布测量 tight bbox（英寸），不为海报尺寸分配整幅 Agg 缓冲区"""
+    w, h = fig.get_size_inches()
+    return fig.get_tightbbox(RendererAgg(int(w * 100), int(h * 100), 100)).padded(pad_inches)
+
+
+def _raster_strips(fig, bbox, size, dpi, facecolor):
+    """按水平条带逐次光栅化到 memmap 缓冲区：每条带单独 savefig（bbox_inches 取条带范围）
+
+    Agg 以整数画布高度翻转 y 轴，条带下沿取 bbox.y0 + (h - y - n)/dpi，
+    使每个条带与整幅渲染的像素网格对齐（亚像素相位一致），拼接无缝。
+    """
+    w, h = size
+    arr = memory_budget.scratch_array((h, w, 4))
+    rows = memory_budget.strip_rows(w, 16, h)   # Agg 画布 + RGBA 副本 ≈ 每像素 16 字节
+    for y in range(0, h, rows):
+        n = min(rows, h - y)
+        y0 = bbox.y0 + (h - y - n) / dpi
+        # 宽高加 1e-3 像素，避免 int() 截断少一行/列；翻转只用整数高度，不影响对齐
+        strip = Bbox([[bbox.x0, y0], [bbox.x0 + (w + 1e-3) / dpi, y0 + (n + 1e-3) / dpi]])
+        buf = io.BytesIO()
+        fig.savefig(buf, format="rgba", bbox_inches=strip, dpi=dpi, facecolor=facecolor)
+        r = fig.canvas.renderer
+        if (int(r.width), int(r.height)) != (w, n):
+            raise RuntimeError(f"条带尺寸 {int(r.width)}×{int(r.height)} 与预期 {w}×{n} 不一致")
+        arr[y:y + n] = np.frombuffer(buf.getbuffer(), np.uint8).reshape(n, w, 4)
+    return arr
+
+
+@contextmanager
+def _dxf(path):
+    """新建 R2010 DXF 文档（毫米单位、标准图层），块正常结束时写入 sink"""
+    with perf.span("dxf"):
+        doc = ezdxf.new("R2010"); doc.units = units.MM; setup_layers(doc)
+        yield doc, doc.modelspace()
+        _save_dxf(doc, path)
+
+
+def _save_dxf(doc, path):
+    """ASCII DXF 直接写入 sink 的二进制流（编码与 saveas 一致）"""
+    if perf.enabled():
+        perf.count("entities", len(doc.modelspace()))
+    with output_sink.get_sink().open(path) as f, perf.span("encode.dxf"):
+        w = io.TextIOWrapper(f, encoding=doc.output_encoding, errors="dxfreplace")
+        doc.write(w)
+        w.flush()
+        w.detach()
+
+
 # ══════════════════════════════════════════════
 #  DXF 工具
 # ══════════════════════════════════════════════
@@ -124,272 +301,203 @@ def setup_layers(doc):
         ("ELEC-LIGHT", 2), ("ELEC-SOCKET", 3), ("ELEC-SWITCH", 30),
         ("ELEC-WIRE", 8), ("GROUND", 42), ("GLASS", 4),
         ("HATCH", GRAY), ("SECTION", BLACK),
+        ("P-ARCH", GRAY), ("E-ARCH", GRAY),           # 设备图引用的建筑底图（INSERT 所在图层）
     ]
     for name, color in layers:
         if name not in doc.layers:
             doc.layers.add(name, color=color)
+    if "DASHED" not in doc.linetypes:     # 1:100 出图时 3.5 mm 划 + 1.5 mm 空
+        doc.linetypes.add("DASHED", pattern=[500, 350, -150], description="Dashed __ __ __")
 
 
-def wall_h(msp, x, y, length, t=240):
-    pts = [(x, y), (x+length, y), (x+length, y+t), (x, y+t)]
-    h = msp.add_hatch(color=BLACK, dxfattribs={"layer": "WALL-FILL"})
-    h.paths.add_polyline_path(pts + [pts[0]], is_closed=True)
-    msp.add_lwpolyline(pts + [pts[0]], close=True, dxfattribs={"layer": "WALL", "lineweight": 50, "color": BLACK})
-
-
-def wall_v(msp, x, y, length, t=240):
-    pts = [(x, y), (x+t, y), (x+t, y+length), (x, y+length)]
-    h = msp.add_hatch(color=BLACK, dxfattribs={"layer": "WALL-FILL"})
-    h.paths.add_polyline_path(pts + [pts[0]], is_closed=True)
-    msp.add_lwpolyline(pts + [pts[0]], close=True, dxfattribs={"layer": "WALL", "lineweight": 50, "color": BLACK})
-
-
-def outer_walls(msp, w, h, t=240):
-    wall_h(msp, 0, 0, w, t); wall_h(msp, 0, h-t, w, t)
-    wall_v(msp, 0, 0, h, t); wall_v(msp, w-t, 0, h, t)
+# ══════════════════════════════════════════════
+#  显示列表回放（DXF + PNG/SVG 共用一份图元）
+# ══════════════════════════════════════════════
 
+def _render(dl, dxf_path, png_path):
+    """同一份显示列表回放两次：DXF 源文件 + PNG/SVG 预览（几何只构建一次）
+
+    回放只用 native_plot.Axes 也实现的绘图调用，native 后端下所有显示列表图纸都不经 matplotlib。
+    """
+    if perf.enabled():
+        perf.count("primitives", len(dl))
+    with _dxf(dxf_path) as (doc, msp):
+        dl.to_dxf(doc, msp, _DXF_STYLE)
+    name = os.path.splitext(os.path.basename(png_path))[0]
+    sheet_set.collect(name, dl)
+    dxf_set.collect(name, dl)
+    with _figure(dl.figsize, plan=True) as (fig, ax):
+        ax.set_facecolor(C_BG); ax.set_aspect("equal"); ax.axis("off")
+        ax.set_title(dl.title, fontsize=16, fontweight="bold", color=C_TEXT, pad=dl.title_pad)
+        dl.to_axes(ax)
+        xlim, ylim = dl.limits()
+        ax.set_xlim(*xlim); ax.set_ylim(*ylim)
+        _save_figure(fig, png_path)
 
-def room_fill(msp, x, y, w, h):
-    pts = [(x, y), (x+w, y), (x+w, y+h), (x, y+h)]
-    hatch = msp.add_hatch(color=LIGHT_FILL, dxfattribs={"layer": "ROOM-FILL"})
-    hatch.paths.add_polyline_path(pts + [pts[0]], is_closed=True)
 
+def _outer_walls(dl, fill=C_WALL, color=C_WALL, lw=0.5, z=None):
+    for (x, y, w, h) in [(0, 0, BW, OW), (0, BH-OW, BW, OW), (0, 0, OW, BH), (BW-OW, 0, OW, BH)]:
+        dl.rect(x, y, w, h, "WALL", fill=fill, color=color, lw=lw, z=z)
 
-def dxf_text(msp, x, y, text, height=200, layer="TEXT"):
-    msp.add_text(text, height=height, dxfattribs={"layer": layer, "color": BLACK, "style": _DXF_STYLE}).set_placement(
-        (x, y), align=TextEntityAlignment.MIDDLE_CENTER)
 
+def _outline(dl):
+    """外墙轮廓：平面、屋顶共用同一个符号（合并图纸集中只存一份块）"""
+    if not dl.has_symbol("OUTLINE"):
+        with dl.define("OUTLINE") as sym:
+            _outer_walls(sym)
+    dl.insert("OUTLINE", 0, 0, "WALL")
 
-def dxf_dim_h(msp, x1, x2, y, offset=-800):
-    yo = y + offset
-    msp.add_line((x1, yo), (x2, yo), dxfattribs={"layer": "DIM", "color": RED})
-    msp.add_line((x1, y), (x1, yo), dxfattribs={"layer": "DIM", "color": RED})
-    msp.add_line((x2, y), (x2, yo), dxfattribs={"layer": "DIM", "color": RED})
-    msp.add_text(str(abs(x2-x1)), height=150, dxfattribs={"layer": "DIM", "color": RED, "style": _DXF_STYLE}).set_placement(
-        ((x1+x2)/2, yo+100), align=TextEntityAlignment.MIDDLE_CENTER)
 
+def _gray_walls(dl, walls, floor_name, layer):
+    """设备专业底图：浅灰墙体，室内留白
 
-def dxf_dim_v(msp, y1, y2, x, offset=800):
-    xo = x + offset
-    msp.add_line((xo, y1), (xo, y2), dxfattribs={"layer": "DIM", "color": RED})
-    msp.add_line((x, y1), (xo, y1), dxfattribs={"layer": "DIM", "color": RED})
-    msp.add_line((x, y2), (xo, y2), dxfattribs={"layer": "DIM", "color": RED})
-    msp.add_text(str(abs(y2-y1)), height=150, dxfattribs={"layer": "DIM", "color": RED, "style": _DXF_STYLE}).set_placement(
-        (xo+100, (y1+y2)/2), align=TextEntityAlignment.MIDDLE_CENTER)
+    底图是该层建筑块的替身：单张 DXF / PNG 画灰色墙体，合并图纸集中改为 INSERT 建筑块（插在 layer 上）。
+    """
+    with dl.define("MEP-BASE", shared=ARCH_BLOCKS[floor_name]) as sym:
+        _outer_walls(sym, fill="#E0E0E0", color=C_LINE, lw=0.3, z=2)
+        sym.rect(OW, OW, BW-2*OW, BH-2*OW, "ROOM-FILL", fill=C_BG, z=1)
+        for (x, y, w, h) in walls:
+            sym.rect(x, y, w, h, "WALL", fill="#E0E0E0", color=C_LINE, lw=0.2, z=2)
+    dl.insert("MEP-BASE", 0, 0, layer, z=1)
 
 
-def dxf_window_h(msp, x, y, length, t=240):
-    msp.add_lwpolyline([(x, y), (x+length, y), (x+length, y+t), (x, y+t), (x, y)],
-                        close=True, dxfattribs={"layer": "WINDOW", "color": BLUE})
-    msp.add_line((x, y+t/2), (x+length, y+t/2), dxfattribs={"layer": "WINDOW", "color": BLUE})
+def _north_arrow(dl, x, y):
+    dl.arrow(x, y, x, y+700, "TEXT", style="-|>", color=C_TEXT, lw=1.5, z=10)
+    dl.text(x, y+850, "N", "TEXT", size=10, weight="bold", color=C_TEXT, va="bottom", z=10)
 
 
-def dxf_window_v(msp, x, y, length, t=240):
-    msp.add_lwpolyline([(x, y), (x+t, y), (x+t, y+length), (x, y+length), (x, y)],
-                        close=True, dxfattribs={"layer": "WINDOW", "color": BLUE})
-    msp.add_line((x+t/2, y), (x+t/2, y+length), dxfattribs={"layer": "WINDOW", "color": BLUE})
+def _dxf_title(dl, x, y, title):
+    """DXF 图名（PNG 的图名由 set_title 绘制）"""
+    dl.text(x, y, title, "TITLE", size=10, weight="bold", color=C_TEXT, only="dxf")
 
 
-def dxf_door_arc(msp, x, y, r=900, start=0, end=90):
-    msp.add_arc(center=(x, y), radius=r, start_angle=start, end_angle=end,
-                dxfattribs={"layer": "DOOR", "color": BLACK})
+def _levels(dl, marks, tick, gap):
+    """立面/剖面标高：左侧短线 + 右对齐标高文字（毫米）"""
+    for (y, txt) in marks:
+        dl.line(-tick, y, 0, y, "DIM", color=C_DIM, lw=0.4, z=8)
+        dl.text(-gap, y, txt, "DIM", size=5.5, color=C_DIM, ha="right", z=8)
 
 
 # ══════════════════════════════════════════════
-#  Matplotlib 预览工具（复用之前的 FloorPlan 类）
+#  平面图显示列表（毫米坐标）
 # ══════════════════════════════════════════════
 
-class FloorPlan:
-    def __init__(self, title, subtitle, w=14000, h=11000, ow=240, iw=120):
-        self.title = title; self.subtitle = subtitle
+ARCH_BLOCKS = {"一层": "ARCH-F1", "二层": "ARCH-F2"}   # 各层建筑块（墙体、门窗、楼梯）
+
+
+class FloorPlan(DisplayList):
+    def __init__(self, title, subtitle, floor_name, w=14000, h=11000, ow=240, iw=120):
+        super().__init__(title, figsize=(16, 13), title_pad=10)
+        self.subtitle = subtitle
         self.W = w; self.H = h; self.OW = ow; self.IW = iw
-        self.fig, self.ax = plt.subplots(1, 1, figsize=(16, 13), dpi=150, facecolor=C_BG)
-        self.ax.set_facecolor(C_BG); self.ax.set_aspect("equal"); self.ax.axis("off")
+        # 墙体、门窗、楼梯画入该层建筑块（设备图在合并图纸集中引用同一个块）
+        with self.define(ARCH_BLOCKS[floor_name]) as self.arch:
+            pass
+        self.insert(ARCH_BLOCKS[floor_name], 0, 0, "WALL")
 
-    def _s(self, v): return v / 1000.0
     def fill_room(self, x, y, w, h):
-        self.ax.add_patch(patches.Rectangle((self._s(x), self._s(y)), self._s(w), self._s(h), facecolor=C_ROOM, edgecolor="none", zorder=1))
+        self.rect(x, y, w, h, "ROOM-FILL", fill=C_ROOM)
     def draw_outer_walls(self):
-        s = self._s; t = self.OW
-        for (x, y, w, h) in [(0,0,self.W,t),(0,self.H-t,self.W,t),(0,0,t,self.H),(self.W-t,0,t,self.H)]:
-            self.ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor=C_WALL,edgecolor=C_WALL,linewidth=0.5,zorder=5))
+        _outline(self.arch)
     def draw_iwall_h(self, x, y, length, t=None):
-        t = t or self.IW
-        self.ax.add_patch(patches.Rectangle((self._s(x),self._s(y)),self._s(length),self._s(t),facecolor=C_WALL,edgecolor=C_WALL,linewidth=0.3,zorder=5))
+        self.arch.rect(x, y, length, t or self.IW, "WALL", fill=C_WALL, color=C_WALL, lw=0.3)
     def draw_iwall_v(self, x, y, length, t=None):
-        t = t or self.IW
-        self.ax.add_patch(patches.Rectangle((self._s(x),self._s(y)),self._s(t),self._s(length),facecolor=C_WALL,edgecolor=C_WALL,linewidth=0.3,zorder=5))
+        self.arch.rect(x, y, t or self.IW, length, "WALL", fill=C_WALL, color=C_WALL, lw=0.3)
     def room_label(self, cx, cy, cn, en="", size_text=""):
-        s = self._s
-        self.ax.text(s(cx),s(cy)+0.25,cn,ha="center",va="center",fontsize=11,fontweight="bold",color=C_TEXT,zorder=10)
-        if en: self.ax.text(s(cx),s(cy)-0.1,en,ha="center",va="center",fontsize=7,color=C_TEXT2,zorder=10)
-        if size_text: self.ax.text(s(cx),s(cy)-0.42,size_text,ha="center",va="center",fontsize=6.5,color=C_TEXT2,zorder=10)
+        self.text(cx, cy+250, cn, "TEXT", size=11, weight="bold", color=C_TEXT)
+        if en: self.text(cx, cy-100, en, "TEXT", size=7, color=C_TEXT2)
+        if size_text: self.text(cx, cy-420, size_text, "TEXT", size=6.5, color=C_TEXT2)
     def door_h(self, x, y, w=900, up=True):
         sa, ea = (0,90) if up else (270,360)
-        self.ax.add_patch(Arc((self._s(x),self._s(y)),self._s(w)*2,self._s(w)*2,angle=0,theta1=sa,theta2=ea,color=C_DOOR,linewidth=0.8,zorder=6))
+        self.arch.arc(x, y, w, w, sa, ea, "DOOR", color=C_DOOR, lw=0.8)
     def door_v(self, x, y, w=900, right=True):
         sa, ea = (0,90) if right else (90,180)
-        self.ax.add_patch(Arc((self._s(x),self._s(y)),self._s(w)*2,self._s(w)*2,angle=0,theta1=sa,theta2=ea,color=C_DOOR,linewidth=0.8,zorder=6))
+        self.arch.arc(x, y, w, w, sa, ea, "DOOR", color=C_DOOR, lw=0.8)
     def window_h(self, x, y, length):
-        s = self._s
-        self.ax.add_patch(patches.Rectangle((s(x),s(y)-0.06),s(length),0.12,facecolor=C_BG,edgecolor=C_WIN,linewidth=1.5,zorder=6))
-        self.ax.plot([s(x),s(x+length)],[s(y),s(y)],color=C_WIN,linewidth=0.5,zorder=7)
+        self.arch.rect(x, y-60, length, 120, "WINDOW", fill=C_BG, color=C_WIN, lw=1.5)
+        self.arch.line(x, y, x+length, y, "WINDOW", color=C_WIN, lw=0.5, z=7)
     def window_v(self, x, y, length):
-        s = self._s
-        self.ax.add_patch(patches.Rectangle((s(x)-0.06,s(y)),0.12,s(length),facecolor=C_BG,edgecolor=C_WIN,linewidth=1.5,zorder=6))
-        self.ax.plot([s(x),s(x)],[s(y),s(y+length)],color=C_WIN,linewidth=0.5,zorder=7)
+        self.arch.rect(x-60, y, 120, length, "WINDOW", fill=C_BG, color=C_WIN, lw=1.5)
+        self.arch.line(x, y, x, y+length, "WINDOW", color=C_WIN, lw=0.5, z=7)
     def stairs(self, x, y, w, h, n=13, direction="up"):
-        s = self._s
-        self.ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="none",edgecolor=C_STAIR,linewidth=0.6,zorder=4))
+        self.arch.rect(x, y, w, h, "STAIRS", color=C_STAIR, lw=0.6)
         step = h / n
         for i in range(1, n):
-            sy = y + i * step; self.ax.plot([s(x),s(x+w)],[s(sy),s(sy)],color=C_STAIR,linewidth=0.4,zorder=4)
-        mx = s(x + w/2)
-        if direction == "up":
-            self.ax.annotate("",xy=(mx,s(y+h)-0.1),xytext=(mx,s(y)+0.1),arrowprops=dict(arrowstyle="->",color=C_DIM,lw=1.2),zorder=8)
-        else:
-            self.ax.annotate("",xy=(mx,s(y)+0.1),xytext=(mx,s(y+h)-0.1),arrowprops=dict(arrowstyle="->",color=C_DIM,lw=1.2),zorder=8)
+            self.arch.line(x, y+i*step, x+w, y+i*step, "STAIRS", color=C_STAIR, lw=0.4)
+        mx = x + w/2; y0, y1 = (y+100, y+h-100) if direction == "up" else (y+h-100, y+100)
+        self.arch.arrow(mx, y0, mx, y1, "STAIRS", color=C_DIM, lw=1.2, z=8)
     def bed_double(self, x, y, w=1800, h=2000):
-        s = self._s
-        self.ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="none",edgecolor=C_LINE,linewidth=0.6,zorder=4))
-        self.ax.add_patch(patches.Rectangle((s(x+60),s(y+h-350)),s(w/2-90),s(280),facecolor="none",edgecolor=C_LINE,linewidth=0.4,zorder=4))
-        self.ax.add_patch(patches.Rectangle((s(x+w/2+30),s(y+h-350)),s(w/2-90),s(280),facecolor="none",edgecolor=C_LINE,linewidth=0.4,zorder=4))
+        self.rect(x, y, w, h, "FURNITURE", color=C_LINE, lw=0.6)
+        self.rect(x+60, y+h-350, w/2-90, 280, "FURNITURE", color=C_LINE, lw=0.4)
+        self.rect(x+w/2+30, y+h-350, w/2-90, 280, "FURNITURE", color=C_LINE, lw=0.4)
     def bed_single(self, x, y, w=1200, h=2000):
-        s = self._s
-        self.ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="none",edgecolor=C_LINE,linewidth=0.6,zorder=4))
-        self.ax.add_patch(patches.Rectangle((s(x+60),s(y+h-350)),s(w-120),s(280),facecolor="none",edgecolor=C_LINE,linewidth=0.4,zorder=4))
+        self.rect(x, y, w, h, "FURNITURE", color=C_LINE, lw=0.6)
+        self.rect(x+60, y+h-350, w-120, 280, "FURNITURE", color=C_LINE, lw=0.4)
     def sofa_L(self, x, y):
-        s = self._s
         for (rx,ry,rw,rh) in [(x,y,2800,700),(x+50,y+50,850,580),(x+950,y+50,850,580),(x+2800,y-100,700,800),(x+2850,y-50,580,680)]:
-            self.ax.add_patch(patches.Rectangle((s(rx),s(ry)),s(rw),s(rh),facecolor="none",edgecolor=C_LINE,linewidth=0.5,zorder=4))
+            self.rect(rx, ry, rw, rh, "FURNITURE", color=C_LINE, lw=0.5)
     def dining_round(self, cx, cy, r=550):
-        s = self._s
-        self.ax.add_patch(patches.Circle((s(cx),s(cy)),s(r),facecolor="none",edgecolor=C_LINE,linewidth=0.6,zorder=4))
+        self.circle(cx, cy, r, "FURNITURE", color=C_LINE, lw=0.6)
         for a in range(0,360,45):
             px = cx + (r+200)*math.cos(math.radians(a)); py = cy + (r+200)*math.sin(math.radians(a))
-            self.ax.add_patch(patches.Circle((s(px),s(py)),s(120),facecolor="none",edgecolor=C_LINE,linewidth=0.4,zorder=4))
+            self.circle(px, py, 120, "FURNITURE", color=C_LINE, lw=0.4)
     def kitchen_L(self, x, y, w, h, d=550):
-        s = self._s
-        pts = [(s(x),s(y)),(s(x+w),s(y)),(s(x+w),s(y+d)),(s(x+d),s(y+d)),(s(x+d),s(y+h)),(s(x),s(y+h)),(s(x),s(y))]
-        self.ax.add_patch(plt.Polygon(pts,facecolor="none",edgecolor=C_LINE,linewidth=0.6,zorder=4))
+        self.polyline([(x,y),(x+w,y),(x+w,y+d),(x+d,y+d),(x+d,y+h),(x,y+h)], "FURNITURE", closed=True, color=C_LINE, lw=0.6)
     def toilet(self, x, y):
-        s = self._s
-        self.ax.add_patch(patches.Ellipse((s(x),s(y)),s(300),s(240),facecolor="none",edgecolor=C_LINE,linewidth=0.5,zorder=4))
-        self.ax.add_patch(patches.Rectangle((s(x-170),s(y-200)),s(340),s(140),facecolor="none",edgecolor=C_LINE,linewidth=0.4,zorder=4))
+        self.ellipse(x, y, 150, 120, "FIXTURE", color=C_LINE, lw=0.5)
+        self.rect(x-170, y-200, 340, 140, "FIXTURE", color=C_LINE, lw=0.4)
     def sink(self, x, y, w=450, h=350):
-        s = self._s
-        self.ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="none",edgecolor=C_LINE,linewidth=0.4,zorder=4))
-        self.ax.add_patch(patches.Circle((s(x+w/2),s(y+h/2)),s(70),facecolor="none",edgecolor=C_LINE,linewidth=0.3,zorder=4))
+        self.rect(x, y, w, h, "FIXTURE", color=C_LINE, lw=0.4)
+        self.circle(x+w/2, y+h/2, 70, "FIXTURE", color=C_LINE, lw=0.3)
     def shower_room(self, x, y, sz=900):
-        s = self._s
-        self.ax.add_patch(patches.Rectangle((s(x),s(y)),s(sz),s(sz),facecolor="none",edgecolor=C_LINE,linewidth=0.5,zorder=4))
-        self.ax.add_patch(patches.Circle((s(x+sz/2),s(y+sz/2)),s(160),facecolor="none",edgecolor=C_LINE,linewidth=0.4,zorder=4))
+        self.rect(x, y, sz, sz, "FIXTURE", color=C_LINE, lw=0.5)
+        self.circle(x+sz/2, y+sz/2, 160, "FIXTURE", color=C_LINE, lw=0.4)
     def wardrobe(self, x, y, w, h=550):
-        s = self._s
-        self.ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="none",edgecolor=C_LINE,linewidth=0.5,zorder=4))
-        self.ax.plot([s(x+w/2),s(x+w/2)],[s(y),s(y+h)],color=C_LINE,linewidth=0.3,zorder=4)
+        self.rect(x, y, w, h, "FURNITURE", color=C_LINE, lw=0.5)
+        self.line(x+w/2, y, x+w/2, y+h, "FURNITURE", color=C_LINE, lw=0.3)
     def desk_chair(self, x, y, w=1400, h=600):
-        s = self._s
-        self.ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="none",edgecolor=C_LINE,linewidth=0.5,zorder=4))
-        self.ax.add_patch(patches.Circle((s(x+w/2),s(y-300)),s(180),facecolor="none",edgecolor=C_LINE,linewidth=0.4,zorder=4))
+        self.rect(x, y, w, h, "FURNITURE", color=C_LINE, lw=0.5)
+        self.circle(x+w/2, y-300, 180, "FURNITURE", color=C_LINE, lw=0.4)
     def tv_wall(self, x, y, w=2200):
-        s = self._s
-        self.ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(120),facecolor=C_LINE,edgecolor=C_LINE,linewidth=0.3,zorder=4))
+        self.rect(x, y, w, 120, "FURNITURE", fill=C_LINE, color=C_LINE, lw=0.3)
     def car_symbol(self, x, y):
-        s = self._s
-        pts = [(s(x+150),s(y)),(s(x+1650),s(y)),(s(x+1800),s(y+350)),(s(x+1800),s(y+3800)),
-               (s(x+1650),s(y+4200)),(s(x+150),s(y+4200)),(s(x),s(y+3800)),(s(x),s(y+350))]
-        self.ax.add_patch(plt.Polygon(pts,facecolor="none",edgecolor=C_LINE,linewidth=0.6,zorder=4,closed=True))
+        self.polyline([(x+150,y),(x+1650,y),(x+1800,y+350),(x+1800,y+3800),
+                       (x+1650,y+4200),(x+150,y+4200),(x,y+3800),(x,y+350)], "FURNITURE", closed=True, color=C_LINE, lw=0.6)
     def dim_h(self, x1, x2, y, offset=-700):
-        s = self._s; yo = s(y+offset)
-        self.ax.plot([s(x1),s(x2)],[yo,yo],color=C_DIM,linewidth=0.6,zorder=8)
-        self.ax.plot([s(x1),s(x1)],[s(y),yo-0.08],color=C_DIM,linewidth=0.4,zorder=8)
-        self.ax.plot([s(x2),s(x2)],[s(y),yo-0.08],color=C_DIM,linewidth=0.4,zorder=8)
-        self.ax.text((s(x1)+s(x2))/2,yo+0.06,f"{abs(x2-x1)}",ha="center",va="bottom",fontsize=6.5,color=C_DIM,zorder=8)
+        self.dim(x1, x2, y, "h", offset=offset)
     def dim_v(self, y1, y2, x, offset=700):
-        s = self._s; xo = s(x+offset)
-        self.ax.plot([xo,xo],[s(y1),s(y2)],color=C_DIM,linewidth=0.6,zorder=8)
-        self.ax.plot([s(x),xo+0.08],[s(y1),s(y1)],color=C_DIM,linewidth=0.4,zorder=8)
-        self.ax.plot([s(x),xo+0.08],[s(y2),s(y2)],color=C_DIM,linewidth=0.4,zorder=8)
-        self.ax.text(xo+0.06,(s(y1)+s(y2))/2,f"{abs(y2-y1)}",ha="left",va="center",fontsize=6.5,color=C_DIM,rotation=90,zorder=8)
+        self.dim(y1, y2, x, "v", offset=offset)
     def dim_total_h(self, x1, x2, y, offset=-1400):
-        s = self._s; yo = s(y+offset)
-        self.ax.plot([s(x1),s(x2)],[yo,yo],color=C_DIM,linewidth=0.8,zorder=8)
-        self.ax.plot([s(x1),s(x1)],[s(y),yo-0.08],color=C_DIM,linewidth=0.4,zorder=8)
-        self.ax.plot([s(x2),s(x2)],[s(y),yo-0.08],color=C_DIM,linewidth=0.4,zorder=8)
-        self.ax.text((s(x1)+s(x2))/2,yo+0.08,f"{abs(x2-x1)}",ha="center",va="bottom",fontsize=7.5,fontweight="bold",color=C_DIM,zorder=8)
+        self.dim(x1, x2, y, "h", offset=offset, lw=0.8, size=7.5, weight="bold", gap=80)
     def dim_total_v(self, y1, y2, x, offset=1400):
-        s = self._s; xo = s(x+offset)
-        self.ax.plot([xo,xo],[s(y1),s(y2)],color=C_DIM,linewidth=0.8,zorder=8)
-        self.ax.plot([s(x),xo+0.08],[s(y1),s(y1)],color=C_DIM,linewidth=0.4,zorder=8)
-        self.ax.plot([s(x),xo+0.08],[s(y2),s(y2)],color=C_DIM,linewidth=0.4,zorder=8)
-        self.ax.text(xo+0.08,(s(y1)+s(y2))/2,f"{abs(y2-y1)}",ha="left",va="center",fontsize=7.5,fontweight="bold",color=C_DIM,rotation=90,zorder=8)
+        self.dim(y1, y2, x, "v", offset=offset, lw=0.8, size=7.5, weight="bold", gap=80)
     def info_block(self, floor_name):
-        s = self._s; x = s(self.W)+2.0; y = s(self.H)-0.5
+        x = self.W+2000; y = self.H-500
         for i, item in enumerate(["项目简介：",f"楼层：{floor_name}","基地尺寸：14m × 11m","建筑面积：308 平米","建筑层数：二层","建筑风格：现代简约","卧室配置：2主卧+1次卧"]):
-            self.ax.text(x,y-i*0.5,item,fontsize=8,color=C_TEXT,fontweight="bold" if i==0 else "normal",zorder=10)
+            self.text(x, y-i*500, item, "INFO", size=8, color=C_TEXT, weight="bold" if i==0 else "normal", ha="left", va="baseline")
     def north_arrow(self):
-        s = self._s; x, y = -1.2, s(self.H)-1.5
-        self.ax.annotate("",xy=(x,y+0.7),xytext=(x,y),arrowprops=dict(arrowstyle="-|>",color=C_TEXT,lw=1.5),zorder=10)
-        self.ax.text(x,y+0.85,"N",ha="center",va="bottom",fontsize=10,fontweight="bold",color=C_TEXT,zorder=10)
-    def save(self, filepath):
-        s = self._s; margin = 2.5
-        self.ax.set_xlim(-margin, s(self.W)+margin+5)
-        self.ax.set_ylim(-margin, s(self.H)+margin*0.6)
-        self.ax.set_title(self.title, fontsize=16, fontweight="bold", color=C_TEXT, pad=10)
-        self.fig.savefig(filepath, bbox_inches="tight", pad_inches=0.3, dpi=150, facecolor=C_BG)
-        svg_path = filepath.replace(".png", ".svg")
-        self.fig.savefig(svg_path, format='svg', bbox_inches="tight", pad_inches=0.3, facecolor=C_BG)
-        plt.close(self.fig)
+        _north_arrow(self, -1200, self.H-1500)
+    def fit(self):
+        margin = 2500
+        self.set_limits((-margin, self.W+margin+5000), (-margin, self.H+margin*0.6))
+    def save(self, png_path, dxf_path):
+        self.fit()
+        _render(self, dxf_path, png_path)
 
 
 # ══════════════════════════════════════════════
 #  一层平面图
 # ══════════════════════════════════════════════
 
-def gen_floor1():
+def floor1_plan():
+    """一层平面图显示列表（采光分析等叠加图复用）"""
     X1 = F1_X1; Y0 = F1_Y0; Y1 = F1_Y1
     NX1 = F1_NX1; NX2 = F1_NX2
 
-    fills = [
-        (OW, OW, X1-OW, Y0-OW),                            # 客厅
-        (X1+IW, OW, BW-OW-X1-IW, Y0-OW),                  # 玄关
-        (OW, Y0+IW, X1-OW, Y1-Y0-IW),                     # 客餐厅 LDK
-        (X1+IW, Y0+IW, BW-OW-X1-IW, Y1-Y0-IW),            # 主卧1（无独立卫浴）
-        (OW, Y1+IW, NX1-OW, BH-OW-Y1-IW),                 # 厨房
-        (NX1+IW, Y1+IW, NX2-NX1-IW, BH-OW-Y1-IW),        # 公共卫浴
-        (NX2+IW, Y1+IW, BW-OW-NX2-IW, BH-OW-Y1-IW),      # 楼梯间
-    ]
-    hwalls = [
-        (OW, Y0, X1-OW),                                   # 客厅|LDK 顶墙
-        (X1+IW, Y0, BW-OW-X1-IW),                          # 玄关|主卧 顶墙
-        (OW, Y1, BW-2*OW),                                 # LDK|厨房 北侧带底墙
-    ]
-    vwalls = [
-        (X1, OW, Y1-OW),                                   # 公共区 | 私密区
-        (NX1, Y1+IW, BH-OW-Y1-IW),                         # 厨房 | 公共卫浴
-        (NX2, Y1+IW, BH-OW-Y1-IW),                         # 公共卫浴 | 楼梯间
-    ]
+    fills = [r[1:] for r in floor_layout.rooms(vars(building_config), "一层")]
+    hwalls, vwalls = floor_layout.walls(vars(building_config), "一层")
 
-    # DXF
-    doc = ezdxf.new("R2010"); doc.units = units.MM; setup_layers(doc); msp = doc.modelspace()
-    for rf in fills: room_fill(msp, *rf)
-    outer_walls(msp, BW, BH, OW)
-    for w in hwalls: wall_h(msp, *w, t=IW)
-    for w in vwalls: wall_v(msp, *w, t=IW)
-    dxf_text(msp, (OW+X1)/2, (OW+Y0)/2, "客厅", 300)
-    dxf_text(msp, (X1+BW)/2, (OW+Y0)/2, "玄关", 200)
-    dxf_text(msp, (OW+X1)/2, (Y0+Y1)/2, "客餐厅 LDK", 300)
-    dxf_text(msp, (X1+BW)/2, (Y0+Y1)/2, "主卧室1", 250)
-    dxf_text(msp, (OW+NX1)/2, (Y1+BH)/2, "厨房", 250)
-    dxf_text(msp, (NX1+NX2)/2, (Y1+BH)/2, "卫浴", 200)
-    dxf_text(msp, (NX2+BW)/2, (Y1+BH)/2, "楼梯间", 200)
-    dxf_dim_h(msp, 0, X1, 0); dxf_dim_h(msp, X1, BW, 0)
-    dxf_dim_v(msp, 0, Y0, BW); dxf_dim_v(msp, Y0, Y1, BW); dxf_dim_v(msp, Y1, BH, BW)
-    doc.saveas(f"{DIRS['平面图']}/一层平面图.dxf")
-
-    # PNG
-    fp = FloorPlan("一层平面图  Ground Floor Plan", "2主卧+1次卧 现代简约别墅")
+    fp = FloorPlan("一层平面图  Ground Floor Plan", "2主卧+1次卧 现代简约别墅", "一层")
     for rf in fills: fp.fill_room(*rf)
     fp.draw_outer_walls()
     for w in hwalls: fp.draw_iwall_h(*w)
@@ -403,34 +511,13 @@ def gen_floor1():
     fp.room_label((NX1+NX2)/2, (Y1+BH)/2, "公共卫浴", "Bathroom", "1.8m×3.6m")
     fp.room_label((NX2+BW)/2, (Y1+BH)/2, "楼梯间", "Stairs", "7.2m×3.6m")
 
-    # 家具
-    fp.sofa_L(800, 3000)
-    fp.tv_wall(1000, Y0+IW+200, 2500)
-    fp.dining_round(5500, 4800)
-    fp.kitchen_L(OW+100, Y1+IW+100, 4300, BH-OW-Y1-IW-200, 550)
-    fp.bed_double(X1+IW+800, Y0+IW+1200, 1800, 2000)
-    fp.wardrobe(X1+IW+200, Y1-700, BW-OW-X1-IW-400, 500)
-    fp.toilet(NX1+IW+400, Y1+IW+500)
-    fp.sink(NX1+IW+300, BH-OW-600)
-    fp.stairs(NX2+IW+400, Y1+IW+300, 2800, 3000, 14, "up")
-
-    # 门
-    fp.door_h(X1+IW+1200, OW, 1200, True)                  # 大门（南面玄关石材门）
-    fp.door_h(3500, Y0, 900, False)                         # 客厅→LDK
-    fp.door_v(X1+IW, Y0+IW+500, 900, True)                 # 玄关→主卧1
-    fp.door_h(2500, Y1+IW, 900, True)                       # LDK→厨房
-    fp.door_h(NX1+IW+200, Y1, 700, False)                   # 卫浴→LDK
-    fp.door_h(NX2+IW+500, Y1, 900, False)                   # 楼梯间→LDK
-
-    # 窗户
-    fp.window_h(1000, 0, 5000)                              # 南面客厅超大落地窗
-    fp.window_h(800, BH, 2500)                              # 北面厨房窗
-    fp.window_h(NX1+IW+200, BH, 1000)                      # 北面卫浴窗
-    fp.window_h(NX2+IW+1500, BH, 3500)                     # 北面楼梯间窗
-    fp.window_v(0, 3000, 3500)                              # 西面LDK大窗
-    fp.window_v(0, Y1+IW+500, 2500)                         # 西面厨房窗
-    fp.window_v(BW, Y0+IW+500, 3500)                        # 东面主卧1窗
-    fp.window_v(BW, Y1+IW+500, 2000)                        # 东面楼梯间窗
+    # 家具、门、窗户（floor_layout，校验与出图共用）
+    for item in floor_layout.furniture(vars(building_config), "一层"):
+        getattr(fp, item[0])(*item[1:])
+    for x, y, w, axis, flag, _ in floor_layout.doors(vars(building_config), "一层"):
+        (fp.door_h if axis == "h" else fp.door_v)(x, y, w, flag)
+    for x, y, length, axis, _ in floor_layout.plan_windows(vars(building_config), "一层"):
+        (fp.window_h if axis == "h" else fp.window_v)(x, y, length)
 
     # 尺寸标注
     fp.dim_h(0, X1, 0); fp.dim_h(X1, BW, 0)
@@ -439,58 +526,25 @@ def gen_floor1():
     fp.dim_v(0, Y0, BW); fp.dim_v(Y0, Y1, BW); fp.dim_v(Y1, BH, BW)
     fp.dim_total_v(0, BH, BW)
     fp.info_block("一层"); fp.north_arrow()
-    fp.save(f"{IMG_DIR}/一层平面图.png")
+    return fp
+
+
+@perf.drawing("gen_floor1")
+def gen_floor1():
+    floor1_plan().save(f"{IMG_DIR}/一层平面图.png", f"{DIRS['平面图']}/一层平面图.dxf")
     print("  ✓ 一层平面图 (DXF + PNG)")
 
 
-def gen_floor2():
+def floor2_plan():
+    """二层平面图显示列表（采光分析等叠加图复用）"""
     X1 = F2_X1; Y0 = F2_Y0; Y1 = F2_Y1; Y2 = F2_Y2
     NX1 = F2_NX1; NX2 = F2_NX2; NX3 = F2_NX3
 
-    fills = [
-        (OW,OW,BW-2*OW,Y0-OW),                             # 阳台
-        (OW,Y0+IW,X1-OW,Y1-Y0-IW),                         # 次卧
-        (X1+IW,Y0+IW,BW-OW-X1-IW,Y1-Y0-IW),               # 多功能区（留空）
-        (OW,Y1+IW,BW-2*OW,Y2-Y1-IW),                       # 走廊/起居厅
-        (OW,Y2+IW,NX1-OW,BH-OW-Y2-IW),                     # 主卧2
-        (NX1+IW,Y2+IW,NX2-NX1-IW,BH-OW-Y2-IW),            # 主卫2
-        (NX2+IW,Y2+IW,NX3-NX2-IW,BH-OW-Y2-IW),            # 留空区
-        (NX3+IW,Y2+IW,BW-OW-NX3-IW,(BH-OW-Y2-IW)//2),     # 公卫
-        (NX3+IW,Y2+IW+(BH-OW-Y2-IW)//2+IW,BW-OW-NX3-IW,(BH-OW-Y2-IW)//2-IW),  # 楼梯间
-    ]
-    YM = Y2+IW+(BH-OW-Y2-IW)//2
-    hwalls = [
-        (OW,Y0,BW-2*OW),                                    # 阳台顶墙
-        (OW,Y1,BW-2*OW),                                    # 走廊底墙
-        (OW,Y2,BW-2*OW),                                    # 主卧区底墙
-        (NX3+IW,YM,BW-OW-NX3-IW),                           # 公卫|楼梯
-    ]
-    vwalls = [
-        (X1,Y0+IW,Y1-Y0-IW),                                # 次卧|多功能区
-        (NX1,Y2+IW,BH-OW-Y2-IW),                            # 主卧2|主卫2
-        (NX2,Y2+IW,BH-OW-Y2-IW),                            # 主卫2|留空区
-        (NX3,Y2+IW,BH-OW-Y2-IW),                            # 留空区|公卫+楼梯
-    ]
+    fills = [r[1:] for r in floor_layout.rooms(vars(building_config), "二层")]
+    hwalls, vwalls = floor_layout.walls(vars(building_config), "二层")
+    YM = floor_layout.f2_stair_split(vars(building_config))
 
-    # DXF
-    doc = ezdxf.new("R2010"); doc.units = units.MM; setup_layers(doc); msp = doc.modelspace()
-    for rf in fills: room_fill(msp, *rf)
-    outer_walls(msp, BW, BH, OW)
-    for w in hwalls: wall_h(msp, *w, t=IW)
-    for w in vwalls: wall_v(msp, *w, t=IW)
-    dxf_text(msp, BW/2, Y0/2, "南向大阳台", 250)
-    dxf_text(msp, (OW+X1)/2, (Y0+Y1)/2, "次卧室", 250)
-    dxf_text(msp, (X1+BW)/2, (Y0+Y1)/2, "多功能区", 250)
-    dxf_text(msp, BW/2, (Y1+Y2)/2, "走廊", 250)
-    dxf_text(msp, (OW+NX1)/2, (Y2+BH)/2, "主卧室2", 300)
-    dxf_text(msp, (NX1+NX2)/2, (Y2+BH)/2, "主卫2", 200)
-    dxf_text(msp, (NX2+NX3)/2, (Y2+BH)/2, "留空区", 250)
-    dxf_text(msp, (NX3+BW)/2, (Y2+YM)/2, "公卫", 200)
-    dxf_text(msp, (NX3+BW)/2, (YM+BH)/2, "楼梯间", 200)
-    doc.saveas(f"{DIRS['平面图']}/二层平面图.dxf")
-
-    # PNG
-    fp = FloorPlan("二层平面图  Second Floor Plan", "2主卧+1次卧 现代简约别墅")
+    fp = FloorPlan("二层平面图  Second Floor Plan", "2主卧+1次卧 现代简约别墅", "二层")
     for rf in fills: fp.fill_room(*rf)
     fp.draw_outer_walls()
     for w in hwalls: fp.draw_iwall_h(*w)
@@ -505,41 +559,25 @@ def gen_floor2():
     fp.room_label((NX3+BW)/2,(Y2+YM)/2,"公卫","WC","2.6m×1.8m")
     fp.room_label((NX3+BW)/2,(YM+BH)/2,"楼梯间","Stairs","2.6m×1.7m")
 
-    # 家具
-    fp.bed_double(1500,7800,1800,2000); fp.wardrobe(400,10100,5000,500)
-    fp.toilet(NX1+IW+500,8000); fp.sink(NX1+IW+400,9600); fp.shower_room(NX1+IW+200,7500,900)
-    fp.bed_single(1200,Y0+IW+300,1200,2000)
-    fp.desk_chair(1200,Y0+IW+2800,1400,550)
-    fp.toilet(NX3+IW+400,Y2+IW+400); fp.sink(NX3+IW+300,YM-500)
-    fp.stairs(NX3+IW+200,YM+IW+200,2200,BH-OW-YM-IW-400,13,"down")
-
-    # 门
-    fp.door_h(2000,Y1,800,False)                            # 次卧→走廊
-    fp.door_h(X1+IW+2000,Y1,800,False)                     # 多功能区→走廊
-    fp.door_h(2500,Y2+IW,900,True)                          # 走廊→主卧2
-    fp.door_v(NX1+IW,8800,800,True)                         # 主卫2→主卧2
-    fp.door_h(NX2+IW+500,Y2+IW,900,True)                   # 走廊→留空区
-    fp.door_v(NX3+IW,Y2+IW+500,700,False)                  # 公卫→走廊
-    fp.door_h(NX3+IW+500,YM,700,True)                      # 楼梯间门
-
-    # 窗户
-    fp.window_h(1000,BH,3000)                               # 主卧2北窗（加宽）
-    fp.window_h(NX1+300,BH,1500)                            # 主卫2北窗
-    fp.window_h(NX2+500,BH,2000)                            # 留空区北窗
-    fp.window_v(0,8000,2000)                                # 主卧2西窗
-    fp.window_v(0,Y0+500,2000)                              # 次卧西窗
-    fp.window_h(1200,Y0,2000)                               # 次卧阳台窗
-    fp.window_h(5500,Y0,4000)                               # 多功能区阳台窗
-    fp.window_h(10500,Y0,2000)                              # 多功能区阳台窗2
-    fp.window_v(BW,8500,2000)                               # 留空区/楼梯东窗
-    fp.window_v(BW,Y0+500,2500)                             # 多功能区东窗
+    # 家具、门、窗户（floor_layout，校验与出图共用）
+    for item in floor_layout.furniture(vars(building_config), "二层"):
+        getattr(fp, item[0])(*item[1:])
+    for x, y, w, axis, flag, _ in floor_layout.doors(vars(building_config), "二层"):
+        (fp.door_h if axis == "h" else fp.door_v)(x, y, w, flag)
+    for x, y, length, axis, _ in floor_layout.plan_windows(vars(building_config), "二层"):
+        (fp.window_h if axis == "h" else fp.window_v)(x, y, length)
 
     # 尺寸
     fp.dim_h(0,X1,0); fp.dim_h(X1,BW,0); fp.dim_total_h(0,BW,0)
     fp.dim_v(0,Y0,BW); fp.dim_v(Y0,Y1,BW); fp.dim_v(Y1,Y2,BW); fp.dim_v(Y2,BH,BW); fp.dim_total_v(0,BH,BW)
     fp.dim_h(0,NX1,BH); fp.dim_h(NX1,NX2,BH); fp.dim_h(NX2,NX3,BH); fp.dim_h(NX3,BW,BH)
     fp.info_block("二层"); fp.north_arrow()
-    fp.save(f"{IMG_DIR}/二层平面图.png")
+    return fp
+
+
+@perf.drawing("gen_floor2")
+def gen_floor2():
+    floor2_plan().save(f"{IMG_DIR}/二层平面图.png", f"{DIRS['平面图']}/二层平面图.dxf")
     print("  ✓ 二层平面图 (DXF + PNG)")
 
 
@@ -547,119 +585,56 @@ def gen_floor2():
 #  立面图 DXF + PNG
 # ══════════════════════════════════════════════
 
-def _elev_dxf(name, width_m, windows, doors, filename):
-    """生成立面图DXF"""
-    doc = ezdxf.new("R2010"); doc.units = units.MM; setup_layers(doc); msp = doc.modelspace()
-    S = 1000  # 1m = 1000mm
-
-    w = width_m * S; gl = 0; f1fl = int(F1_FL*S); f1cl = int(F1_CL*S)
-    f2fl = int(F2_FL*S); f2cl = int(F2_CL*S); roof = int(ROOF*S); top = int(TOP*S)
-    wt = int(WALL_T*S)
-
-    # 外轮廓
-    msp.add_lwpolyline([(0,gl),(0,top),(w,top),(w,gl),(0,gl)], close=True,
-                        dxfattribs={"layer": "WALL", "lineweight": 50, "color": BLACK})
-    # 楼层线
-    for y in [f1cl, f2fl, f2cl, roof]:
-        msp.add_line((0,y),(w,y), dxfattribs={"layer": "WALL", "color": GRAY, "linetype": "DASHED"})
-    # 地面线
-    msp.add_line((-1000,gl),(w+1000,gl), dxfattribs={"layer": "GROUND", "lineweight": 30})
-
-    # 窗户
-    for (x,y,ww,wh,divs) in windows:
-        xi=int(x*S); yi=int(y*S); wi=int(ww*S); hi=int(wh*S)
-        msp.add_lwpolyline([(xi,yi),(xi+wi,yi),(xi+wi,yi+hi),(xi,yi+hi),(xi,yi)],
-                            close=True, dxfattribs={"layer": "WINDOW", "color": BLUE})
-        msp.add_line((xi,yi+hi//2),(xi+wi,yi+hi//2), dxfattribs={"layer": "WINDOW", "color": BLUE})
-        for d in range(1, divs):
-            dx = xi + d*wi//divs
-            msp.add_line((dx,yi),(dx,yi+hi), dxfattribs={"layer": "WINDOW", "color": BLUE})
-
-    # 门
-    for (x,y,dw,dh) in doors:
-        xi=int(x*S); yi=int(y*S); di=int(dw*S); hi=int(dh*S)
-        msp.add_lwpolyline([(xi,yi),(xi+di,yi),(xi+di,yi+hi),(xi,yi+hi),(xi,yi)],
-                            close=True, dxfattribs={"layer": "DOOR", "color": BLACK})
-
-    # 标高
-    for (y, txt) in [(gl,"±0.000"),(f1fl,f"+{F1_FL:.3f}"),(f2fl,f"+{F2_FL:.3f}"),(roof,f"+{ROOF:.3f}"),(top,f"+{TOP:.3f}")]:
-        msp.add_line((-200,y),(0,y), dxfattribs={"layer": "DIM", "color": RED})
-        msp.add_text(txt, height=100, dxfattribs={"layer": "DIM", "color": RED, "style": _DXF_STYLE}).set_placement(
-            (-300, y), align=TextEntityAlignment.MIDDLE_RIGHT)
-
-    dxf_dim_h(msp, 0, w, gl)
-    dxf_dim_v(msp, gl, top, w)
-    dxf_text(msp, w/2, top+500, name, 300)
-    doc.saveas(f"{DIRS['立面图']}/{filename}.dxf")
-
-
-def _elev_png(title, width_m, windows, doors, filename, has_balcony=False):
-    """生成立面图PNG"""
-    fig, ax = plt.subplots(1,1,figsize=(16,9),dpi=150,facecolor=C_BG)
-    ax.set_facecolor(C_BG); ax.set_aspect("equal"); ax.axis("off")
-    ax.set_title(title, fontsize=16, fontweight="bold", color=C_TEXT, pad=12)
-
-    w = width_m
-    ax.fill_between([-1,w+1],[-0.3,-0.3],[0,0],color=C_GROUND,alpha=0.3,zorder=1)
-    ax.plot([-1,w+1],[0,0],color=C_LINE,linewidth=1.5,zorder=3)
-    ax.plot([0,0,w,w],[GL,TOP,TOP,GL],color=C_WALL,linewidth=2,zorder=5)
-    ax.plot([0,w],[GL,GL],color=C_WALL,linewidth=2,zorder=5)
+def _elevation(title, name, width_m, windows, doors, filename, has_balcony=False):
+    """立面图显示列表（构建一次，DXF 与 PNG 共用）；建筑参数为米，图元为毫米"""
+    S = 1000
+    w = width_m*S; top = TOP*S
+    dl = DisplayList(title, figsize=(16, 9))
+    dl.rect(-1000, -300, w+2000, 300, "GROUND", fill=C_GROUND, alpha=0.3, z=1, only="dxf")
+    dl.rect(-1000, -300, w+2000, 300, "GROUND", fill=C_GROUND, color=C_GROUND, alpha=0.3, z=1, only="plot")  # 图上带同色描边
+    dl.line(-1000, 0, w+1000, 0, "GROUND", color=C_LINE, lw=1.5, z=3)
+    dl.rect(0, GL*S, w, top-GL*S, "WALL", color=C_WALL, lw=2)
     for yl in [F1_CL,F2_FL,F2_CL,ROOF]:
-        ax.plot([0,w],[yl,yl],color=C_LINE,linewidth=0.5,linestyle="--",zorder=3)
+        dl.line(0, yl*S, w, yl*S, "WALL", color=C_LINE, lw=0.5, dashed=True, z=3)
 
     for (x,y,ww,wh,divs) in windows:
-        ax.add_patch(patches.Rectangle((x,y),ww,wh,facecolor=C_GLASS,edgecolor=C_LINE,linewidth=1,zorder=4))
+        x, y, ww, wh = x*S, y*S, ww*S, wh*S
+        dl.rect(x, y, ww, wh, "WINDOW", fill=C_GLASS, color=C_LINE, lw=1, z=4)
         for d in range(1,divs):
-            ax.plot([x+d*ww/divs,x+d*ww/divs],[y,y+wh],color=C_LINE,linewidth=0.5,zorder=4)
-        ax.plot([x,x+ww],[y+wh/2,y+wh/2],color=C_LINE,linewidth=0.3,zorder=4)
+            dl.line(x+d*ww/divs, y, x+d*ww/divs, y+wh, "WINDOW", color=C_LINE, lw=0.5, z=4)
+        dl.line(x, y+wh/2, x+ww, y+wh/2, "WINDOW", color=C_LINE, lw=0.3, z=4)
 
     for (x,y,dw,dh) in doors:
-        ax.add_patch(patches.Rectangle((x,y),dw,dh,facecolor="#E8DCC8",edgecolor=C_LINE,linewidth=1,zorder=4))
+        dl.rect(x*S, y*S, dw*S, dh*S, "DOOR", fill="#E8DCC8", color=C_LINE, lw=1, z=4)
 
     if has_balcony:
-        ax.add_patch(patches.Rectangle((0.24,F2_FL-1.1),w-0.48,1.1,facecolor="none",edgecolor=C_LINE,linewidth=0.8,zorder=4))
+        by = F2_FL*S-1100
+        dl.rect(240, by, w-480, 1100, "WALL", color=C_LINE, lw=0.8, z=4)
         for i in range(1,28):
-            bx = 0.24 + i*(w-0.48)/28
-            ax.plot([bx,bx],[F2_FL-1.1,F2_FL],color=C_LINE,linewidth=0.3,zorder=4)
-
-    # 标高
-    for (yy,txt) in [(GL,"±0.000"),(F1_FL,f"+{F1_FL:.3f}"),(F2_FL,f"+{F2_FL:.3f}"),(ROOF,f"+{ROOF:.3f}"),(TOP,f"+{TOP:.3f}")]:
-        ax.plot([-0.15,0],[yy,yy],color=C_DIM,linewidth=0.4,zorder=8)
-        ax.text(-0.2,yy,txt,ha="right",va="center",fontsize=5.5,color=C_DIM,zorder=8)
+            bx = 240 + i*(w-480)/28
+            dl.line(bx, by, bx, by+1100, "WALL", color=C_LINE, lw=0.3, z=4)
 
-    def dim_h(x1,x2,y,off=-0.6):
-        yo=y+off; ax.plot([x1,x2],[yo,yo],color=C_DIM,linewidth=0.6,zorder=8)
-        ax.plot([x1,x1],[y,yo],color=C_DIM,linewidth=0.4,zorder=8); ax.plot([x2,x2],[y,yo],color=C_DIM,linewidth=0.4,zorder=8)
-        ax.text((x1+x2)/2,yo+0.04,f"{abs(x2-x1)*1000:.0f}",ha="center",va="bottom",fontsize=6,color=C_DIM,zorder=8)
-    def dim_v(y1,y2,x,off=0.6):
-        xo=x+off; ax.plot([xo,xo],[y1,y2],color=C_DIM,linewidth=0.6,zorder=8)
-        ax.plot([x,xo],[y1,y1],color=C_DIM,linewidth=0.4,zorder=8); ax.plot([x,xo],[y2,y2],color=C_DIM,linewidth=0.4,zorder=8)
-        ax.text(xo+0.04,(y1+y2)/2,f"{abs(y2-y1)*1000:.0f}",ha="left",va="center",fontsize=6,color=C_DIM,rotation=90,zorder=8)
-
-    dim_h(0,w,GL); dim_v(GL,F1_FL,-0.2,offset=-0.8) if False else None
-    dim_v(GL,TOP,w)
-
-    ax.set_xlim(-2.5,w+1.5); ax.set_ylim(-1.5,TOP+1.0)
-    fig.savefig(f"{IMG_DIR}/{filename}.png",bbox_inches="tight",pad_inches=0.3,dpi=150,facecolor=C_BG)
-    fig.savefig(f"{IMG_DIR}/{filename}.svg", format='svg', bbox_inches="tight", pad_inches=0.3, facecolor=C_BG)
-    plt.close(fig)
+    _levels(dl, [(GL*S,"±0.000"),(F1_FL*S,f"+{F1_FL:.3f}"),(F2_FL*S,f"+{F2_FL:.3f}"),
+                 (ROOF*S,f"+{ROOF:.3f}"),(top,f"+{TOP:.3f}")], 150, 200)
+    dl.dim(0, w, GL*S, "h", offset=-600, size=6, ext=0, gap=40)
+    dl.dim(GL*S, top, w, "v", offset=600, size=6, ext=0, gap=40)
+    _dxf_title(dl, w/2, top+500, name)
+    dl.set_limits((-2500, w+1500), (-1500, top+1000))
+    _render(dl, f"{DIRS['立面图']}/{filename}.dxf", f"{IMG_DIR}/{filename}.png")
 
 
+@perf.drawing("gen_elevations")
 def gen_elevations():
-    _elev_dxf("南立面图", W_m, SOUTH_WIN, SOUTH_DOOR, "南立面图")
-    _elev_png("南立面图  South Elevation", W_m, SOUTH_WIN, SOUTH_DOOR, "南立面图", has_balcony=True)
+    _elevation("南立面图  South Elevation", "南立面图", W_m, SOUTH_WIN, SOUTH_DOOR, "南立面图", has_balcony=True)
     print("  ✓ 南立面图 (DXF + PNG)")
 
-    _elev_dxf("北立面图", W_m, NORTH_WIN, [], "北立面图")
-    _elev_png("北立面图  North Elevation", W_m, NORTH_WIN, [], "北立面图")
+    _elevation("北立面图  North Elevation", "北立面图", W_m, NORTH_WIN, [], "北立面图")
     print("  ✓ 北立面图 (DXF + PNG)")
 
-    _elev_dxf("东立面图", D_m, EAST_WIN, [], "东立面图")
-    _elev_png("东立面图  East Elevation", D_m, EAST_WIN, [], "东立面图")
+    _elevation("东立面图  East Elevation", "东立面图", D_m, EAST_WIN, [], "东立面图")
     print("  ✓ 东立面图 (DXF + PNG)")
 
-    _elev_dxf("西立面图", D_m, WEST_WIN, [], "西立面图")
-    _elev_png("西立面图  West Elevation", D_m, WEST_WIN, [], "西立面图")
+    _elevation("西立面图  West Elevation", "西立面图", D_m, WEST_WIN, [], "西立面图")
     print("  ✓ 西立面图 (DXF + PNG)")
 
 
@@ -667,79 +642,42 @@ def gen_elevations():
 #  剖面图 DXF + PNG
 # ══════════════════════════════════════════════
 
+@perf.drawing("gen_section")
 def gen_section():
-    S = 1000; d = int(D_m*S)
-    doc = ezdxf.new("R2010"); doc.units = units.MM; setup_layers(doc); msp = doc.modelspace()
-    wt = int(WALL_T*S); gl=0; f1fl=int(F1_FL*S); f1cl=int(F1_CL*S); f2fl=int(F2_FL*S)
-    f2cl=int(F2_CL*S); roof_i=int(ROOF*S); top_i=int(TOP*S); slab_i=int(SLAB*S)
-
-    # 外墙
-    wall_v(msp, 0, gl, top_i-gl, wt)
-    wall_v(msp, d-wt, gl, top_i-gl, wt)
-    # 楼板
-    wall_h(msp, 0, f1cl, d, slab_i)
-    wall_h(msp, 0, f2cl, d, slab_i)
-    # 女儿墙
-    wall_v(msp, 0, roof_i, int(PARAPET*S), wt)
-    wall_v(msp, d-wt, roof_i, int(PARAPET*S), wt)
-    # 地面线
-    msp.add_line((-1000,gl),(d+1000,gl), dxfattribs={"layer": "GROUND", "lineweight": 30})
-    # 基础
-    msp.add_lwpolyline([(-300,-500),(d+300,-500),(d+300,gl),(-300,gl),(-300,-500)],
-                        close=True, dxfattribs={"layer": "HATCH", "color": GRAY})
+    S = 1000; d = D_m*S; wt = WALL_T*S; top = TOP*S
+    dl = DisplayList("1-1 剖面图  Section 1-1", figsize=(14, 10))
+    dl.rect(-1000, -500, d+2000, 500, "GROUND", fill=C_GROUND, alpha=0.3, z=1, only="dxf")
+    dl.rect(-1000, -500, d+2000, 500, "GROUND", fill=C_GROUND, color=C_GROUND, alpha=0.3, z=1, only="plot")
+    dl.line(-1000, 0, d+1000, 0, "GROUND", color=C_LINE, lw=1.5, z=3)
+    dl.rect(-300, -500, d+600, 500, "HATCH", fill="#E0D8C8", color=C_LINE, lw=0.8)           # 基础
+    # 外墙、楼板、女儿墙
+    for x in (0, d-wt):
+        dl.rect(x, GL*S, wt, top-GL*S, "SECTION", fill=C_WALL, color=C_WALL, lw=0.5)
+        dl.rect(x, ROOF*S, wt, PARAPET*S, "SECTION", fill=C_WALL, color=C_WALL, lw=0.5)
+    for y in (F1_CL, F2_CL):
+        dl.rect(0, y*S, d, SLAB*S, "SECTION", fill="#C0C0C0", color=C_LINE, lw=0.8)
+    dl.rect(wt, F1_FL*S, d-2*wt, F1H*S, "ROOM-FILL", fill=C_ROOM, alpha=0.3)
+    dl.rect(wt, F2_FL*S, d-2*wt, F2H*S, "ROOM-FILL", fill=C_ROOM, alpha=0.3)
     # 内墙（一层Y1=7200处，二层Y2=7200处）
-    iw_i = int(0.12*S)
-    wall_v(msp, 7200-iw_i//2, f1fl, int(F1H*S), iw_i)
-    wall_v(msp, 7200-iw_i//2, f2fl, int(F2H*S), iw_i)
+    iw = 120
+    dl.rect(7200-iw/2, F1_FL*S, iw, F1H*S, "SECTION", fill=C_WALL, color=C_WALL, lw=0.5)
+    dl.rect(7200-iw/2, F2_FL*S, iw, F2H*S, "SECTION", fill=C_WALL, color=C_WALL, lw=0.5)
     # 楼梯（位于Y=7.2~10.8m区域北侧）
-    n=14; stx=7200; stw=3600
-    for i in range(n):
-        sx=stx+i*stw//n; sy=f1fl+i*(f2fl-f1fl)//n
-        sw=stw//n; sh=(f2fl-f1fl)//n
-        msp.add_lwpolyline([(sx,sy),(sx+sw,sy),(sx+sw,sy+sh),(sx,sy+sh),(sx,sy)],
-                            close=True, dxfattribs={"layer": "STAIRS", "color": GRAY})
-    # 标注
-    dxf_text(msp, 3500, f1fl+int(F1H*S)//2, "一层 F1", 300)
-    dxf_text(msp, 3500, f2fl+int(F2H*S)//2, "二层 F2", 300)
-    dxf_dim_h(msp, 0, d, gl)
-    dxf_dim_v(msp, gl, top_i, d)
-    dxf_text(msp, d//2, top_i+600, "1-1 剖面图", 350)
-    doc.saveas(f"{DIRS['剖面图']}/1-1剖面图.dxf")
-
-    # PNG（复用之前的逻辑）
-    fig, ax = plt.subplots(1,1,figsize=(14,10),dpi=150,facecolor=C_BG)
-    ax.set_facecolor(C_BG); ax.set_aspect("equal"); ax.axis("off")
-    ax.set_title("1-1 剖面图  Section 1-1",fontsize=16,fontweight="bold",color=C_TEXT,pad=12)
-    ax.fill_between([-1,D_m+1],[-0.5,-0.5],[0,0],color=C_GROUND,alpha=0.3,zorder=1)
-    ax.plot([-1,D_m+1],[0,0],color=C_LINE,linewidth=1.5,zorder=3)
-    ax.add_patch(patches.Rectangle((-0.3,-0.5),D_m+0.6,0.5,facecolor="#E0D8C8",edgecolor=C_LINE,linewidth=0.8,zorder=2))
-    ax.add_patch(patches.Rectangle((0,GL),WALL_T,TOP-GL,facecolor=C_WALL,edgecolor=C_WALL,linewidth=0.5,zorder=5))
-    ax.add_patch(patches.Rectangle((D_m-WALL_T,GL),WALL_T,TOP-GL,facecolor=C_WALL,edgecolor=C_WALL,linewidth=0.5,zorder=5))
-    ax.add_patch(patches.Rectangle((0,F1_CL),D_m,SLAB,facecolor="#C0C0C0",edgecolor=C_LINE,linewidth=0.8,zorder=5))
-    ax.add_patch(patches.Rectangle((0,F2_CL),D_m,SLAB,facecolor="#C0C0C0",edgecolor=C_LINE,linewidth=0.8,zorder=5))
-    ax.add_patch(patches.Rectangle((0,ROOF),WALL_T,PARAPET,facecolor=C_WALL,edgecolor=C_WALL,linewidth=0.5,zorder=5))
-    ax.add_patch(patches.Rectangle((D_m-WALL_T,ROOF),WALL_T,PARAPET,facecolor=C_WALL,edgecolor=C_WALL,linewidth=0.5,zorder=5))
-    ax.add_patch(patches.Rectangle((WALL_T,F1_FL),D_m-2*WALL_T,F1H,facecolor=C_ROOM,edgecolor="none",alpha=0.3,zorder=1))
-    ax.add_patch(patches.Rectangle((WALL_T,F2_FL),D_m-2*WALL_T,F2H,facecolor=C_ROOM,edgecolor="none",alpha=0.3,zorder=1))
-    iw=0.12
-    ax.add_patch(patches.Rectangle((7.2-iw/2,F1_FL),iw,F1H,facecolor=C_WALL,edgecolor=C_WALL,linewidth=0.5,zorder=5))
-    ax.add_patch(patches.Rectangle((7.2-iw/2,F2_FL),iw,F2H,facecolor=C_WALL,edgecolor=C_WALL,linewidth=0.5,zorder=5))
-    n=14; stx=7.2; stw=3.6
+    n=14; stx=7200; stw=3600; rise=(F2_FL-F1_FL)*S
     for i in range(n):
-        sx=stx+i*stw/n; sy=F1_FL+i*(F2_FL-F1_FL)/n; sw=stw/n; sh=(F2_FL-F1_FL)/n
-        ax.add_patch(patches.Rectangle((sx,sy),sw,sh,facecolor="none",edgecolor=C_STAIR,linewidth=0.5,zorder=4))
-    for wy in [F1_FL+0.9,F2_FL+0.9]:
-        ax.add_patch(patches.Rectangle((0,wy),WALL_T,1.5,facecolor=C_GLASS,edgecolor=C_LINE,linewidth=0.8,zorder=6))
-        ax.add_patch(patches.Rectangle((D_m-WALL_T,wy),WALL_T,1.5,facecolor=C_GLASS,edgecolor=C_LINE,linewidth=0.8,zorder=6))
-    for (yy,txt) in [(GL,"±0.000"),(F1_FL,f"+{F1_FL:.3f}"),(F2_FL,f"+{F2_FL:.3f}"),(ROOF,f"+{ROOF:.3f}"),(TOP,f"+{TOP:.3f}")]:
-        ax.plot([-0.5,0],[yy,yy],color=C_DIM,linewidth=0.4,zorder=8)
-        ax.text(-0.6,yy,txt,ha="right",va="center",fontsize=5.5,color=C_DIM,zorder=8)
-    ax.text(3.5,F1_FL+F1H/2,"一层 F1",ha="center",va="center",fontsize=12,color=C_TEXT2,zorder=10)
-    ax.text(3.5,F2_FL+F2H/2,"二层 F2",ha="center",va="center",fontsize=12,color=C_TEXT2,zorder=10)
-    ax.set_xlim(-2.5,D_m+2.5); ax.set_ylim(-1.2,TOP+1.0)
-    fig.savefig(f"{IMG_DIR}/1-1剖面图.png",bbox_inches="tight",pad_inches=0.3,dpi=150,facecolor=C_BG)
-    fig.savefig(f"{IMG_DIR}/1-1剖面图.svg", format='svg', bbox_inches="tight", pad_inches=0.3, facecolor=C_BG)
-    plt.close(fig)
+        dl.rect(stx+i*stw/n, F1_FL*S+i*rise/n, stw/n, rise/n, "STAIRS", color=C_STAIR, lw=0.5)
+    for wy in [F1_FL+0.9, F2_FL+0.9]:
+        dl.rect(0, wy*S, wt, 1500, "GLASS", fill=C_GLASS, color=C_LINE, lw=0.8)
+        dl.rect(d-wt, wy*S, wt, 1500, "GLASS", fill=C_GLASS, color=C_LINE, lw=0.8)
+    _levels(dl, [(GL*S,"±0.000"),(F1_FL*S,f"+{F1_FL:.3f}"),(F2_FL*S,f"+{F2_FL:.3f}"),
+                 (ROOF*S,f"+{ROOF:.3f}"),(top,f"+{TOP:.3f}")], 500, 600)
+    dl.text(3500, (F1_FL+F1H/2)*S, "一层 F1", "TEXT", size=12, color=C_TEXT2)
+    dl.text(3500, (F2_FL+F2H/2)*S, "二层 F2", "TEXT", size=12, color=C_TEXT2)
+    dl.dim(0, d, GL*S, "h", offset=-800, only="dxf")
+    dl.dim(GL*S, top, d, "v", offset=800, only="dxf")
+    _dxf_title(dl, d/2, top+600, "1-1 剖面图")
+    dl.set_limits((-2500, d+2500), (-1200, top+1000))
+    _render(dl, f"{DIRS['剖面图']}/1-1剖面图.dxf", f"{IMG_DIR}/1-1剖面图.png")
     print("  ✓ 1-1剖面图 (DXF + PNG)")
 
 
@@ -747,155 +685,132 @@ def gen_section():
 #  屋顶平面图 DXF + PNG
 # ══════════════════════════════════════════════
 
+@perf.drawing("gen_roof")
 def gen_roof():
-    doc = ezdxf.new("R2010"); doc.units = units.MM; setup_layers(doc); msp = doc.modelspace()
-    outer_walls(msp, BW, BH, OW)
+    dl = DisplayList("屋顶平面图  Roof Plan")
+    dl.rect(OW, OW, BW-2*OW, BH-2*OW, "ROOM-FILL", fill="#E8E8E8")
+    _outline(dl)
+    cx, cy = BW/2, BH/2
+    for dx,dy,lb in [(0,-1,"i=3%"),(0,1,"i=3%"),(-1,0,"i=3%"),(1,0,"i=3%")]:
+        dl.arrow(cx, cy, cx+dx*2000, cy+dy*2000, "DIM", color=C_DIM, lw=1, z=8)
+        dl.text(cx+dx*2300, cy+dy*2300, lb, "DIM", size=7, color=C_DIM, rotation=90 if dx!=0 else 0, z=8)
     # 排水沟
-    inset = 600
-    msp.add_lwpolyline([(inset,inset),(BW-inset,inset),(BW-inset,BH-inset),(inset,BH-inset),(inset,inset)],
-                        close=True, dxfattribs={"layer": "DIM", "color": GRAY, "linetype": "DASHED"})
+    dl.rect(600, 600, BW-1200, BH-1200, "DIM", color=C_LINE, lw=0.5, dashed=True, z=3)
     # 落水管
     for (px,py) in [(500,500),(BW-500,500),(500,BH-500),(BW-500,BH-500)]:
-        msp.add_circle((px,py), 55, dxfattribs={"layer": "FIXTURE", "color": BLACK})
+        dl.circle(px, py, 80, "FIXTURE", fill=C_WALL, color=C_WALL, z=6)
+        dl.text(px, py-200, "落水管\nφ110", "TEXT", size=5, color=C_TEXT2, va="top")
     # 检修口
-    msp.add_lwpolyline([(6500,5000),(7300,5000),(7300,5800),(6500,5800),(6500,5000)],
-                        close=True, dxfattribs={"layer": "FIXTURE", "color": BLACK})
-    dxf_text(msp, BW//2, BH//2, "屋面找坡层 i=3%", 300)
-    dxf_text(msp, 6900, 5400, "检修口 800×800", 150)
-    dxf_dim_h(msp, 0, BW, 0); dxf_dim_v(msp, 0, BH, BW)
-    dxf_text(msp, BW//2, BH+800, "屋顶平面图", 350)
-    doc.saveas(f"{DIRS['屋顶']}/屋顶平面图.dxf")
-
-    # PNG（复用之前逻辑）
-    fig, ax = plt.subplots(1,1,figsize=(16,13),dpi=150,facecolor=C_BG)
-    ax.set_facecolor(C_BG); ax.set_aspect("equal"); ax.axis("off")
-    ax.set_title("屋顶平面图  Roof Plan",fontsize=16,fontweight="bold",color=C_TEXT,pad=12)
-    s = _s
-    ax.add_patch(patches.Rectangle((s(OW),s(OW)),s(BW-2*OW),s(BH-2*OW),facecolor="#E8E8E8",edgecolor="none",zorder=1))
-    for (x,y,w,h) in [(0,0,BW,OW),(0,BH-OW,BW,OW),(0,0,OW,BH),(BW-OW,0,OW,BH)]:
-        ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor=C_WALL,edgecolor=C_WALL,linewidth=0.5,zorder=5))
-    cx,cy = s(BW/2),s(BH/2)
-    for dx,dy,lb in [(0,-1,"i=3%"),(0,1,"i=3%"),(-1,0,"i=3%"),(1,0,"i=3%")]:
-        ex=cx+dx*2.0; ey=cy+dy*2.0
-        ax.annotate("",xy=(ex,ey),xytext=(cx,cy),arrowprops=dict(arrowstyle="->",color=C_DIM,lw=1),zorder=8)
-        ax.text(cx+dx*2.3,cy+dy*2.3,lb,ha="center",va="center",fontsize=7,color=C_DIM,rotation=90 if dx!=0 else 0,zorder=8)
-    ax.add_patch(patches.Rectangle((s(600),s(600)),s(BW-1200),s(BH-1200),facecolor="none",edgecolor=C_LINE,linewidth=0.5,linestyle="--",zorder=3))
-    for px,py in [(s(500),s(500)),(s(BW-500),s(500)),(s(500),s(BH-500)),(s(BW-500),s(BH-500))]:
-        ax.add_patch(patches.Circle((px,py),0.08,facecolor=C_WALL,edgecolor=C_WALL,zorder=6))
-        ax.text(px,py-0.2,"落水管\nφ110",ha="center",va="top",fontsize=5,color=C_TEXT2,zorder=10)
-    ax.add_patch(patches.Rectangle((s(6500),s(5000)),s(800),s(800),facecolor="none",edgecolor=C_LINE,linewidth=0.8,zorder=4))
-    ax.text(s(6900),s(5400),"检修口\n800×800",ha="center",va="center",fontsize=6,color=C_TEXT2,zorder=10)
-    ax.text(s(BW/2),s(BH/2)-0.3,"屋面找坡层",ha="center",va="center",fontsize=11,color=C_TEXT2,zorder=10)
-    nx,ny = -1.0,s(BH)-1.0
-    ax.annotate("",xy=(nx,ny+0.7),xytext=(nx,ny),arrowprops=dict(arrowstyle="-|>",color=C_TEXT,lw=1.5),zorder=10)
-    ax.text(nx,ny+0.85,"N",ha="center",va="bottom",fontsize=10,fontweight="bold",color=C_TEXT,zorder=10)
-    ax.set_xlim(-2.0,s(BW)+2.0); ax.set_ylim(-1.5,s(BH)+1.5)
-    fig.savefig(f"{IMG_DIR}/屋顶平面图.png",bbox_inches="tight",pad_inches=0.3,dpi=150,facecolor=C_BG)
-    fig.savefig(f"{IMG_DIR}/屋顶平面图.svg", format='svg', bbox_inches="tight", pad_inches=0.3, facecolor=C_BG)
-    plt.close(fig)
+    dl.rect(6500, 5000, 800, 800, "FIXTURE", color=C_LINE, lw=0.8)
+    dl.text(6900, 5400, "检修口\n800×800", "TEXT", size=6, color=C_TEXT2)
+    dl.text(BW/2, BH/2-300, "屋面找坡层", "TEXT", size=11, color=C_TEXT2)
+    _north_arrow(dl, -1000, BH-1000)
+    dl.dim(0, BW, 0, "h", offset=-800, only="dxf"); dl.dim(0, BH, BW, "v", offset=800, only="dxf")
+    _dxf_title(dl, BW/2, BH+800, "屋顶平面图")
+    dl.set_limits((-2000, BW+2000), (-1500, BH+1500))
+    _render(dl, f"{DIRS['屋顶']}/屋顶平面图.dxf", f"{IMG_DIR}/屋顶平面图.png")
     print("  ✓ 屋顶平面图 (DXF + PNG)")
 
 
 # ══════════════════════════════════════════════
-#  给排水 DXF + PNG（简化DXF，详细PNG）
+#  给排水 DXF + PNG
 # ══════════════════════════════════════════════
 
-def _plumbing_dxf(floor_name, pipes_supply, pipes_drain, pipes_hot, fixtures, filename):
-    doc = ezdxf.new("R2010"); doc.units = units.MM; setup_layers(doc); msp = doc.modelspace()
-    outer_walls(msp, BW, BH, OW)
-    for pts in pipes_supply:
-        msp.add_lwpolyline(pts, dxfattribs={"layer": "PIPE-SUPPLY", "color": 5})
-    for pts in pipes_drain:
-        msp.add_lwpolyline(pts, dxfattribs={"layer": "PIPE-DRAIN", "color": 42, "linetype": "DASHED"})
-    for pts in pipes_hot:
-        msp.add_lwpolyline(pts, dxfattribs={"layer": "PIPE-HOT", "color": 1})
-    for (x,y,txt) in fixtures:
-        msp.add_circle((x,y), 80, dxfattribs={"layer": "FIXTURE", "color": 5})
-        dxf_text(msp, x, y-200, txt, 120)
-    dxf_text(msp, BW//2, BH+600, f"{floor_name}给排水平面图", 350)
-    doc.saveas(f"{DIRS['给排水']}/{filename}.dxf")
-
-
-def _plumbing_png(title, floor_name, walls, pipes_s, pipes_d, pipes_h, fixtures, filename):
-    """给排水 PNG 专业预览：管径标注、立管编号、阀门水表、房间名称、增强图例"""
-    fig, ax = plt.subplots(1,1,figsize=(16,13),dpi=150,facecolor=C_BG)
-    ax.set_facecolor(C_BG); ax.set_aspect("equal"); ax.axis("off")
-    ax.set_title(title, fontsize=16, fontweight="bold", color=C_TEXT, pad=12)
-    s = _s
-    # 墙体
-    for (x,y,w,h) in [(0,0,BW,OW),(0,BH-OW,BW,OW),(0,0,OW,BH),(BW-OW,0,OW,BH)]:
-        ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#E0E0E0",edgecolor=C_LINE,linewidth=0.3,zorder=2))
-    ax.add_patch(patches.Rectangle((s(OW),s(OW)),s(BW-2*OW),s(BH-2*OW),facecolor=C_BG,edgecolor="none",zorder=1))
-    for (x,y,w,h) in walls:
-        ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#E0E0E0",edgecolor=C_LINE,linewidth=0.2,zorder=2))
-
-    # 绘制给水管（蓝色实线 2.5）
+_PIPE_SUFFIX = {C_WATER_SUPPLY: "SUPPLY", C_WATER_DRAIN: "DRAIN", C_LINE: "LEGEND"}
+
+
+def _valve(sym, color):
+    """阀门（蝴蝶形 ▷◁）"""
+    r = 60
+    sym.polyline([(-r,0),(r*0.3,-r*0.6),(r*0.3,r*0.6)], "FIXTURE", closed=True, fill="white", color=color, lw=1.2, z=9)
+    sym.polyline([(r,0),(-r*0.3,-r*0.6),(-r*0.3,r*0.6)], "FIXTURE", closed=True, fill="white", color=color, lw=1.2, z=9)
+
+
+def _water_meter(sym, color):
+    """水表（菱形 + W）"""
+    sym.polyline([(0,100),(100,0),(0,-100),(-100,0)], "FIXTURE", closed=True, fill="white", color=color, lw=1.2, z=10)
+    sym.text(0, 0, "W", "FIXTURE", size=7, weight="bold", color=color, z=11)
+
+
+def _shower(sym, color):
+    sym.circle(0, 0, 60, "FIXTURE", fill="white", color=color, lw=1, z=8)
+    for i in range(6):
+        ang = math.radians(i*60)
+        sym.line(0, 0, 80*math.cos(ang), 80*math.sin(ang), "FIXTURE", color=color, lw=0.8, z=8)
+
+
+def _faucet(sym, color):
+    sym.rect(-40, -30, 80, 60, "FIXTURE", color=color, lw=1, z=8)
+    sym.line(-20, 0, 20, 0, "FIXTURE", color=color, lw=1, z=8)
+
+
+def _floor_drain(sym, color):
+    sym.circle(0, 0, 50, "FIXTURE", fill="white", color=color, lw=1, z=8)
+    sym.line(-40, 0, 40, 0, "FIXTURE", color=color, lw=0.8, z=8)
+
+
+_PLUMBING_SYMBOLS = {"VALVE": _valve, "WATER-METER": _water_meter, "SHOWER": _shower,
+                     "FAUCET": _faucet, "FLOOR-DRAIN": _floor_drain}
+
+
+def _plumbing_symbol(dl, kind, color):
+    """按 (符号, 管线颜色) 定义一次块，返回块名"""
+    name = f"{kind}-{_PIPE_SUFFIX[color]}"
+    if not dl.has_symbol(name):
+        with dl.define(name) as sym:
+            _PLUMBING_SYMBOLS[kind](sym, color)
+    return name
+
+
+def _pipe_label(dl, p1, p2, txt, layer):
+    """管段中点的管径标注（白底，文字沿管段方向且不倒置）"""
+    rot = math.degrees(math.atan2(p2[1]-p1[1], p2[0]-p1[0]))
+    dl.text((p1[0]+p2[0])/2, (p1[1]+p2[1])/2, txt, layer, size=5, color=C_TEXT, box=0.15,
+            rotation=rot if -90<rot<90 else rot+180, z=9)
+
+
+def _plumbing(title, floor_name, walls, pipes_s, pipes_d, pipes_h, fixtures, filename):
+    """给排水平面：管径标注、立管编号、阀门水表、房间名称、图例（DXF 与 PNG 共用一份显示列表）"""
+    dl = DisplayList(title)
+    _gray_walls(dl, walls, floor_name, "P-ARCH")
+
+    # 给水管（蓝色实线 2.5）、排水管（棕色虚线 2.5）、热水管（红色实线 2.0），逐段标注管径
     for pts in pipes_s:
-        for i in range(len(pts)-1):
-            p1,p2=pts[i],pts[i+1]
-            mx,my=(p1[0]+p2[0])/2,(p1[1]+p2[1])/2
-            ax.plot([s(p[0]) for p in [p1,p2]],[s(p[1]) for p in [p1,p2]],color=C_WATER_SUPPLY,linewidth=2.5,zorder=7)
-            rot=math.degrees(math.atan2(p2[1]-p1[1],p2[0]-p1[0]))
-            ax.text(s(mx),s(my),"DN25" if i==0 or (p1[0]==p2[0] and abs(p2[1]-p1[1])>3000) else "DN20",ha="center",va="center",fontsize=5,color=C_TEXT,bbox=dict(boxstyle="round,pad=0.15",facecolor="white",edgecolor="none"),rotation=rot if -90<rot<90 else rot+180,zorder=9)
-    # 绘制排水管（棕色虚线 2.5）
+        dl.polyline(pts, "PIPE-SUPPLY", color=C_WATER_SUPPLY, lw=2.5)
+        for i, (p1, p2) in enumerate(zip(pts, pts[1:])):
+            _pipe_label(dl, p1, p2, "DN25" if i==0 or (p1[0]==p2[0] and abs(p2[1]-p1[1])>3000) else "DN20", "PIPE-SUPPLY")
     for pts in pipes_d:
-        for i in range(len(pts)-1):
-            p1,p2=pts[i],pts[i+1]
-            mx,my=(p1[0]+p2[0])/2,(p1[1]+p2[1])/2
-            ax.plot([s(p[0]) for p in [p1,p2]],[s(p[1]) for p in [p1,p2]],color=C_WATER_DRAIN,linewidth=2.5,linestyle="--",zorder=7)
-            rot=math.degrees(math.atan2(p2[1]-p1[1],p2[0]-p1[0]))
-            ax.text(s(mx),s(my),"DN110" if abs(p2[0]-p1[0])<100 or abs(p2[1]-p1[1])>4000 else "DN50",ha="center",va="center",fontsize=5,color=C_TEXT,bbox=dict(boxstyle="round,pad=0.15",facecolor="white",edgecolor="none"),rotation=rot if -90<rot<90 else rot+180,zorder=9)
-    # 绘制热水管（红色实线 2.0）
+        dl.polyline(pts, "PIPE-DRAIN", color=C_WATER_DRAIN, lw=2.5, dashed=True)
+        for p1, p2 in zip(pts, pts[1:]):
+            _pipe_label(dl, p1, p2, "DN110" if abs(p2[0]-p1[0])<100 or abs(p2[1]-p1[1])>4000 else "DN50", "PIPE-DRAIN")
     for pts in pipes_h:
-        for i in range(len(pts)-1):
-            p1,p2=pts[i],pts[i+1]
-            mx,my=(p1[0]+p2[0])/2,(p1[1]+p2[1])/2
-            ax.plot([s(p[0]) for p in [p1,p2]],[s(p[1]) for p in [p1,p2]],color=C_HOTWATER,linewidth=2.0,zorder=7)
-            rot=math.degrees(math.atan2(p2[1]-p1[1],p2[0]-p1[0]))
-            ax.text(s(mx),s(my),"DN20",ha="center",va="center",fontsize=5,color=C_TEXT,bbox=dict(boxstyle="round,pad=0.15",facecolor="white",edgecolor="none"),rotation=rot if -90<rot<90 else rot+180,zorder=9)
+        dl.polyline(pts, "PIPE-HOT", color=C_HOTWATER, lw=2.0)
+        for p1, p2 in zip(pts, pts[1:]):
+            _pipe_label(dl, p1, p2, "DN20", "PIPE-HOT")
 
     # 立管编号：收集给水/排水立管位置（建筑边界的端点，去重）
-    riser_supply, riser_drain = [], []
     def _near_edge(x,y):
         return x<=600 or x>=BW-600 or y<=600 or y>=BH-600
     def _key(p):
         return (round(p[0]/500)*500, round(p[1]/500)*500)
-    seen_s = set()
-    for pts in pipes_s:
-        for pt in [pts[0], pts[-1]]:
-            if _near_edge(pt[0],pt[1]) and _key(pt) not in seen_s:
-                seen_s.add(_key(pt)); riser_supply.append(pt)
-    seen_d = set()
-    for pts in pipes_d:
-        for pt in [pts[0], pts[-1]]:
-            if _near_edge(pt[0],pt[1]) and _key(pt) not in seen_d:
-                seen_d.add(_key(pt)); riser_drain.append(pt)
-    for i, pt in enumerate(riser_supply):
-        ax.add_patch(patches.Circle((s(pt[0]),s(pt[1])),0.12,facecolor="white",edgecolor=C_WATER_SUPPLY,linewidth=1.5,zorder=10))
-        ax.text(s(pt[0]),s(pt[1]),f"JL-{i+1}",ha="center",va="center",fontsize=6,fontweight="bold",color=C_WATER_SUPPLY,zorder=11)
-    for i, pt in enumerate(riser_drain):
-        ax.add_patch(patches.Circle((s(pt[0]),s(pt[1])),0.12,facecolor="white",edgecolor=C_WATER_DRAIN,linewidth=1.5,zorder=10))
-        ax.text(s(pt[0]),s(pt[1]),f"WL-{i+1}",ha="center",va="center",fontsize=6,fontweight="bold",color=C_WATER_DRAIN,zorder=11)
-
-    # 阀门符号（蝴蝶形 ▷◁）：在每个 fixture 入口及主管分支处
-    def draw_valve(ax, x, y, color, zorder):
-        r = 0.06
-        t1 = plt.Polygon([(s(x)-r,s(y)), (s(x)+r*0.3,s(y)-r*0.6), (s(x)+r*0.3,s(y)+r*0.6)], facecolor="white", edgecolor=color, linewidth=1.2, zorder=zorder)
-        t2 = plt.Polygon([(s(x)+r,s(y)), (s(x)-r*0.3,s(y)-r*0.6), (s(x)-r*0.3,s(y)+r*0.6)], facecolor="white", edgecolor=color, linewidth=1.2, zorder=zorder)
-        ax.add_patch(t1); ax.add_patch(t2)
+    for pipes, prefix, color, layer in [(pipes_s, "JL", C_WATER_SUPPLY, "PIPE-SUPPLY"),
+                                        (pipes_d, "WL", C_WATER_DRAIN, "PIPE-DRAIN")]:
+        seen, risers = set(), []
+        for pts in pipes:
+            for pt in [pts[0], pts[-1]]:
+                if _near_edge(pt[0],pt[1]) and _key(pt) not in seen:
+                    seen.add(_key(pt)); risers.append(pt)
+        for i, pt in enumerate(risers):
+            dl.circle(pt[0], pt[1], 120, layer, fill="white", color=color, lw=1.5, z=10)
+            dl.text(pt[0], pt[1], f"{prefix}-{i+1}", layer, size=6, weight="bold", color=color, z=11)
+
+    # 阀门：每个 fixture 入口及主管分支处；水表：入户处
     for (x,y,txt,c) in fixtures:
-        draw_valve(ax, x, y, c, 9)
+        dl.insert(_plumbing_symbol(dl, "VALVE", c), x, y, "FIXTURE", z=9)
     if pipes_s:
         for pt in pipes_s[0][:2]:
-            draw_valve(ax, pt[0], pt[1], C_WATER_SUPPLY, 9)
-
-    # 水表符号（菱形+W）：入户处
-    if pipes_s:
-        inlet = pipes_s[0][0]
-        dx, dy = 0.1, 0.1
-        diamond = [(s(inlet[0]),s(inlet[1])+dy), (s(inlet[0])+dx,s(inlet[1])), (s(inlet[0]),s(inlet[1])-dy), (s(inlet[0])-dx,s(inlet[1]))]
-        ax.add_patch(plt.Polygon(diamond, facecolor="white", edgecolor=C_WATER_SUPPLY, linewidth=1.2, zorder=10))
-        ax.text(s(inlet[0]),s(inlet[1]),"W",ha="center",va="center",fontsize=7,fontweight="bold",color=C_WATER_SUPPLY,zorder=11)
+            dl.insert(_plumbing_symbol(dl, "VALVE", C_WATER_SUPPLY), pt[0], pt[1], "FIXTURE", z=9)
+        dl.insert(_plumbing_symbol(dl, "WATER-METER", C_WATER_SUPPLY), *pipes_s[0][0], "FIXTURE", z=10)
 
     # 房间名称（浅灰大字号，与平面图一致）
     C_ROOM_LABEL = "#AAAAAA"
@@ -909,54 +824,42 @@ def _plumbing_png(title, floor_name, walls, pipes_s, pipes_d, pipes_h, fixtures,
                  (BW/2,(F2_Y1+F2_Y2)/2,"走廊"),((OW+F2_NX1)/2,(F2_Y2+BH)/2,"主卧室2"),((F2_NX1+F2_NX2)/2,(F2_Y2+BH)/2,"主卫2"),
                  ((F2_NX2+F2_NX3)/2,(F2_Y2+BH)/2,"留空区"),((F2_NX3+BW)/2,(F2_Y2+YM)/2,"公卫"),((F2_NX3+BW)/2,(YM+BH)/2,"楼梯间")]
     for cx,cy,name in rooms:
-        ax.text(s(cx),s(cy),name,ha="center",va="center",fontsize=14,color=C_ROOM_LABEL,zorder=4)
-
-    # 给水器具符号：淋浴头/水龙头/地漏轮廓
-    def fixture_shower(ax, x, y, color):
-        ax.add_patch(patches.Circle((s(x),s(y)),0.06,facecolor="white",edgecolor=color,linewidth=1,zorder=8))
-        for i in range(6):
-            ang = i*60 * math.pi/180
-            ax.plot([s(x),s(x)+0.08*math.cos(ang)],[s(y),s(y)+0.08*math.sin(ang)],color=color,linewidth=0.8,zorder=8)
-    def fixture_faucet(ax, x, y, color):
-        ax.add_patch(patches.Rectangle((s(x)-0.04,s(y)-0.03),0.08,0.06,facecolor="none",edgecolor=color,linewidth=1,zorder=8))
-        ax.plot([s(x)-0.02,s(x)+0.02],[s(y),s(y)],color=color,linewidth=1,zorder=8)
-    def fixture_drain(ax, x, y, color):
-        ax.add_patch(patches.Circle((s(x),s(y)),0.05,facecolor="white",edgecolor=color,linewidth=1,zorder=8))
-        ax.plot([s(x)-0.04,s(x)+0.04],[s(y),s(y)],color=color,linewidth=0.8,zorder=8)
-    for (x,y,txt,c) in fixtures:
-        if "主卫" in txt and "给水" in txt:
-            fixture_shower(ax, x, y, c)
-        elif "排水" in txt:
-            fixture_drain(ax, x, y, c)
-        else:
-            fixture_faucet(ax, x, y, c)
-        ax.text(s(x),s(y)-0.22,txt,ha="center",va="top",fontsize=5,color=c,zorder=10)
-
-    # 增强图例
-    lx, ly = s(BW)+1.0, s(BH)-0.2
-    ax.text(lx,ly+0.5,"图例",fontsize=9,fontweight="bold",color=C_TEXT,zorder=10)
-    items = [(C_WATER_SUPPLY,"给水管 DN20/25","line",2.5,False),(C_WATER_DRAIN,"排水管 DN50/110","line",2.5,True),(C_HOTWATER,"热水管 DN20","line",2.0,False)]
-    for i,(c,txt,kind,lw,dash) in enumerate(items):
-        yy = ly - i*0.35
-        ax.plot([lx,lx+0.45],[yy,yy],color=c,linewidth=lw,linestyle="--" if dash else "-",zorder=10)
-        ax.text(lx+0.5,yy,txt,va="center",fontsize=6,color=C_TEXT,zorder=10)
-    ax.add_patch(patches.Circle((lx+0.22,ly-1.2),0.08,facecolor="white",edgecolor=C_WATER_SUPPLY,zorder=10))
-    ax.text(lx+0.35,ly-1.2,"立管 JL/WL",va="center",fontsize=6,color=C_TEXT,zorder=10)
-    draw_valve(ax, (lx+0.22)*1000, (ly-1.55)*1000, C_LINE, 10)
-    ax.text(lx+0.35,ly-1.55,"阀门",va="center",fontsize=6,color=C_TEXT,zorder=10)
-    dx2,dy2=0.08,0.08; dm=[(0,dy2),(dx2,0),(0,-dy2),(-dx2,0)]
-    ax.add_patch(plt.Polygon([(lx+0.22+d,ly-1.9+e) for d,e in dm],facecolor="white",edgecolor=C_WATER_SUPPLY,linewidth=1,zorder=10))
-    ax.text(lx+0.35,ly-1.9,"水表",va="center",fontsize=6,color=C_TEXT,zorder=10)
-
-    nx,ny = -1.0,s(BH)-1.0
-    ax.annotate("",xy=(nx,ny+0.7),xytext=(nx,ny),arrowprops=dict(arrowstyle="-|>",color=C_TEXT,lw=1.5),zorder=10)
-    ax.text(nx,ny+0.85,"N",ha="center",va="bottom",fontsize=10,fontweight="bold",color=C_TEXT,zorder=10)
-    ax.set_xlim(-2.0,s(BW)+4.0); ax.set_ylim(-1.5,s(BH)+1.5)
-    fig.savefig(f"{IMG_DIR}/{filename}.png",bbox_inches="tight",pad_inches=0.3,dpi=150,facecolor=C_BG)
-    fig.savefig(f"{IMG_DIR}/{filename}.svg", format='svg', bbox_inches="tight", pad_inches=0.3, facecolor=C_BG)
-    plt.close(fig)
-
+        dl.text(cx, cy, name, "TEXT", size=14, color=C_ROOM_LABEL, z=4)
 
+    # 给水器具符号：淋浴头/水龙头/地漏
+    for (x,y,txt,c) in fixtures:
+        dl.insert(_plumbing_symbol(dl, floor_layout.plumbing_symbol(txt), c), x, y, "FIXTURE", z=8)
+        dl.text(x, y-220, txt, "TEXT", size=5, color=c, va="top")
+
+    # 图例
+    lx, ly = BW+1000, BH-200
+    dl.text(lx, ly+500, "图例", "TEXT", size=9, weight="bold", color=C_TEXT, ha="left", va="baseline")
+    items = [(C_WATER_SUPPLY,"给水管 DN20/25","PIPE-SUPPLY",2.5,False),(C_WATER_DRAIN,"排水管 DN50/110","PIPE-DRAIN",2.5,True),
+             (C_HOTWATER,"热水管 DN20","PIPE-HOT",2.0,False)]
+    for i,(c,txt,layer,lw,dash) in enumerate(items):
+        yy = ly - i*350
+        dl.line(lx, yy, lx+450, yy, layer, color=c, lw=lw, dashed=dash, z=10)
+        dl.text(lx+500, yy, txt, "TEXT", size=6, color=C_TEXT, ha="left")
+    dl.circle(lx+220, ly-1200, 80, "PIPE-SUPPLY", fill="white", color=C_WATER_SUPPLY, z=10)
+    dl.text(lx+350, ly-1200, "立管 JL/WL", "TEXT", size=6, color=C_TEXT, ha="left")
+    dl.insert(_plumbing_symbol(dl, "VALVE", C_LINE), lx+220, ly-1550, "FIXTURE", z=10)
+    dl.text(lx+350, ly-1550, "阀门", "TEXT", size=6, color=C_TEXT, ha="left")
+    dl.insert(_plumbing_symbol(dl, "WATER-METER", C_WATER_SUPPLY), lx+220, ly-1900, "FIXTURE", scale=0.8, z=10)
+    dl.text(lx+350, ly-1900, "水表", "TEXT", size=6, color=C_TEXT, ha="left")
+
+    _north_arrow(dl, -1000, BH-1000)
+    _dxf_title(dl, BW/2, BH+600, f"{floor_name}给排水平面图")
+    dl.set_limits((-2000, BW+4000), (-1500, BH+1500))
+    _render(dl, f"{DIRS['给排水']}/{filename}.dxf", f"{IMG_DIR}/{filename}.png")
+
+
+def _fixtures(floor_name):
+    """floor_layout 的给排水点位 → (x, y, 说明, 管线颜色)"""
+    colors = {"supply": C_WATER_SUPPLY, "drain": C_WATER_DRAIN}
+    return [(x, y, txt, colors[kind]) for x, y, txt, kind in floor_layout.PLUMBING[floor_name]]
+
+
+@perf.drawing("gen_plumbing")
 def gen_plumbing():
     # 一层布局: X1=8200, Y0=2200, Y1=7400, NX1=4800, NX2=6600（无独立主卫）
     f1_walls = [(240,2200,7960,120),(8320,2200,BW-240-8320,120),(240,7400,BW-480,120),
@@ -967,12 +870,9 @@ def gen_plumbing():
     f1_pd = [[(2000,9000),(2000,10500),(500,10500)],
              [(5500,9500),(5500,10500),(3000,10500)]]
     f1_ph = [[(2500,10500),(2500,8200),(4200,8200)]]
-    f1_fix = [(2500,8000,"厨房给水",C_WATER_SUPPLY),(5200,9500,"卫浴给水",C_WATER_SUPPLY),
-              (2000,9000,"厨房排水",C_WATER_DRAIN),(5500,9500,"卫浴排水",C_WATER_DRAIN)]
+    f1_fix = _fixtures("一层")
 
-    _plumbing_dxf("一层", f1_ps, f1_pd, f1_ph,
-        [(x,y,t) for (x,y,t,c) in f1_fix], "一层给排水平面图")
-    _plumbing_png("一层给排水平面图  1F Plumbing Plan", "一层", f1_walls, f1_ps, f1_pd, f1_ph, f1_fix, "一层给排水平面图")
+    _plumbing("一层给排水平面图  1F Plumbing Plan", "一层", f1_walls, f1_ps, f1_pd, f1_ph, f1_fix, "一层给排水平面图")
 
     # 二层布局: X1=4800, Y0=1500, Y1=5200, Y2=7200, NX1=5800, NX2=8000, NX3=11200
     f2_walls = [(240,1500,BW-480,120),(240,5200,BW-480,120),
@@ -984,12 +884,9 @@ def gen_plumbing():
     f2_pd = [[(5900,9000),(5900,10500),(500,10500)],
              [(12000,7200),(12000,200),(10000,200)]]
     f2_ph = [[(6500,8500),(6200,8500),(6200,9500)]]
-    f2_fix = [(6200,9500,"主卫2给水",C_WATER_SUPPLY),(11800,7000,"公卫给水",C_WATER_SUPPLY),
-              (5900,9000,"主卫2排水",C_WATER_DRAIN),(12000,7200,"公卫排水",C_WATER_DRAIN)]
+    f2_fix = _fixtures("二层")
 
-    _plumbing_dxf("二层", f2_ps, f2_pd, f2_ph,
-        [(x,y,t) for (x,y,t,c) in f2_fix], "二层给排水平面图")
-    _plumbing_png("二层给排水平面图  2F Plumbing Plan", "二层", f2_walls, f2_ps, f2_pd, f2_ph, f2_fix, "二层给排水平面图")
+    _plumbing("二层给排水平面图  2F Plumbing Plan", "二层", f2_walls, f2_ps, f2_pd, f2_ph, f2_fix, "二层给排水平面图")
     print("  ✓ 给排水图 (DXF + PNG) × 2")
 
 
@@ -997,79 +894,50 @@ def gen_plumbing():
 #  电气 DXF + PNG
 # ══════════════════════════════════════════════
 
-def _elec_dxf(floor_name, lights, sockets, switches, filename):
-    doc = ezdxf.new("R2010"); doc.units = units.MM; setup_layers(doc); msp = doc.modelspace()
-    outer_walls(msp, BW, BH, OW)
-    for (x,y,txt) in lights:
-        msp.add_circle((x,y), 100, dxfattribs={"layer": "ELEC-LIGHT", "color": 2})
-        msp.add_line((x-70,y-70),(x+70,y+70), dxfattribs={"layer": "ELEC-LIGHT", "color": 2})
-        msp.add_line((x-70,y+70),(x+70,y-70), dxfattribs={"layer": "ELEC-LIGHT", "color": 2})
-        dxf_text(msp, x, y-200, txt, 100)
-    for (x,y,txt) in sockets:
-        msp.add_lwpolyline([(x-60,y-40),(x+60,y-40),(x+60,y+40),(x-60,y+40),(x-60,y-40)],
-                            close=True, dxfattribs={"layer": "ELEC-SOCKET", "color": 3})
-        dxf_text(msp, x, y-150, txt, 80)
-    for (x,y,txt) in switches:
-        msp.add_circle((x,y), 60, dxfattribs={"layer": "ELEC-SWITCH", "color": 30})
-        msp.add_line((x,y),(x+120,y+60), dxfattribs={"layer": "ELEC-SWITCH", "color": 30})
-        dxf_text(msp, x, y-150, txt, 80)
-    dxf_text(msp, BW//2, BH+600, f"{floor_name}电气平面图", 350)
-    doc.saveas(f"{DIRS['电气']}/{filename}.dxf")
-
-
+C_WIRE = "#AAAAAA"  # 回路控制线（浅灰虚线）
+
+
+def _elec_symbols(dl):
+    """电气图块：主灯⊕、筒灯、普通插座 10A（半圆+竖线）、专用插座 16A、单控/双控开关"""
+    with dl.define("LIGHT-MAIN") as sym:
+        sym.circle(0, 0, 150, "ELEC-LIGHT", color=C_ELEC_LIGHT, lw=0.6, z=8)
+        sym.line(-120, 0, 120, 0, "ELEC-LIGHT", color=C_LINE, lw=0.4, z=9)
+        sym.line(0, -120, 0, 120, "ELEC-LIGHT", color=C_LINE, lw=0.4, z=9)
+    with dl.define("DOWNLIGHT") as sym:
+        sym.circle(0, 0, 80, "ELEC-LIGHT", fill=C_ELEC_DOWNLIGHT, color=C_LINE, lw=0.3, z=8)
+    with dl.define("SOCKET-10A") as sym:
+        sym.arc(-40, 0, 40, 60, 270, 90, "ELEC-SOCKET", color=C_LINE, lw=0.5, z=8)
+        sym.arc(40, 0, 40, 60, 90, 270, "ELEC-SOCKET", color=C_LINE, lw=0.5, z=8)
+        sym.line(0, -60, 0, 60, "ELEC-SOCKET", color=C_LINE, lw=0.5, z=8)
+        sym.arc(-40, 0, 60, 60, 270, 90, "ELEC-SOCKET", fill=C_ELEC_SOCKET, color=C_LINE, lw=0.3, alpha=0.8, z=8)
+    with dl.define("SOCKET-16A") as sym:
+        sym.rect(-60, -50, 120, 100, "ELEC-SOCKET", fill=C_ELEC_SOCKET, color=C_LINE, lw=0.5, alpha=0.8, z=8)
+        sym.text(0, 0, "16A", "ELEC-SOCKET", size=4.5, weight="bold", color="white", z=9)
+    with dl.define("SWITCH") as sym:
+        sym.circle(0, 0, 80, "ELEC-SWITCH", color=C_ELEC_SWITCH, lw=0.6, z=8)
+        sym.line(-50, 50, 80, -60, "ELEC-SWITCH", color=C_ELEC_SWITCH, lw=0.5, z=9)
+    with dl.define("SWITCH-2WAY") as sym:
+        sym.circle(0, 0, 80, "ELEC-SWITCH", color=C_ELEC_SWITCH, lw=0.6, z=8)
+        sym.line(-50, 50, 80, -60, "ELEC-SWITCH", color=C_ELEC_SWITCH, lw=0.5, z=9)
+        sym.line(40, -20, 100, 40, "ELEC-SWITCH", color=C_ELEC_SWITCH, lw=0.4, z=9)
+
+
+def _db(dl, x, y, size=6):
+    """配电箱"""
+    dl.rect(x-80, y-60, 160, 120, "ELEC-WIRE", fill="#E8E8E8", color=C_LINE, lw=0.5, z=7)
+    dl.text(x, y, "DB", "ELEC-WIRE", size=size, weight="bold", color=C_TEXT, z=8)
+
+
+@perf.drawing("gen_electrical")
 def gen_electrical():
     # 一层电气: X1=8200, Y0=2200, Y1=7400, NX1=4800, NX2=6600（无独立主卫）
-    f1_lights = [
-        (11000,1200,"玄关筒灯"),(4000,1200,"客厅筒灯"),
-        (4000,4700,"LDK主灯"),(5500,4200,"餐厅灯"),
-        (2500,9000,"厨房主灯"),(5700,9000,"卫浴灯"),
-        (10500,4700,"主卧1主灯"),
-        (10500,9000,"楼梯灯"),
-    ]
-    f1_sockets = [
-        (800,8000,"冰箱"),(2000,10500,"油烟机16A"),(3500,10500,"微波炉"),(4200,10500,"小家电"),
-        (800,10200,"净水器"),(5400,10200,"吹风机"),
-        (500,3500,"电视"),(500,4200,"路由器"),
-        (500,5500,"沙发USB"),(3500,5500,"沙发USB"),(7500,6500,"空调16A"),
-        (8800,3500,"床头L"),(8800,4200,"USB充电L"),(12000,3500,"床头R"),(12000,4200,"USB充电R"),
-        (8800,6800,"空调16A"),
-    ]
-    f1_switches = [
-        (2800,7400,"厨房灯"),(5000,7400,"卫浴灯"),(10500,500,"玄关"),
-        (7500,2400,"客厅(门口)"),(4000,4500,"LDK(沙发)"),(5500,4500,"餐厅"),
-        (8800,2800,"主卧(门口)"),(12000,2800,"主卧(床头)"),
-        (7500,7400,"楼梯↑"),
-    ]
-    _elec_dxf("一层", f1_lights, f1_sockets, f1_switches, "一层电气平面图")
-
     # 二层电气: X1=4800, Y0=1500, Y1=5200, Y2=7200, NX1=5800, NX2=8000, NX3=11200
-    f2_lights = [
-        (3000,8800,"主卧2主灯"),(6900,8500,"主卫2灯"),
-        (12200,7800,"公卫灯"),(2000,3500,"次卧灯"),
-        (7500,3500,"多功能区灯"),
-        (2000,6200,"走廊灯1"),(5000,6200,"走廊灯2"),(8000,6200,"走廊灯3"),
-        (12200,9500,"楼梯灯"),(3000,800,"阳台灯1"),(7000,800,"阳台灯2"),(12000,800,"阳台灯3"),
-    ]
-    f2_sockets = [
-        (600,8000,"床头USB L"),(600,8600,"床头L"),(4500,8000,"床头USB R"),(4500,8600,"床头R"),
-        (600,10500,"空调16A"),
-        (600,2000,"床头"),(600,2600,"USB"),(3500,2500,"书桌"),(600,4600,"空调16A"),
-        (5200,2000,"预留"),(5200,2600,"预留"),(5200,4600,"空调16A"),
-        (12000,7500,"吹风机"),(6500,10000,"吹风机"),
-        (5000,500,"阳台"),(9000,500,"洗衣机"),
-    ]
-    f2_switches = [
-        (2800,7200,"主卧2(门口)"),(600,7600,"主卧2(床头)"),
-        (6200,7200,"主卫2"),(11500,7200,"公卫"),
-        (2000,5000,"次卧(门口)"),(600,1800,"次卧(床头)"),
-        (5500,5000,"多功能区"),
-        (2000,5500,"走廊(次卧侧)"),(8000,7000,"走廊(主卧侧)"),
-        (11800,7200,"楼梯↓"),(3000,1700,"阳台"),
-    ]
-    _elec_dxf("二层", f2_lights, f2_sockets, f2_switches, "二层电气平面图")
+    # 灯具 / 插座 / 开关点位见 floor_layout.ELECTRICAL
+    f1, f2 = floor_layout.ELECTRICAL["一层"], floor_layout.ELECTRICAL["二层"]
+    f1_lights, f1_sockets, f1_switches = f1["lights"], f1["sockets"], f1["switches"]
+    f2_lights, f2_sockets, f2_switches = f2["lights"], f2["sockets"], f2["switches"]
 
-    # 生成电气 PNG（专业电气符号 + 回路线 + 配电箱 +  room labels）
-    C_WIRE = "#AAAAAA"  # 回路控制线（浅灰虚线）
+    # 专业电气符号 + 回路线 + 配电箱 + 房间名称
     F1_ROOM_LABELS = [
         ((OW+F1_X1)/2, (OW+F1_Y0)/2, "客厅"), ((F1_X1+BW)/2, (OW+F1_Y0)/2, "玄关"),
         ((OW+F1_X1)/2, (F1_Y0+F1_Y1)/2, "LDK"), ((F1_X1+BW)/2, (F1_Y0+F1_Y1)/2, "主卧"),
@@ -1083,8 +951,6 @@ def gen_electrical():
         ((F2_NX2+F2_NX3)/2, (F2_Y2+BH)/2, "留空区"), ((F2_NX3+BW)/2, (F2_Y2+F2_YM)/2, "公卫"),
         ((F2_NX3+BW)/2, (F2_YM+BH)/2, "楼梯间"),
     ]
-    def light_is_downlight(txt): return "筒灯" in txt or "射灯" in txt
-    def socket_is_16a(txt): return "16A" in txt or "空调" in txt or "油烟机" in txt
 
     for floor_n, lights, sockets, switches, walls, fname, room_labels, db_x, db_y, circuit_pairs in [
         ("一层", f1_lights, f1_sockets, f1_switches,
@@ -1103,94 +969,54 @@ def gen_electrical():
           (2000,5000,2000,3500),(5500,5000,7500,3500),(2000,5500,3500,6200),(8000,7000,8000,6200),
           (11800,7200,12200,9500),(3000,1700,5000,800)]),
     ]:
-        fig, ax = plt.subplots(1,1,figsize=(18,14),dpi=150,facecolor=C_BG)
-        ax.set_facecolor(C_BG); ax.set_aspect("equal"); ax.axis("off")
-        ax.set_title(f"{fname}  {floor_n} Electrical Plan", fontsize=16, fontweight="bold", color=C_TEXT, pad=12)
-        s = _s
-        for (x,y,w,h) in [(0,0,BW,OW),(0,BH-OW,BW,OW),(0,0,OW,BH),(BW-OW,0,OW,BH)]:
-            ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#E0E0E0",edgecolor=C_LINE,linewidth=0.3,zorder=2))
-        ax.add_patch(patches.Rectangle((s(OW),s(OW)),s(BW-2*OW),s(BH-2*OW),facecolor=C_BG,edgecolor="none",zorder=1))
-        for (x,y,w,h) in walls:
-            ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#E0E0E0",edgecolor=C_LINE,linewidth=0.2,zorder=2))
+        dl = DisplayList(f"{fname}  {floor_n} Electrical Plan", figsize=(18, 14))
+        _elec_symbols(dl)
+        _gray_walls(dl, walls, floor_n, "E-ARCH")
 
         # 房间名称标注（大号浅灰字 8pt）
         for rx, ry, rname in room_labels:
-            ax.text(s(rx), s(ry), rname, ha="center", va="center", fontsize=8, color="#999999", alpha=0.85, zorder=3)
+            dl.text(rx, ry, rname, "TEXT", size=8, color="#999999", alpha=0.85, z=3)
 
         # 回路线：开关→灯具 浅灰虚线
         for sx, sy, lx, ly in circuit_pairs:
-            ax.plot([s(sx), s(lx)], [s(sy), s(ly)], color=C_WIRE, linestyle="--", linewidth=0.6, alpha=0.8, zorder=4)
+            dl.line(sx, sy, lx, ly, "ELEC-WIRE", color=C_WIRE, dashed=True, lw=0.6, alpha=0.8)
 
-        # 配电箱符号
-        ax.add_patch(patches.Rectangle((s(db_x)-0.08, s(db_y)-0.06), 0.16, 0.12, facecolor="#E8E8E8", edgecolor=C_LINE, linewidth=0.5, zorder=7))
-        ax.text(s(db_x), s(db_y), "DB", ha="center", va="center", fontsize=6, fontweight="bold", color=C_TEXT, zorder=8)
-        ax.text(s(db_x)+0.22, s(db_y)+0.02, "总进线 BV10\n照明 BV2.5\n插座 BV2.5/4", ha="left", va="top", fontsize=5, color=C_TEXT2, zorder=8)
+        _db(dl, db_x, db_y)
+        dl.text(db_x+220, db_y+20, "总进线 BV10\n照明 BV2.5\n插座 BV2.5/4", "ELEC-WIRE", size=5, color=C_TEXT2,
+                ha="left", va="top", z=8)
 
-        # 灯具：主灯⊕(空心圆+十字 r=0.15)、筒灯(实心小圆)
         for (x,y,txt) in lights:
-            if light_is_downlight(txt):
-                ax.add_patch(patches.Circle((s(x), s(y)), 0.08, facecolor="#FFD54F", edgecolor=C_LINE, linewidth=0.3, zorder=8))
-            else:
-                ax.add_patch(patches.Circle((s(x), s(y)), 0.15, facecolor="none", edgecolor="#FFC107", linewidth=0.6, zorder=8))
-                ax.plot([s(x)-0.12, s(x)+0.12], [s(y), s(y)], color=C_LINE, linewidth=0.4, zorder=9)
-                ax.plot([s(x), s(x)], [s(y)-0.12, s(y)+0.12], color=C_LINE, linewidth=0.4, zorder=9)
-            ax.text(s(x), s(y)-0.28, txt, ha="center", va="top", fontsize=5, color=C_TEXT2, zorder=10)
-
-        # 插座：普通10A(半圆+竖线)、专用16A(方框+16A)
+            dl.insert(floor_layout.light_symbol(txt), x, y, "ELEC-LIGHT")
+            dl.text(x, y-280, txt, "TEXT", size=5, color=C_TEXT2, va="top")
         for (x,y,txt) in sockets:
-            if socket_is_16a(txt):
-                ax.add_patch(patches.Rectangle((s(x)-0.06, s(y)-0.05), 0.12, 0.10, facecolor="#4CAF50", edgecolor=C_LINE, linewidth=0.5, alpha=0.8, zorder=8))
-                ax.text(s(x), s(y), "16A", ha="center", va="center", fontsize=4.5, fontweight="bold", color="white", zorder=9)
-            else:
-                ax.add_patch(patches.Arc((s(x)-0.04, s(y)), 0.08, 0.12, theta1=270, theta2=90, color=C_LINE, linewidth=0.5, zorder=8))
-                ax.add_patch(patches.Arc((s(x)+0.04, s(y)), 0.08, 0.12, theta1=90, theta2=270, color=C_LINE, linewidth=0.5, zorder=8))
-                ax.plot([s(x), s(x)], [s(y)-0.06, s(y)+0.06], color=C_LINE, linewidth=0.5, zorder=8)
-                ax.add_patch(patches.Wedge((s(x)-0.04, s(y)), 0.06, 270, 90, facecolor="#4CAF50", edgecolor=C_LINE, linewidth=0.3, alpha=0.8, zorder=8))
-            ax.text(s(x), s(y)-0.22, txt, ha="center", va="top", fontsize=5, color=C_TEXT2, zorder=10)
-
-        # 开关：圆+斜线（单控/双控符号）
+            dl.insert(floor_layout.socket_symbol(txt), x, y, "ELEC-SOCKET")
+            dl.text(x, y-220, txt, "TEXT", size=5, color=C_TEXT2, va="top")
         for (x,y,txt) in switches:
-            ax.add_patch(patches.Circle((s(x), s(y)), 0.08, facecolor="none", edgecolor="#FF9800", linewidth=0.6, zorder=8))
-            ax.plot([s(x)-0.05, s(x)+0.08], [s(y)+0.05, s(y)-0.06], color="#FF9800", linewidth=0.5, zorder=9)
-            if "床头" in txt:
-                ax.plot([s(x)+0.04, s(x)+0.10], [s(y)-0.02, s(y)+0.04], color="#FF9800", linewidth=0.4, zorder=9)
-            ax.text(s(x), s(y)-0.22, txt, ha="center", va="top", fontsize=5, color=C_TEXT2, zorder=10)
-
-        # 增强图例
-        lx, ly = s(BW)+1.2, s(BH)-0.2
-        ax.text(lx, ly+0.5, "图例", fontsize=9, fontweight="bold", color=C_TEXT, zorder=10)
-        ax.add_patch(patches.Circle((lx+0.12, ly+0.1), 0.12, facecolor="none", edgecolor="#FFC107", linewidth=0.5, zorder=8))
-        ax.plot([lx+0.0, lx+0.24], [ly+0.1, ly+0.1], color=C_LINE, linewidth=0.3, zorder=9)
-        ax.plot([lx+0.12, lx+0.12], [ly-0.02, ly+0.22], color=C_LINE, linewidth=0.3, zorder=9)
-        ax.text(lx+0.38, ly+0.1, "吸顶灯/主灯", va="center", fontsize=6, color=C_TEXT, zorder=10)
-        ax.add_patch(patches.Circle((lx+0.12, ly-0.35), 0.06, facecolor="#FFD54F", edgecolor=C_LINE, linewidth=0.3, zorder=8))
-        ax.text(lx+0.38, ly-0.35, "筒灯/射灯", va="center", fontsize=6, color=C_TEXT, zorder=10)
-        ax.add_patch(patches.Arc((lx+0.02, ly-0.78), 0.12, 0.18, theta1=270, theta2=90, color=C_LINE, linewidth=0.4, zorder=8))
-        ax.add_patch(patches.Wedge((lx+0.02, ly-0.78), 0.09, 270, 90, facecolor="#4CAF50", edgecolor=C_LINE, linewidth=0.2, alpha=0.8, zorder=8))
-        ax.plot([lx+0.02, lx+0.02], [ly-0.9, ly-0.66], color=C_LINE, linewidth=0.4, zorder=8)
-        ax.text(lx+0.38, ly-0.78, "普通插座 10A", va="center", fontsize=6, color=C_TEXT, zorder=10)
-        ax.add_patch(patches.Rectangle((lx+0.04, ly-1.18), 0.14, 0.10, facecolor="#4CAF50", edgecolor=C_LINE, linewidth=0.4, zorder=8))
-        ax.text(lx+0.11, ly-1.13, "16A", ha="center", va="center", fontsize=4.5, fontweight="bold", color="white", zorder=9)
-        ax.text(lx+0.38, ly-1.13, "专用插座 16A", va="center", fontsize=6, color=C_TEXT, zorder=10)
-        ax.add_patch(patches.Circle((lx+0.12, ly-1.53), 0.08, facecolor="none", edgecolor="#FF9800", linewidth=0.5, zorder=8))
-        ax.plot([lx+0.07, lx+0.20], [ly-1.47, ly-1.59], color="#FF9800", linewidth=0.4, zorder=9)
-        ax.text(lx+0.38, ly-1.53, "单控开关", va="center", fontsize=6, color=C_TEXT, zorder=10)
-        ax.add_patch(patches.Circle((lx+0.12, ly-1.88), 0.08, facecolor="none", edgecolor="#FF9800", linewidth=0.5, zorder=8))
-        ax.plot([lx+0.07, lx+0.20], [ly-1.82, ly-1.94], color="#FF9800", linewidth=0.4, zorder=9)
-        ax.plot([lx+0.16, lx+0.22], [ly-1.9, ly-1.86], color="#FF9800", linewidth=0.3, zorder=9)
-        ax.text(lx+0.38, ly-1.88, "双控开关", va="center", fontsize=6, color=C_TEXT, zorder=10)
-        ax.plot([lx+0.04, lx+0.22], [ly-2.18, ly-2.18], color=C_WIRE, linestyle="--", linewidth=0.5, zorder=8)
-        ax.text(lx+0.38, ly-2.18, "回路控制线", va="center", fontsize=6, color=C_TEXT, zorder=10)
-        ax.add_patch(patches.Rectangle((lx+0.04, ly-2.48), 0.16, 0.12, facecolor="#E8E8E8", edgecolor=C_LINE, linewidth=0.4, zorder=8))
-        ax.text(lx+0.12, ly-2.42, "DB", ha="center", va="center", fontsize=5, fontweight="bold", color=C_TEXT, zorder=9)
-        ax.text(lx+0.38, ly-2.42, "配电箱", va="center", fontsize=6, color=C_TEXT, zorder=10)
-        nx, ny = -1.0, s(BH)-1.0
-        ax.annotate("", xy=(nx, ny+0.7), xytext=(nx, ny), arrowprops=dict(arrowstyle="-|>", color=C_TEXT, lw=1.5), zorder=10)
-        ax.text(nx, ny+0.85, "N", ha="center", va="bottom", fontsize=10, fontweight="bold", color=C_TEXT, zorder=10)
-        ax.set_xlim(-2.0, s(BW)+4.5); ax.set_ylim(-1.5, s(BH)+1.5)
-        fig.savefig(f"{IMG_DIR}/{fname}.png", bbox_inches="tight", pad_inches=0.3, dpi=150, facecolor=C_BG)
-        fig.savefig(f"{IMG_DIR}/{fname}.svg", format='svg', bbox_inches="tight", pad_inches=0.3, facecolor=C_BG)
-        plt.close(fig)
+            dl.insert(floor_layout.switch_symbol(txt), x, y, "ELEC-SWITCH")
+            dl.text(x, y-220, txt, "TEXT", size=5, color=C_TEXT2, va="top")
+
+        # 图例：与图中相同的图块
+        lx, ly = BW+1200, BH-200
+        dl.text(lx, ly+500, "图例", "TEXT", size=9, weight="bold", color=C_TEXT, ha="left", va="baseline")
+        for i, (sym, txt, layer) in enumerate([("LIGHT-MAIN", "吸顶灯/主灯", "ELEC-LIGHT"),
+                                               ("DOWNLIGHT", "筒灯/射灯", "ELEC-LIGHT"),
+                                               ("SOCKET-10A", "普通插座 10A", "ELEC-SOCKET"),
+                                               ("SOCKET-16A", "专用插座 16A", "ELEC-SOCKET"),
+                                               ("SWITCH", "单控开关", "ELEC-SWITCH"),
+                                               ("SWITCH-2WAY", "双控开关", "ELEC-SWITCH")]):
+            yy = ly + 100 - i*350
+            dl.insert(sym, lx+120, yy, layer)
+            dl.text(lx+380, yy, txt, "TEXT", size=6, color=C_TEXT, ha="left")
+        yy = ly + 100 - 6*350
+        dl.line(lx+40, yy, lx+220, yy, "ELEC-WIRE", color=C_WIRE, dashed=True, lw=0.5, z=8)
+        dl.text(lx+380, yy, "回路控制线", "TEXT", size=6, color=C_TEXT, ha="left")
+        _db(dl, lx+120, yy-350, size=5)
+        dl.text(lx+380, yy-350, "配电箱", "TEXT", size=6, color=C_TEXT, ha="left")
+
+        _north_arrow(dl, -1000, BH-1000)
+        _dxf_title(dl, BW/2, BH+600, f"{floor_n}电气平面图")
+        dl.set_limits((-2000, BW+4500), (-1500, BH+1500))
+        _render(dl, f"{DIRS['电气']}/{fname}.dxf", f"{IMG_DIR}/{fname}.png")
     print("  ✓ 电气图 (DXF + PNG) × 2")
 
 
@@ -1198,417 +1024,326 @@ def gen_electrical():
 #  效果图（南立面渲染 + 室内俯视）
 # ══════════════════════════════════════════════
 
+@perf.drawing("gen_render_south")
 def gen_render_south():
     """南立面建筑表现图风格：天空云彩、地面投影、墙面质感、窗户反射、阳台细部、景观层次"""
-    fig, ax = plt.subplots(1, 1, figsize=(20, 12), dpi=200, facecolor="#E8F0F8")
-    ax.set_facecolor("#E8F0F8")
-    ax.set_aspect("equal")
-    ax.axis("off")
-
-    # ── 1. 天空：多层渐变 + 写意白云 ──
-    for i in range(120):
-        y0 = TOP + 0.5 + i * 4.5 / 120
-        y1 = y0 + 0.04
-        t = i / 120
-        # 非线性渐变：顶部更蓝，中间过渡更自然
-        r = 0.48 + 0.42 * (1 - 0.3 * (1 - t) ** 2)
-        g = 0.68 + 0.28 * (1 - 0.2 * t ** 1.5)
-        b = 0.88 + 0.12 * (0.5 + 0.5 * math.sin(t * math.pi))
-        ax.fill_between([-3, W_m + 3], [y0] * 2, [y1] * 2, color=(r, g, b), zorder=0)
-    # 白云：半透明椭圆叠加
-    cloud_specs = [(-0.5, TOP + 1.2, 1.8, 0.5, 0.4), (2.5, TOP + 1.5, 2.2, 0.55, 0.45),
-                  (7.0, TOP + 1.0, 1.5, 0.4, 0.35), (11.0, TOP + 1.8, 2.0, 0.5, 0.4), (W_m + 1.5, TOP + 1.3, 1.6, 0.45, 0.38)]
-    for cx, cy, rx, ry, a in cloud_specs:
-        ax.add_patch(patches.Ellipse((cx, cy), rx, ry, facecolor="white", edgecolor="none", alpha=0.75, zorder=0))
-        ax.add_patch(patches.Ellipse((cx + rx * 0.3, cy - ry * 0.1), rx * 0.7, ry * 0.8, facecolor="white", edgecolor="none", alpha=0.65, zorder=0))
-
-    # ── 2. 地面：草坪条纹、人行步道、建筑投影 ──
-    ax.fill_between([-3, W_m + 3], [-1.5, -1.5], [0, 0], color="#7A8D5A", zorder=1)
-    # 草坪条纹纹理（交替深浅）
-    for stripe in range(60):
-        xs = -3 + stripe * (W_m + 6) / 30
-        xe = xs + (W_m + 6) / 60
-        shade = "#8B9D6B" if stripe % 2 == 0 else "#7A8D5A"
-        ax.fill_between([xs, xe], [-0.2, -0.2], [0, 0], color=shade, zorder=1)
-    # 人行步道（大门延伸到底部）
-    pw_left, pw_right = 9.8, 10.2
-    ax.add_patch(patches.Rectangle((pw_left, -1.5), pw_right - pw_left, 1.5, facecolor="#B0A89A", edgecolor="#989078", linewidth=0.4, zorder=1))
-    # 建筑在地面的投影（暗色梯度）
-    shadow_left, shadow_right = -0.2, W_m + 0.2
-    for s in range(25):
-        t = s / 25
-        xx = [shadow_left + t * (shadow_right - shadow_left), shadow_left + (t + 0.04) * (shadow_right - shadow_left)]
-        alpha = 0.4 * (1 - t * 0.3) * (1 - abs(t - 0.5) * 0.5)
-        ax.fill_between(xx, [-0.5, -0.5], [0, 0], color="#2A3A20", alpha=alpha, zorder=1)
-
-    # ── 3. 墙面：白色纵向渐变 + 石材纹理 ──
-    # 一层左侧白色墙（纵向渐变：上浅下深）
-    for row in range(40):
-        yb = GL + row * (F1_CL - GL) / 40
-        yt = yb + (F1_CL - GL) / 40
-        t = row / 40
-        shade = 0.96 - 0.06 * t
-        ax.add_patch(patches.Rectangle((0, yb), 8.0, (F1_CL - GL) / 40, facecolor=(shade, shade * 0.98, shade * 0.92), edgecolor="none", zorder=3))
-    # 一层右侧深色石材（DARK_STONE_X=8.2 到 W_m）
-    stone_w = W_m - DARK_STONE_X
-    ax.add_patch(patches.Rectangle((DARK_STONE_X, GL), stone_w, F1_CL - GL, facecolor="#4A4038", edgecolor="none", zorder=3))
-    for line in range(12):
-        ly = GL + (F1_CL - GL) * (0.1 + 0.8 * line / 12)
-        ax.plot([DARK_STONE_X, W_m], [ly, ly], color="#3A3028", linewidth=0.15, alpha=0.6, zorder=3)
-    # 二层墙体（纵向渐变）
-    for row in range(35):
-        yb = F2_FL + row * (F2_CL - F2_FL) / 35
-        t = row / 35
-        shade = 0.94 - 0.05 * t
-        ax.add_patch(patches.Rectangle((0, yb), W_m, (F2_CL - F2_FL) / 35, facecolor=(shade, shade * 0.96, shade * 0.88), edgecolor="none", zorder=3))
-    # 女儿墙
-    ax.add_patch(patches.Rectangle((0, ROOF), W_m, PARAPET, facecolor="#E8E2D5", edgecolor="none", zorder=3))
-    # 墙面-屋顶交接细微阴影线
-    ax.plot([0, W_m], [ROOF, ROOF], color="#B0A898", linewidth=0.4, alpha=0.5, zorder=4)
-    # 屋顶压顶线（更明显）
-    ax.add_patch(patches.Rectangle((-0.06, TOP - 0.12), W_m + 0.12, 0.12, facecolor="#C8BEA8", edgecolor="#988E78", linewidth=0.8, zorder=4))
-    ax.add_patch(patches.Rectangle((-0.03, TOP - 0.06), W_m + 0.06, 0.06, facecolor="#D8D0C0", edgecolor="#B0A898", linewidth=0.5, zorder=4))
-    # 楼层分隔线
-    ax.add_patch(patches.Rectangle((-0.03, F1_CL - 0.05), W_m + 0.06, 0.2, facecolor="#D8D0C0", edgecolor="#C0B8A8", linewidth=0.5, zorder=4))
-    # 外轮廓
-    ax.plot([0, 0, W_m, W_m], [GL, TOP, TOP, GL], color="#8A7E6E", linewidth=1.5, zorder=5)
-    ax.plot([0, W_m], [GL, GL], color="#8A7E6E", linewidth=1.5, zorder=5)
-
-    # ── 4. 窗户：自然反射 + 双线窗框 + 窗台阴影 ──
-    def rwin(x, y, w, h, divs=2):
-        # 窗套/线脚（外框）
-        ax.add_patch(patches.Rectangle((x - 0.05, y - 0.05), w + 0.10, h + 0.10, facecolor="#7A7A7A", edgecolor="#5A5A5A", linewidth=0.9, zorder=6))
-        ax.add_patch(patches.Rectangle((x - 0.03, y - 0.03), w + 0.06, h + 0.06, facecolor="#8A8A8A", edgecolor="#6A6A6A", linewidth=0.5, zorder=6))
-        for j in range(divs):
-            gx = x + j * w / divs
-            for k in range(25):
-                gy = y + k * h / 25
-                t = k / 25
-                # 玻璃反射：顶部深蓝→底部浅蓝→底部微弱天空/绿色反射
-                if t < 0.5:
-                    r, g, b = 0.35 + 0.25 * t, 0.55 + 0.25 * t, 0.75 + 0.15 * t
-                else:
-                    r = 0.48 + 0.12 * (t - 0.5) + 0.05  # 底部微弱绿色反射
-                    g = 0.82 + 0.08 * (t - 0.5)
-                    b = 0.90 + 0.05 * (1 - t)
-                ax.add_patch(patches.Rectangle((gx + 0.02, gy), w / divs - 0.04, h / 25, facecolor=(r, g, b), edgecolor="none", zorder=7))
-            ax.plot([gx, gx + w / divs], [y, y], color="#5A5A5A", linewidth=0.4, zorder=8)
-            ax.plot([gx, gx + w / divs], [y + h, y + h], color="#5A5A5A", linewidth=0.4, zorder=8)
-            ax.plot([gx, gx], [y, y + h], color="#5A5A5A", linewidth=0.4, zorder=8)
-            ax.plot([gx + w / divs, gx + w / divs], [y, y + h], color="#5A5A5A", linewidth=0.4, zorder=8)
-        ax.plot([x, x + w], [y + h * 0.5, y + h * 0.5], color="#555", linewidth=0.35, zorder=8)
-        # 窗台 + 下方阴影条
-        ax.add_patch(patches.Rectangle((x - 0.06, y - 0.08), w + 0.12, 0.08, facecolor="#C0B8A8", edgecolor="#A09888", linewidth=0.5, zorder=6))
-        ax.add_patch(patches.Rectangle((x - 0.04, y - 0.12), w + 0.08, 0.04, facecolor="#3A3A38", alpha=0.35, edgecolor="none", zorder=6))
-
-    for (x, y, w, h, divs) in SOUTH_WIN:
-        rwin(x, y, w, h, divs)
-
-    # ── 5. 玄关大门 + 门头灯 ──
-    dx, dy = 9.5, F1_FL
-    dw, dh = 1.2, 2.6
-    ax.add_patch(patches.Rectangle((dx - 0.06, dy), dw + 0.12, dh + 0.1, facecolor="#3A3028", edgecolor="#2A2018", linewidth=1.2, zorder=6))
-    ax.add_patch(patches.Rectangle((dx, dy), dw / 2 - 0.02, dh, facecolor="#5A4A3A", edgecolor="#3A3028", linewidth=0.8, zorder=7))
-    ax.add_patch(patches.Rectangle((dx + dw / 2 + 0.02, dy), dw / 2 - 0.02, dh, facecolor="#5A4A3A", edgecolor="#3A3028", linewidth=0.8, zorder=7))
-    for i in range(3):
-        ax.add_patch(patches.Rectangle((dx - 0.3 - i * 0.15, dy - (i + 1) * 0.15), dw + 0.6 + i * 0.3, 0.15, facecolor="#4A4038", edgecolor="#3A3028", linewidth=0.5, zorder=4))
-    # 门头灯（小黄色光点）
-    ax.add_patch(patches.Circle((dx + dw / 2, dy + dh + 0.25), 0.06, facecolor="#FFE066", edgecolor="#E0B840", linewidth=0.3, alpha=0.9, zorder=8))
-    ax.add_patch(patches.Circle((dx + dw / 2, dy + dh + 0.25), 0.12, facecolor="#FFE066", edgecolor="none", alpha=0.3, zorder=7))
-
-    # ── 6. 阳台：底板阴影 + 细栏杆 + 精致绿植盆 ──
-    # 阳台底板（底面有阴影）
-    ax.add_patch(patches.Rectangle((0.15, F2_FL - 0.15), W_m - 0.3, 0.15, facecolor="#D0C8B8", edgecolor="#B0A898", linewidth=0.5, zorder=4))
-    ax.add_patch(patches.Rectangle((0.12, F2_FL - 1.25), W_m - 0.24, 0.08, facecolor="#2A2820", alpha=0.4, edgecolor="none", zorder=4))
-    # 栏杆立柱更细致
-    for i in range(13):
-        px = 0.2 + i * (W_m - 0.4) / 12
-        ax.add_patch(patches.Rectangle((px - 0.02, F2_FL - 1.1), 0.04, 1.08, facecolor="#787878", edgecolor="#585858", linewidth=0.25, zorder=5))
-        ax.add_patch(patches.Rectangle((px - 0.015, F2_FL - 0.02), 0.03, 0.02, facecolor="#888888", edgecolor="#686868", linewidth=0.2, zorder=5))
-    for i in range(12):
-        px1 = 0.2 + i * (W_m - 0.4) / 12 + 0.035
-        px2 = 0.2 + (i + 1) * (W_m - 0.4) / 12 - 0.035
-        ax.add_patch(patches.Rectangle((px1, F2_FL - 1.02), px2 - px1, 0.9, facecolor="#A8C8E0", edgecolor="#88A8C0", linewidth=0.25, alpha=0.55, zorder=5))
-    ax.add_patch(patches.Rectangle((0.22, F2_FL - 0.05), W_m - 0.44, 0.05, facecolor="#808080", edgecolor="#606060", linewidth=0.4, zorder=6))
-    # 阳台绿植盆（更精致）
-    def _ph(x, y):
-        return ((int(x * 1000) * 31 + int(y * 1000)) % 1000) / 1000.0
-    for fx, fy in [(1.2, F2_FL - 1.05), (4.5, F2_FL - 1.05), (7.5, F2_FL - 1.05), (10.5, F2_FL - 1.05), (13.0, F2_FL - 1.05)]:
-        ax.add_patch(patches.Rectangle((fx - 0.14, fy - 0.12), 0.28, 0.12, facecolor="#B89A78", edgecolor="#987858", linewidth=0.35, zorder=6))
-        ax.add_patch(patches.Rectangle((fx - 0.11, fy - 0.08), 0.22, 0.08, facecolor="#C8A878", edgecolor="#A88858", linewidth=0.2, zorder=6))
-        for j in range(4):
-            off = (_ph(fx * 100 + j, fy) - 0.5) * 0.15
-            ax.add_patch(patches.Ellipse((fx + off, fy + 0.02), 0.22, 0.18, facecolor="#4A8A3A", edgecolor="#3A6A2A", linewidth=0.25, zorder=6))
-        ax.add_patch(patches.Ellipse((fx, fy + 0.05), 0.28, 0.22, facecolor="#5A9A4A", edgecolor="#3A7A2A", linewidth=0.3, zorder=6))
-
-    # ── 7. 景观：多层次树、自然灌木、花坛点缀 ──
-    def _hash(x, y):
-        return ((int(x * 1000) * 31 + int(y * 1000)) % 1000) / 1000.0
-
-    def tree(cx, cy, th=1.2, cr=0.8):
-        ax.add_patch(patches.Rectangle((cx - 0.07, cy), 0.14, th, facecolor="#7A5F37", edgecolor="#5A3F17", linewidth=0.5, zorder=2))
-        layers = [(0, cr * 1.1, "#3A6A2A"), (cr * 0.25, cr * 0.95, "#4A7A3A"), (cr * 0.5, cr * 0.8, "#5A8A4A"),
-                  (cr * 0.35, cr * 0.65, "#4A7A38"), (cr * 0.7, cr * 0.55, "#6A9A5A"), (cr * 0.15, cr * 0.9, "#3D6E30")]
-        for i, (dy_t, r, c) in enumerate(layers):
-            rx = r * (1 + 0.08 * (_hash(cx + i, cy) - 0.5))
-            ry = r * 1.4 * (0.92 + 0.16 * _hash(cx + i * 2, cy))
-            ox = (_hash(cx + i * 3, cy) - 0.5) * 0.08
-            ax.add_patch(patches.Ellipse((cx + ox, cy + th + dy_t), rx * 2, ry, facecolor=c, edgecolor="#2A5A1A", linewidth=0.25, alpha=0.9, zorder=2))
-
-    def bush(cx, cy, w=0.8, h=0.4):
-        for i in range(5):
-            dx_b = (_hash(cx * 100 + i, cy) - 0.5) * w
-            dy_b = (_hash(cx, cy * 100 + i) - 0.3) * h
-            rw = 0.25 + _hash(cx + i * 0.1, cy) * 0.2
-            rh = 0.15 + _hash(cy, cx + i) * 0.15
-            ax.add_patch(patches.Ellipse((cx + dx_b, cy + dy_b + h * 0.3), rw, rh, facecolor="#5A8A4A", edgecolor="#3A6A2A", linewidth=0.25, alpha=0.85, zorder=2))
-
-    tree(-1.5, 0, 1.5, 1.0)
-    tree(W_m + 1.5, 0, 1.8, 1.2)
-    tree(-0.5, -0.3, 0.8, 0.6)
-    bush(1.2, -0.1, 0.7, 0.35)
-    bush(5.2, -0.1, 0.6, 0.3)
-    bush(8.2, -0.1, 0.8, 0.35)
-    bush(12.2, -0.1, 0.65, 0.32)
-    # 花坛/花丛（红/黄/粉）
-    for (fx, fy, colors) in [(2.5, 0.05, ["#E85A5A", "#F0A050"]), (6.5, 0.03, ["#F0C060", "#E87070"]), (10.0, 0.02, ["#E888A0", "#F0B050"])]:
-        for i in range(6):
-            ax.add_patch(patches.Ellipse((fx + 0.15 * (i % 3 - 1), fy + 0.08 * (i // 3)), 0.12, 0.1, facecolor=colors[i % len(colors)], edgecolor="none", alpha=0.85, zorder=2))
-
-    ax.text(W_m / 2, TOP + 2.5, "南立面渲染效果图", ha="center", va="center", fontsize=20, fontweight="bold", color="#4A5A6A", zorder=10)
-    ax.text(W_m / 2, TOP + 2.0, "South Elevation Rendering  |  现代简约风格  |  14m × 11m  |  二层别墅", ha="center", va="center", fontsize=9, color="#8A8A8A", zorder=10)
-    ax.set_xlim(-3, W_m + 3)
-    ax.set_ylim(-1.8, TOP + 3.5)
-    fig.savefig(f"{IMG_DIR}/南立面渲染效果图.png", bbox_inches="tight", pad_inches=0.2, dpi=200, facecolor="#E8F0F8")
-    fig.savefig(f"{IMG_DIR}/南立面渲染效果图.svg", format='svg', bbox_inches="tight", pad_inches=0.3, facecolor="#E8F0F8")
-    plt.close(fig)
+    with _figure((20, 12), dpi=200, facecolor="#E8F0F8") as (fig, ax):
+        ax.set_facecolor("#E8F0F8")
+        ax.set_aspect("equal")
+        ax.axis("off")
+
+        # ── 1. 天空：多层渐变 + 写意白云 ──
+        for i in range(120):
+            y0 = TOP + 0.5 + i * 4.5 / 120
+            y1 = y0 + 0.04
+            t = i / 120
+            # 非线性渐变：顶部更蓝，中间过渡更自然
+            r = 0.48 + 0.42 * (1 - 0.3 * (1 - t) ** 2)
+            g = 0.68 + 0.28 * (1 - 0.2 * t ** 1.5)
+            b = 0.88 + 0.12 * (0.5 + 0.5 * math.sin(t * math.pi))
+            ax.fill_between([-3, W_m + 3], [y0] * 2, [y1] * 2, color=(r, g, b), zorder=0)
+        # 白云：半透明椭圆叠加
+        cloud_specs = [(-0.5, TOP + 1.2, 1.8, 0.5, 0.4), (2.5, TOP + 1.5, 2.2, 0.55, 0.45),
+                      (7.0, TOP + 1.0, 1.5, 0.4, 0.35), (11.0, TOP + 1.8, 2.0, 0.5, 0.4), (W_m + 1.5, TOP + 1.3, 1.6, 0.45, 0.38)]
+        for cx, cy, rx, ry, a in cloud_specs:
+            ax.add_patch(patches.Ellipse((cx, cy), rx, ry, facecolor="white", edgecolor="none", alpha=0.75, zorder=0))
+            ax.add_patch(patches.Ellipse((cx + rx * 0.3, cy - ry * 0.1), rx * 0.7, ry * 0.8, facecolor="white", edgecolor="none", alpha=0.65, zorder=0))
+
+        # ── 2. 地面：草坪条纹、人行步道、建筑投影 ──
+        ax.fill_between([-3, W_m + 3], [-1.5, -1.5], [0, 0], color="#7A8D5A", zorder=1)
+        # 草坪条纹纹理（交替深浅）
+        for stripe in range(60):
+            xs = -3 + stripe * (W_m + 6) / 30
+            xe = xs + (W_m + 6) / 60
+            shade = "#8B9D6B" if stripe % 2 == 0 else "#7A8D5A"
+            ax.fill_between([xs, xe], [-0.2, -0.2], [0, 0], color=shade, zorder=1)
+        # 人行步道（大门延伸到底部）
+        pw_left, pw_right = 9.8, 10.2
+        ax.add_patch(patches.Rectangle((pw_left, -1.5), pw_right - pw_left, 1.5, facecolor="#B0A89A", edgecolor="#989078", linewidth=0.4, zorder=1))
+        # 建筑在地面的投影（暗色梯度）
+        shadow_left, shadow_right = -0.2, W_m + 0.2
+        for s in range(25):
+            t = s / 25
+            xx = [shadow_left + t * (shadow_right - shadow_left), shadow_left + (t + 0.04) * (shadow_right - shadow_left)]
+            alpha = 0.4 * (1 - t * 0.3) * (1 - abs(t - 0.5) * 0.5)
+            ax.fill_between(xx, [-0.5, -0.5], [0, 0], color="#2A3A20", alpha=alpha, zorder=1)
+
+        # ── 3. 墙面：白色纵向渐变 + 石材纹理 ──
+        # 一层左侧白色墙（纵向渐变：上浅下深）
+        for row in range(40):
+            yb = GL + row * (F1_CL - GL) / 40
+            yt = yb + (F1_CL - GL) / 40
+            t = row / 40
+            shade = 0.96 - 0.06 * t
+            ax.add_patch(patches.Rectangle((0, yb), 8.0, (F1_CL - GL) / 40, facecolor=(shade, shade * 0.98, shade * 0.92), edgecolor="none", zorder=3))
+        # 一层右侧深色石材（DARK_STONE_X=8.2 到 W_m）
+        stone_w = W_m - DARK_STONE_X
+        ax.add_patch(patches.Rectangle((DARK_STONE_X, GL), stone_w, F1_CL - GL, facecolor="#4A4038", edgecolor="none", zorder=3))
+        for line in range(12):
+            ly = GL + (F1_CL - GL) * (0.1 + 0.8 * line / 12)
+            ax.plot([DARK_STONE_X, W_m], [ly, ly], color="#3A3028", linewidth=0.15, alpha=0.6, zorder=3)
+        # 二层墙体（纵向渐变）
+        for row in range(35):
+            yb = F2_FL + row * (F2_CL - F2_FL) / 35
+            t = row / 35
+            shade = 0.94 - 0.05 * t
+            ax.add_patch(patches.Rectangle((0, yb), W_m, (F2_CL - F2_FL) / 35, facecolor=(shade, shade * 0.96, shade * 0.88), edgecolor="none", zorder=3))
+        # 女儿墙
+        ax.add_patch(patches.Rectangle((0, ROOF), W_m, PARAPET, facecolor="#E8E2D5", edgecolor="none", zorder=3))
+        # 墙面-屋顶交接细微阴影线
+        ax.plot([0, W_m], [ROOF, ROOF], color="#B0A898", linewidth=0.4, alpha=0.5, zorder=4)
+        # 屋顶压顶线（更明显）
+        ax.add_patch(patches.Rectangle((-0.06, TOP - 0.12), W_m + 0.12, 0.12, facecolor="#C8BEA8", edgecolor="#988E78", linewidth=0.8, zorder=4))
+        ax.add_patch(patches.Rectangle((-0.03, TOP - 0.06), W_m + 0.06, 0.06, facecolor="#D8D0C0", edgecolor="#B0A898", linewidth=0.5, zorder=4))
+        # 楼层分隔线
+        ax.add_patch(patches.Rectangle((-0.03, F1_CL - 0.05), W_m + 0.06, 0.2, facecolor="#D8D0C0", edgecolor="#C0B8A8", linewidth=0.5, zorder=4))
+        # 外轮廓
+        ax.plot([0, 0, W_m, W_m], [GL, TOP, TOP, GL], color="#8A7E6E", linewidth=1.5, zorder=5)
+        ax.plot([0, W_m], [GL, GL], color="#8A7E6E", linewidth=1.5, zorder=5)
+
+        # ── 4. 窗户：自然反射 + 双线窗框 + 窗台阴影 ──
+        def rwin(x, y, w, h, divs=2):
+            # 窗套/线脚（外框）
+            ax.add_patch(patches.Rectangle((x - 0.05, y - 0.05), w + 0.10, h + 0.10, facecolor="#7A7A7A", edgecolor="#5A5A5A", linewidth=0.9, zorder=6))
+            ax.add_patch(patches.Rectangle((x - 0.03, y - 0.03), w + 0.06, h + 0.06, facecolor="#8A8A8A", edgecolor="#6A6A6A", linewidth=0.5, zorder=6))
+            for j in range(divs):
+                gx = x + j * w / divs
+                for k in range(25):
+                    gy = y + k * h / 25
+                    t = k / 25
+                    # 玻璃反射：顶部深蓝→底部浅蓝→底部微弱天空/绿色反射
+                    if t < 0.5:
+                        r, g, b = 0.35 + 0.25 * t, 0.55 + 0.25 * t, 0.75 + 0.15 * t
+                    else:
+                        r = 0.48 + 0.12 * (t - 0.5) + 0.05  # 底部微弱绿色反射
+                        g = 0.82 + 0.08 * (t - 0.5)
+                        b = 0.90 + 0.05 * (1 - t)
+                    ax.add_patch(patches.Rectangle((gx + 0.02, gy), w / divs - 0.04, h / 25, facecolor=(r, g, b), edgecolor="none", zorder=7))
+                ax.plot([gx, gx + w / divs], [y, y], color="#5A5A5A", linewidth=0.4, zorder=8)
+                ax.plot([gx, gx + w / divs], [y + h, y + h], color="#5A5A5A", linewidth=0.4, zorder=8)
+                ax.plot([gx, gx], [y, y + h], color="#5A5A5A", linewidth=0.4, zorder=8)
+                ax.plot([gx + w / divs, gx + w / divs], [y, y + h], color="#5A5A5A", linewidth=0.4, zorder=8)
+            ax.plot([x, x + w], [y + h * 0.5, y + h * 0.5], color="#555", linewidth=0.35, zorder=8)
+            # 窗台 + 下方阴影条
+            ax.add_patch(patches.Rectangle((x - 0.06, y - 0.08), w + 0.12, 0.08, facecolor="#C0B8A8", edgecolor="#A09888", linewidth=0.5, zorder=6))
+            ax.add_patch(patches.Rectangle((x - 0.04, y - 0.12), w + 0.08, 0.04, facecolor="#3A3A38", alpha=0.35, edgecolor="none", zorder=6))
+
+        for (x, y, w, h, divs) in SOUTH_WIN:
+            rwin(x, y, w, h, divs)
+
+        # ── 5. 玄关大门 + 门头灯 ──
+        dx, dy = 9.5, F1_FL
+        dw, dh = 1.2, 2.6
+        ax.add_patch(patches.Rectangle((dx - 0.06, dy), dw + 0.12, dh + 0.1, facecolor="#3A3028", edgecolor="#2A2018", linewidth=1.2, zorder=6))
+        ax.add_patch(patches.Rectangle((dx, dy), dw / 2 - 0.02, dh, facecolor="#5A4A3A", edgecolor="#3A3028", linewidth=0.8, zorder=7))
+        ax.add_patch(patches.Rectangle((dx + dw / 2 + 0.02, dy), dw / 2 - 0.02, dh, facecolor="#5A4A3A", edgecolor="#3A3028", linewidth=0.8, zorder=7))
+        for i in range(3):
+            ax.add_patch(patches.Rectangle((dx - 0.3 - i * 0.15, dy - (i + 1) * 0.15), dw + 0.6 + i * 0.3, 0.15, facecolor="#4A4038", edgecolor="#3A3028", linewidth=0.5, zorder=4))
+        # 门头灯（小黄色光点）
+        ax.add_patch(patches.Circle((dx + dw / 2, dy + dh + 0.25), 0.06, facecolor="#FFE066", edgecolor="#E0B840", linewidth=0.3, alpha=0.9, zorder=8))
+        ax.add_patch(patches.Circle((dx + dw / 2, dy + dh + 0.25), 0.12, facecolor="#FFE066", edgecolor="none", alpha=0.3, zorder=7))
+
+        # ── 6. 阳台：底板阴影 + 细栏杆 + 精致绿植盆 ──
+        # 阳台底板（底面有阴影）
+        ax.add_patch(patches.Rectangle((0.15, F2_FL - 0.15), W_m - 0.3, 0.15, facecolor="#D0C8B8", edgecolor="#B0A898", linewidth=0.5, zorder=4))
+        ax.add_patch(patches.Rectangle((0.12, F2_FL - 1.25), W_m - 0.24, 0.08, facecolor="#2A2820", alpha=0.4, edgecolor="none", zorder=4))
+        # 栏杆立柱更细致
+        for i in range(13):
+            px = 0.2 + i * (W_m - 0.4) / 12
+            ax.add_patch(patches.Rectangle((px - 0.02, F2_FL - 1.1), 0.04, 1.08, facecolor="#787878", edgecolor="#585858", linewidth=0.25, zorder=5))
+            ax.add_patch(patches.Rectangle((px - 0.015, F2_FL - 0.02), 0.03, 0.02, facecolor="#888888", edgecolor="#686868", linewidth=0.2, zorder=5))
+        for i in range(12):
+            px1 = 0.2 + i * (W_m - 0.4) / 12 + 0.035
+            px2 = 0.2 + (i + 1) * (W_m - 0.4) / 12 - 0.035
+            ax.add_patch(patches.Rectangle((px1, F2_FL - 1.02), px2 - px1, 0.9, facecolor="#A8C8E0", edgecolor="#88A8C0", linewidth=0.25, alpha=0.55, zorder=5))
+        ax.add_patch(patches.Rectangle((0.22, F2_FL - 0.05), W_m - 0.44, 0.05, facecolor="#808080", edgecolor="#606060", linewidth=0.4, zorder=6))
+        # 阳台绿植盆（更精致）
+        def _ph(x, y):
+            return ((int(x * 1000) * 31 + int(y * 1000)) % 1000) / 1000.0
+        for fx, fy in [(1.2, F2_FL - 1.05), (4.5, F2_FL - 1.05), (7.5, F2_FL - 1.05), (10.5, F2_FL - 1.05), (13.0, F2_FL - 1.05)]:
+            ax.add_patch(patches.Rectangle((fx - 0.14, fy - 0.12), 0.28, 0.12, facecolor="#B89A78", edgecolor="#987858", linewidth=0.35, zorder=6))
+            ax.add_patch(patches.Rectangle((fx - 0.11, fy - 0.08), 0.22, 0.08, facecolor="#C8A878", edgecolor="#A88858", linewidth=0.2, zorder=6))
+            for j in range(4):
+                off = (_ph(fx * 100 + j, fy) - 0.5) * 0.15
+                ax.add_patch(patches.Ellipse((fx + off, fy + 0.02), 0.22, 0.18, facecolor="#4A8A3A", edgecolor="#3A6A2A", linewidth=0.25, zorder=6))
+            ax.add_patch(patches.Ellipse((fx, fy + 0.05), 0.28, 0.22, facecolor="#5A9A4A", edgecolor="#3A7A2A", linewidth=0.3, zorder=6))
+
+        # ── 7. 景观：多层次树、自然灌木、花坛点缀 ──
+        def _hash(x, y):
+            return ((int(x * 1000) * 31 + int(y * 1000)) % 1000) / 1000.0
+
+        def tree(cx, cy, th=1.2, cr=0.8):
+            ax.add_patch(patches.Rectangle((cx - 0.07, cy), 0.14, th, facecolor="#7A5F37", edgecolor="#5A3F17", linewidth=0.5, zorder=2))
+            layers = [(0, cr * 1.1, "#3A6A2A"), (cr * 0.25, cr * 0.95, "#4A7A3A"), (cr * 0.5, cr * 0.8, "#5A8A4A"),
+                      (cr * 0.35, cr * 0.65, "#4A7A38"), (cr * 0.7, cr * 0.55, "#6A9A5A"), (cr * 0.15, cr * 0.9, "#3D6E30")]
+            for i, (dy_t, r, c) in enumerate(layers):
+                rx = r * (1 + 0.08 * (_hash(cx + i, cy) - 0.5))
+                ry = r * 1.4 * (0.92 + 0.16 * _hash(cx + i * 2, cy))
+                ox = (_hash(cx + i * 3, cy) - 0.5) * 0.08
+                ax.add_patch(patches.Ellipse((cx + ox, cy + th + dy_t), rx * 2, ry, facecolor=c, edgecolor="#2A5A1A", linewidth=0.25, alpha=0.9, zorder=2))
+
+        def bush(cx, cy, w=0.8, h=0.4):
+            for i in range(5):
+                dx_b = (_hash(cx * 100 + i, cy) - 0.5) * w
+                dy_b = (_hash(cx, cy * 100 + i) - 0.3) * h
+                rw = 0.25 + _hash(cx + i * 0.1, cy) * 0.2
+                rh = 0.15 + _hash(cy, cx + i) * 0.15
+                ax.add_patch(patches.Ellipse((cx + dx_b, cy + dy_b + h * 0.3), rw, rh, facecolor="#5A8A4A", edgecolor="#3A6A2A", linewidth=0.25, alpha=0.85, zorder=2))
+
+        tree(-1.5, 0, 1.5, 1.0)
+        tree(W_m + 1.5, 0, 1.8, 1.2)
+        tree(-0.5, -0.3, 0.8, 0.6)
+        bush(1.2, -0.1, 0.7, 0.35)
+        bush(5.2, -0.1, 0.6, 0.3)
+        bush(8.2, -0.1, 0.8, 0.35)
+        bush(12.2, -0.1, 0.65, 0.32)
+        # 花坛/花丛（红/黄/粉）
+        for (fx, fy, colors) in [(2.5, 0.05, ["#E85A5A", "#F0A050"]), (6.5, 0.03, ["#F0C060", "#E87070"]), (10.0, 0.02, ["#E888A0", "#F0B050"])]:
+            for i in range(6):
+                ax.add_patch(patches.Ellipse((fx + 0.15 * (i % 3 - 1), fy + 0.08 * (i // 3)), 0.12, 0.1, facecolor=colors[i % len(colors)], edgecolor="none", alpha=0.85, zorder=2))
+
+        ax.text(W_m / 2, TOP + 2.5, "南立面渲染效果图", ha="center", va="center", fontsize=20, fontweight="bold", color="#4A5A6A", zorder=10)
+        ax.text(W_m / 2, TOP + 2.0, "South Elevation Rendering  |  现代简约风格  |  14m × 11m  |  二层别墅", ha="center", va="center", fontsize=9, color="#8A8A8A", zorder=10)
+        ax.set_xlim(-3, W_m + 3)
+        ax.set_ylim(-1.8, TOP + 3.5)
+        _save_figure(fig, f"{IMG_DIR}/南立面渲染效果图.png", dpi=200, facecolor="#E8F0F8", pad_inches=0.2)
     print("  ✓ 南立面渲染效果图 (PNG)")
 
 
-def _interior_render(title, subtitle, floor_name, rooms, furniture, walls_h, walls_v, windows, filename):
-    """通用室内俯视效果图生成器"""
-    fig, ax = plt.subplots(1,1,figsize=(18,14),dpi=200,facecolor="#F5F2ED")
-    ax.set_facecolor("#F5F2ED"); ax.set_aspect("equal"); ax.axis("off")
-    ax.set_title(title, fontsize=18, fontweight="bold", color="#3A3A3A", pad=8)
-    ax.text(0.5, 0.97, subtitle, transform=ax.transAxes, ha="center", fontsize=9, color="#888", zorder=20)
-    s = _s
-
-    # 外墙
-    for (x,y,w,h) in [(0,0,BW,OW),(0,BH-OW,BW,OW),(0,0,OW,BH),(BW-OW,0,OW,BH)]:
-        ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#3A3A3A",edgecolor="#2A2A2A",linewidth=0.8,zorder=5))
-
-    # 房间填充
-    room_colors = {"客厅":"#D4C8B0","玄关":"#C8BCA8","客餐厅":"#D4C8B0","LDK":"#D4C8B0",
-                   "厨房":"#E8E2D5","主卧":"#D4C8B0","主卫":"#E0E0E0","客卫":"#E0E0E0","公卫":"#E0E0E0",
-                   "楼梯":"#C0B8A8","走廊":"#D8D0C0","次卧":"#D4C8B0","书房":"#D4C8B0",
-                   "阳台":"#C8D8C0","车库":"#B8B8B8","休闲":"#D0C8B8"}
-    for (x,y,w,h,name) in rooms:
-        color = "#D4C8B0"
-        for key, c in room_colors.items():
-            if key in name:
-                color = c; break
-        ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor=color,edgecolor="none",zorder=1))
-
-    # 内墙
-    for (x,y,length) in walls_h:
-        ax.add_patch(patches.Rectangle((s(x),s(y)),s(length),s(IW),facecolor="#3A3A3A",edgecolor="#2A2A2A",linewidth=0.3,zorder=5))
-    for (x,y,length) in walls_v:
-        ax.add_patch(patches.Rectangle((s(x),s(y)),s(IW),s(length),facecolor="#3A3A3A",edgecolor="#2A2A2A",linewidth=0.3,zorder=5))
-
-    # 窗户
-    for (x,y,w,h,orient) in windows:
-        if orient == "h":
-            ax.add_patch(patches.Rectangle((s(x),s(y)-0.04),s(w),0.08,facecolor="#A8C8D8",edgecolor="#7098A8",linewidth=0.8,zorder=6))
-        else:
-            ax.add_patch(patches.Rectangle((s(x)-0.04,s(y)),0.08,s(h),facecolor="#A8C8D8",edgecolor="#7098A8",linewidth=0.8,zorder=6))
-
-    # 家具
-    for item in furniture:
-        kind = item[0]
-        if kind == "bed_d":
-            x,y,w,h = item[1:5]
-            ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#E8E0D5",edgecolor="#B0A898",linewidth=0.6,zorder=4))
-            ax.add_patch(patches.Rectangle((s(x+60),s(y+h-350)),s(w/2-90),s(280),facecolor="#F5F0E8",edgecolor="#C0B8A8",linewidth=0.4,zorder=4))
-            ax.add_patch(patches.Rectangle((s(x+w/2+30),s(y+h-350)),s(w/2-90),s(280),facecolor="#F5F0E8",edgecolor="#C0B8A8",linewidth=0.4,zorder=4))
-        elif kind == "bed_s":
-            x,y,w,h = item[1:5]
-            ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#E8E0D5",edgecolor="#B0A898",linewidth=0.6,zorder=4))
-            ax.add_patch(patches.Rectangle((s(x+60),s(y+h-350)),s(w-120),s(280),facecolor="#F5F0E8",edgecolor="#C0B8A8",linewidth=0.4,zorder=4))
-        elif kind == "sofa":
-            x,y = item[1:3]
-            for (rx,ry,rw,rh) in [(x,y,2800,700),(x+50,y+50,850,580),(x+950,y+50,850,580),(x+2800,y-100,700,800)]:
-                ax.add_patch(patches.Rectangle((s(rx),s(ry)),s(rw),s(rh),facecolor="#8BA87A",edgecolor="#6A8A5A",linewidth=0.5,zorder=4))
-        elif kind == "tv":
-            x,y,w = item[1:4]
-            ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(120),facecolor="#5A5A5A",edgecolor="#3A3A3A",linewidth=0.4,zorder=4))
-        elif kind == "dining":
-            cx,cy = item[1:3]
-            ax.add_patch(patches.Circle((s(cx),s(cy)),s(550),facecolor="#F0E8D8",edgecolor="#C0B8A0",linewidth=0.6,zorder=4))
-            for a in range(0,360,45):
-                px = cx + 750*math.cos(math.radians(a)); py = cy + 750*math.sin(math.radians(a))
-                ax.add_patch(patches.Circle((s(px),s(py)),s(120),facecolor="#A0A0A0",edgecolor="#808080",linewidth=0.3,zorder=4))
-        elif kind == "kitchen_L":
-            x,y,w,h = item[1:5]
-            pts = [(s(x),s(y)),(s(x+w),s(y)),(s(x+w),s(y+550)),(s(x+550),s(y+550)),(s(x+550),s(y+h)),(s(x),s(y+h))]
-            ax.add_patch(plt.Polygon(pts,facecolor="#D8D0C0",edgecolor="#A8A098",linewidth=0.5,closed=True,zorder=4))
-        elif kind == "toilet":
-            x,y = item[1:3]
-            ax.add_patch(patches.Ellipse((s(x),s(y)),s(300),s(240),facecolor="white",edgecolor="#B0B0B0",linewidth=0.5,zorder=4))
-            ax.add_patch(patches.Rectangle((s(x-170),s(y-200)),s(340),s(140),facecolor="white",edgecolor="#B0B0B0",linewidth=0.4,zorder=4))
-        elif kind == "sink":
-            x,y = item[1:3]
-            ax.add_patch(patches.Rectangle((s(x),s(y)),s(450),s(350),facecolor="white",edgecolor="#B0B0B0",linewidth=0.4,zorder=4))
-            ax.add_patch(patches.Circle((s(x+225),s(y+175)),s(70),facecolor="#D0D0D0",edgecolor="#A0A0A0",linewidth=0.3,zorder=4))
-        elif kind == "shower":
-            x,y,sz = item[1:4]
-            ax.add_patch(patches.Rectangle((s(x),s(y)),s(sz),s(sz),facecolor="#E8E8E8",edgecolor="#B0B0B0",linewidth=0.5,zorder=4))
-            ax.add_patch(patches.Circle((s(x+sz/2),s(y+sz/2)),s(160),facecolor="#D0D0D0",edgecolor="#A0A0A0",linewidth=0.4,zorder=4))
-        elif kind == "stairs":
-            x,y,w,h,n = item[1:6]
-            ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#C0B8A8",edgecolor="#A0A098",linewidth=0.6,zorder=4))
-            step = h / n
-            for i in range(1, n):
-                sy2 = y + i * step
-                ax.plot([s(x),s(x+w)],[s(sy2),s(sy2)],color="#A0A098",linewidth=0.3,zorder=4)
-            mx = s(x + w/2)
-            ax.annotate("",xy=(mx,s(y+h)-0.1),xytext=(mx,s(y)+0.1),arrowprops=dict(arrowstyle="->",color="#CC0000",lw=1),zorder=8)
-        elif kind == "wardrobe":
-            x,y,w,h = item[1:5]
-            ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#C8B8A0",edgecolor="#A8A088",linewidth=0.5,zorder=4))
-        elif kind == "desk":
-            x,y,w,h = item[1:5]
-            ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#C8B8A0",edgecolor="#A8A088",linewidth=0.5,zorder=4))
-        elif kind == "door":
-            x,y,r,sa,ea = item[1:6]
+# 效果图点缀（只在俯视效果图上出现，不属于建筑几何）
+INTERIOR_PLANTS = {
+    "一层": [(500, 500), (7500, 500), (500, 6500)],
+    "二层": [(500, 500), (7000, 500), (13000, 500)],
+}
+
+
+def _interior_render(title, subtitle, floor, filename):
+    """通用室内俯视效果图生成器：房间、隔墙、窗、家具、门与灯具取自 floor_layout（与平面图同一份几何）"""
+    p = vars(building_config)
+    rooms = floor_layout.rooms(p, floor)
+    walls_h, walls_v = floor_layout.walls(p, floor)
+    with _figure((18, 14), dpi=200, facecolor="#F5F2ED") as (fig, ax):
+        ax.set_facecolor("#F5F2ED"); ax.set_aspect("equal"); ax.axis("off")
+        ax.set_title(title, fontsize=18, fontweight="bold", color="#3A3A3A", pad=8)
+        ax.text(0.5, 0.97, subtitle, transform=ax.transAxes, ha="center", fontsize=9, color="#888", zorder=20)
+        s = _s
+
+        # 外墙
+        for (x,y,w,h) in [(0,0,BW,OW),(0,BH-OW,BW,OW),(0,0,OW,BH),(BW-OW,0,OW,BH)]:
+            ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#3A3A3A",edgecolor="#2A2A2A",linewidth=0.8,zorder=5))
+
+        # 房间填充
+        room_colors = {"客厅":"#D4C8B0","玄关":"#C8BCA8","客餐厅":"#D4C8B0","LDK":"#D4C8B0",
+                       "厨房":"#E8E2D5","主卧":"#D4C8B0","主卫":"#E0E0E0","客卫":"#E0E0E0","公卫":"#E0E0E0",
+                       "楼梯":"#C0B8A8","走廊":"#D8D0C0","次卧":"#D4C8B0","书房":"#D4C8B0",
+                       "阳台":"#C8D8C0","车库":"#B8B8B8","休闲":"#D0C8B8"}
+        for (name,x,y,w,h) in rooms:
+            color = "#D4C8B0"
+            for key, c in room_colors.items():
+                if key in name:
+                    color = c; break
+            ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor=color,edgecolor="none",zorder=1))
+
+        # 内墙
+        for (x,y,length) in walls_h:
+            ax.add_patch(patches.Rectangle((s(x),s(y)),s(length),s(IW),facecolor="#3A3A3A",edgecolor="#2A2A2A",linewidth=0.3,zorder=5))
+        for (x,y,length) in walls_v:
+            ax.add_patch(patches.Rectangle((s(x),s(y)),s(IW),s(length),facecolor="#3A3A3A",edgecolor="#2A2A2A",linewidth=0.3,zorder=5))
+
+        # 窗户
+        for (x,y,length,axis,_) in floor_layout.plan_windows(p, floor):
+            if axis == "h":
+                ax.add_patch(patches.Rectangle((s(x),s(y)-0.04),s(length),0.08,facecolor="#A8C8D8",edgecolor="#7098A8",linewidth=0.8,zorder=6))
+            else:
+                ax.add_patch(patches.Rectangle((s(x)-0.04,s(y)),0.08,s(length),facecolor="#A8C8D8",edgecolor="#7098A8",linewidth=0.8,zorder=6))
+
+        # 家具（FloorPlan 方法名，见 floor_layout.furniture）
+        for item in floor_layout.furniture(p, floor):
+            kind = item[0]
+            if kind == "bed_double":
+                x,y,w,h = item[1:5]
+                ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#E8E0D5",edgecolor="#B0A898",linewidth=0.6,zorder=4))
+                ax.add_patch(patches.Rectangle((s(x+60),s(y+h-350)),s(w/2-90),s(280),facecolor="#F5F0E8",edgecolor="#C0B8A8",linewidth=0.4,zorder=4))
+                ax.add_patch(patches.Rectangle((s(x+w/2+30),s(y+h-350)),s(w/2-90),s(280),facecolor="#F5F0E8",edgecolor="#C0B8A8",linewidth=0.4,zorder=4))
+            elif kind == "bed_single":
+                x,y,w,h = item[1:5]
+                ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#E8E0D5",edgecolor="#B0A898",linewidth=0.6,zorder=4))
+                ax.add_patch(patches.Rectangle((s(x+60),s(y+h-350)),s(w-120),s(280),facecolor="#F5F0E8",edgecolor="#C0B8A8",linewidth=0.4,zorder=4))
+            elif kind == "sofa_L":
+                x,y = item[1:3]
+                for (rx,ry,rw,rh) in [(x,y,2800,700),(x+50,y+50,850,580),(x+950,y+50,850,580),(x+2800,y-100,700,800)]:
+                    ax.add_patch(patches.Rectangle((s(rx),s(ry)),s(rw),s(rh),facecolor="#8BA87A",edgecolor="#6A8A5A",linewidth=0.5,zorder=4))
+            elif kind == "tv_wall":
+                x,y,w = item[1:4]
+                ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(120),facecolor="#5A5A5A",edgecolor="#3A3A3A",linewidth=0.4,zorder=4))
+            elif kind == "dining_round":
+                cx,cy = item[1:3]
+                ax.add_patch(patches.Circle((s(cx),s(cy)),s(550),facecolor="#F0E8D8",edgecolor="#C0B8A0",linewidth=0.6,zorder=4))
+                for a in range(0,360,45):
+                    px = cx + 750*math.cos(math.radians(a)); py = cy + 750*math.sin(math.radians(a))
+                    ax.add_patch(patches.Circle((s(px),s(py)),s(120),facecolor="#A0A0A0",edgecolor="#808080",linewidth=0.3,zorder=4))
+            elif kind == "kitchen_L":
+                x,y,w,h = item[1:5]
+                pts = [(s(x),s(y)),(s(x+w),s(y)),(s(x+w),s(y+550)),(s(x+550),s(y+550)),(s(x+550),s(y+h)),(s(x),s(y+h))]
+                ax.add_patch(patches.Polygon(pts,facecolor="#D8D0C0",edgecolor="#A8A098",linewidth=0.5,closed=True,zorder=4))
+            elif kind == "toilet":
+                x,y = item[1:3]
+                ax.add_patch(patches.Ellipse((s(x),s(y)),s(300),s(240),facecolor="white",edgecolor="#B0B0B0",linewidth=0.5,zorder=4))
+                ax.add_patch(patches.Rectangle((s(x-170),s(y-200)),s(340),s(140),facecolor="white",edgecolor="#B0B0B0",linewidth=0.4,zorder=4))
+            elif kind == "sink":
+                x,y = item[1:3]
+                ax.add_patch(patches.Rectangle((s(x),s(y)),s(450),s(350),facecolor="white",edgecolor="#B0B0B0",linewidth=0.4,zorder=4))
+                ax.add_patch(patches.Circle((s(x+225),s(y+175)),s(70),facecolor="#D0D0D0",edgecolor="#A0A0A0",linewidth=0.3,zorder=4))
+            elif kind == "shower_room":
+                x,y,sz = item[1:4]
+                ax.add_patch(patches.Rectangle((s(x),s(y)),s(sz),s(sz),facecolor="#E8E8E8",edgecolor="#B0B0B0",linewidth=0.5,zorder=4))
+                ax.add_patch(patches.Circle((s(x+sz/2),s(y+sz/2)),s(160),facecolor="#D0D0D0",edgecolor="#A0A0A0",linewidth=0.4,zorder=4))
+            elif kind == "stairs":
+                x,y,w,h,n = item[1:6]
+                ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#C0B8A8",edgecolor="#A0A098",linewidth=0.6,zorder=4))
+                step = h / n
+                for i in range(1, n):
+                    sy2 = y + i * step
+                    ax.plot([s(x),s(x+w)],[s(sy2),s(sy2)],color="#A0A098",linewidth=0.3,zorder=4)
+                mx = s(x + w/2)
+                ax.annotate("",xy=(mx,s(y+h)-0.1),xytext=(mx,s(y)+0.1),arrowprops=dict(arrowstyle="->",color="#CC0000",lw=1),zorder=8)
+            elif kind == "wardrobe":
+                x,y,w,h = item[1:5]
+                ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#C8B8A0",edgecolor="#A8A088",linewidth=0.5,zorder=4))
+            elif kind == "desk_chair":
+                x,y,w,h = item[1:5]
+                ax.add_patch(patches.Rectangle((s(x),s(y)),s(w),s(h),facecolor="#C8B8A0",edgecolor="#A8A088",linewidth=0.5,zorder=4))
+
+        # 门（开启弧线与 FloorPlan.door_h / door_v 一致）
+        for (x,y,r,axis,flag,_) in floor_layout.doors(p, floor):
+            sa, ea = (0,90) if flag else ((270,360) if axis == "h" else (90,180))
             ax.add_patch(Arc((s(x),s(y)),s(r)*2,s(r)*2,angle=0,theta1=sa,theta2=ea,color="#5A5A5A",linewidth=0.6,zorder=6))
-        elif kind == "label":
-            x,y,text = item[1:4]
-            ax.text(s(x),s(y),text,ha="center",va="center",fontsize=8,fontweight="bold",color="#5A5A5A",zorder=10)
-        elif kind == "light":
-            x,y = item[1:3]
+
+        # 房间名、灯具、绿植
+        for (name,x,y,w,h) in rooms:
+            ax.text(s(x+w/2),s(y+h/2),name,ha="center",va="center",fontsize=8,fontweight="bold",color="#5A5A5A",zorder=10)
+        for (x,y,_) in floor_layout.ELECTRICAL[floor]["lights"]:
             ax.add_patch(patches.Circle((s(x),s(y)),0.06,facecolor="#FFD700",edgecolor="#CC9900",linewidth=0.3,alpha=0.7,zorder=8))
-        elif kind == "plant":
-            x,y = item[1:3]
+        for (x,y) in INTERIOR_PLANTS[floor]:
             ax.add_patch(patches.Circle((s(x),s(y)),0.08,facecolor="#4A8A3A",edgecolor="#3A6A2A",linewidth=0.3,zorder=8))
 
-    ax.set_xlim(-0.5, s(BW)+0.5); ax.set_ylim(-0.5, s(BH)+0.5)
-    fig.savefig(f"{IMG_DIR}/{filename}.png",bbox_inches="tight",pad_inches=0.2,dpi=200,facecolor="#F5F2ED")
-    fig.savefig(f"{IMG_DIR}/{filename}.svg", format='svg', bbox_inches="tight", pad_inches=0.3, facecolor="#F5F2ED")
-    plt.close(fig)
+        ax.set_xlim(-0.5, s(BW)+0.5); ax.set_ylim(-0.5, s(BH)+0.5)
+        _save_figure(fig, f"{IMG_DIR}/{filename}.png", dpi=200, facecolor="#F5F2ED", pad_inches=0.2)
 
 
+@perf.drawing("gen_render_interior_f1")
 def gen_render_interior_f1():
     """一层室内俯视效果图"""
-    X1=F1_X1; Y0=F1_Y0; Y1=F1_Y1; NX1=F1_NX1; NX2=F1_NX2
-
-    rooms = [
-        (OW, OW, X1-OW, Y0-OW, "客厅"),
-        (X1+IW, OW, BW-OW-X1-IW, Y0-OW, "玄关"),
-        (OW, Y0+IW, X1-OW, Y1-Y0-IW, "LDK"),
-        (X1+IW, Y0+IW, BW-OW-X1-IW, Y1-Y0-IW, "主卧"),
-        (OW, Y1+IW, NX1-OW, BH-OW-Y1-IW, "厨房"),
-        (NX1+IW, Y1+IW, NX2-NX1-IW, BH-OW-Y1-IW, "卫浴"),
-        (NX2+IW, Y1+IW, BW-OW-NX2-IW, BH-OW-Y1-IW, "楼梯"),
-    ]
-    walls_h = [(OW,Y0,X1-OW),(X1+IW,Y0,BW-OW-X1-IW),(OW,Y1,BW-2*OW)]
-    walls_v = [(X1,OW,Y1-OW),(NX1,Y1+IW,BH-OW-Y1-IW),(NX2,Y1+IW,BH-OW-Y1-IW)]
-    windows = [
-        (1000,0,5000,OW,"h"),
-        (800,BH,2500,OW,"h"),(NX1+IW+200,BH,1000,OW,"h"),(NX2+IW+1500,BH,3500,OW,"h"),
-        (0,3000,OW,3500,"v"),(0,Y1+IW+500,OW,2500,"v"),
-        (BW,Y0+IW+500,OW,3500,"v"),(BW,Y1+IW+500,OW,2000,"v"),
-    ]
-    furniture = [
-        ("sofa", 800, 3000),
-        ("tv", 1000, Y0+IW+200, 2500),
-        ("dining", 5500, 4800),
-        ("kitchen_L", OW+100, Y1+IW+100, 4300, BH-OW-Y1-IW-200),
-        ("bed_d", X1+IW+800, Y0+IW+1200, 1800, 2000),
-        ("wardrobe", X1+IW+200, Y1-700, BW-OW-X1-IW-400, 500),
-        ("toilet", NX1+IW+400, Y1+IW+500),
-        ("sink", NX1+IW+300, BH-OW-600),
-        ("stairs", NX2+IW+400, Y1+IW+300, 2800, 3000, 14),
-        ("door", X1+IW+1200, OW, 1200, 0, 90),
-        ("door", 3500, Y0, 900, 270, 360),
-        ("door", 2500, Y1+IW, 900, 0, 90),
-        ("label", (OW+X1)/2, (OW+Y0)/2, "客厅"),
-        ("label", (X1+BW)/2, (OW+Y0)/2, "玄关"),
-        ("label", (OW+X1)/2, (Y0+Y1)/2, "客餐厅 LDK"),
-        ("label", (X1+BW)/2, (Y0+Y1)/2, "主卧1"),
-        ("label", (OW+NX1)/2, (Y1+BH)/2, "厨房"),
-        ("label", (NX1+NX2)/2, (Y1+BH)/2, "卫浴"),
-        ("label", (NX2+BW)/2, (Y1+BH)/2, "楼梯间"),
-        ("light", 4000, 1200), ("light", 11000, 1200),
-        ("light", 4000, 4700), ("light", 5500, 4200),
-        ("light", 2500, 9000), ("light", 5700, 9000), ("light", 10500, 9000),
-        ("light", 10500, 4700),
-        ("plant", 500, 500), ("plant", 7500, 500), ("plant", 500, 6500),
-    ]
     _interior_render("一层室内俯视效果图", "Ground Floor Interior Rendering  |  实物家具渲染  |  14m × 11m",
-                     "一层", rooms, furniture, walls_h, walls_v, windows, "一层室内俯视效果图")
+                     "一层", "一层室内俯视效果图")
     print("  ✓ 一层室内俯视效果图 (PNG)")
 
 
+@perf.drawing("gen_render_interior_f2")
 def gen_render_interior_f2():
     """二层室内俯视效果图"""
-    X1=F2_X1; Y0=F2_Y0; Y1=F2_Y1; Y2=F2_Y2
-    NX1=F2_NX1; NX2=F2_NX2; NX3=F2_NX3
-    YM = Y2+IW+(BH-OW-Y2-IW)//2
-
-    rooms = [
-        (OW,OW,BW-2*OW,Y0-OW,"阳台"),
-        (OW,Y0+IW,X1-OW,Y1-Y0-IW,"次卧"),
-        (X1+IW,Y0+IW,BW-OW-X1-IW,Y1-Y0-IW,"多功能区"),
-        (OW,Y1+IW,BW-2*OW,Y2-Y1-IW,"走廊"),
-        (OW,Y2+IW,NX1-OW,BH-OW-Y2-IW,"主卧"),
-        (NX1+IW,Y2+IW,NX2-NX1-IW,BH-OW-Y2-IW,"主卫"),
-        (NX2+IW,Y2+IW,NX3-NX2-IW,BH-OW-Y2-IW,"留空"),
-        (NX3+IW,Y2+IW,BW-OW-NX3-IW,(BH-OW-Y2-IW)//2,"公卫"),
-        (NX3+IW,YM+IW,BW-OW-NX3-IW,(BH-OW-Y2-IW)//2-IW,"楼梯"),
-    ]
-    walls_h = [(OW,Y0,BW-2*OW),(OW,Y1,BW-2*OW),(OW,Y2,BW-2*OW),
-               (NX3+IW,YM,BW-OW-NX3-IW)]
-    walls_v = [(X1,Y0+IW,Y1-Y0-IW),(NX1,Y2+IW,BH-OW-Y2-IW),
-               (NX2,Y2+IW,BH-OW-Y2-IW),(NX3,Y2+IW,BH-OW-Y2-IW)]
-    windows = [
-        (1000,BH,3000,OW,"h"),(NX1+300,BH,1500,OW,"h"),(NX2+500,BH,2000,OW,"h"),
-        (0,8000,OW,2000,"v"),(0,Y0+500,OW,2000,"v"),
-        (1200,Y0,2000,IW,"h"),(5500,Y0,4000,IW,"h"),(10500,Y0,2000,IW,"h"),
-        (BW,8500,OW,2000,"v"),(BW,Y0+500,OW,2500,"v"),
-    ]
-    furniture = [
-        ("bed_d", 1500, 7800, 1800, 2000),
-        ("wardrobe", 400, 10100, 5000, 500),
-        ("toilet", NX1+IW+500, 8000),
-        ("sink", NX1+IW+400, 9600),
-        ("shower", NX1+IW+200, 7500, 900),
-        ("bed_s", 1200, Y0+IW+300, 1200, 2000),
-        ("desk", 1200, Y0+IW+2800, 1400, 550),
-        ("toilet", NX3+IW+400, Y2+IW+400),
-        ("sink", NX3+IW+300, YM-500),
-        ("stairs", NX3+IW+200, YM+IW+200, 2200, BH-OW-YM-IW-400, 13),
-        ("door", 2000, Y1, 800, 270, 360),
-        ("door", X1+IW+2000, Y1, 800, 270, 360),
-        ("door", 2500, Y2+IW, 900, 0, 90),
-        ("door", NX2+IW+500, Y2+IW, 900, 0, 90),
-        ("label", BW/2, Y0/2, "南向大阳台"),
-        ("label", (OW+X1)/2, (Y0+Y1)/2, "次卧"),
-        ("label", (X1+BW)/2, (Y0+Y1)/2, "多功能区"),
-        ("label", BW/2, (Y1+Y2)/2, "走廊"),
-        ("label", (OW+NX1)/2, (Y2+BH)/2, "主卧2"),
-        ("label", (NX1+NX2)/2, (Y2+BH)/2, "主卫2"),
-        ("label", (NX2+NX3)/2, (Y2+BH)/2, "留空区"),
-        ("label", (NX3+BW)/2, (Y2+YM)/2, "公卫"),
-        ("label", (NX3+BW)/2, (YM+BH)/2, "楼梯间"),
-        ("light", 3000, 8800), ("light", 6900, 8500),
-        ("light", 2000, 3500), ("light", 7500, 3500),
-        ("light", 2000, 6200), ("light", 5000, 6200), ("light", 8000, 6200),
-        ("light", 12200, 7800), ("light", 12200, 9500),
-        ("light", 3000, 800), ("light", 7000, 800), ("light", 12000, 800),
-        ("plant", 500, 500), ("plant", 7000, 500), ("plant", 13000, 500),
-    ]
     _interior_render("二层室内俯视效果图", "Second Floor Interior Rendering  |  实物家具渲染  |  14m × 11m",
-                     "二层", rooms, furniture, walls_h, walls_v, windows, "二层室内俯视效果图")
+                     "二层", "二层室内俯视效果图")
     print("  ✓ 二层室内俯视效果图 (PNG)")
 
 
@@ -1621,9 +1356,43 @@ def gen_render():
 # ══════════════════════════════════════════════
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="两层轻奢别墅 — 全套图纸生成")
+    render_quality.add_quality_argument(parser)
+    parser.add_argument("--out", default=os.getcwd(), help="输出根目录（默认当前目录）")
+    parser.add_argument("--package", metavar="PATH",
+                        help="改为直接打包输出到 .zip / .tar / .tar.gz（不写目录树）")
+    parser.add_argument("--writers", type=int, default=2,
+                        help="后台 PNG 压缩/写出线程数（0 = 同步写出）")
+    perf.add_profile_arguments(parser)
+    metrics.add_metrics_arguments(parser)
+    memory_budget.add_budget_argument(parser)
+    tiles.add_tiles_argument(parser)
+    svg_compact.add_svg_argument(parser)
+    native_plot.add_backend_argument(parser)
+    sheet_set.add_pdf_argument(parser)
+    dxf_set.add_dxf_argument(parser)
+    validate.add_validate_argument(parser)
+    parser.add_argument("--summary", metavar="PATH", help="JSON 运行汇总另存到 PATH")
+    args = parser.parse_args()
+    validate.check_from_args(args)
+    render_quality.set_quality(args.quality)
+    memory_budget.set_budget(args.memory_budget)
+    svg_compact.set_mode(args.svg_mode)
+    native_plot.set_backend(args.backend)
+    sheet_set.set_format(args.pdf_set)
+    dxf_set.set_format(args.dxf_set)
+    perf.start_from_args(args)
+    metrics_server = metrics.start_from_args(args)
+    sink = (output_sink.open_archive(args.package) if args.package
+            else output_sink.DirectorySink(args.out))
+    if args.writers > 0:
+        sink = output_sink.BackgroundWriter(sink, workers=args.writers)
+    output_sink.set_sink(sink)
+
     print("=" * 60)
     print("  两层轻奢别墅 — 全套图纸生成")
-    print("  输出目录：图纸/")
+    print(f"  输出目录：图纸/  [{args.quality}]")
     print("=" * 60)
 
     print("\n📐 01-建筑设计")
@@ -1638,21 +1407,33 @@ if __name__ == "__main__":
 
     print("\n⚡ 03-电气设计")
     gen_electrical()
+    if args.pdf_set:
+        with _mpl_style():
+            sheet_set.write(f"{BASE}/图纸集_{args.pdf_set}.pdf", sink)
+    if args.dxf_set:
+        with _dxf(f"{BASE}/图纸集_{args.dxf_set}.dxf") as (doc, msp):
+            dxf_set.write(doc, _DXF_STYLE)
 
     print("\n🎨 04-效果图")
     gen_render()
+    if args.tiles:
+        tiles.export_written(sink, args.tiles)
+    sink.close()   # 等待后台写出完成；写出失败在此抛出
+    perf.finish_from_args(args)
+    metrics.finish_from_args(args, metrics_server)
 
     print(f"\n  字体: {_DXF_FONT_FAMILY} ({_DXF_FONT_FILE})")
     print("\n" + "=" * 60)
     print("  全部完成！")
     print("=" * 60)
 
-    # 打印目录结构
-    print("\n📁 图纸目录结构：")
-    for root, dirs, files in sorted(os.walk(BASE)):
-        level = root.replace(BASE, "").count(os.sep)
-        indent = "  " * level
-        folder = os.path.basename(root)
-        print(f"  {indent}{folder}/")
-        for f in sorted(files):
-            print(f"  {indent}  {f}")
+    # 运行汇总（吞吐、逐图纸耗时与峰值内存、缓存命中率、输出文件）
+    summary = metrics.dumps_summary(
+        quality=args.quality,
+        output=args.package or args.out,
+        files=sorted(p for p in sink.paths if p.startswith(BASE + "/")),
+    )
+    print(summary)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(summary)
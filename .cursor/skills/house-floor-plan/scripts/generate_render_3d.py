@@ -13,7 +13,8 @@
 
 import numpy as np
 from PIL import Image, ImageDraw, ImageFilter, ImageFont
-import math, os, sys, random
+import math, os, sys, random, hashlib, threading
+from collections import OrderedDict
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from building_config import (
@@ -23,10 +24,121 @@ from building_config import (
     SOUTH_WIN, SOUTH_DOOR, EAST_WIN,
     DARK_STONE_X,
 )
+import render_quality
+import output_sink
+import memory_budget
+import metrics
+import perf
+import spec
+import tiles
+import validate
+
+OUT = "docs/images"   # 相对路径，实际写到哪里由 output_sink 当前 sink 决定
+W, H = 3600, 2400     # standard 画布尺寸；其他质量预设按比例缩放
+_PX = 1.0             # 当前渲染的像素缩放系数（内部画布宽 / W）
+SEED = 42             # 基础随机种子：背景（天空云层）直接使用，纹理噪声按方案与视点派生
+_RNG = np.random.default_rng(SEED)   # 当前渲染的纹理随机数发生器（_begin_render 重新播种）
+
+
+def set_seed(seed):
+    global SEED
+    SEED = seed
+
+
+def _derive_seed(*parts):
+    """由任意标识派生 64 位种子（与进程、哈希随机化无关）"""
+    digest = hashlib.sha1(":".join(map(str, parts)).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def px(v):
+    """把按 standard 画布设计的绝对像素量（线宽、模糊半径、纹理尺寸等）换算到当前画布"""
+    return max(1, int(round(v * _PX)))
+
+
+def _begin_render(view):
+    """按当前质量预设确定内部画布尺寸（含超采样），并用 (方案哈希, 视点, SEED)
+    为本次渲染的纹理噪声播种，返回 (w, h)；同一方案同一视点每次渲染逐字节一致"""
+    global _PX, _RNG
+    q = render_quality.preset()
+    _PX = q["scale"] * q["supersample"]
+    _RNG = np.random.default_rng(_derive_seed(spec.current_hash(), view, SEED))
+    return int(W * _PX), int(H * _PX)
+
+
+@perf.timed("finish")
+def _finish_render(fb):
+    """帧缓冲转 PIL（唯一一次整帧拷贝），再超采样缩小抗锯齿（print）或锐化（standard）；
+    条带模式下原样返回帧缓冲，收尾在编码时逐条带完成（_finish_strips）"""
+    if fb.strips:
+        return fb
+    img = fb.to_image()
+    q = render_quality.preset()
+    if q["supersample"] > 1:
+        return img.resize((int(W * q["scale"]), int(H * q["scale"])), Image.LANCZOS)
+    if q["sharpen"]:
+        return img.filter(ImageFilter.SHARPEN)
+    return img
+
 
-OUT = os.path.join(os.getcwd(), "docs", "images")
-os.makedirs(OUT, exist_ok=True)
-W, H = 3600, 2400
+def _finish_strips(fb):
+    """逐条带收尾：返回 (输出尺寸, 条带迭代器)；条带带上下边距，结果与整帧处理一致
+
+    超采样缩小：Pillow 按 box 重采样时会读取 box 外（边距内）的源像素；
+    锐化：3×3 核，整图边缘行原样保留，条带边距行裁掉。
+    """
+    q = render_quality.preset()
+    if q["supersample"] > 1:
+        ow, oh = int(W * q["scale"]), int(H * q["scale"])
+        ratio = fb.h / oh
+        margin = 4 * int(math.ceil(ratio))           # LANCZOS 支撑半径 3×缩放比
+    else:
+        ow, oh, ratio = fb.w, fb.h, 1
+        margin = 1 if q["sharpen"] else 0
+    rows = memory_budget.strip_rows(fb.w, int(6 * ratio * ratio), oh)
+
+    def strips():
+        for oy in range(0, oh, rows):
+            n = min(rows, oh - oy)
+            s0 = max(0, int(oy * ratio) - margin)
+            s1 = min(fb.h, int(math.ceil((oy + n) * ratio)) + margin)
+            src = Image.fromarray(np.asarray(fb.arr[s0:s1]))
+            if ratio != 1:
+                out = src.resize((ow, n), Image.LANCZOS, box=(0, oy * ratio - s0, fb.w, (oy + n) * ratio - s0))
+            elif q["sharpen"]:
+                out = src.filter(ImageFilter.SHARPEN).crop((0, oy - s0, fb.w, oy - s0 + n))
+            else:
+                out = src.crop((0, oy - s0, fb.w, oy - s0 + n))
+            yield np.asarray(out)
+    return (ow, oh), strips()
+
+
+def _save_render(img, name, key=None):
+    """PNG 压缩与写出交给 sink.submit（BackgroundWriter 下与下一张效果图的绘制重叠）；
+    给出 key 时编码结果同时存入渲染缓存"""
+    if isinstance(img, FrameBuffer):
+        size, strips = _finish_strips(img)
+        encode = lambda: output_sink.encode_png_rows("RGB", size, strips)
+    else:
+        raw = img.tobytes()
+        encode = lambda: output_sink.encode_png(img.mode, img.size, raw)
+
+    def encode_and_cache():
+        data = encode()
+        if key is not None:
+            RENDER_CACHE.put(key, data)
+        return data
+    output_sink.get_sink().submit(f"{OUT}/{name}.png", encode_and_cache)
+
+
+def _save_cached(key, name):
+    """渲染缓存命中时直接写出 PNG，返回 True"""
+    data = RENDER_CACHE.get(key)
+    if data is None:
+        return False
+    output_sink.get_sink().write(f"{OUT}/{name}.png", data)
+    print(f"  ✓ {name}（缓存）")
+    return True
 
 
 class Camera:
@@ -66,39 +178,212 @@ def project_quad(cam, pts_3d):
     return pts2d
 
 
-def make_sky(w, h):
-    img = Image.new("RGB", (w, h))
-    draw = ImageDraw.Draw(img)
-    for y in range(h):
-        t = y / h
-        r = int(120 + 100*t); g = int(155 + 80*t); b = int(210 + 40*t)
-        draw.line([(0, y), (w, y)], fill=(min(r,255), min(g,255), min(b,255)))
-    cloud_img = Image.new("RGBA", (w, h), (0,0,0,0))
-    cd = ImageDraw.Draw(cloud_img)
-    random.seed(42)
+# ═══════════════════════════════════════════════════════════
+#  帧缓冲：单块预分配 NumPy 数组 (h, w, 3) uint8
+#  所有图元只在自身包围盒内取局部区域原地混合 —— 不再整帧
+#  RGB↔RGBA 转换、整帧 composite/alpha_composite，也不再每次
+#  合成后重建 ImageDraw。整张渲染只在最终编码时转成 PIL 图像一次。
+# ═══════════════════════════════════════════════════════════
+
+class FrameBuffer:
+    """预分配帧缓冲：实心/纹理多边形填充、线/椭圆/矩形/文字、局部模糊混合
+
+    内存预算模式下（memory_budget）大画布分配在 memmap 上，
+    混合、纹理缩放与柔边模糊按水平条带处理，临时数组不随整幅画布增长。
+    """
+
+    def __init__(self, w, h):
+        self.w = w; self.h = h
+        self.strips = memory_budget.should_strip(w * h * 3)
+        if self.strips:
+            self.arr = memory_budget.scratch_array((h, w, 3))
+        else:
+            self.arr = np.zeros((h, w, 3), dtype=np.uint8)
+
+    def load(self, src):
+        """把背景层（同尺寸数组）拷入缓冲区，不重新分配"""
+        np.copyto(self.arr, src)
+
+    def to_image(self):
+        return Image.fromarray(self.arr)
+
+    # ── 内部工具 ──
+    def _clip(self, x0, y0, x1, y1):
+        x0 = max(0, int(x0)); y0 = max(0, int(y0))
+        x1 = min(self.w, int(x1)); y1 = min(self.h, int(y1))
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1, y1
+
+    def _strips(self, box, bytes_per_px=24, min_rows=0):
+        """把 box 切成水平条带（未启用内存预算时只有一条，即 box 本身）"""
+        x0, y0, x1, y1 = box
+        n = max(min_rows, memory_budget.strip_rows(x1 - x0, bytes_per_px, y1 - y0))
+        for sy in range(y0, y1, n):
+            yield x0, sy, x1, min(y1, sy + n)
+
+    def _blend(self, box, src, alpha):
+        """box 区域内原地 alpha 混合；src 为颜色或与 box 同尺寸的图像，alpha 为 uint8 掩码"""
+        x0, y0, x1, y1 = box
+        solid = np.ndim(src) == 1
+        for _, sy0, _, sy1 in self._strips(box):
+            dst = self.arr[sy0:sy1, x0:x1]
+            a = alpha[sy0 - y0:sy1 - y0].astype(np.uint16)[..., None]
+            s = np.asarray(src if solid else src[sy0 - y0:sy1 - y0], dtype=np.uint16)
+            dst[...] = ((dst * (255 - a) + s * a + 127) // 255).astype(np.uint8)
+
+    def _fill(self, box, color, paint):
+        """按掩码混合纯色：每个条带单独绘制局部掩码"""
+        for sub in self._strips(box):
+            self._blend(sub, color, np.asarray(self._mask(sub, paint)))
+
+    def _soft(self, box, color, blur, paint):
+        """柔边混合：掩码按条带（上下各留 3σ 边距）绘制并高斯模糊，只混合条带本身；
+        条带至少 4 倍边距高，重复模糊的边距开销不超过一半"""
+        x0, y0, x1, y1 = box
+        m = 3 * blur
+        for _, sy0, _, sy1 in self._strips(box, 2, 4 * m):
+            ext = (x0, max(y0, sy0 - m), x1, min(y1, sy1 + m))
+            mask = np.asarray(self._mask(ext, paint).filter(ImageFilter.GaussianBlur(blur)))
+            self._blend((x0, sy0, x1, sy1), color, mask[sy0 - ext[1]:sy1 - ext[1]])
+
+    def _mask(self, box, paint):
+        """在 box 大小的局部 L 掩码上绘制，paint(draw, ox, oy) 负责坐标平移"""
+        x0, y0, x1, y1 = box
+        m = Image.new("L", (x1 - x0, y1 - y0), 0)
+        paint(ImageDraw.Draw(m), x0, y0)
+        return m
+
+    def _paint(self, bounds, paint):
+        """不透明图元：取局部区域转 PIL 绘制后写回"""
+        box = self._clip(*bounds)
+        if box is None:
+            return
+        x0, y0, x1, y1 = box
+        sub = Image.fromarray(self.arr[y0:y1, x0:x1])
+        paint(ImageDraw.Draw(sub), x0, y0)
+        self.arr[y0:y1, x0:x1] = np.asarray(sub)
+
+    # ── 多边形 ──
+    def polygon(self, pts, fill=None, outline=None, width=1, alpha=255):
+        poly = [(int(p[0]), int(p[1])) for p in pts]
+        xs = [p[0] for p in poly]; ys = [p[1] for p in poly]
+        box = self._clip(min(xs) - width, min(ys) - width, max(xs) + width + 1, max(ys) + width + 1)
+        if box is None:
+            return
+
+        def shift(ox, oy):
+            return [(x - ox, y - oy) for x, y in poly]
+        if fill is not None:
+            self._fill(box, fill, lambda d, ox, oy: d.polygon(shift(ox, oy), fill=alpha))
+        if outline is not None:
+            self._fill(box, outline, lambda d, ox, oy: d.polygon(shift(ox, oy), outline=alpha, width=width))
+
+    def textured_polygon(self, pts, texture, alpha=255):
+        """纹理拉伸到多边形包围盒（裁剪到画布内的部分）后按多边形掩码混合"""
+        xs = [p[0] for p in pts]; ys = [p[1] for p in pts]
+        box = self._clip(min(xs), min(ys), int(max(xs)) + 1, int(max(ys)) + 1)
+        if box is None:
+            return
+        x0, y0, x1, y1 = box
+        poly = [(int(p[0]), int(p[1])) for p in pts]
+        sy = texture.height / (y1 - y0)
+        for sub in self._strips(box):
+            r0, r1 = sub[1] - y0, sub[3] - y0
+            m = self._mask(sub, lambda d, ox, oy: d.polygon([(x - ox, y - oy) for x, y in poly], fill=alpha))
+            # 条带只缩放对应的纹理区域（box 参数），Pillow 会读取区域外的支撑像素，接缝处连续
+            if r0 == 0 and sub[3] == y1:
+                tex = texture.resize((x1 - x0, y1 - y0), Image.LANCZOS)
+            else:
+                tex = texture.resize((x1 - x0, r1 - r0), Image.LANCZOS,
+                                     box=(0, r0 * sy, texture.width, r1 * sy))
+            self._blend(sub, np.asarray(tex), np.asarray(m))
+
+    @perf.timed("shadow")
+    def soft_polygon(self, pts, color, alpha, blur):
+        """半透明柔边多边形（阴影）：掩码只在包围盒 + 3σ 边距内模糊"""
+        poly = [(int(p[0]), int(p[1])) for p in pts]
+        xs = [p[0] for p in poly]; ys = [p[1] for p in poly]
+        m = 3 * blur
+        box = self._clip(min(xs) - m, min(ys) - m, max(xs) + m + 1, max(ys) + m + 1)
+        if box is None:
+            return
+        self._soft(box, color, blur,
+                   lambda d, ox, oy: d.polygon([(x - ox, y - oy) for x, y in poly], fill=alpha))
+
+    def soft_ellipse(self, bbox, color, alpha, blur):
+        """半透明柔边椭圆（光晕）"""
+        ex0, ey0, ex1, ey1 = bbox
+        m = 3 * blur
+        box = self._clip(ex0 - m, ey0 - m, ex1 + m + 1, ey1 + m + 1)
+        if box is None:
+            return
+        self._soft(box, color, blur,
+                   lambda d, ox, oy: d.ellipse([ex0 - ox, ey0 - oy, ex1 - ox, ey1 - oy], fill=alpha))
+
+    # ── 不透明图元 ──
+    def line(self, pts, fill, width=1):
+        xs = [p[0] for p in pts]; ys = [p[1] for p in pts]
+        self._paint((min(xs) - width, min(ys) - width, max(xs) + width + 1, max(ys) + width + 1),
+                    lambda d, ox, oy: d.line([(x - ox, y - oy) for x, y in pts], fill=fill, width=width))
+
+    def ellipse(self, bbox, fill):
+        x0, y0, x1, y1 = bbox
+        self._paint((x0, y0, x1 + 1, y1 + 1),
+                    lambda d, ox, oy: d.ellipse([x0 - ox, y0 - oy, x1 - ox, y1 - oy], fill=fill))
+
+    def rectangle(self, bbox, fill, outline=None):
+        x0, y0, x1, y1 = bbox
+        self._paint((x0, y0, x1 + 1, y1 + 1),
+                    lambda d, ox, oy: d.rectangle([x0 - ox, y0 - oy, x1 - ox, y1 - oy],
+                                                  fill=fill, outline=outline))
+
+    def text(self, xy, text, fill, font, anchor="la"):
+        x, y = xy
+        tx0, ty0, tx1, ty1 = font.getbbox(text, anchor=anchor)
+        self._paint((x + tx0 - 1, y + ty0 - 1, x + tx1 + 2, y + ty1 + 2),
+                    lambda d, ox, oy: d.text((x - ox, y - oy), text, fill=fill, font=font, anchor=anchor))
+
+
+@perf.timed("sky")
+def make_sky(fb, seed=42):
+    """天空渐变 + 云层，直接写入帧缓冲"""
+    w, h = fb.w, fb.h
+    t = np.arange(h) / h
+    grad = np.stack([120 + 100*t, 155 + 80*t, 210 + 40*t], axis=1)
+    fb.arr[...] = np.minimum(grad.astype(np.int32), 255).astype(np.uint8)[:, None, :]
+    # 云只出现在上部 35% 区域：掩码只覆盖该条带（含椭圆半径与模糊边距）
+    band = fb._clip(0, 0, w, int(h*0.35) + px(70) + 3*px(15))
+    rng = random.Random(seed)   # 局部发生器，不改动全局 random 状态
+    puffs = []
     for _ in range(8):
-        cx = random.randint(100, w-100); cy = random.randint(50, int(h*0.35))
+        cx = rng.randint(px(100), w-px(100)); cy = rng.randint(px(50), int(h*0.35))
         for __ in range(5):
-            rx = random.randint(40, 120); ry = random.randint(20, 50)
-            dx = random.randint(-80, 80); dy = random.randint(-20, 20)
-            cd.ellipse([cx+dx-rx, cy+dy-ry, cx+dx+rx, cy+dy+ry],
-                       fill=(255, 255, 255, random.randint(30, 70)))
-    cloud_img = cloud_img.filter(ImageFilter.GaussianBlur(15))
-    img.paste(Image.alpha_composite(img.convert("RGBA"), cloud_img).convert("RGB"))
-    return img
+            rx = rng.randint(px(40), px(120)); ry = rng.randint(px(20), px(50))
+            dx = rng.randint(-px(80), px(80)); dy = rng.randint(-px(20), px(20))
+            puffs.append(([cx+dx-rx, cy+dy-ry, cx+dx+rx, cy+dy+ry], rng.randint(30, 70)))
 
+    def clouds(d, ox, oy):
+        for (ex0, ey0, ex1, ey1), a in puffs:
+            d.ellipse([ex0-ox, ey0-oy, ex1-ox, ey1-oy], fill=a)
+    fb._soft(band, (255, 255, 255), px(15), clouds)
 
+
+@perf.timed("texture")
 def make_wall_texture(w, h, base_color=(240, 235, 225), noise_level=5):
+    w, h = px(w), px(h)   # 纹理分辨率随画布缩放
     arr = np.full((h, w, 3), base_color, dtype=np.uint8)
-    noise = np.random.randint(-noise_level, noise_level+1, (h, w, 3))
-    arr = np.clip(arr.astype(int) + noise, 0, 255).astype(np.uint8)
+    noise = _RNG.integers(-noise_level, noise_level+1, (h, w, 3), dtype=np.int16)
+    arr = np.clip(arr.astype(np.int16) + noise, 0, 255).astype(np.uint8)
     for y in range(h):
         factor = 1.0 - (y / h) * 0.08
         arr[y] = np.clip(arr[y] * factor, 0, 255).astype(np.uint8)
     return Image.fromarray(arr)
 
 
+@perf.timed("texture")
 def make_glass_texture(w, h, tint=(80, 130, 170)):
+    w, h = px(w), px(h)
     arr = np.zeros((h, w, 3), dtype=np.uint8)
     for y in range(h):
         t = y / h  # 0=top, 1=bottom
@@ -129,35 +414,246 @@ def make_glass_texture(w, h, tint=(80, 130, 170)):
     return Image.fromarray(arr)
 
 
+@perf.timed("texture")
 def make_dark_texture(w, h, base_color=(55, 52, 48)):
+    w, h = px(w), px(h)
     arr = np.full((h, w, 3), base_color, dtype=np.uint8)
-    noise = np.random.randint(-3, 4, (h, w, 3))
-    return Image.fromarray(np.clip(arr.astype(int) + noise, 0, 255).astype(np.uint8))
+    noise = _RNG.integers(-3, 4, (h, w, 3), dtype=np.int16)
+    return Image.fromarray(np.clip(arr.astype(np.int16) + noise, 0, 255).astype(np.uint8))
 
 
-def draw_textured_quad(img, pts2d, texture, alpha=255):
+@perf.timed("quad.textured")
+def draw_textured_quad(fb, pts2d, texture, alpha=255):
     if pts2d is None or len(pts2d) < 4:
         return
-    xs = [p[0] for p in pts2d]; ys = [p[1] for p in pts2d]
-    x0, x1 = max(0, int(min(xs))), min(img.width, int(max(xs))+1)
-    y0, y1 = max(0, int(min(ys))), min(img.height, int(max(ys))+1)
-    if x1 <= x0 or y1 <= y0:
-        return
-    mask = Image.new("L", img.size, 0)
-    md = ImageDraw.Draw(mask)
-    poly = [(int(p[0]), int(p[1])) for p in pts2d]
-    md.polygon(poly, fill=alpha)
-    tex_resized = texture.resize((x1-x0, y1-y0), Image.LANCZOS)
-    tex_full = Image.new("RGB", img.size, (0,0,0))
-    tex_full.paste(tex_resized, (x0, y0))
-    img.paste(Image.composite(tex_full, img, mask))
+    fb.textured_polygon(pts2d, texture, alpha)
 
 
-def draw_solid_quad(draw, pts2d, color, outline=None, width=1):
+@perf.timed("quad.solid")
+def draw_solid_quad(fb, pts2d, color, outline=None, width=1):
     if pts2d is None or len(pts2d) < 4:
         return
-    poly = [(int(p[0]), int(p[1])) for p in pts2d]
-    draw.polygon(poly, fill=color, outline=outline, width=width)
+    fb.polygon(pts2d, fill=color, outline=outline, width=width)
+
+
+# ═══════════════════════════════════════════════════════════
+#  背景层缓存（天空 + 远山 + 草地条纹）
+#  背景只依赖相机、画布尺寸与随机种子，与建筑本身无关；
+#  同一视点批量渲染多个方案时直接从缓存取底图。
+# ═══════════════════════════════════════════════════════════
+
+BG_CACHE_SIZE = 8                                   # 内存 LRU 容量（张）
+BG_CACHE_DIR = os.environ.get("HOUSE_BG_CACHE_DIR")  # 可选磁盘缓存目录
+
+
+class BackgroundCache:
+    """背景层 LRU 缓存：内存 OrderedDict + 可选磁盘 PNG；可在多个渲染线程间共享"""
+
+    def __init__(self, maxsize=BG_CACHE_SIZE, disk_dir=BG_CACHE_DIR):
+        self.maxsize = maxsize
+        self.disk_dir = disk_dir
+        self.hits = 0; self.misses = 0
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"bg-{digest}.png")
+
+    def get(self, key, build):
+        """返回 key 对应的背景数组（只读，调用方用 FrameBuffer.load 拷入）；未命中时调用 build() 生成并缓存"""
+        with self._lock:
+            arr = self._mem.get(key)
+            if arr is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+        if arr is not None:
+            metrics.inc("cache_requests_total", cache="background", result="hit")
+            return arr
+        hit = False
+        if self.disk_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                with Image.open(path) as f:
+                    arr = np.asarray(f.convert("RGB"))
+                hit = True
+        if arr is None:
+            arr = build()
+            if self.disk_dir:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                path = self._disk_path(key)
+                tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                Image.fromarray(arr).save(tmp, format="PNG")
+                os.replace(tmp, path)
+        metrics.inc("cache_requests_total", cache="background", result="hit" if hit else "miss")
+        arr.flags.writeable = False
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._mem[key] = arr
+            self._mem.move_to_end(key)
+            if len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+        return arr
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            self.hits = 0; self.misses = 0
+
+
+BG_CACHE = BackgroundCache()
+
+
+# ═══════════════════════════════════════════════════════════
+#  成品渲染缓存
+#  渲染完全由 (方案, 相机, 质量, 种子, 渲染器代码) 决定；
+#  方案变体批量出图时，未变化的视点直接取缓存 PNG，不再绘制与编码。
+# ═══════════════════════════════════════════════════════════
+
+RENDER_CACHE_BYTES = 256 << 20                              # 内存 LRU 容量（PNG 字节数）
+RENDER_CACHE_DIR = os.environ.get("HOUSE_RENDER_CACHE_DIR")  # 可选磁盘缓存目录（多 worker 共享）
+
+
+def _source_digest(*modules):
+    """渲染相关源码的摘要：本文件、质量预设与分条/内存策略任一变化即令缓存失效"""
+    h = hashlib.sha1()
+    for path in (os.path.abspath(__file__),) + tuple(m.__file__ for m in modules):
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:12]
+
+
+_RENDERER_VERSION = _source_digest(render_quality, memory_budget)
+
+
+class RenderCache:
+    """成品 PNG 缓存：内存 OrderedDict（按字节数淘汰）+ 可选磁盘目录；put 可在后台写出线程调用"""
+
+    def __init__(self, max_bytes=RENDER_CACHE_BYTES, disk_dir=RENDER_CACHE_DIR):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._mem = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"render-{digest}.png")
+
+    def get(self, key):
+        with self._lock:
+            data = self._mem.get(key)
+            if data is not None:
+                self._mem.move_to_end(key)
+        if data is None and self.disk_dir and os.path.exists(self._disk_path(key)):
+            with open(self._disk_path(key), "rb") as f:
+                data = f.read()
+            self._remember(key, data)
+        metrics.inc("cache_requests_total", cache="render", result="miss" if data is None else "hit")
+        return data
+
+    def _remember(self, key, data):
+        with self._lock:
+            if key in self._mem:
+                self._size -= len(self._mem.pop(key))
+            self._mem[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and self._mem:
+                self._size -= len(self._mem.popitem(last=False)[1])
+
+    def put(self, key, data):
+        self._remember(key, data)
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self._disk_path(key)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            self._size = 0
+
+
+RENDER_CACHE = RenderCache()
+
+
+def _render_key(view, cam):
+    """(视点, 方案哈希, 相机, 质量, 种子, 渲染器版本)"""
+    return (view, spec.current_hash(),
+            tuple(round(float(v), 6) for v in cam.pos),
+            tuple(round(float(v), 6) for v in cam.target),
+            cam.fov, cam.w, cam.h, render_quality.get_quality(), SEED, _RENDERER_VERSION)
+
+
+def _bg_key(view, cam, gy, seed):
+    return (view, tuple(round(float(v), 6) for v in cam.pos),
+            tuple(round(float(v), 6) for v in cam.target),
+            cam.fov, cam.w, cam.h, gy, seed)
+
+
+def _draw_grass(fb, y0, base_color=(110, 145, 95)):
+    y0 = max(0, y0)
+    fb.arr[y0:] = base_color
+    # 草地条纹纹理：每隔15像素（standard）一条水平线，交替稍浅/稍深
+    step = px(15)
+    for k, delta in enumerate((10, -10)):
+        stripe_color = tuple(min(255, max(0, base_color[i] + delta)) for i in range(3))
+        fb.arr[y0 + k*step::2*step] = stripe_color
+
+
+def _south_background(fb, cam, gy, seed=42):
+    w, h = cam.w, cam.h
+    make_sky(fb, seed)
+    # 远山
+    for layer, (base, amp, freq, phase, color) in enumerate([
+        (h*0.32, px(80), [6,10,15], [0,1,2], (140,155,140)),
+        (h*0.36, px(60), [5,8], [0.5,2], (160,172,158)),
+    ]):
+        pts = []
+        for i in range(w+1):
+            t = i / w
+            y_off = sum(a * math.sin(t*f+p) for a, f, p in
+                        zip([amp*0.6/(j+1) for j in range(len(freq))], freq, phase))
+            pts.append((i, int(base - y_off)))
+        pts += [(w, h//2), (0, h//2)]
+        fb.polygon(pts, fill=color)
+    _draw_grass(fb, gy)
+
+
+def _southeast_background(fb, cam, gy, seed=42):
+    w, h = cam.w, cam.h
+    make_sky(fb, seed)
+    # 远山
+    mpts = [(0, h//2)]
+    for i in range(w+1):
+        t = i / w
+        y_off = (0.5*math.sin(t*5+0.5)*70 + 0.3*math.sin(t*9+2)*60) * _PX
+        mpts.append((i, int(h*0.33 - y_off)))
+    mpts.append((w, h//2))
+    fb.polygon(mpts, fill=(150, 162, 148))
+    _draw_grass(fb, gy-px(30))
+
+
+@perf.timed("background")
+def background_layer(fb, view, cam, gy, seed=42):
+    """按 (视点, 相机, 画布尺寸, 地平线, 种子) 取缓存背景拷入 fb；
+    条带模式（大画布）下直接画进 fb，不在内存里多留一整幅"""
+    build = {"south": _south_background, "southeast": _southeast_background}[view]
+    if fb.strips:
+        build(fb, cam, gy, seed)
+        return
+
+    def make():
+        layer = FrameBuffer(cam.w, cam.h)
+        build(layer, cam, gy, seed)
+        return layer.arr
+    fb.load(BG_CACHE.get(_bg_key(view, cam, gy, seed), make))
 
 
 # 建筑尺寸（米） — 从 building_config 统一导入
@@ -178,38 +674,38 @@ def roof_face(x0, z0, x1, z1, y):
     return [(x0, y, z0), (x1, y, z0), (x1, y, z1), (x0, y, z1)]
 
 
-def _draw_window(cam, img, x, y, w, h, face_fn, divs_v=2, divs_h=1, glass_tint=(75,125,165)):
+@perf.timed("window")
+def _draw_window(cam, fb, x, y, w, h, face_fn, divs_v=2, divs_h=1, glass_tint=(75,125,165)):
     ft = 0.06
     frame = project_quad(cam, face_fn(x-ft, y-ft, x+w+ft, y+h+ft))
-    draw = ImageDraw.Draw(img)
-    draw_solid_quad(draw, frame, (55, 52, 48))
+    draw_solid_quad(fb, frame, (55, 52, 48))
     glass = project_quad(cam, face_fn(x, y, x+w, y+h))
-    draw_textured_quad(img, glass, make_glass_texture(200, 300, glass_tint))
-    draw = ImageDraw.Draw(img)
+    draw_textured_quad(fb, glass, make_glass_texture(200, 300, glass_tint))
     for i in range(1, divs_v):
         frac = i * w / divs_v
         p3a = list(face_fn(x+frac, y, x+frac, y+h))
         p1 = cam.project(p3a[0]); p2 = cam.project(p3a[3])
         if p1 and p2:
-            draw.line([(int(p1[0]),int(p1[1])),(int(p2[0]),int(p2[1]))], fill=(55,52,48), width=2)
+            fb.line([(int(p1[0]),int(p1[1])),(int(p2[0]),int(p2[1]))], fill=(55,52,48), width=px(2))
     for i in range(1, divs_h):
         frac = i * h / divs_h
         p3a = list(face_fn(x, y+frac, x+w, y+frac))
         p1 = cam.project(p3a[0]); p2 = cam.project(p3a[1])
         if p1 and p2:
-            draw.line([(int(p1[0]),int(p1[1])),(int(p2[0]),int(p2[1]))], fill=(55,52,48), width=2)
+            fb.line([(int(p1[0]),int(p1[1])),(int(p2[0]),int(p2[1]))], fill=(55,52,48), width=px(2))
 
 
-def _draw_tree(draw, cam, pos3d, trunk_h=2.5, crown_r=1.2, color=(55,110,45)):
+@perf.timed("landscape")
+def _draw_tree(fb, cam, pos3d, trunk_h=2.5, crown_r=1.2, color=(55,110,45)):
     base = cam.project(pos3d)
     top_p = cam.project((pos3d[0], pos3d[1]+trunk_h, pos3d[2]))
     if not base or not top_p:
         return
     bx, by = int(base[0]), int(base[1])
     tx, ty = int(top_p[0]), int(top_p[1])
-    trunk_w = max(4, int(abs(bx-tx)*0.08+4))
-    draw.rectangle([bx-trunk_w, ty, bx+trunk_w, by], fill=(100, 75, 55))
-    scale = max(20, int(crown_r * 600 / base[2]))
+    trunk_w = max(px(4), int(abs(bx-tx)*0.08) + px(4))
+    fb.rectangle([bx-trunk_w, ty, bx+trunk_w, by], fill=(100, 75, 55))
+    scale = max(px(20), int(crown_r * 600 * _PX / base[2]))
     # 5层椭圆叠加，底层最深顶层最浅，每层有基于位置的伪随机偏移
     seed = pos3d[0] * 7.3 + pos3d[1] * 11.1 + pos3d[2] * 13.7
     for i, (dy_base, r_ratio, cs) in enumerate([
@@ -221,15 +717,16 @@ def _draw_tree(draw, cam, pos3d, trunk_h=2.5, crown_r=1.2, color=(55,110,45)):
         r = int(scale * r_ratio)
         c = tuple(min(255, color[j] + cs) for j in range(3))
         ex, ey = tx + off_x, ty + dy_base + off_y
-        draw.ellipse([ex - int(r*1.1), ey - int(r*0.8), ex + int(r*1.1), ey + int(r*0.8)], fill=c)
+        fb.ellipse([ex - int(r*1.1), ey - int(r*0.8), ex + int(r*1.1), ey + int(r*0.8)], fill=c)
 
 
-def _draw_bush(draw, cam, pos3d, size=0.5, color=(65,125,55)):
+@perf.timed("landscape")
+def _draw_bush(fb, cam, pos3d, size=0.5, color=(65,125,55)):
     bp = cam.project(pos3d)
     if not bp:
         return
     bpx, bpy = int(bp[0]), int(bp[1])
-    s = max(10, int(size * 500 / bp[2]))
+    s = max(px(10), int(size * 500 * _PX / bp[2]))
     # 5个椭圆叠加，颜色变化更大
     seed = pos3d[0] * 5.2 + pos3d[2] * 8.1
     for i, (dx_frac, rx_ratio, ry_ratio, cs) in enumerate([
@@ -239,15 +736,12 @@ def _draw_bush(draw, cam, pos3d, size=0.5, color=(65,125,55)):
         dx = int(s * dx_frac) + int(s * 0.05 * math.sin(seed + i))
         rx, ry = int(s * rx_ratio), int(s * ry_ratio)
         c = tuple(min(255, max(0, color[j] + cs)) for j in range(3))
-        draw.ellipse([bpx+dx-rx, bpy-ry, bpx+dx+rx, bpy+ry//2], fill=c)
+        fb.ellipse([bpx+dx-rx, bpy-ry, bpx+dx+rx, bpy+ry//2], fill=c)
 
 
-def _add_glow(img, x, y, radius=25, color=(255,240,200), alpha=30):
-    glow = Image.new("RGBA", img.size, (0,0,0,0))
-    gd = ImageDraw.Draw(glow)
-    gd.ellipse([x-radius, y-radius, x+radius, y+radius], fill=(*color, alpha))
-    glow = glow.filter(ImageFilter.GaussianBlur(radius//2))
-    return Image.alpha_composite(img.convert("RGBA"), glow).convert("RGB")
+@perf.timed("glow")
+def _add_glow(fb, x, y, radius=25, color=(255,240,200), alpha=30):
+    fb.soft_ellipse([x-radius, y-radius, x+radius, y+radius], color, alpha, radius//2)
 
 
 def _get_fonts():
@@ -255,7 +749,7 @@ def _get_fonts():
     bold = os.path.join(_font_dir, "NotoSansSC-Subset-Bold.ttf")
     regular = os.path.join(_font_dir, "NotoSansSC-Subset.ttf")
     try:
-        return ImageFont.truetype(bold, 64), ImageFont.truetype(regular, 30)
+        return ImageFont.truetype(bold, px(64)), ImageFont.truetype(regular, px(30))
     except Exception:
         pass
     return ImageFont.load_default(), ImageFont.load_default()
@@ -265,172 +759,139 @@ def _get_fonts():
 #  南立面正面透视效果图
 # ═══════════════════════════════════════════════════════════
 
+@perf.drawing("perspective_south")
 def generate_south_perspective():
-    cam = Camera(pos=(BW/2, F1H*0.8, -22), target=(BW/2, F1H*0.9, 0), fov=42)
-    img = make_sky(W, H)
-    draw = ImageDraw.Draw(img)
-
-    # 远山
-    for layer, (base, amp, freq, phase, color) in enumerate([
-        (H*0.32, 80, [6,10,15], [0,1,2], (140,155,140)),
-        (H*0.36, 60, [5,8], [0.5,2], (160,172,158)),
-    ]):
-        pts = []
-        for i in range(W+1):
-            t = i / W
-            y_off = sum(a * math.sin(t*f+p) for a, f, p in
-                        zip([amp*0.6/(j+1) for j in range(len(freq))], freq, phase))
-            pts.append((i, int(base - y_off)))
-        pts += [(W, H//2), (0, H//2)]
-        draw.polygon(pts, fill=color)
-
-    # 地面 — 先画一个大区域
-    # 建筑底部位置
+    W, H = _begin_render("south")
+    cam = Camera(pos=(BW/2, F1H*0.8, -22), target=(BW/2, F1H*0.9, 0), fov=42, w=W, h=H)
+    key = _render_key("south", cam)
+    if _save_cached(key, "南立面透视效果图"):
+        return
+    # 地面 — 建筑底部位置
     base_pt = cam.project((BW/2, 0, 0))
     gy = int(base_pt[1]) if base_pt else int(H*0.7)
-    base_color = (110, 145, 95)
-    draw.rectangle([0, gy, W, H], fill=base_color)
-    # 草地条纹纹理：每隔15像素画一条水平线，交替稍浅/稍深
-    for y in range(gy, H, 15):
-        delta = 10 if ((y - gy) // 15) % 2 == 0 else -10
-        stripe_color = tuple(min(255, max(0, base_color[i] + delta)) for i in range(3))
-        draw.line([(0, y), (W, y)], fill=stripe_color)
+    # 天空 + 远山 + 草地（缓存背景层）
+    fb = FrameBuffer(W, H)
+    background_layer(fb, "south", cam, gy, SEED)
     # 建筑正下方前景阴影：半透明深色梯度
     pt_left = cam.project((0, 0, 0))
     pt_right = cam.project((BW, 0, 0))
     if pt_left and pt_right:
-        bx0 = max(0, int(min(pt_left[0], pt_right[0])) - 40)
-        bx1 = min(W, int(max(pt_left[0], pt_right[0])) + 40)
-        shadow_layer = Image.new("RGBA", (W, H), (0, 0, 0, 0))
-        sd = ImageDraw.Draw(shadow_layer)
-        sd.polygon([(bx0, gy), (bx1, gy), (bx1, H), (bx0, H)], fill=(0, 0, 0, 35))
-        shadow_layer = shadow_layer.filter(ImageFilter.GaussianBlur(25))
-        img = Image.alpha_composite(img.convert("RGBA"), shadow_layer).convert("RGB")
-        draw = ImageDraw.Draw(img)
+        bx0 = max(0, int(min(pt_left[0], pt_right[0])) - px(40))
+        bx1 = min(W, int(max(pt_left[0], pt_right[0])) + px(40))
+        fb.soft_polygon([(bx0, gy), (bx1, gy), (bx1, H), (bx0, H)], (0, 0, 0), 35, px(25))
 
     # 院子
     yard = project_quad(cam, south_face(-2, -0.01, BW+2, 0))
     if yard:
-        draw_solid_quad(draw, yard, (195, 185, 165))
+        draw_solid_quad(fb, yard, (195, 185, 165))
 
     # ── 建筑 ──
     # 一层底座
-    draw_textured_quad(img, project_quad(cam, south_face(0, 0, BW, BASE_H)),
+    draw_textured_quad(fb, project_quad(cam, south_face(0, 0, BW, BASE_H)),
                        make_dark_texture(600, 100, (55, 52, 48)))
     # 一层墙
-    draw_textured_quad(img, project_quad(cam, south_face(0, BASE_H, BW, F1_TOP)),
+    draw_textured_quad(fb, project_quad(cam, south_face(0, BASE_H, BW, F1_TOP)),
                        make_wall_texture(600, 400, (242, 237, 228)))
     # 腰线
-    draw_textured_quad(img, project_quad(cam, south_face(-0.05, F1_TOP-0.05, BW+0.05, F2_BOT+0.05)),
+    draw_textured_quad(fb, project_quad(cam, south_face(-0.05, F1_TOP-0.05, BW+0.05, F2_BOT+0.05)),
                        make_dark_texture(600, 50, (65, 60, 55)))
     # 二层墙
-    draw_textured_quad(img, project_quad(cam, south_face(0, F2_BOT, BW, F2_TOP)),
+    draw_textured_quad(fb, project_quad(cam, south_face(0, F2_BOT, BW, F2_TOP)),
                        make_wall_texture(600, 400, (245, 240, 230)))
     # 女儿墙
-    draw_textured_quad(img, project_quad(cam, south_face(0, ROOF, BW, TOP)),
+    draw_textured_quad(fb, project_quad(cam, south_face(0, ROOF, BW, TOP)),
                        make_wall_texture(600, 100, (235, 230, 220)))
-    draw = ImageDraw.Draw(img)
-    draw_solid_quad(draw, project_quad(cam, south_face(-0.08, TOP-0.1, BW+0.08, TOP)), (60, 56, 52))
+    draw_solid_quad(fb, project_quad(cam, south_face(-0.08, TOP-0.1, BW+0.08, TOP)), (60, 56, 52))
 
     # ── 窗户 — 从 building_config.SOUTH_WIN 统一读取 ──
     for (x, y, w, h, divs) in SOUTH_WIN:
-        _draw_window(cam, img, x, y, w, h, south_face, divs_v=divs)
+        _draw_window(cam, fb, x, y, w, h, south_face, divs_v=divs)
 
-    draw = ImageDraw.Draw(img)
 
-    draw_textured_quad(img, project_quad(cam, south_face(DARK_STONE_X, BASE_H, BW, F1_TOP)),
+    draw_textured_quad(fb, project_quad(cam, south_face(DARK_STONE_X, BASE_H, BW, F1_TOP)),
                        make_dark_texture(400, 400, (50, 45, 38)))
-    draw = ImageDraw.Draw(img)
 
     door_x, door_y, door_w, door_h = SOUTH_DOOR[0]
-    draw_solid_quad(draw, project_quad(cam, south_face(door_x-0.1, BASE_H, door_x+door_w+0.1, BASE_H+door_h+0.1)),
+    draw_solid_quad(fb, project_quad(cam, south_face(door_x-0.1, BASE_H, door_x+door_w+0.1, BASE_H+door_h+0.1)),
                     (45, 42, 38))
-    draw_textured_quad(img, project_quad(cam, south_face(door_x, BASE_H, door_x+door_w, BASE_H+door_h)),
+    draw_textured_quad(fb, project_quad(cam, south_face(door_x, BASE_H, door_x+door_w, BASE_H+door_h)),
                        make_dark_texture(150, 300, (50, 45, 40)))
-    draw = ImageDraw.Draw(img)
     for i in range(4):
         py = BASE_H + 0.2 + i * 0.65
         for j in range(2):
-            px = door_x + 0.08 + j * 0.68
-            draw_solid_quad(draw, project_quad(cam, south_face(px, py, px+0.58, py+0.55)),
+            xm = door_x + 0.08 + j * 0.68
+            draw_solid_quad(fb, project_quad(cam, south_face(xm, py, xm+0.58, py+0.55)),
                             (60, 55, 50), outline=(50, 45, 40))
     hp = cam.project((door_x + door_w - 0.2, BASE_H + door_h*0.45, 0))
     if hp:
-        draw.ellipse([int(hp[0])-4, int(hp[1])-8, int(hp[0])+4, int(hp[1])+8], fill=(200, 175, 120))
+        fb.ellipse([int(hp[0])-px(4), int(hp[1])-px(8), int(hp[0])+px(4), int(hp[1])+px(8)], fill=(200, 175, 120))
 
     # 雨棚
     canopy_x, canopy_w = door_x - 0.8, 3.0
     canopy_y = BASE_H + door_h + 0.15
-    draw_solid_quad(draw, project_quad(cam, south_face(canopy_x, canopy_y, canopy_x+canopy_w, canopy_y+0.12)),
+    draw_solid_quad(fb, project_quad(cam, south_face(canopy_x, canopy_y, canopy_x+canopy_w, canopy_y+0.12)),
                     (55, 52, 48))
-    for px in [canopy_x+0.1, canopy_x+canopy_w-0.2]:
-        draw_solid_quad(draw, project_quad(cam, south_face(px, BASE_H, px+0.1, canopy_y)), (55, 52, 48))
+    for xm in [canopy_x+0.1, canopy_x+canopy_w-0.2]:
+        draw_solid_quad(fb, project_quad(cam, south_face(xm, BASE_H, xm+0.1, canopy_y)), (55, 52, 48))
 
     # 台阶
     for i in range(4):
         sx = door_x - 0.3 - i*0.15; sw = door_w + 0.6 + i*0.3
         sy = -i * 0.12
         c = 195 - i*10
-        draw_solid_quad(draw, project_quad(cam, south_face(sx, sy, sx+sw, sy+0.12)), (c, c-5, c-12))
+        draw_solid_quad(fb, project_quad(cam, south_face(sx, sy, sx+sw, sy+0.12)), (c, c-5, c-12))
 
     # ── 阳台玻璃栏杆 ──
     railing_bot = F1_TOP + 0.25; railing_top = F2_BOT
-    draw_solid_quad(draw, project_quad(cam, south_face(0.2, railing_top-0.04, BW-0.2, railing_top)),
+    draw_solid_quad(fb, project_quad(cam, south_face(0.2, railing_top-0.04, BW-0.2, railing_top)),
                     (100, 100, 100))
     n_panels = 8
     for i in range(n_panels+1):
-        px = 0.3 + i * (BW-0.6) / n_panels
-        draw_solid_quad(draw, project_quad(cam, south_face(px-0.02, railing_bot, px+0.02, railing_top)),
+        xm = 0.3 + i * (BW-0.6) / n_panels
+        draw_solid_quad(fb, project_quad(cam, south_face(xm-0.02, railing_bot, xm+0.02, railing_top)),
                         (90, 90, 90))
     for i in range(n_panels):
         px0 = 0.3 + i * (BW-0.6) / n_panels + 0.04
         px1 = 0.3 + (i+1) * (BW-0.6) / n_panels - 0.04
         gp = project_quad(cam, south_face(px0, railing_bot+0.04, px1, railing_top-0.06))
         if gp:
-            draw_textured_quad(img, gp, make_glass_texture(100, 80, (160, 190, 210)), alpha=100)
-    draw = ImageDraw.Draw(img)
+            draw_textured_quad(fb, gp, make_glass_texture(100, 80, (160, 190, 210)), alpha=100)
 
     # ── 景观 ──
-    _draw_tree(draw, cam, (-3, 0, -1), 3.0, 1.5, (50, 105, 40))
-    _draw_tree(draw, cam, (-1.5, 0, -2), 2.0, 0.9, (60, 115, 48))
-    _draw_tree(draw, cam, (BW+3, 0, -1), 3.5, 1.8, (48, 100, 38))
-    _draw_tree(draw, cam, (BW+1.5, 0, -2), 2.0, 1.0, (55, 110, 45))
+    _draw_tree(fb, cam, (-3, 0, -1), 3.0, 1.5, (50, 105, 40))
+    _draw_tree(fb, cam, (-1.5, 0, -2), 2.0, 0.9, (60, 115, 48))
+    _draw_tree(fb, cam, (BW+3, 0, -1), 3.5, 1.8, (48, 100, 38))
+    _draw_tree(fb, cam, (BW+1.5, 0, -2), 2.0, 1.0, (55, 110, 45))
     for bpos in [(1,0,-0.5), (5,0,-0.5), (9,0,-0.5), (13,0,-0.5)]:
-        _draw_bush(draw, cam, bpos, 0.5, (65, 125, 55))
+        _draw_bush(fb, cam, bpos, 0.5, (65, 125, 55))
 
     # 花盆
     for fx in [2.0, 4.5, 7.0, 9.5, 12.0]:
         fp = cam.project((fx, railing_bot-0.05, 0))
         if fp:
-            px, py = int(fp[0]), int(fp[1])
-            draw.rectangle([px-8, py-12, px+8, py], fill=(170, 110, 75))
-            draw.ellipse([px-12, py-22, px+12, py-8], fill=(70, 140, 55))
+            cx, py = int(fp[0]), int(fp[1])
+            fb.rectangle([cx-px(8), py-px(12), cx+px(8), py], fill=(170, 110, 75))
+            fb.ellipse([cx-px(12), py-px(22), cx+px(12), py-px(8)], fill=(70, 140, 55))
 
     # 门灯光晕
     for lx in [door_x - 0.3, door_x + door_w + 0.3]:
         lp = cam.project((lx, BASE_H + door_h * 0.7, 0))
         if lp:
-            px, py = int(lp[0]), int(lp[1])
-            img = _add_glow(img, px, py, 25, (255,240,200), 30)
-            draw = ImageDraw.Draw(img)
-            draw.rectangle([px-4, py-8, px+4, py+2], fill=(220, 200, 160), outline=(180,160,120))
+            lpx, lpy = int(lp[0]), int(lp[1])
+            _add_glow(fb, lpx, lpy, px(25), (255,240,200), 30)
+            fb.rectangle([lpx-px(4), lpy-px(8), lpx+px(4), lpy+px(2)], fill=(220, 200, 160), outline=(180,160,120))
 
     # 地面阴影
-    shadow = Image.new("RGBA", (W, H), (0,0,0,0))
-    sd = ImageDraw.Draw(shadow)
-    sd.polygon([(0, gy), (int(W*0.05), H), (int(W*0.95), H), (W, gy)], fill=(0,0,0,20))
-    shadow = shadow.filter(ImageFilter.GaussianBlur(30))
-    img = Image.alpha_composite(img.convert("RGBA"), shadow).convert("RGB")
-    draw = ImageDraw.Draw(img)
+    fb.soft_polygon([(0, gy), (int(W*0.05), H), (int(W*0.95), H), (W, gy)], (0, 0, 0), 20, px(30))
 
     # 标题
     ft, fs = _get_fonts()
-    draw.text((W//2, 50), "南立面透视效果图", fill=(50, 65, 80), font=ft, anchor="mt")
-    draw.text((W//2, 100), "现代简约别墅  |  14m × 11m  |  2主卧+1次卧  |  建筑面积 308㎡",
+    fb.text((W//2, px(50)), "南立面透视效果图", fill=(50, 65, 80), font=ft, anchor="mt")
+    fb.text((W//2, px(100)), "现代简约别墅  |  14m × 11m  |  2主卧+1次卧  |  建筑面积 308㎡",
               fill=(120, 135, 150), font=fs, anchor="mt")
 
-    img = img.filter(ImageFilter.SHARPEN)
-    img.save(f"{OUT}/南立面透视效果图.png", quality=95)
+    img = _finish_render(fb)
+    _save_render(img, "南立面透视效果图", key)
     print("  ✓ 南立面透视效果图")
 
 
@@ -438,107 +899,90 @@ def generate_south_perspective():
 #  东南角透视效果图
 # ═══════════════════════════════════════════════════════════
 
+@perf.drawing("perspective_southeast")
 def generate_southeast_perspective():
-    cam = Camera(pos=(-8, F1H*1.0, -18), target=(BW*0.45, F1H*0.7, BD*0.3), fov=48)
-    img = make_sky(W, H)
-    draw = ImageDraw.Draw(img)
-
-    # 远山
-    mpts = [(0, H//2)]
-    for i in range(W+1):
-        t = i / W
-        y_off = 0.5*math.sin(t*5+0.5)*70 + 0.3*math.sin(t*9+2)*60
-        mpts.append((i, int(H*0.33 - y_off)))
-    mpts.append((W, H//2))
-    draw.polygon(mpts, fill=(150, 162, 148))
-
+    W, H = _begin_render("southeast")
+    cam = Camera(pos=(-8, F1H*1.0, -18), target=(BW*0.45, F1H*0.7, BD*0.3), fov=48, w=W, h=H)
+    key = _render_key("southeast", cam)
+    if _save_cached(key, "东南角透视效果图"):
+        return
     # 地面
     base_pt = cam.project((BW/2, 0, BD/2))
     gy = int(base_pt[1]) if base_pt else int(H*0.65)
-    base_color = (110, 145, 95)
-    draw.rectangle([0, gy-30, W, H], fill=base_color)
-    # 草地条纹纹理：每隔15像素画一条水平线
-    for y in range(gy-30, H, 15):
-        delta = 10 if ((y - (gy-30)) // 15) % 2 == 0 else -10
-        stripe_color = tuple(min(255, max(0, base_color[i] + delta)) for i in range(3))
-        draw.line([(0, y), (W, y)], fill=stripe_color)
+    # 天空 + 远山 + 草地（缓存背景层）
+    fb = FrameBuffer(W, H)
+    background_layer(fb, "southeast", cam, gy, SEED)
 
     # 院子
     yard = project_quad(cam, [(-1, 0.01, -2), (BW+1, 0.01, -2), (BW+1, 0.01, 0), (-1, 0.01, 0)])
     if yard:
-        draw_solid_quad(draw, yard, (195, 185, 165))
+        draw_solid_quad(fb, yard, (195, 185, 165))
 
     # ── 南面 ──
-    draw_textured_quad(img, project_quad(cam, south_face(0, 0, BW, BASE_H)),
+    draw_textured_quad(fb, project_quad(cam, south_face(0, 0, BW, BASE_H)),
                        make_dark_texture(600, 80, (55, 52, 48)))
-    draw_textured_quad(img, project_quad(cam, south_face(0, BASE_H, BW, F1_TOP)),
+    draw_textured_quad(fb, project_quad(cam, south_face(0, BASE_H, BW, F1_TOP)),
                        make_wall_texture(600, 400, (242, 237, 228)))
-    draw_textured_quad(img, project_quad(cam, south_face(-0.05, F1_TOP-0.05, BW+0.05, F2_BOT+0.05)),
+    draw_textured_quad(fb, project_quad(cam, south_face(-0.05, F1_TOP-0.05, BW+0.05, F2_BOT+0.05)),
                        make_dark_texture(600, 40, (62, 58, 53)))
-    draw_textured_quad(img, project_quad(cam, south_face(0, F2_BOT, BW, F2_TOP)),
+    draw_textured_quad(fb, project_quad(cam, south_face(0, F2_BOT, BW, F2_TOP)),
                        make_wall_texture(600, 400, (245, 240, 230)))
-    draw_textured_quad(img, project_quad(cam, south_face(0, ROOF, BW, TOP)),
+    draw_textured_quad(fb, project_quad(cam, south_face(0, ROOF, BW, TOP)),
                        make_wall_texture(600, 80, (235, 230, 220)))
-    draw = ImageDraw.Draw(img)
-    draw_solid_quad(draw, project_quad(cam, south_face(-0.06, TOP-0.08, BW+0.06, TOP)), (58, 55, 50))
+    draw_solid_quad(fb, project_quad(cam, south_face(-0.06, TOP-0.08, BW+0.06, TOP)), (58, 55, 50))
 
     # ── 东面 ──
-    draw_textured_quad(img, project_quad(cam, east_face(0, 0, BD, BASE_H)),
+    draw_textured_quad(fb, project_quad(cam, east_face(0, 0, BD, BASE_H)),
                        make_dark_texture(500, 80, (50, 47, 43)))
-    draw_textured_quad(img, project_quad(cam, east_face(0, BASE_H, BD, F1_TOP)),
+    draw_textured_quad(fb, project_quad(cam, east_face(0, BASE_H, BD, F1_TOP)),
                        make_wall_texture(500, 400, (228, 223, 215)))
-    draw_textured_quad(img, project_quad(cam, east_face(-0.05, F1_TOP-0.05, BD+0.05, F2_BOT+0.05)),
+    draw_textured_quad(fb, project_quad(cam, east_face(-0.05, F1_TOP-0.05, BD+0.05, F2_BOT+0.05)),
                        make_dark_texture(500, 40, (58, 54, 49)))
-    draw_textured_quad(img, project_quad(cam, east_face(0, F2_BOT, BD, F2_TOP)),
+    draw_textured_quad(fb, project_quad(cam, east_face(0, F2_BOT, BD, F2_TOP)),
                        make_wall_texture(500, 400, (232, 227, 218)))
-    draw_textured_quad(img, project_quad(cam, east_face(0, ROOF, BD, TOP)),
+    draw_textured_quad(fb, project_quad(cam, east_face(0, ROOF, BD, TOP)),
                        make_wall_texture(500, 80, (225, 220, 212)))
-    draw = ImageDraw.Draw(img)
-    draw_solid_quad(draw, project_quad(cam, east_face(-0.05, TOP-0.08, BD+0.05, TOP)), (55, 52, 47))
+    draw_solid_quad(fb, project_quad(cam, east_face(-0.05, TOP-0.08, BD+0.05, TOP)), (55, 52, 47))
 
     # 屋顶 (无挑高体量，平屋顶)
-    draw_solid_quad(draw, project_quad(cam, roof_face(0, 0, BW, BD, TOP)), (200, 195, 185),
+    draw_solid_quad(fb, project_quad(cam, roof_face(0, 0, BW, BD, TOP)), (200, 195, 185),
                     outline=(180,175,165))
 
     # ── 南面窗户 — 从 building_config.SOUTH_WIN 统一读取 ──
     for (x, y, w, h, divs) in SOUTH_WIN:
-        _draw_window(cam, img, x, y, w, h, south_face, divs_v=divs)
+        _draw_window(cam, fb, x, y, w, h, south_face, divs_v=divs)
 
     # 右侧深色石材区域
-    draw_textured_quad(img, project_quad(cam, south_face(DARK_STONE_X, BASE_H, BW, F1_TOP)),
+    draw_textured_quad(fb, project_quad(cam, south_face(DARK_STONE_X, BASE_H, BW, F1_TOP)),
                        make_dark_texture(400, 400, (50, 45, 38)))
 
     # ── 东面窗户 — 从 building_config.EAST_WIN 统一读取 ──
     def east_face_win(z0, y0, z1, y1):
         return [(BW, y0, z0), (BW, y0, z1), (BW, y1, z1), (BW, y1, z0)]
     for (x, y, w, h, divs) in EAST_WIN:
-        _draw_window(cam, img, x, y, w, h, east_face_win, divs_v=divs, glass_tint=(70,118,155))
-
-    draw = ImageDraw.Draw(img)
+        _draw_window(cam, fb, x, y, w, h, east_face_win, divs_v=divs, glass_tint=(70,118,155))
 
     # 大门 — 从 building_config.SOUTH_DOOR 统一读取
     door_x, door_y, door_w, door_h = SOUTH_DOOR[0]
-    draw_solid_quad(draw, project_quad(cam, south_face(door_x-0.1, BASE_H, door_x+door_w+0.1, BASE_H+door_h+0.1)),
+    draw_solid_quad(fb, project_quad(cam, south_face(door_x-0.1, BASE_H, door_x+door_w+0.1, BASE_H+door_h+0.1)),
                     (42, 40, 36))
-    draw_textured_quad(img, project_quad(cam, south_face(door_x, BASE_H, door_x+door_w, BASE_H+door_h)),
+    draw_textured_quad(fb, project_quad(cam, south_face(door_x, BASE_H, door_x+door_w, BASE_H+door_h)),
                        make_dark_texture(120, 250, (48, 43, 38)))
-    draw = ImageDraw.Draw(img)
 
     # 阳台栏杆
     railing_bot = F1_TOP + 0.25; railing_top = F2_BOT
-    draw_solid_quad(draw, project_quad(cam, south_face(0.2, railing_top-0.04, BW-0.2, railing_top)),
+    draw_solid_quad(fb, project_quad(cam, south_face(0.2, railing_top-0.04, BW-0.2, railing_top)),
                     (95, 95, 95))
     for i in range(9):
-        px = 0.3 + i * (BW-0.6) / 8
-        draw_solid_quad(draw, project_quad(cam, south_face(px-0.02, railing_bot, px+0.02, railing_top)),
+        xm = 0.3 + i * (BW-0.6) / 8
+        draw_solid_quad(fb, project_quad(cam, south_face(xm-0.02, railing_bot, xm+0.02, railing_top)),
                         (85, 85, 85))
     for i in range(8):
         px0 = 0.3 + i * (BW-0.6) / 8 + 0.04
         px1 = 0.3 + (i+1) * (BW-0.6) / 8 - 0.04
         gp = project_quad(cam, south_face(px0, railing_bot+0.04, px1, railing_top-0.06))
         if gp:
-            draw_textured_quad(img, gp, make_glass_texture(80, 60, (155, 185, 205)), alpha=90)
-    draw = ImageDraw.Draw(img)
+            draw_textured_quad(fb, gp, make_glass_texture(80, 60, (155, 185, 205)), alpha=90)
 
     # 轮廓线
     edge_pairs = [
@@ -550,35 +994,64 @@ def generate_southeast_perspective():
     for a, b in edge_pairs:
         p1 = cam.project(a); p2 = cam.project(b)
         if p1 and p2:
-            draw.line([(int(p1[0]),int(p1[1])),(int(p2[0]),int(p2[1]))], fill=(60,58,55), width=2)
+            fb.line([(int(p1[0]),int(p1[1])),(int(p2[0]),int(p2[1]))], fill=(60,58,55), width=px(2))
 
     # 景观
-    _draw_tree(draw, cam, (-3, 0, -1), 3.0, 1.5, (50, 105, 40))
-    _draw_tree(draw, cam, (-1.5, 0, -2), 2.0, 0.9, (60, 115, 48))
-    _draw_tree(draw, cam, (BW+3, 0, BD+2), 3.5, 1.8, (48, 100, 38))
-    _draw_tree(draw, cam, (BW+1, 0, BD+3), 2.0, 1.0, (55, 110, 45))
-    _draw_tree(draw, cam, (-2, 0, BD+1), 2.5, 1.2, (52, 108, 42))
+    _draw_tree(fb, cam, (-3, 0, -1), 3.0, 1.5, (50, 105, 40))
+    _draw_tree(fb, cam, (-1.5, 0, -2), 2.0, 0.9, (60, 115, 48))
+    _draw_tree(fb, cam, (BW+3, 0, BD+2), 3.5, 1.8, (48, 100, 38))
+    _draw_tree(fb, cam, (BW+1, 0, BD+3), 2.0, 1.0, (55, 110, 45))
+    _draw_tree(fb, cam, (-2, 0, BD+1), 2.5, 1.2, (52, 108, 42))
     for bpos in [(1,0,-0.5),(5,0,-0.5),(9,0,-0.5),(13,0,-0.5),
                   (BW+0.5,0,2),(BW+0.5,0,5),(BW+0.5,0,8)]:
-        _draw_bush(draw, cam, bpos, 0.5, (65, 125, 55))
+        _draw_bush(fb, cam, bpos, 0.5, (65, 125, 55))
 
     # 标题
     ft, fs = _get_fonts()
-    draw.text((W//2, 50), "东南角透视效果图", fill=(50, 65, 80), font=ft, anchor="mt")
-    draw.text((W//2, 100), "Southeast Perspective  |  现代简约别墅  |  14m × 11m  |  建筑面积 308㎡",
+    fb.text((W//2, px(50)), "东南角透视效果图", fill=(50, 65, 80), font=ft, anchor="mt")
+    fb.text((W//2, px(100)), "Southeast Perspective  |  现代简约别墅  |  14m × 11m  |  建筑面积 308㎡",
               fill=(120, 135, 150), font=fs, anchor="mt")
 
-    img = img.filter(ImageFilter.SHARPEN)
-    img.save(f"{OUT}/东南角透视效果图.png", quality=95)
+    img = _finish_render(fb)
+    _save_render(img, "东南角透视效果图", key)
     print("  ✓ 东南角透视效果图")
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="3D透视渲染效果图")
+    render_quality.add_quality_argument(parser)
+    parser.add_argument("--out", default=os.getcwd(), help="输出根目录（默认当前目录）")
+    parser.add_argument("--writers", type=int, default=1,
+                        help="后台 PNG 压缩/写出线程数（0 = 同步写出）")
+    perf.add_profile_arguments(parser)
+    metrics.add_metrics_arguments(parser)
+    memory_budget.add_budget_argument(parser)
+    tiles.add_tiles_argument(parser)
+    parser.add_argument("--seed", type=int, default=SEED, help="基础随机种子（云层、纹理噪声）")
+    validate.add_validate_argument(parser)
+    args = parser.parse_args()
+    validate.check_from_args(args)
+    render_quality.set_quality(args.quality)
+    set_seed(args.seed)
+    memory_budget.set_budget(args.memory_budget)
+    perf.start_from_args(args)
+    metrics_server = metrics.start_from_args(args)
+    sink = output_sink.DirectorySink(args.out)
+    if args.writers > 0:
+        sink = output_sink.BackgroundWriter(sink, workers=args.writers)
+    output_sink.set_sink(sink)
+
     print("=" * 55)
-    print("  3D透视渲染效果图")
+    print(f"  3D透视渲染效果图  [{args.quality}]")
     print("=" * 55)
     generate_south_perspective()
     generate_southeast_perspective()
+    if args.tiles:
+        tiles.export_written(sink, args.tiles)
+    sink.close()
+    perf.finish_from_args(args)
+    metrics.finish_from_args(args, metrics_server)
     print("=" * 55)
     print("  完成！")
     print("=" * 55)
@@ -0,0 +1,308 @@
+"""
+图像回归 — 比较出图的 PNG（docs/images）与基准图集，输出差异热力图与 HTML 报告
+
+  python image_diff.py 基准/docs/images docs/images                 # 只在终端列出结果
+  python image_diff.py 基准/docs/images docs/images --report diff/  # diff/index.html + 热力图
+  python image_diff.py a.png b.png --tolerance 24 --max-ratio 0.001
+
+有图像未通过时退出码 1。逐图结果：
+  same      像素完全相同（字节相同的文件连解码都省掉）
+  pass      有差异，但超过 --tolerance 的像素比例 ≤ --max-ratio 且 SSIM ≥ --min-ssim
+  fail      超出上述阈值
+  size      尺寸不同；missing / new 只在一侧存在
+
+  - 像素差异：两图按 uint8 直接求逐像素最大通道差（max − min，不转浮点），超过 --tolerance
+    视为变化像素。差异图按 2×2 取最大值逐级缩小成金字塔（最大值不会漏掉单像素变化），
+    到 TILE 一级得到变化块网格；热力图用同一金字塔中宽度不超过 HEAT_WIDTH 的一级
+  - 感知差异：灰度 SSIM（7×7 均值窗），只在变化块（外扩半个窗口）上按全分辨率计算，
+    变化块超过 DENSE 时整幅计算一次；未变化的块 SSIM 为 1，全图 SSIM 为各块按面积加权平均。
+    不用缩小后的图估算 SSIM：细线在同一个缩小格内平移 1 px，缩小后两图完全相同
+  - 热力图：新图淡化为浅灰作底，变化像素按差值由橙到红着色
+  - 多张图用 --jobs 个进程并行比较；报告中的原图直接引用两侧文件，不另存副本
+"""
+
+import argparse
+import html
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+TOLERANCE = 16                  # 通道差不超过此值的像素视为相同（抗锯齿抖动）
+MAX_RATIO = 0.0                 # 变化像素占比上限
+MIN_SSIM = 0.999                # 全图 SSIM 下限
+TILE = 64                       # 变化块边长（px，2 的幂）
+DENSE = 0.25                    # 变化块超过此比例时整幅计算一次 SSIM 图
+WINDOW = 7                      # SSIM 均值窗边长
+HEAT_WIDTH = 1600               # 热力图最大宽度（px）
+_C1, _C2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+
+
+# ══════════════════════════════════════════════
+#  SSIM
+# ══════════════════════════════════════════════
+
+def _box(x, r):
+    """(2r+1)² 均值滤波（积分图，'valid' 区域）"""
+    s = np.cumsum(np.cumsum(np.pad(x, ((1, 0), (1, 0))), 0), 1)
+    k = 2 * r + 1
+    return (s[k:, k:] - s[:-k, k:] - s[k:, :-k] + s[:-k, :-k]) / (k * k)
+
+
+def ssim_map(a, b):
+    """灰度图（uint8 / float 二维数组）→ 同尺寸 SSIM 图（边缘反射填充）"""
+    r = WINDOW // 2
+    a = np.pad(a.astype(np.float64), r, mode="reflect")
+    b = np.pad(b.astype(np.float64), r, mode="reflect")
+    ma, mb = _box(a, r), _box(b, r)
+    va, vb, cov = _box(a * a, r) - ma * ma, _box(b * b, r) - mb * mb, _box(a * b, r) - ma * mb
+    return ((2 * ma * mb + _C1) * (2 * cov + _C2)) / ((ma * ma + mb * mb + _C1) * (va + vb + _C2))
+
+
+def _tile_means(m, size):
+    """SSIM 图按 size × size 分块求均值 → 块网格"""
+    rows = np.add.reduceat(m, np.arange(0, m.shape[0], size), axis=0)
+    sums = np.add.reduceat(rows, np.arange(0, m.shape[1], size), axis=1)
+    h = np.diff(np.append(np.arange(0, m.shape[0], size), m.shape[0]))
+    w = np.diff(np.append(np.arange(0, m.shape[1], size), m.shape[1]))
+    return sums / np.outer(h, w)
+
+
+def _max_pyramid(diff):
+    """差异图按 2×2 取最大值逐级缩小 → [全分辨率, 1/2, 1/4, …, 1/TILE]（边缘补 0）"""
+    h, w = diff.shape
+    pad = np.zeros((-(-h // TILE) * TILE, -(-w // TILE) * TILE), np.uint8)
+    pad[:h, :w] = diff
+    levels = [pad]
+    while levels[-1].shape[0] > pad.shape[0] // TILE:
+        m = levels[-1]
+        levels.append(m.reshape(m.shape[0] // 2, 2, m.shape[1] // 2, 2).max(axis=(1, 3)))
+    return levels
+
+
+def _tile_ssim(a, b, changed):
+    """变化块的全分辨率 SSIM（其余块为 1）→ 块网格"""
+    scores = np.ones(changed.shape)
+    if changed.sum() > DENSE * changed.size:
+        scores[changed] = _tile_means(ssim_map(a, b), TILE)[changed]
+        return scores
+    r = WINDOW // 2
+    for i, j in np.argwhere(changed):
+        y0, x0 = i * TILE, j * TILE
+        y1, x1 = min(y0 + TILE, a.shape[0]), min(x0 + TILE, a.shape[1])
+        ya, xa = max(y0 - r, 0), max(x0 - r, 0)
+        m = ssim_map(a[ya:y1 + r, xa:x1 + r], b[ya:y1 + r, xa:x1 + r])
+        scores[i, j] = m[y0 - ya:y1 - ya, x0 - xa:x1 - xa].mean()
+    return scores
+
+
+# ══════════════════════════════════════════════
+#  比较单张图
+# ══════════════════════════════════════════════
+
+def _load(path):
+    img = Image.open(path)
+    return img.convert("RGB") if img.mode != "RGB" else img
+
+
+def _same_bytes(a, b):
+    if os.path.getsize(a) != os.path.getsize(b):
+        return False
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        return fa.read() == fb.read()
+
+
+def _heatmap(path, new, pyramid, tol):
+    """新图淡化为底，变化像素着色；取差异金字塔中宽度不超过 HEAT_WIDTH 的一级"""
+    w, h = new.size
+    level = next(i for i, m in enumerate(pyramid) if -(-w >> i) <= HEAT_WIDTH or i == len(pyramid) - 1)
+    gray = new.convert("L")
+    base = np.asarray(gray.reduce(1 << level) if level else gray, dtype=np.float32)
+    diff = pyramid[level][:base.shape[0], :base.shape[1]]
+    light = (255 - (255 - base) * 0.3).astype(np.uint8)
+    out = np.repeat(light[:, :, None], 3, axis=2)
+    hot = diff > tol
+    t = diff[hot].astype(np.float32) / 255
+    out[hot] = np.stack([np.full_like(t, 255), 180 * (1 - t) ** 2, np.zeros_like(t)], axis=1).astype(np.uint8)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    Image.fromarray(out).save(path, compress_level=1)
+
+
+def compare(old_path, new_path, tol=TOLERANCE, max_ratio=MAX_RATIO, min_ssim=MIN_SSIM, heatmap=None):
+    """比较两张 PNG → 结果 dict；heatmap 给出路径且有差异时写热力图"""
+    t0 = time.perf_counter()
+    result = {"status": "same", "changed": 0, "ratio": 0.0, "max_diff": 0, "ssim": 1.0}
+    if not _same_bytes(old_path, new_path):
+        old, new = _load(old_path), _load(new_path)
+        result["size"] = [list(old.size), list(new.size)]
+        if old.size != new.size:
+            result.update(status="size", ssim=None)
+        else:
+            a, b = np.asarray(old), np.asarray(new)
+            if not np.array_equal(a, b):
+                diff = (np.maximum(a, b) - np.minimum(a, b)).max(axis=2)
+                h, w = diff.shape
+                pyramid = _max_pyramid(diff)
+                changed = pyramid[-1] > tol
+                count = int(np.count_nonzero(diff > tol))
+                scores = _tile_ssim(np.asarray(old.convert("L")), np.asarray(new.convert("L")), changed)
+                area = np.outer(np.diff(np.append(np.arange(0, h, TILE), h)),
+                                np.diff(np.append(np.arange(0, w, TILE), w)))
+                ssim = float((scores * area).sum() / (h * w))
+                ratio = count / (h * w)
+                result.update(status="pass" if ratio <= max_ratio and ssim >= min_ssim else "fail",
+                              changed=count, ratio=round(ratio, 6), max_diff=int(diff.max()),
+                              ssim=round(ssim, 5), tiles=int(changed.sum()))
+                if heatmap and count:
+                    _heatmap(heatmap, new, pyramid, tol)
+                    result["heatmap"] = heatmap
+    result["seconds"] = round(time.perf_counter() - t0, 3)
+    return result
+
+
+# ══════════════════════════════════════════════
+#  目录比较 + 报告
+# ══════════════════════════════════════════════
+
+def _pairs(old, new):
+    """→ [(名称, 旧路径或 None, 新路径或 None)]；两个参数都是文件时比较这一对"""
+    if os.path.isfile(old) and os.path.isfile(new):
+        return [(os.path.basename(new), old, new)]
+
+    def scan(root):
+        found = {}
+        for d, _, files in os.walk(root):
+            for f in files:
+                if f.lower().endswith(".png"):
+                    p = os.path.join(d, f)
+                    found[os.path.relpath(p, root)] = p
+        return found
+    a, b = scan(old), scan(new)
+    return [(rel, a.get(rel), b.get(rel)) for rel in sorted(set(a) | set(b))]
+
+
+def _job(args):
+    rel, old, new, tol, max_ratio, min_ssim, report = args
+    heat = report and os.path.join(report, "heatmaps", os.path.splitext(rel)[0] + "_diff.png")
+    return rel, compare(old, new, tol, max_ratio, min_ssim, heat)
+
+
+def compare_sets(old, new, tol=TOLERANCE, max_ratio=MAX_RATIO, min_ssim=MIN_SSIM, report=None, jobs=None):
+    """比较两个图集 → {名称: 结果}（结果含 old / new 路径）"""
+    results, work = {}, []
+    for rel, a, b in _pairs(old, new):
+        if a is None or b is None:
+            results[rel] = {"status": "new" if a is None else "missing"}
+        else:
+            work.append((rel, a, b, tol, max_ratio, min_ssim, report))
+    jobs = min(jobs or os.cpu_count() or 1, len(work))
+    if jobs > 1:
+        methods = mp.get_all_start_methods()
+        ctx = mp.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(jobs, mp_context=ctx) as pool:
+            results.update(pool.map(_job, work))
+    else:
+        results.update(map(_job, work))
+    for rel, a, b in _pairs(old, new):
+        results[rel].update(old=a, new=b)
+    return dict(sorted(results.items()))
+
+
+_CSS = """body{font-family:sans-serif;margin:24px;color:#222}
+table{border-collapse:collapse}td,th{border-bottom:1px solid #ddd;padding:6px 10px;text-align:left;vertical-align:top}
+.fail,.size,.missing,.new{color:#c0392b;font-weight:bold}.pass{color:#b9770e}.same{color:#1e8449}
+img{width:360px;border:1px solid #ccc;background:#fff}figure{display:inline-block;margin:0 8px 8px 0}
+figcaption{font-size:12px;color:#666}"""
+
+
+def write_report(report, results, seconds):
+    """report/index.html：汇总表 + 有差异的图并排显示基准、新图与热力图"""
+    def src(p):
+        return html.escape(os.path.relpath(p, report).replace(os.sep, "/"))
+
+    counts = {}
+    for r in results.values():
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    rows = []
+    for rel, r in results.items():
+        s = r["status"]
+        cells = [f"<td>{html.escape(rel)}</td>", f'<td class="{s}">{s}</td>']
+        if "changed" in r:
+            ssim = "" if r["ssim"] is None else f"{r['ssim']:.5f}"
+            cells += [f"<td>{r['changed']}</td>", f"<td>{r['ratio'] * 100:.4f}%</td>",
+                      f"<td>{r['max_diff']}</td>", f"<td>{ssim}</td>"]
+        else:
+            cells += ["<td></td>"] * 4
+        figures = []
+        if s not in ("same",):
+            for label, p in (("基准", r.get("old")), ("新图", r.get("new")), ("差异", r.get("heatmap"))):
+                if p:
+                    figures.append(f'<figure><a href="{src(p)}"><img loading="lazy" src="{src(p)}"></a>'
+                                   f"<figcaption>{label}</figcaption></figure>")
+        cells.append(f"<td>{''.join(figures)}</td>")
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+    summary = "，".join(f"{k} {v}" for k, v in sorted(counts.items()))
+    page = (f'<!DOCTYPE html><html lang="zh"><head><meta charset="utf-8"><title>图像回归</title>'
+            f"<style>{_CSS}</style></head><body><h1>图像回归</h1><p>{len(results)} 张：{summary}（{seconds} s）</p>"
+            "<table><tr><th>图</th><th>结果</th><th>变化像素</th><th>占比</th><th>最大差</th><th>SSIM</th><th></th></tr>"
+            f"{''.join(rows)}</table></body></html>")
+    os.makedirs(report, exist_ok=True)
+    with open(os.path.join(report, "index.html"), "w", encoding="utf-8") as f:
+        f.write(page)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="比较出图 PNG 与基准图集：像素 + SSIM 差异、热力图与 HTML 报告")
+    ap.add_argument("golden", help="基准图集目录或 PNG 文件")
+    ap.add_argument("new", help="新出图目录（如 docs/images）或 PNG 文件")
+    ap.add_argument("--tolerance", type=int, default=TOLERANCE,
+                    help=f"通道差不超过此值的像素视为相同（默认 {TOLERANCE}）")
+    ap.add_argument("--max-ratio", type=float, default=MAX_RATIO,
+                    help=f"允许的变化像素占比（默认 {MAX_RATIO:g}）")
+    ap.add_argument("--min-ssim", type=float, default=MIN_SSIM, help=f"全图 SSIM 下限（默认 {MIN_SSIM:g}）")
+    ap.add_argument("--report", metavar="DIR", help="输出 DIR/index.html 与 DIR/heatmaps/ 热力图")
+    ap.add_argument("--json", metavar="PATH", help="完整结果另存为 JSON")
+    ap.add_argument("--jobs", type=int, default=None, help="并行进程数（默认 CPU 核数）")
+    args = ap.parse_args(argv)
+    for p in (args.golden, args.new):
+        if not os.path.exists(p):
+            ap.error(f"路径不存在: {p}")
+
+    t0 = time.perf_counter()
+    results = compare_sets(args.golden, args.new, args.tolerance, args.max_ratio, args.min_ssim,
+                           args.report, args.jobs)
+    seconds = round(time.perf_counter() - t0, 2)
+    failed = 0
+    for rel, r in results.items():
+        s = r["status"]
+        if s == "same":
+            continue
+        failed += s != "pass"
+        mark = "~" if s == "pass" else "✗"
+        if "changed" in r and s != "size":
+            print(f"  {mark} {rel}: {s}  变化像素 {r['changed']}（{r['ratio'] * 100:.4f}%）"
+                  f"  最大差 {r['max_diff']}  SSIM {r['ssim']:.5f}")
+        elif s == "size":
+            print(f"  {mark} {rel}: 尺寸 {r['size'][0]} → {r['size'][1]}")
+        else:
+            print(f"  {mark} {rel}: {'只在新图集中' if s == 'new' else '新图集中缺失'}")
+    if args.report:
+        write_report(args.report, results, seconds)
+        print(f"  报告: {os.path.join(args.report, 'index.html')}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"images": results, "failed": failed, "seconds": seconds}, f, ensure_ascii=False, indent=2)
+    if failed:
+        print(f"  ✗ {failed} / {len(results)} 张图未通过（{seconds} s）")
+        return 1
+    print(f"  ✓ {len(results)} 张图通过（{seconds} s）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
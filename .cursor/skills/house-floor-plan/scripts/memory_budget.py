@@ -0,0 +1,131 @@
+"""
+内存预算 — 大画布条带渲染与并发重任务限流（generate_all.py / generate_render_3d.py / serve.py 共用）
+
+  python generate_all.py --memory-budget 2G
+  python generate_render_3d.py --quality poster --memory-budget 1.5G
+  HOUSE_MEMORY_BUDGET=3G python serve.py --http 8765
+
+启用预算（或使用 poster 预设）后：
+  - matplotlib 图纸按水平条带多次光栅化，写入内存映射（memmap）的整幅缓冲区，
+    PNG 从缓冲区逐行流式编码，不再同时持有 Agg 画布、RGBA 副本与编码副本
+  - 3D 帧缓冲分配在 memmap 上，局部混合 / 纹理缩放 / 柔边模糊按条带处理，
+    收尾（锐化、超采样缩小）在编码时逐条带完成；背景层不再放入内存缓存
+  - serve.py 按估计的单图峰值内存决定同时派发的任务数（MemoryGate）
+
+memmap 文件放在 HOUSE_SCRATCH_DIR（默认系统临时目录）；容器里 /tmp 若是 tmpfs
+（占用内存），应把它指向真实磁盘。峰值内存随条带大小（预算的 1/16）而非整幅画布增长。
+"""
+
+import asyncio
+import os
+import re
+import tempfile
+
+import numpy as np
+
+import render_quality
+
+_budget = None          # 字节；None 表示不限
+
+
+def parse_size(text):
+    """'2G' / '1.5g' / '512M' / '800000000' → 字节数"""
+    m = re.fullmatch(r"\s*([\d.]+)\s*([kmgt]?)i?b?\s*", str(text), re.I)
+    if not m:
+        raise ValueError(f"无法解析内存大小: {text!r}（例：2G、512M）")
+    return int(float(m.group(1)) * 1024 ** " kmgt".index(m.group(2).lower() or " "))
+
+
+def set_budget(nbytes):
+    """设置内存预算（字节或 '2G' 形式的字符串；None 取消）"""
+    global _budget
+    _budget = parse_size(nbytes) if isinstance(nbytes, str) else nbytes
+
+
+def get_budget():
+    return _budget
+
+
+def active():
+    """是否启用条带渲染：设置了预算，或当前质量预设要求（poster）"""
+    return _budget is not None or render_quality.preset().get("strips", False)
+
+
+def strip_bytes():
+    """单个条带工作集上限：预算的 1/16，限制在 8–128 MB；poster 未设预算时按 2 GB 计"""
+    budget = _budget if _budget is not None else 2 << 30
+    return min(128 << 20, max(8 << 20, budget // 16))
+
+
+def strip_rows(width, bytes_per_px, total_rows):
+    """条带行数；未启用时返回 total_rows（整块处理，与原实现逐字节一致）"""
+    if not active():
+        return total_rows
+    return max(16, min(total_rows, strip_bytes() // max(1, width * bytes_per_px)))
+
+
+def should_strip(nbytes):
+    """整幅缓冲区超过一个条带的工作集时改用条带渲染"""
+    return active() and nbytes > strip_bytes()
+
+
+def scratch_array(shape, dtype=np.uint8):
+    """分配在临时文件上的数组：页面由内核按需换出，文件创建后即删除，无需清理"""
+    with tempfile.TemporaryFile(dir=os.environ.get("HOUSE_SCRATCH_DIR")) as f:
+        return np.memmap(f, dtype=dtype, mode="w+", shape=shape)
+
+
+# ── 单图峰值估计与并发限流 ──
+
+# standard 质量下单张图纸峰值内存增量（MB，条带模式外），其他预设按 scale² 缩放；
+# 服务运行中用实测峰值替换（见 MemoryGate.observe）
+ESTIMATE_MB = {
+    "perspective_south": 130, "perspective_southeast": 130,
+    "render_south": 100, "render_interior_f1": 60, "render_interior_f2": 60,
+}
+DEFAULT_ESTIMATE_MB = 45
+
+
+def estimate(name, quality):
+    """图纸 name 在 quality 预设下的估计峰值增量（字节）"""
+    q = render_quality.PRESETS[quality]
+    mb = ESTIMATE_MB.get(name, DEFAULT_ESTIMATE_MB) * (q["scale"] * q["supersample"]) ** 2
+    if q.get("strips"):
+        mb = min(mb, 4 * strip_bytes() / 2**20 + DEFAULT_ESTIMATE_MB)
+    return int(mb * 2**20)
+
+
+class MemoryGate:
+    """按估计内存派发任务：在途估计之和不超过预算；没有在途任务时总是放行一个，避免饿死"""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.in_use = 0
+        self.running = 0
+        self.observed = {}          # (name, quality) → 实测峰值增量
+        self._cond = asyncio.Condition()
+
+    def cost(self, name, quality):
+        return self.observed.get((name, quality)) or estimate(name, quality)
+
+    def observe(self, name, quality, nbytes):
+        if nbytes:
+            self.observed[(name, quality)] = nbytes
+
+    async def acquire(self, nbytes):
+        async with self._cond:
+            await self._cond.wait_for(
+                lambda: self.running == 0 or self.in_use + nbytes <= self.budget)
+            self.in_use += nbytes
+            self.running += 1
+
+    async def release(self, nbytes):
+        async with self._cond:
+            self.in_use -= nbytes
+            self.running -= 1
+            self._cond.notify_all()
+
+
+def add_budget_argument(parser):
+    parser.add_argument("--memory-budget", metavar="SIZE", default=os.environ.get("HOUSE_MEMORY_BUDGET"),
+                        help="内存预算（如 2G）：大画布改为条带渲染 + memmap，serve.py 按预算限制并发")
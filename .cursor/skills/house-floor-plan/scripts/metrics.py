@@ -0,0 +1,320 @@
+"""
+运行指标 — 计数器 / 仪表 / 直方图，导出为 Prometheus 文本格式或 JSON 汇总
+
+  metrics.inc("cache_requests_total", cache="background", result="hit")
+  metrics.observe("drawing_duration_seconds", 0.81, drawing="gen_floor1")
+  metrics.set_max("drawing_peak_rss_bytes", rss, drawing="gen_floor1")
+  with metrics.track_drawing("gen_floor1"): ...   # 次数、耗时、成败、峰值内存
+
+与 perf（按需开启的分层计时）不同，指标始终收集：每张图纸只多几次字典更新，
+供批量 worker 统计吞吐、延迟分布、缓存命中率与单任务峰值内存，据此确定 worker 规模。
+
+  write_prometheus(path)   原子写文件（node_exporter textfile collector 可直接采集）
+  serve_prometheus(port)   后台线程提供 http://127.0.0.1:<port>/metrics
+  snapshot() / merge()     worker 进程把本任务的指标带回服务进程汇总（serve.py）
+"""
+
+import bisect
+import http.server
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# 指标元数据：名称 → (类型, 说明)
+METRICS = {
+    "drawings_total":           ("counter",   "生成的图纸数（status=ok|error）"),
+    "drawing_duration_seconds": ("histogram", "单张图纸生成耗时（含同步编码与写出）"),
+    "drawing_peak_rss_bytes":   ("gauge",     "单张图纸生成期间的进程峰值 RSS"),
+    "output_files_total":       ("counter",   "写出的文件数（按格式）"),
+    "output_bytes_total":       ("counter",   "写出的字节数（按格式）"),
+    "cache_requests_total":     ("counter",   "缓存查询次数（result=hit|miss）"),
+    "process_peak_rss_bytes":   ("gauge",     "进程峰值 RSS"),
+}
+
+# 直方图桶上界（秒）：draft 平面图约 0.2 s，print 透视图可达数十秒
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_lock = threading.Lock()
+_counters = {}      # (name, labels) → float
+_gauges = {}        # (name, labels) → float
+_hists = {}         # (name, labels) → [bucket_counts..., sum, count]
+_t0 = time.time()
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, n=1, **labels):
+    k = _key(name, labels)
+    with _lock:
+        _counters[k] = _counters.get(k, 0) + n
+
+
+def set_max(name, value, **labels):
+    """仪表取最大值（峰值类指标）"""
+    k = _key(name, labels)
+    with _lock:
+        if value > _gauges.get(k, float("-inf")):
+            _gauges[k] = value
+
+
+def observe(name, value, **labels):
+    k = _key(name, labels)
+    with _lock:
+        h = _hists.get(k)
+        if h is None:
+            h = _hists[k] = [0] * (len(BUCKETS) + 2)
+        h[bisect.bisect_left(BUCKETS, value)] += 1   # 末位桶为 +Inf
+        h[-2] += value
+        h[-1] += 1
+
+
+def reset():
+    global _t0
+    with _lock:
+        _counters.clear(); _gauges.clear(); _hists.clear()
+    _t0 = time.time()
+
+
+# ── 峰值内存 ──
+
+def reset_peak_rss():
+    """Linux：向 clear_refs 写 5 重置 VmHWM；其他平台无法重置，退化为进程峰值"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_bytes():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    ru = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return ru if sys.platform == "darwin" else ru * 1024
+
+
+def current_rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+@contextmanager
+def track_drawing(name):
+    """记录一张图纸：次数（按成败）、耗时直方图、生成期间峰值 RSS"""
+    reset_peak_rss()
+    t0 = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        observe("drawing_duration_seconds", time.perf_counter() - t0, drawing=name)
+        inc("drawings_total", drawing=name, status=status)
+        rss = peak_rss_bytes()
+        set_max("drawing_peak_rss_bytes", rss, drawing=name)
+        set_max("process_peak_rss_bytes", rss)
+
+
+def record_output(path, nbytes):
+    fmt = os.path.splitext(path)[1].lstrip(".").lower() or "bin"
+    inc("output_files_total", format=fmt)
+    inc("output_bytes_total", nbytes, format=fmt)
+
+
+# ── 跨进程汇总 ──
+
+def snapshot():
+    """可 pickle 的指标快照"""
+    with _lock:
+        return {"counters": dict(_counters), "gauges": dict(_gauges),
+                "hists": {k: list(v) for k, v in _hists.items()}}
+
+
+def merge(snap):
+    """把另一个进程的快照并入：计数器与直方图相加，仪表取最大"""
+    with _lock:
+        for k, v in snap["counters"].items():
+            _counters[k] = _counters.get(k, 0) + v
+        for k, v in snap["gauges"].items():
+            if v > _gauges.get(k, float("-inf")):
+                _gauges[k] = v
+        for k, v in snap["hists"].items():
+            h = _hists.setdefault(k, [0] * len(v))
+            for i, x in enumerate(v):
+                h[i] += x
+
+
+# ── 导出 ──
+
+def _fmt_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in items) + "}"
+
+
+def _num(v):
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+def render_prometheus(prefix="house_"):
+    """Prometheus 文本格式（0.0.4）"""
+    snap = snapshot()
+    series = {}
+    for kind, store in (("counter", snap["counters"]), ("gauge", snap["gauges"]),
+                        ("histogram", snap["hists"])):
+        for (name, labels), v in store.items():
+            series.setdefault(name, []).append((labels, v))
+    lines = []
+    for name in sorted(series):
+        kind, help_ = METRICS.get(name, ("untyped", ""))
+        full = prefix + name
+        lines.append(f"# HELP {full} {help_}")
+        lines.append(f"# TYPE {full} {kind}")
+        for labels, v in sorted(series[name]):
+            if kind == "histogram":
+                cum = 0
+                for le, n in zip(BUCKETS + ("+Inf",), v[:-2]):
+                    cum += n
+                    lines.append(f"{full}_bucket{_fmt_labels(labels, [('le', le)])} {cum}")
+                lines.append(f"{full}_sum{_fmt_labels(labels)} {_num(v[-2])}")
+                lines.append(f"{full}_count{_fmt_labels(labels)} {v[-1]}")
+            else:
+                lines.append(f"{full}{_fmt_labels(labels)} {_num(v)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """先写临时文件再 rename，采集方不会读到半个文件"""
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, path)
+    return path
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        data = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_prometheus(port, host="127.0.0.1"):
+    """后台线程提供 /metrics，返回 server（shutdown() 停止）"""
+    server = http.server.ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def _quantile(h, q):
+    """由直方图桶估计分位数（取所在桶上界）"""
+    target = q * h[-1]
+    cum = 0
+    for le, n in zip(BUCKETS + (float("inf"),), h[:-2]):
+        cum += n
+        if cum >= target and n:
+            return le
+    return None
+
+
+def summary(**extra):
+    """JSON 汇总：吞吐、逐图纸耗时与峰值内存、延迟分位数、缓存命中率、输出统计"""
+    snap = snapshot()
+    elapsed = time.time() - _t0
+    drawings = {}
+    for (name, labels), v in snap["hists"].items():
+        if name == "drawing_duration_seconds":
+            d = drawings.setdefault(dict(labels)["drawing"], {})
+            d["count"] = v[-1]
+            d["seconds"] = round(v[-2] / v[-1], 4) if v[-1] else 0.0
+    for (name, labels), v in snap["gauges"].items():
+        if name == "drawing_peak_rss_bytes":
+            drawings.setdefault(dict(labels)["drawing"], {})["peak_rss_mb"] = round(v / 2**20, 1)
+    total = [0] * (len(BUCKETS) + 2)
+    for (name, _), v in snap["hists"].items():
+        if name == "drawing_duration_seconds":
+            total = [a + b for a, b in zip(total, v)]
+    ok = sum(v for (n, l), v in snap["counters"].items()
+             if n == "drawings_total" and ("status", "ok") in l)
+    failed = sum(v for (n, l), v in snap["counters"].items()
+                 if n == "drawings_total" and ("status", "error") in l)
+    caches = {}
+    for (name, labels), v in snap["counters"].items():
+        if name == "cache_requests_total":
+            lab = dict(labels)
+            caches.setdefault(lab["cache"], {"hit": 0, "miss": 0})[lab["result"]] += v
+    for c in caches.values():
+        n = c["hit"] + c["miss"]
+        c["hit_rate"] = round(c["hit"] / n, 3) if n else None
+    outputs = {}
+    for (name, labels), v in snap["counters"].items():
+        if name in ("output_files_total", "output_bytes_total"):
+            o = outputs.setdefault(dict(labels)["format"], {"files": 0, "bytes": 0})
+            o["files" if name == "output_files_total" else "bytes"] += int(v)
+    peak = snap["gauges"].get(("process_peak_rss_bytes", ()), peak_rss_bytes())
+    return {
+        **extra,
+        "elapsed_seconds": round(elapsed, 3),
+        "drawings": {"ok": int(ok), "failed": int(failed),
+                     "per_second": round(ok / elapsed, 3) if elapsed else None,
+                     "p50_seconds": _quantile(total, 0.5) if total[-1] else None,
+                     "p95_seconds": _quantile(total, 0.95) if total[-1] else None},
+        "per_drawing": dict(sorted(drawings.items())),
+        "caches": caches,
+        "outputs": dict(sorted(outputs.items())),
+        "peak_rss_mb": round(peak / 2**20, 1),
+    }
+
+
+# ── 命令行 ──
+
+def add_metrics_arguments(parser):
+    """给命令行加 --metrics-file PATH 与 --metrics-port PORT"""
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="结束时把指标写成 Prometheus 文本文件（textfile collector）")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="运行期间在 127.0.0.1:PORT/metrics 提供 Prometheus 指标")
+
+
+def start_from_args(args):
+    if args.metrics_port:
+        return serve_prometheus(args.metrics_port)
+    return None
+
+
+def finish_from_args(args, server=None):
+    if args.metrics_file:
+        write_prometheus(args.metrics_file)
+    if server is not None:
+        server.shutdown()
+
+
+def dumps_summary(**extra):
+    return json.dumps(summary(**extra), ensure_ascii=False, indent=2)
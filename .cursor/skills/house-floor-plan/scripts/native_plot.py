@@ -0,0 +1,458 @@
+"""
+原生绘图后端 — 显示列表图纸（平面图、立面图、剖面图、屋顶、给排水、电气）不经 matplotlib 渲染，直接写 SVG，PNG 由 Pillow 光栅化
+
+  python generate_all.py --backend native     # 显示列表图纸走本后端；南立面渲染图、室内效果图仍用 matplotlib
+  python generate_all.py                      # 默认 matplotlib
+
+生成函数的绘图代码不变：_render() 回放显示列表时以 _figure(..., plan=True) 取画布，native 后端下返回本模块的
+Figure / Axes，Axes 实现显示列表回放用到的子集（add_patch / plot / text / annotate / set_title / set_xlim / set_ylim …）。
+patches.* 对象只用来描述几何：取 get_path() + get_patch_transform() 与颜色、线宽，
+不进入 artist 树；没有布局引擎、tight bbox 测量与 Agg 渲染，SVG 写出只是字符串拼接。
+
+与 matplotlib 输出的差异：
+  - 画布 = 坐标范围（等比缩放到默认子图框）+ 标题 + 边距，不逐 artist 测量 tight bbox
+  - 图元不裁剪到坐标范围；文字度量取自 Pillow 读取的同一套 NotoSansSC 子集字体
+  - SVG 始终为 compact 结构（<text> + 内嵌字体子集 + <symbol>/<use>），忽略 --svg-mode matplotlib
+  - PNG 以 2× 超采样绘制后盒式缩小作抗锯齿；超采样画布超过 MAX_SUPERSAMPLE_PX 时不超采样
+  - 不走 memory_budget 的条带渲染：显示列表图纸画布不超过 18×14 in，poster 预设下整幅 RGB 缓冲区约 120 MB
+"""
+
+import functools
+import math
+from xml.sax.saxutils import escape
+
+import numpy as np
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Arc
+from matplotlib.path import Path
+from PIL import Image, ImageDraw, ImageFont
+
+import svg_compact
+
+BACKENDS = ("matplotlib", "native")
+_backend = "matplotlib"
+
+SOFTWARE = "house-floor-plan native_plot"
+AXES_BOX = (0.125, 0.11, 0.775, 0.77)   # matplotlib 默认子图位置（left, bottom, width, height）
+LINE_SPACING = 1.2
+DASHES = (3.7, 1.6)                     # matplotlib lines.dashed_pattern，按线宽缩放
+ARROW_HEAD = (4.0, 2.0)                 # "->" / "-|>" 箭头长、半宽（pt）：0.4 / 0.2 × 默认 10 pt
+ARROW_SHRINK = 2.0                      # 箭头两端各缩进 2 pt（annotate 默认）
+SUPERSAMPLE = 2
+MAX_SUPERSAMPLE_PX = 64_000_000
+
+
+def set_backend(name):
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"未知平面图后端: {name!r}（可选 {' / '.join(BACKENDS)}）")
+    _backend = name
+
+
+def get_backend():
+    return _backend
+
+
+# ── 颜色 / 字体 ──
+
+def _rgba(color, alpha=None):
+    if color is None or (isinstance(color, str) and color.lower() == "none"):
+        return None
+    r, g, b, a = to_rgba(color, alpha)
+    return None if a <= 0 else (r, g, b, a)
+
+
+def _svg_color(rgba):
+    return "#%02x%02x%02x" % tuple(round(c * 255) for c in rgba[:3])
+
+
+def _pil_color(rgba):
+    return tuple(round(c * 255) for c in rgba)
+
+
+def _weight(w):
+    return 700 if w in ("bold", "heavy", "black", 700, 800, 900) or str(w) in ("700", "800", "900") else 400
+
+
+@functools.lru_cache(maxsize=256)
+def _font(weight, px):
+    return ImageFont.truetype(svg_compact.FONTS[weight], px)
+
+
+@functools.lru_cache(maxsize=4096)
+def _metrics(line, weight):
+    """1 pt 字号下单行的 (宽, 上伸, 下伸)；上伸/下伸与 "lp" 取大（同 matplotlib 的行高规则）"""
+    f = _font(weight, 100)
+    _, lp_top, _, lp_bottom = f.getbbox("lp", anchor="ls")
+    _, top, _, bottom = f.getbbox(line, anchor="ls") if line else (0, 0, 0, 0)
+    return f.getlength(line) / 100, -min(top, lp_top) / 100, max(bottom, lp_bottom) / 100
+
+
+def _layout(text, size, weight, ha):
+    """多行文字块（未旋转）：返回 (宽, 高, [(行, x, 基线 y)])，坐标相对块中心，y 向下"""
+    lines = text.split("\n")
+    ms = [_metrics(line, weight) for line in lines]
+    lp_asc = _metrics("", weight)[1]
+    baselines, y = [], ms[0][1]
+    for i, (_, asc, _) in enumerate(ms):
+        if i:
+            y += max(lp_asc, asc) * LINE_SPACING
+        baselines.append(y)
+    w = max(m[0] for m in ms) * size
+    h = (baselines[-1] + ms[-1][2]) * size
+    x = {"left": -w / 2, "center": 0.0, "right": w / 2}[ha]
+    return w, h, [(line, x, b * size - h / 2) for line, b in zip(lines, baselines)]
+
+
+# ── 折线 ──
+
+def _dashes(poly, pattern):
+    """折线按 [实, 空, …] 长度切成若干实线段"""
+    out, cur = [], [poly[0]]
+    i, left, on = 0, pattern[0], True
+    for p0, p1 in zip(poly, poly[1:]):
+        seg, t = math.dist(p0, p1), 0.0
+        while seg - t > left:
+            t += left
+            q = (p0[0] + (p1[0] - p0[0]) * t / seg, p0[1] + (p1[1] - p0[1]) * t / seg)
+            if on:
+                out.append(cur + [q])
+            cur = [q]
+            on, i = not on, (i + 1) % len(pattern)
+            left = pattern[i]
+        left -= seg - t
+        if on:
+            cur.append(p1)
+    if on and len(cur) > 1:
+        out.append(cur)
+    return out
+
+
+def _arc_path(patch):
+    """Arc 只取 theta1→theta2 一段；椭圆弧的角度按 matplotlib 的拉伸规则换算"""
+    t1, t2 = patch.theta1, patch.theta2
+    w, h = patch.width, patch.height
+    if w != h and not (t1 != t2 and t1 % 360 == t2 % 360):
+        def stretch(t):
+            t = math.radians(t)
+            return (math.degrees(math.atan2(w / h * math.sin(t), math.cos(t))) + 360) % 360
+        t1, t2 = stretch(t1), stretch(t2)
+    return Path.arc(t1, t2)
+
+
+# ── Figure / Axes ──
+
+class Axes:
+    """平面图用到的 Axes 子集；图元按 (zorder, 添加顺序) 记录，坐标为数据坐标"""
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.items = []
+        self.xlim = self.ylim = None
+        self.title = None
+        self.facecolor = None
+
+    def _add(self, zorder, item):
+        self.items.append((zorder, len(self.items), item))
+
+    def set_facecolor(self, color):
+        self.facecolor = color
+
+    def set_aspect(self, aspect):
+        if aspect != "equal":
+            raise ValueError("native 后端只支持等比坐标（set_aspect('equal')）")
+
+    def axis(self, *args):
+        pass
+
+    def set_xlim(self, left, right):
+        self.xlim = (left, right)
+
+    def set_ylim(self, bottom, top):
+        self.ylim = (bottom, top)
+
+    def set_title(self, label, fontsize=12, fontweight="normal", color="black", pad=6.0):
+        self.title = (label, fontsize, _weight(fontweight), _rgba(color), pad)
+
+    def add_patch(self, patch):
+        if not patch.get_visible():
+            return patch
+        path = _arc_path(patch) if isinstance(patch, Arc) else patch.get_path()
+        verts = patch.get_patch_transform().transform(path.vertices)
+        fill = _rgba(patch.get_facecolor()) if patch.get_fill() else None
+        lw = patch.get_linewidth()
+        stroke = _rgba(patch.get_edgecolor()) if lw > 0 else None
+        dashed = patch.get_linestyle() in ("--", "dashed")
+        self._add(patch.get_zorder(), ("path", verts, path.codes, fill, stroke, lw, dashed, "butt"))
+        return patch
+
+    def plot(self, xs, ys, color="#1f77b4", linewidth=1.5, linestyle="-", alpha=None, zorder=2):
+        verts = np.column_stack([np.asarray(xs, float), np.asarray(ys, float)])
+        self._add(zorder, ("path", verts, None, None, _rgba(color, alpha), linewidth,
+                           linestyle in ("--", "dashed"), "square"))
+
+    def text(self, x, y, s, ha="left", va="baseline", fontsize=10, fontweight="normal",
+             color="black", rotation=0, alpha=None, bbox=None, zorder=3):
+        box = None
+        if bbox:
+            pad = float(dict(kv.split("=") for kv in bbox.get("boxstyle", "square").split(",")[1:]
+                             ).get("pad", 0.3))
+            box = (pad, _rgba(bbox.get("facecolor", "white")), _rgba(bbox.get("edgecolor", "none")))
+        self._add(zorder, ("text", x, y, str(s), fontsize, _weight(fontweight), _rgba(color, alpha),
+                           ha, va, float(rotation or 0) % 360, box))
+
+    def annotate(self, text, xy, xytext=None, arrowprops=None, zorder=3):
+        if text:
+            raise ValueError("native 后端的 annotate 只支持无文字的箭头")
+        props = arrowprops or {}
+        self._add(zorder, ("arrow", xytext or xy, xy, props.get("arrowstyle", "->"),
+                           _rgba(props.get("color", "black")), props.get("lw", 1.0)))
+
+
+class Figure:
+    """单 Axes 的图纸；save 时才按坐标范围确定画布与变换"""
+
+    def __init__(self, figsize, facecolor="white"):
+        self.figsize = figsize
+        self.facecolor = facecolor
+        self.ax = Axes(self)
+
+    # 数据坐标 → 页面坐标（pt，y 向下）
+    def _page(self, pad_inches):
+        ax = self.ax
+        (x0, x1), (y0, y1) = ax.xlim, ax.ylim
+        fw, fh = self.figsize[0] * 72, self.figsize[1] * 72
+        k = min(fw * AXES_BOX[2] / (x1 - x0), fh * AXES_BOX[3] / (y1 - y0))
+        pad = pad_inches * 72
+        top = pad
+        if ax.title:
+            label, size, weight, _, tpad = ax.title
+            top += _layout(label, size, weight, "center")[1] + tpad
+        w, h = (x1 - x0) * k + 2 * pad, (y1 - y0) * k + top + pad
+        def to_page(xy):
+            xy = np.asarray(xy, float)
+            return np.column_stack([pad + (xy[:, 0] - x0) * k, top + (y1 - xy[:, 1]) * k])
+        return w, h, top, to_page
+
+    def _primitives(self, pad_inches):
+        """页面坐标下的图元序列（已按 zorder 排序），SVG 与光栅共用"""
+        w, h, top, to_page = self._page(pad_inches)
+        out = []
+        if self.ax.title:
+            label, size, weight, color, _ = self.ax.title
+            out.append(("text", w / 2, top - self.ax.title[4], label, size, weight, color,
+                        "center", "bottom", 0.0, None))
+        for _, _, item in sorted(self.ax.items, key=lambda it: it[:2]):
+            kind = item[0]
+            if kind == "path":
+                out.append((kind, to_page(item[1])) + item[2:])
+            elif kind == "text":
+                (px, py), = to_page([item[1:3]])
+                out.append((kind, px, py) + item[3:])
+            else:
+                p0, p1 = to_page([item[1], item[2]])
+                out.append((kind, p0, p1) + item[3:])
+        return w, h, out
+
+    # ── SVG ──
+
+    def to_svg(self, facecolor=None, pad_inches=0.3):
+        w, h, prims = self._primitives(pad_inches)
+        bg = _rgba(facecolor or self.facecolor)
+        body = [f'<rect width="{w:.2f}" height="{h:.2f}" style="{_svg_fill(bg)};stroke:none"/>'] if bg else []
+        for prim in prims:
+            body.extend(_SVG[prim[0]](*prim[1:]))
+        data = ('<?xml version="1.0" encoding="utf-8"?>\n'
+                f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+                f'width="{w:.2f}pt" height="{h:.2f}pt" viewBox="0 0 {w:.2f} {h:.2f}" version="1.1">'
+                '<defs><style type="text/css">*{stroke-linejoin:round;stroke-linecap:butt}</style></defs>'
+                + "".join(body) + "</svg>")
+        return svg_compact.compact(data.encode("utf-8"))
+
+    # ── 光栅 ──
+
+    def to_raw(self, dpi, facecolor=None, pad_inches=0.3):
+        """Pillow 光栅化：返回 (模式, (宽, 高), 像素 bytes)；背景不透明时为 RGB（缩小与编码都更快）"""
+        w, h, prims = self._primitives(pad_inches)
+        size = max(1, round(w * dpi / 72)), max(1, round(h * dpi / 72))
+        ss = SUPERSAMPLE if size[0] * size[1] * SUPERSAMPLE ** 2 <= MAX_SUPERSAMPLE_PX else 1
+        bg = _rgba(facecolor or self.facecolor) or (1, 1, 1, 0)
+        mode = "RGB" if bg[3] >= 1 else "RGBA"
+        img = Image.new(mode, (size[0] * ss, size[1] * ss), _pil_color(bg))
+        draw = ImageDraw.Draw(img, "RGBA")
+        scale = dpi / 72 * ss
+        for prim in prims:
+            _RASTER[prim[0]](img, draw, scale, *prim[1:])
+        if ss > 1:
+            img = img.reduce(ss)
+        return mode, img.size, img.tobytes()
+
+
+# ── SVG 图元 ──
+
+def _svg_fill(rgba):
+    if rgba is None:
+        return "fill:none"
+    return f"fill:{_svg_color(rgba)}" + (f";fill-opacity:{rgba[3]:.3g}" if rgba[3] < 1 else "")
+
+
+def _svg_stroke(rgba, lw, dashed, cap):
+    if rgba is None:
+        return "stroke:none"
+    s = f"stroke:{_svg_color(rgba)};stroke-width:{lw:.3g}"
+    if rgba[3] < 1:
+        s += f";stroke-opacity:{rgba[3]:.3g}"
+    if dashed:
+        s += ";stroke-dasharray:" + ",".join(f"{d * lw:.3g}" for d in DASHES)
+    elif cap != "butt":
+        s += f";stroke-linecap:{cap}"
+    return s
+
+
+def _svg_d(verts, codes):
+    out = []
+    for pts, code in Path(verts, codes).iter_segments(simplify=False, curves=True):
+        if code == Path.CLOSEPOLY:
+            out.append("z")
+            continue
+        cmd = {Path.MOVETO: "M", Path.LINETO: "L", Path.CURVE3: "Q", Path.CURVE4: "C"}[code]
+        out.append(cmd + " ".join(f"{v:.4f}" for v in pts))
+    return "".join(out)
+
+
+def _svg_path(verts, codes, fill, stroke, lw, dashed, cap):
+    if fill is None and stroke is None:
+        return []
+    return [f'<path d="{_svg_d(verts, codes)}" style="{_svg_fill(fill)};{_svg_stroke(stroke, lw, dashed, cap)}"/>']
+
+
+def _text_frame(x, y, text, size, weight, ha, va, rot):
+    """matplotlib 默认 rotation_mode：先旋转，再按旋转后的外接框对齐 → (块中心, 块宽高, 行)"""
+    w, h, lines = _layout(text, size, weight, ha)
+    r = math.radians(rot)
+    c, s = abs(math.cos(r)), abs(math.sin(r))
+    bw, bh = w * c + h * s, w * s + h * c
+    cx = x + {"left": bw / 2, "center": 0.0, "right": -bw / 2}[ha]
+    if va == "baseline" and not rot:
+        cy = y - lines[-1][2]
+    else:
+        cy = y + {"top": bh / 2, "center": 0.0, "center_baseline": 0.0, "bottom": -bh / 2,
+                  "baseline": -bh / 2}[va]
+    return cx, cy, w, h, lines
+
+
+def _svg_text(x, y, text, size, weight, color, ha, va, rot, box):
+    if color is None:
+        return []
+    cx, cy, w, h, lines = _text_frame(x, y, text, size, weight, ha, va, rot)
+    tf = f' transform="translate({cx:.3f} {cy:.3f}) rotate({-rot:.3g})"' if rot else ""
+    ox, oy = (0.0, 0.0) if rot else (cx, cy)
+    out = []
+    if box:
+        pad = box[0] * size
+        out.append(f'<rect x="{ox - w / 2 - pad:.3f}" y="{oy - h / 2 - pad:.3f}" width="{w + 2 * pad:.3f}" '
+                   f'height="{h + 2 * pad:.3f}" rx="{pad:.3f}"{tf} '
+                   f'style="{_svg_fill(box[1])};{_svg_stroke(box[2], 1.0, False, "butt")}"/>')
+    anchor = {"left": "start", "center": "middle", "right": "end"}[ha]
+    style = (f"font-size:{size:g}px;font-family:'{svg_compact.FONT_FAMILY}'"
+             + (";font-weight:700" if weight == 700 else "")
+             + f";text-anchor:{anchor};{_svg_fill(color)}")
+    for line, lx, ly in lines:
+        if line:
+            out.append(f'<text x="{ox + lx:.3f}" y="{oy + ly:.3f}"{tf} style="{style}">{escape(line)}</text>')
+    return out
+
+
+def _arrow_geometry(p0, p1, style, lw):
+    """箭杆（折线）与箭头（开口两笔或闭合三角形）的页面坐标"""
+    d = p1 - p0
+    n = float(np.hypot(*d)) or 1.0
+    u = d / n
+    v = np.array([-u[1], u[0]])
+    a, b = p0 + u * ARROW_SHRINK, p1 - u * ARROW_SHRINK
+    hl, hw = ARROW_HEAD
+    base = b - u * hl
+    if style == "-|>":
+        return [a, base], [base + v * hw, b, base - v * hw], True
+    return [a, b], [base + v * hw, b, base - v * hw], False
+
+
+def _svg_arrow(p0, p1, style, color, lw):
+    shaft, head, closed = _arrow_geometry(p0, p1, style, lw)
+    fmt = lambda pts: "L".join(f"{x:.4f} {y:.4f}" for x, y in pts)
+    out = [f'<path d="M{fmt(shaft)}" style="fill:none;{_svg_stroke(color, lw, False, "butt")}"/>']
+    out.append(f'<path d="M{fmt(head)}{"z" if closed else ""}" '
+               f'style="{_svg_fill(color if closed else None)};{_svg_stroke(color, lw, False, "butt")}"/>')
+    return out
+
+
+_SVG = {"path": _svg_path, "text": _svg_text, "arrow": _svg_arrow}
+
+
+# ── Pillow 图元 ──
+
+def _stroke_polys(draw, polys, color, width, dashed, lw_scale):
+    for poly in polys:
+        pieces = _dashes(poly, [d * lw_scale for d in DASHES]) if dashed else [poly]
+        for piece in pieces:
+            if len(piece) > 1:
+                draw.line(piece, fill=color, width=width, joint="curve")
+
+
+def _raster_path(img, draw, scale, verts, codes, fill, stroke, lw, dashed, cap):
+    polys = [[tuple(p) for p in poly]
+             for poly in Path(verts * scale, codes).to_polygons(closed_only=False) if len(poly) > 1]
+    if fill is not None:
+        for poly in polys:
+            if len(poly) > 2:
+                draw.polygon(poly, fill=_pil_color(fill))
+    if stroke is not None:
+        closed = [poly + [poly[1]] if len(poly) > 2 and poly[0] == poly[-1] else poly for poly in polys]
+        _stroke_polys(draw, closed, _pil_color(stroke), max(1, round(lw * scale)), dashed, lw * scale)
+
+
+def _raster_text(img, draw, scale, x, y, text, size, weight, color, ha, va, rot, box):
+    if color is None:
+        return
+    cx, cy, w, h, lines = _text_frame(x, y, text, size, weight, ha, va, rot)
+    font = _font(weight, max(1, round(size * scale)))
+    pad = box[0] * size if box else 0.0
+    anchor = {"left": "ls", "center": "ms", "right": "rs"}[ha]
+    if not rot:
+        target, ox, oy = draw, cx * scale, cy * scale
+    else:   # 旋转文字：先画到透明图层，旋转后贴回
+        lw_, lh_ = math.ceil((w + 2 * pad + 2) * scale), math.ceil((h + 2 * pad + 2) * scale)
+        layer = Image.new("RGBA", (lw_, lh_), (0, 0, 0, 0))
+        target, ox, oy = ImageDraw.Draw(layer, "RGBA"), lw_ / 2, lh_ / 2
+    if box and box[1] is not None:
+        target.rounded_rectangle([ox - (w / 2 + pad) * scale, oy - (h / 2 + pad) * scale,
+                                  ox + (w / 2 + pad) * scale, oy + (h / 2 + pad) * scale],
+                                 radius=pad * scale, fill=_pil_color(box[1]))
+    for line, lx, ly in lines:
+        if line:
+            target.text((ox + lx * scale, oy + ly * scale), line, font=font,
+                        fill=_pil_color(color), anchor=anchor)
+    if rot:
+        layer = layer.rotate(rot, resample=Image.BICUBIC, expand=True)
+        img.paste(layer, (round(cx * scale - layer.width / 2), round(cy * scale - layer.height / 2)), layer)
+
+
+def _raster_arrow(img, draw, scale, p0, p1, style, color, lw):
+    shaft, head, closed = _arrow_geometry(p0, p1, style, lw)
+    c, width = _pil_color(color), max(1, round(lw * scale))
+    draw.line([tuple(p * scale) for p in shaft], fill=c, width=width)
+    pts = [tuple(p * scale) for p in head]
+    if closed:
+        draw.polygon(pts, fill=c)
+        draw.line(pts + [pts[0], pts[1]], fill=c, width=width, joint="curve")
+    else:
+        draw.line(pts, fill=c, width=width, joint="curve")
+
+
+_RASTER = {"path": _raster_path, "text": _raster_text, "arrow": _raster_arrow}
+
+
+def add_backend_argument(parser):
+    parser.add_argument("--backend", choices=BACKENDS, default=_backend,
+                        help="显示列表图纸（平面/立面/剖面/屋顶/给排水/电气）的绘制后端：matplotlib（默认）"
+                             "或 native（直接写 SVG，Pillow 光栅化 PNG）；渲染效果图始终用 matplotlib")
@@ -0,0 +1,384 @@
+"""
+平面分隔优化 — 在约束下批量搜索隔墙坐标（F1_X1、F1_Y0 … F2_NX3），输出 Pareto 最优方案
+
+  python optimize_layout.py                                     # 默认 100 万个候选，列出前 10 个
+  python optimize_layout.py --samples 5000000 --weight 卧室面积=2 --target 主卧室1=30 -o pareto.jsonl
+  python optimize_layout.py --vary F2_Y2=6800:7600 --fix F1_X1 --min-stack 0.3
+
+候选方案按批（默认每批 10 万个）表示为参数数组，floor_layout.rooms 逐元素算出全部房间矩形，
+约束与目标都是数组运算。搜索交替进行全域均匀采样（有序的隔墙组采样后排序，保证 Y0 < Y1 等）
+与围绕当前 Pareto 前沿的变异采样；每批先用前沿的代表点剔除明显被支配的候选，再精确更新前沿。
+
+约束：
+  - 房间净宽 / 面积不小于 MIN_ROOM（未列出的房间只要求净宽 ≥ MIN_WIDTH）
+  - 二层楼梯间落在一层楼梯间正上方（平面包含）
+  - 二层湿区（主卫2、公卫）压在一层湿区（厨房、公共卫浴）上方的面积占比 ≥ --min-stack
+  - 基准方案中位于某房间范围内的窗户，在候选方案中仍不跨越该房间的隔墙
+    （基准方案里已经跨墙的窗户只提示，不作约束 —— 窗户列表不随隔墙移动）
+  - 家具洁具整件落在所在房间内、门扇不扫过家具、设备与给排水点位不压墙
+    （validate 的同名检查项，对整批方案逐元素计算；点位是绝对坐标，不随隔墙移动。
+    与窗户一样，基准方案里已有的冲突只提示，不作约束，候选方案不得引入新的冲突）
+输出前再用 validate.validate 逐个复核前沿方案，有错误的方案不输出。
+
+目标（权重为 0 则不参与；前沿按各目标在前沿内归一化后的加权和排序）：
+  卧室面积    三间卧室净面积之和，越大越好
+  湿区对齐    二层湿区压在一层湿区上的面积占比，越大越好
+  方正度      主要房间的最大长宽比，越小越好
+  面积偏差    与 --target 指定面积之差的绝对值之和，越小越好（未指定目标面积时不参与）
+
+-o 输出 JSON Lines，每行一个 spec 覆盖项，可直接用于 takeoff.py --specs 或 serve.py 请求的 spec。
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import floor_layout
+import spec as spec_mod
+import validate
+
+VARIABLES = ("F1_X1", "F1_Y0", "F1_Y1", "F1_NX1", "F1_NX2",
+             "F2_X1", "F2_Y0", "F2_Y1", "F2_Y2", "F2_NX1", "F2_NX2", "F2_NX3")
+# 沿同一方向依次排列的隔墙：全域采样后组内排序
+ORDERED = (("F1_Y0", "F1_Y1"), ("F1_NX1", "F1_NX2"),
+           ("F2_Y0", "F2_Y1", "F2_Y2"), ("F2_NX1", "F2_NX2", "F2_NX3"))
+STEP = 50             # 坐标步距 mm
+
+# 房间最小净宽 mm / 最小净面积 m²（参照 GB 50096，并按本方案的带状布局放宽）
+MIN_WIDTH = 900
+MIN_ROOM = {
+    "一层": {"客厅": (1800, 10), "玄关": (1200, 3), "客餐厅 LDK": (3000, 12), "主卧室1": (2600, 9),
+            "厨房": (1800, 5), "公共卫浴": (1500, 3), "楼梯间": (2400, 6)},
+    "二层": {"南向大阳台": (1000, 0), "次卧室": (2400, 6), "多功能区": (2000, 6),
+            "走廊/起居厅": (1200, 0), "主卧室2": (2600, 9), "主卫2": (1500, 3),
+            "公卫": (1200, 2.5), "楼梯间": (1500, 3.5)},
+}
+BEDROOMS = (("一层", "主卧室1"), ("二层", "主卧室2"), ("二层", "次卧室"))
+MAIN_ROOMS = (("一层", "客餐厅 LDK"), ("一层", "主卧室1"), ("二层", "主卧室2"),
+              ("二层", "次卧室"), ("二层", "多功能区"))
+
+OBJECTIVES = ("卧室面积", "湿区对齐", "方正度", "面积偏差")
+MAXIMIZE = {"卧室面积", "湿区对齐"}
+QUANTUM = {"卧室面积": 0.01, "湿区对齐": 0.001, "方正度": 0.01, "面积偏差": 0.01}
+LAYOUT_CHECKS = ("家具洁具", "设备点位", "门扇开启")    # 只对基准方案中没有冲突的项目作约束
+PROBES = 256          # 预筛用的前沿代表点数
+CHUNK = 1024          # 精确 Pareto 更新的分块大小
+
+
+# ══════════════════════════════════════════════
+#  候选方案 → 房间 / 约束 / 目标
+# ══════════════════════════════════════════════
+
+def default_bounds(s):
+    """各变量的默认搜索范围：外墙内皮之间（x 向变量取 BW，y 向取 BH）"""
+    return {n: (s["OW"], (s["BW"] if "X" in n[3:] else s["BH"]) - s["OW"]) for n in VARIABLES}
+
+
+class Problem:
+    """一组搜索设置：基准方案、变量范围、约束与目标权重"""
+
+    def __init__(self, base=None, bounds=None, weights=None, targets=None, min_stack=floor_layout.MIN_STACK):
+        self.base = dict(base or {})
+        self.spec = spec_mod.resolve(self.base)
+        bounds = default_bounds(self.spec) if bounds is None else bounds
+        self.names = [n for n in VARIABLES if n in bounds]
+        self.lo = np.array([bounds[n][0] for n in self.names], dtype=float)
+        self.hi = np.array([bounds[n][1] for n in self.names], dtype=float)
+        self.targets = dict(targets or {})
+        weights = {**dict.fromkeys(OBJECTIVES, 1.0), **(weights or {})}
+        if not self.targets:
+            weights["面积偏差"] = 0.0
+        self.objectives = [o for o in OBJECTIVES if weights[o] > 0]
+        self.weights = np.array([weights[o] for o in self.objectives])
+        self.min_stack = min_stack
+        self.windows, self.waived = [], []
+        for facade, floor, name, lo, hi, fits in validate.window_rooms(self.spec):
+            if fits:
+                self.windows.append((facade, floor, name, lo, hi))
+            else:
+                where = f"{validate.FACADE_NAMES[facade]}立面{floor}窗 {lo / 1000:g}~{hi / 1000:g} m"
+                self.waived.append(f"{where} 跨越「{name}」的隔墙" if name else f"{where} 背后没有房间")
+        # 家具 / 门扇 / 点位同理：只约束基准方案中没有冲突的件、门扇-家具对与点位
+        self.layout = {}
+        for floor in floor_layout.FLOORS:
+            home, inside = validate.furniture_rooms(self.spec, floor)
+            devices = [inside[:, 0] for _, _, inside in validate.device_rooms(self.spec, floor)]
+            self.layout[floor] = ((home & inside).any(axis=1)[:, 0],
+                                  ~validate.door_swing_hits(self.spec, floor)[..., 0], devices)
+        self.waived += [f["message"] for f in validate.validate(self.spec) if f["check"] in LAYOUT_CHECKS]
+
+    def params(self, X):
+        p = {k: v for k, v in self.spec.items() if isinstance(v, (int, float))}
+        p.update({n: X[:, i] for i, n in enumerate(self.names)})
+        return p
+
+    def evaluate(self, X):
+        """X (n, 变量数) → (可行掩码 (n,), 目标矩阵 (n, 目标数)，均为越小越好)"""
+        with np.errstate(divide="ignore", invalid="ignore"):     # 退化房间（宽或深 ≤ 0）另由约束排除
+            return self._evaluate(X)
+
+    def _evaluate(self, X):
+        p = self.params(X)
+        rooms = floor_layout.room_table(p)
+        ok = np.ones(len(X), dtype=bool)
+        for (floor, name), (x, y, w, h) in rooms.items():
+            width, area = MIN_ROOM[floor].get(name, (MIN_WIDTH, 0))
+            ok &= (np.minimum(w, h) >= width) & (w * h >= area * 1e6)
+
+        # 二层楼梯间在一层楼梯间正上方
+        (ax, ay, aw, ah), (bx, by, bw, bh) = rooms["一层", "楼梯间"], rooms["二层", "楼梯间"]
+        ok &= (bx >= ax) & (by >= ay) & (bx + bw <= ax + aw) & (by + bh <= ay + ah)
+
+        stack = floor_layout.wet_stack(rooms)
+        ok &= stack >= self.min_stack                             # NaN（二层湿区面积为 0）视为不可行
+
+        for facade, floor, name, lo, hi in self.windows:
+            a, b = validate.facade_span(rooms[floor, name], facade)
+            ok &= (a <= lo) & (hi <= b)
+
+        # 家具 / 门扇 / 点位的判定较贵，只算通过上面约束的候选
+        idx = np.flatnonzero(ok)
+        sub = {k: v[idx] if isinstance(v, np.ndarray) else v for k, v in p.items()}
+        fit = np.ones(len(idx), dtype=bool)
+        for floor in floor_layout.FLOORS:
+            furniture, doors, devices = self.layout[floor]
+            home, inside = validate.furniture_rooms(sub, floor)
+            fit &= (home & inside).any(axis=1)[furniture].all(axis=0)
+            fit &= ~validate.door_swing_hits(sub, floor)[doors].any(axis=0)
+            for keep, (_, _, inside) in zip(devices, validate.device_rooms(sub, floor)):
+                fit &= inside[keep].all(axis=0)
+        ok[idx] = fit
+
+        values = {
+            "卧室面积": -sum(rooms[k][2] * rooms[k][3] for k in BEDROOMS) / 1e6,
+            "湿区对齐": -stack,
+            "方正度": np.max([np.maximum(rooms[k][2], rooms[k][3]) / np.minimum(rooms[k][2], rooms[k][3])
+                            for k in MAIN_ROOMS], axis=0),
+            "面积偏差": sum(np.abs(rooms[k][2] * rooms[k][3] / 1e6 - t) for k, t in self._targets()),
+        }
+        F = np.column_stack([np.broadcast_to(np.round(values[o] / QUANTUM[o]) * QUANTUM[o], (len(X),))
+                             for o in self.objectives]) if self.objectives else np.zeros((len(X), 0))
+        return ok, F
+
+    def _targets(self):
+        for name, area in self.targets.items():
+            floor, _, room = name.rpartition(":")
+            keys = [k for k in floor_layout.room_table(self.spec) if k[1] == room and (not floor or k[0] == floor)]
+            if len(keys) != 1:
+                raise ValueError(f"目标面积的房间名无法唯一确定: {name!r}（同名房间写作 层:房间，如 二层:楼梯间）")
+            yield keys[0], area
+
+    def baseline(self):
+        return np.array([[self.spec[n] for n in self.names]], dtype=float)
+
+    def overrides(self, x):
+        """变量向量 → spec 覆盖项（基准覆盖项 + 本方案的隔墙坐标）"""
+        return {**self.base, **{n: int(v) for n, v in zip(self.names, x)}}
+
+    def check(self, x):
+        """一个前沿方案的完整一致性校验（validate 的错误项）"""
+        return validate.errors(validate.validate(spec_mod.resolve(self.overrides(x))))
+
+    def values(self, f):
+        """内部目标向量 → {目标名: 展示值}（越大越好的目标还原符号）"""
+        return {o: (-v if o in MAXIMIZE else v) for o, v in zip(self.objectives, f)}
+
+
+# ══════════════════════════════════════════════
+#  采样与 Pareto 前沿
+# ══════════════════════════════════════════════
+
+def _snap(X, lo, hi):
+    return np.clip(np.round(X / STEP) * STEP, lo, hi)
+
+
+def sample_uniform(rng, problem, n):
+    X = rng.uniform(problem.lo, problem.hi, (n, len(problem.names)))
+    for group in ORDERED:
+        idx = [problem.names.index(g) for g in group if g in problem.names]
+        if len(idx) > 1:
+            X[:, idx] = np.sort(X[:, idx], axis=1)
+    return _snap(X, problem.lo, problem.hi)
+
+
+def sample_around(rng, problem, front, n, scales=(0.01, 0.03, 0.1)):
+    """前沿点的变异：每个子代平均改动两个变量，步长在 scales（相对变量范围）中随机取"""
+    parents = front[rng.integers(len(front), size=n)]
+    d = parents.shape[1]
+    mask = rng.random(parents.shape) < min(1.0, 2 / d)
+    scale = np.asarray(scales)[rng.integers(len(scales), size=(n, 1))]
+    X = parents + mask * rng.normal(0, 1, parents.shape) * (problem.hi - problem.lo) * scale
+    return _snap(X, problem.lo, problem.hi)
+
+
+def dominated_by(P, C):
+    """C 中被 P 任一点支配的掩码（越小越好）"""
+    if not len(P) or not len(C):
+        return np.zeros(len(C), dtype=bool)
+    le = (P[None, :, :] <= C[:, None, :]).all(axis=2)
+    lt = (P[None, :, :] < C[:, None, :]).any(axis=2)
+    return (le & lt).any(axis=1)
+
+
+def pareto(F):
+    """非支配点的下标（目标相同的点只保留一个）"""
+    if not len(F):
+        return np.zeros(0, dtype=int)
+    _, first = np.unique(F, axis=0, return_index=True)
+    order = first[np.lexsort(F[first].T[::-1])]        # 字典序：支配者总排在被支配者之前
+    keep = []
+    front = F[:0]
+    for start in range(0, len(order), CHUNK):
+        idx = order[start:start + CHUNK]
+        C = F[idx]
+        alive = ~dominated_by(front, C)
+        idx, C = idx[alive], C[alive]
+        # 块内只可能被排在前面的点支配
+        le = (C[None, :, :] <= C[:, None, :]).all(axis=2)
+        lt = (C[None, :, :] < C[:, None, :]).any(axis=2)
+        inner = np.tril(le & lt, k=-1).any(axis=1)
+        keep.extend(idx[~inner])
+        front = F[keep]
+    return np.array(keep, dtype=int)
+
+
+def _probes(F, weights, k=PROBES):
+    """前沿代表点：加权和最好的若干点 + 每个目标的最优点"""
+    if len(F) <= k:
+        return F
+    span = np.ptp(F, axis=0)
+    score = ((F - F.min(axis=0)) / np.where(span > 0, span, 1)) @ weights
+    pick = set(np.argsort(score)[:k - F.shape[1]].tolist()) | set(np.argmin(F, axis=0).tolist())
+    return F[sorted(pick)]
+
+
+def rank(F, weights):
+    """前沿内各目标归一化到 [0, 1] 后的加权和（越小越好）"""
+    if not len(F):
+        return np.zeros(0)
+    span = np.ptp(F, axis=0)
+    return ((F - F.min(axis=0)) / np.where(span > 0, span, 1)) @ weights
+
+
+def search(problem, samples=1_000_000, batch=100_000, seed=0, log=None):
+    """返回 (前沿变量矩阵, 前沿目标矩阵, 统计信息)，前沿按加权和排序"""
+    rng = np.random.default_rng(seed)
+    ok, F = problem.evaluate(problem.baseline())
+    X_front, F_front = problem.baseline()[ok], F[ok]
+    evaluated = feasible = 0
+    while evaluated < samples:
+        n = min(batch, samples - evaluated)
+        if len(X_front):
+            m = n // 2
+            X = np.concatenate([sample_uniform(rng, problem, n - m), sample_around(rng, problem, X_front, m)])
+        else:
+            X = sample_uniform(rng, problem, n)
+        ok, F = problem.evaluate(X)
+        X, F = X[ok], F[ok]
+        evaluated, feasible = evaluated + n, feasible + len(X)
+        alive = ~dominated_by(_probes(F_front, problem.weights), F)
+        X = np.concatenate([X_front, X[alive]])
+        F = np.concatenate([F_front, F[alive]])
+        keep = pareto(F)
+        X_front, F_front = X[keep], F[keep]
+        if log:
+            log(f"  {evaluated:>10,} 个候选，可行 {feasible:,}，前沿 {len(X_front)}")
+    order = np.argsort(rank(F_front, problem.weights), kind="stable")
+    return X_front[order], F_front[order], {"evaluated": evaluated, "feasible": feasible}
+
+
+# ══════════════════════════════════════════════
+#  命令行
+# ══════════════════════════════════════════════
+
+def _pairs(items, cast=float):
+    out = {}
+    for text in items:
+        name, _, value = text.partition("=")
+        out[name] = cast(value)
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="在约束下搜索平面隔墙坐标，输出 Pareto 最优 spec")
+    ap.add_argument("--samples", type=int, default=1_000_000, help="候选方案总数（默认 100 万）")
+    ap.add_argument("--batch", type=int, default=100_000, help="每批候选数（决定峰值内存）")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--base", metavar="PATH", help="基准方案（spec 覆盖项 JSON，默认 building_config）")
+    ap.add_argument("--vary", action="append", default=[], metavar="NAME=LO:HI",
+                    help="变量搜索范围 mm（默认整个外墙内皮范围）")
+    ap.add_argument("--fix", action="append", default=[], metavar="NAME", help="固定为基准值、不参与搜索")
+    ap.add_argument("--weight", action="append", default=[], metavar="目标=W",
+                    help=f"目标权重（默认均为 1，0 表示不参与）：{'、'.join(OBJECTIVES)}")
+    ap.add_argument("--target", action="append", default=[], metavar="房间=M2",
+                    help="目标净面积（同名房间写作 层:房间），用于「面积偏差」")
+    ap.add_argument("--min-stack", type=float, default=floor_layout.MIN_STACK, help="二层湿区压在一层湿区上的最小面积占比")
+    ap.add_argument("--top", type=int, default=10, help="列出前 N 个方案")
+    ap.add_argument("-o", "--output", metavar="PATH", help="前沿方案另存为 JSON Lines（每行一个 spec 覆盖项）")
+    args = ap.parse_args(argv)
+
+    base = None
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+    s = spec_mod.resolve(base)
+    bounds = default_bounds(s)
+    for text in args.vary:
+        name, _, rng = text.partition("=")
+        if name not in bounds:
+            ap.error(f"未知变量 {name!r}（可选：{', '.join(VARIABLES)}）")
+        bounds[name] = tuple(map(float, rng.split(":")))
+    for name in args.fix:
+        if name not in bounds:
+            ap.error(f"未知变量 {name!r}")
+        del bounds[name]
+    weights = _pairs(args.weight)
+    unknown = set(weights) - set(OBJECTIVES)
+    if unknown:
+        ap.error(f"未知目标 {', '.join(sorted(unknown))}（可选：{'、'.join(OBJECTIVES)}）")
+    try:
+        problem = Problem(base, bounds, weights, _pairs(args.target), args.min_stack)
+        list(problem._targets())
+    except ValueError as e:
+        ap.error(str(e))
+
+    for text in problem.waived:
+        print(f"  ⚠ 基准方案已有：{text}（不作约束）")
+    t0 = time.perf_counter()
+    X, F, stats = search(problem, args.samples, args.batch, args.seed, log=print)
+    seconds = time.perf_counter() - t0
+    print(f"  {stats['evaluated']:,} 个候选 / {seconds:.1f} s，可行 {stats['feasible']:,}，"
+          f"Pareto 前沿 {len(X)} 个方案")
+    valid = np.array([not problem.check(x) for x in X], dtype=bool)
+    if not valid.all():
+        print(f"  ⚠ {int((~valid).sum())} 个前沿方案未通过 validate，已剔除")
+        X, F = X[valid], F[valid]
+    if not len(X):
+        return 1
+
+    base_ok, base_f = problem.evaluate(problem.baseline())
+    head = "  ".join(f"{o:>6}" for o in problem.objectives)
+    print(f"\n  {'#':>3}  {head}  隔墙坐标")
+    if base_ok[0]:
+        vals = problem.values(base_f[0])
+        print(f"  {'基准':>2}  " + "  ".join(f"{vals[o]:>8.3g}" for o in problem.objectives))
+    for i, (x, f) in enumerate(zip(X[:args.top], F[:args.top]), 1):
+        vals = problem.values(f)
+        coords = " ".join(f"{n}={int(v)}" for n, v in zip(problem.names, x) if v != s[n])
+        print(f"  {i:>3}  " + "  ".join(f"{vals[o]:>8.3g}" for o in problem.objectives) + f"  {coords or '（同基准）'}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for x in X:
+                f.write(json.dumps(problem.overrides(x), ensure_ascii=False) + "\n")
+        print(f"\n  ✓ {len(X)} 个方案 → {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
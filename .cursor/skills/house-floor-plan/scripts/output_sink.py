@@ -0,0 +1,359 @@
+"""
+图纸输出目标 — generate_all.py / generate_render_3d.py 共用
+
+生成函数只产出相对路径（图纸/01-建筑设计/平面图/一层平面图.dxf、docs/images/一层平面图.png），
+写到哪里由当前 sink 决定：
+
+  DirectorySink(root)   写入 root/ 下的目录树（默认：当前工作目录）
+  MemorySink()          写入内存字典 {相对路径: bytes}，供服务进程间传递
+  ZipSink(fileobj)      流式写 ZIP；fileobj 可以是不可 seek 的流（如 HTTP 响应体）
+  TarSink(fileobj)      流式写 TAR（可选 gz/bz2/xz 压缩）
+  BackgroundWriter(s)   包装任一 sink：PNG 压缩与文件 I/O 交给有界后台线程池
+
+具体 sink 每写出一个文件记一次 metrics（按格式的文件数与字节数）。
+所有写入都经由 sink.open(path) 得到的二进制流：ezdxf 直接 doc.write 到流，
+matplotlib savefig / Pillow save 直接写流，不经过临时文件。
+sink.submit(path, encode) 提交一个返回 bytes 的编码函数：同步 sink 当场执行，
+BackgroundWriter 放到线程池执行（zlib 压缩与文件写入会释放 GIL，可与下一张图纸的绘制重叠）。
+sink.read(path) 读回已写出的文件（目录 / 内存 sink），供瓦片导出等后处理。
+"""
+
+import io
+import os
+import struct
+import tarfile
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+from PIL import Image, PngImagePlugin
+
+import metrics
+import perf
+
+
+class OutputSink:
+    """输出目标基类：子类实现 write()，需要时覆盖 open() 以真正流式写出"""
+
+    def __init__(self):
+        self.paths = []                 # 已写出的相对路径（按写出顺序）
+        self._lock = threading.Lock()   # 归档类 sink 的条目必须串行写入
+        self._owned = None              # open_archive 按路径打开的文件，close() 时一并关闭
+
+    def write(self, path, data):
+        raise NotImplementedError
+
+    def read(self, path):
+        """读回已写出的文件（瓦片导出等后处理用）；流式归档不支持"""
+        raise NotImplementedError
+
+    @contextmanager
+    def open(self, path):
+        """返回可写二进制流，退出时提交；默认先缓冲到内存再 write()"""
+        buf = io.BytesIO()
+        yield buf
+        self.write(path, buf.getvalue())
+
+    def submit(self, path, encode):
+        """写入 encode() 返回的 bytes；同步 sink 立即执行"""
+        data = encode()
+        with perf.span("write"):
+            self.write(path, data)
+
+    def flush(self):
+        """等待已提交的写入完成（同步 sink 无事可做）"""
+
+    def close(self):
+        if self._owned is not None:
+            self._owned.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DirectorySink(OutputSink):
+    def __init__(self, root):
+        super().__init__()
+        self.root = os.path.abspath(root)
+
+    def _full(self, path):
+        full = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        return full
+
+    def write(self, path, data):
+        with open(self._full(path), "wb") as f:
+            f.write(data)
+        self.paths.append(path)
+        metrics.record_output(path, len(data))
+
+    @contextmanager
+    def open(self, path):
+        with open(self._full(path), "wb") as f:
+            yield f
+            nbytes = f.tell()
+        self.paths.append(path)
+        metrics.record_output(path, nbytes)
+
+    def read(self, path):
+        with open(os.path.join(self.root, path), "rb") as f:
+            return f.read()
+
+
+class MemorySink(OutputSink):
+    def __init__(self):
+        super().__init__()
+        self.files = {}
+
+    def write(self, path, data):
+        self.files[path] = data
+        self.paths.append(path)
+        metrics.record_output(path, len(data))
+
+    def read(self, path):
+        try:
+            return self.files[path]
+        except KeyError:
+            raise FileNotFoundError(path) from None
+
+
+class ZipSink(OutputSink):
+    """流式 ZIP：条目直接写入 fileobj（PNG 已压缩，用 ZIP_STORED；DXF/SVG 用 DEFLATE）"""
+
+    STORED_EXT = (".png", ".jpg", ".webp")
+
+    def __init__(self, fileobj, compresslevel=6):
+        super().__init__()
+        self.zf = zipfile.ZipFile(fileobj, "w", compresslevel=compresslevel)
+
+    def _info(self, path):
+        info = zipfile.ZipInfo(path, time.localtime()[:6])
+        info.compress_type = (zipfile.ZIP_STORED if path.lower().endswith(self.STORED_EXT)
+                              else zipfile.ZIP_DEFLATED)
+        return info
+
+    def write(self, path, data):
+        with self._lock:
+            self.zf.writestr(self._info(path), data)
+            self.paths.append(path)
+        metrics.record_output(path, len(data))
+
+    @contextmanager
+    def open(self, path):
+        info = self._info(path)
+        with self._lock:
+            with self.zf.open(info, "w", force_zip64=True) as f:
+                yield f
+            self.paths.append(path)
+        metrics.record_output(path, info.file_size)
+
+    def close(self):
+        self.zf.close()
+        super().close()
+
+
+class TarSink(OutputSink):
+    """流式 TAR：tar 头需要文件大小，条目先缓冲到内存再写出"""
+
+    def __init__(self, fileobj, compression=""):
+        super().__init__()
+        self.tf = tarfile.open(fileobj=fileobj, mode=f"w|{compression}")
+
+    def write(self, path, data):
+        info = tarfile.TarInfo(path)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        with self._lock:
+            self.tf.addfile(info, io.BytesIO(data))
+            self.paths.append(path)
+        metrics.record_output(path, len(data))
+
+    def close(self):
+        self.tf.close()
+        super().close()
+
+
+class BackgroundWriter(OutputSink):
+    """有界后台写出：编码与 I/O 在线程池中执行，调用方只做 CPU 绑定的绘制
+
+    - 背压：在途任务达到 max_pending 时 submit/write 阻塞，内存中最多缓存 max_pending 份待写数据
+    - 错误传播：后台任务的第一个异常在下一次 submit、flush() 或 close() 时于调用方线程重新抛出
+    """
+
+    def __init__(self, inner, workers=2, max_pending=4):
+        super().__init__()
+        self.inner = inner
+        self.paths = inner.paths
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="sink-writer")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = set()
+        self._error = None
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+    def _done(self, fut):
+        self._slots.release()
+        with self._lock:
+            self._pending.discard(fut)
+            if fut.exception() is not None and self._error is None:
+                self._error = fut.exception()
+
+    def _run(self, path, encode):
+        data = encode()
+        with perf.span("write"):
+            self.inner.write(path, data)
+
+    def submit(self, path, encode):
+        self._raise_pending_error()
+        self._slots.acquire()
+        fut = self._pool.submit(self._run, path, encode)
+        with self._lock:
+            self._pending.add(fut)
+        fut.add_done_callback(self._done)
+
+    def write(self, path, data):
+        self.submit(path, lambda: data)
+
+    def read(self, path):
+        self.flush()
+        return self.inner.read(path)
+
+    def flush(self):
+        """等待所有在途任务完成，并抛出其中的第一个错误"""
+        while True:
+            with self._lock:
+                pending = list(self._pending)
+            if not pending:
+                break
+            for fut in pending:
+                fut.exception()
+        self._raise_pending_error()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._pool.shutdown(wait=True)
+            self.inner.close()
+
+
+@perf.timed("encode.png")
+def encode_png(mode, size, raw, dpi=None, software=None):
+    """把原始像素编码为 PNG bytes（Pillow 的 zlib 压缩释放 GIL，适合放在后台线程）"""
+    img = Image.frombuffer(mode, size, raw, "raw", mode, 0, 1)
+    kw = {}
+    if dpi:
+        kw["dpi"] = (dpi, dpi)
+    if software:
+        info = PngImagePlugin.PngInfo()
+        info.add_text("Software", software)
+        kw["pnginfo"] = info
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", **kw)
+    return buf.getvalue()
+
+
+def _png_chunk(tag, data):
+    return (struct.pack(">I", len(data)) + tag + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+
+def _png_filter(rows, prev, bpp):
+    """逐行自适应滤波（None / Sub / Up，取残差绝对值和最小者），rows: (n, stride) uint8"""
+    up_src = np.vstack([prev[None], rows[:-1]])
+    cand = np.stack([rows,
+                     rows - np.pad(rows, ((0, 0), (bpp, 0)))[:, :-bpp],
+                     rows - up_src])
+    # 残差按有符号字节取绝对值：min(v, 256-v)，uint8 运算避免整块升位
+    cost = np.minimum(cand, np.negative(cand)).sum(axis=2, dtype=np.uint32)
+    best = cost.argmin(axis=0)
+    out = np.empty((rows.shape[0], rows.shape[1] + 1), np.uint8)
+    out[:, 0] = best
+    out[:, 1:] = cand[best, np.arange(rows.shape[0])]
+    return out
+
+
+@perf.timed("encode.png")
+def write_png_rows(f, mode, size, strips, dpi=None, software=None, level=6):
+    """把逐条带产出的像素行流式编码为 PNG 写入 f：任意时刻只持有一个条带及其压缩输出
+
+    strips 依次产出 (rows, w, channels) uint8 数组，总行数等于 size[1]。
+    """
+    w, h = size
+    channels = {"RGB": 3, "RGBA": 4}[mode]
+    f.write(b"\x89PNG\r\n\x1a\n")
+    f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2 if mode == "RGB" else 6, 0, 0, 0)))
+    if dpi:
+        ppm = int(round(dpi / 0.0254))
+        f.write(_png_chunk(b"pHYs", struct.pack(">IIB", ppm, ppm, 1)))
+    if software:
+        f.write(_png_chunk(b"tEXt", b"Software\0" + software.encode("latin-1", "replace")))
+    z = zlib.compressobj(level)
+    prev = np.zeros(w * channels, np.uint8)
+    pending, done = [], 0
+    stride = w * channels
+    step = max(1, (4 << 20) // stride)     # 滤波按约 4 MB 的行块进行，临时数组与条带大小无关
+    for strip in strips:
+        strip = strip.reshape(strip.shape[0], stride)
+        for y in range(0, strip.shape[0], step):
+            rows = np.ascontiguousarray(strip[y:y + step])
+            pending.append(z.compress(_png_filter(rows, prev, channels).tobytes()))
+            prev = rows[-1].copy()
+            done += rows.shape[0]
+        if sum(map(len, pending)) >= 1 << 18:
+            f.write(_png_chunk(b"IDAT", b"".join(pending)))
+            pending = []
+    if done != h:
+        raise ValueError(f"PNG 行数不符：期望 {h}，实际 {done}")
+    pending.append(z.flush())
+    f.write(_png_chunk(b"IDAT", b"".join(pending)))
+    f.write(_png_chunk(b"IEND", b""))
+
+
+def encode_png_rows(mode, size, strips, dpi=None, software=None):
+    """write_png_rows 的 bytes 版本，供 sink.submit"""
+    buf = io.BytesIO()
+    write_png_rows(buf, mode, size, strips, dpi, software)
+    return buf.getvalue()
+
+
+def open_archive(path_or_fileobj, fmt=None):
+    """按格式（zip / tar / tar.gz）或文件扩展名创建归档 sink"""
+    name = path_or_fileobj if isinstance(path_or_fileobj, str) else ""
+    fmt = fmt or ("zip" if name.endswith(".zip") else
+                  "tar.gz" if name.endswith((".tar.gz", ".tgz")) else
+                  "tar" if name.endswith(".tar") else None)
+    if fmt not in ("zip", "tar", "tar.gz"):
+        raise ValueError(f"未知归档格式: {fmt or name!r}（可选 zip / tar / tar.gz）")
+    fileobj = open(path_or_fileobj, "wb") if name else path_or_fileobj
+    sink = ZipSink(fileobj) if fmt == "zip" else TarSink(fileobj, "gz" if fmt == "tar.gz" else "")
+    if name:
+        sink._owned = fileobj
+    return sink
+
+
+_current = None
+
+
+def set_sink(sink):
+    """切换当前输出目标"""
+    global _current
+    _current = sink
+
+
+def get_sink():
+    """当前输出目标；未设置时写入当前工作目录"""
+    global _current
+    if _current is None:
+        _current = DirectorySink(os.getcwd())
+    return _current
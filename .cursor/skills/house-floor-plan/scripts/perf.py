@@ -0,0 +1,247 @@
+"""
+性能埋点 — 生成脚本中的计时区间（span）与计数器
+
+  with perf.span("facade"): ...        # 计时区间，可嵌套
+  @perf.timed("texture")               # 整个函数作为一个区间
+  @perf.drawing("gen_floor1")          # 一张图纸：区间 + 可选的逐图 cProfile
+  perf.count("artists", n)             # 累加计数器
+
+未调用 perf.start() 时 span() 返回共享的空对象、count() 直接返回，
+埋点开销只有一次全局变量判断。bench.py 与 --profile 通过 start()/stop() 收集数据。
+
+区间层级：图纸（gen_* / perspective_*）→ 后端（dxf / matplotlib）→
+阶段（raster.agg / encode.* / write 及 3D 的 sky、texture 等）。
+每个区间记录墙钟时间与线程 CPU 时间，可导出 Chrome trace-event JSON
+（chrome://tracing 或 https://ui.perfetto.dev 打开）。
+"""
+
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+
+import metrics
+
+_recorder = None
+
+
+class Recorder:
+    """收集区间事件（名称、起止时间、线程、嵌套深度）与计数器"""
+
+    def __init__(self, cprofile_dir=None):
+        self.t0 = time.perf_counter()
+        self.events = []          # (name, start, end, thread_id, depth, cpu_seconds)
+        self.counters = {}
+        self.cprofile_dir = cprofile_dir
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def add(self, name, start, end, depth, cpu=0.0):
+        with self._lock:
+            self.events.append((name, start, end, threading.get_ident(), depth, cpu))
+
+    def stages(self):
+        """按名称汇总：{name: {"seconds": 累计耗时, "cpu_seconds": 累计 CPU, "count": 次数}}
+        （嵌套区间各自计入）"""
+        out = {}
+        for name, start, end, _, _, cpu in self.events:
+            s = out.setdefault(name, {"seconds": 0.0, "cpu_seconds": 0.0, "count": 0})
+            s["seconds"] += end - start
+            s["cpu_seconds"] += cpu
+            s["count"] += 1
+        for s in out.values():
+            s["seconds"] = round(s["seconds"], 6)
+            s["cpu_seconds"] = round(s["cpu_seconds"], 6)
+        return out
+
+    def chrome_trace(self):
+        """Chrome trace-event 格式（完整事件 ph=X，时间单位微秒）"""
+        pid = os.getpid()
+        tids = {}
+        events = []
+        for name, start, end, tid, depth, cpu in sorted(self.events, key=lambda e: (e[1], e[4])):
+            t = tids.setdefault(tid, len(tids))
+            events.append({
+                "name": name, "cat": category(name), "ph": "X", "pid": pid, "tid": t,
+                "ts": round((start - self.t0) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "args": {"cpu_ms": round(cpu * 1e3, 3), "depth": depth},
+            })
+        names = {th.ident: th.name for th in threading.enumerate()}
+        for tid, t in tids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": t,
+                           "args": {"name": names.get(tid, f"thread-{t}")}})
+        for name, value in sorted(self.counters.items()):
+            events.append({"name": name, "ph": "C", "pid": pid, "tid": 0,
+                           "ts": round((time.perf_counter() - self.t0) * 1e6, 1),
+                           "args": {name: value}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+        return path
+
+
+def category(name):
+    """区间所属层级，用于 trace 的 cat 字段与汇总分组"""
+    if name.startswith(("gen_", "perspective_")):
+        return "drawing"
+    if name in ("dxf", "matplotlib", "native"):
+        return "backend"
+    if name.startswith(("raster.", "encode.")):
+        return "encode"
+    if name == "write":
+        return "io"
+    return "stage"
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("rec", "name", "start", "cpu", "depth")
+
+    def __init__(self, rec, name):
+        self.rec = rec
+        self.name = name
+
+    def __enter__(self):
+        local = self.rec._local
+        self.depth = getattr(local, "depth", 0)
+        local.depth = self.depth + 1
+        self.cpu = time.thread_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        cpu = time.thread_time() - self.cpu
+        self.rec._local.depth = self.depth
+        self.rec.add(self.name, self.start, end, self.depth, cpu)
+        return False
+
+
+def span(name):
+    rec = _recorder
+    if rec is None:
+        return _NULL
+    return _Span(rec, name)
+
+
+def timed(name):
+    """装饰器：把整个函数调用记为一个区间"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            rec = _recorder
+            if rec is None:
+                return fn(*args, **kwargs)
+            with _Span(rec, name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def drawing(name):
+    """装饰器：一张图纸的生成函数；始终记入 metrics（次数、耗时、峰值内存），
+    Recorder 设置了 cprofile_dir 时另存 <name>.prof"""
+    def deco(fn):
+        def run(*args, **kwargs):
+            rec = _recorder
+            if rec is None:
+                return fn(*args, **kwargs)
+            if rec.cprofile_dir is None:
+                with _Span(rec, name):
+                    return fn(*args, **kwargs)
+            prof = cProfile.Profile()
+            try:
+                with _Span(rec, name):
+                    return prof.runcall(fn, *args, **kwargs)
+            finally:
+                os.makedirs(rec.cprofile_dir, exist_ok=True)
+                prof.dump_stats(os.path.join(rec.cprofile_dir, f"{name}.prof"))
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with metrics.track_drawing(name):
+                return run(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def count(name, n=1):
+    rec = _recorder
+    if rec is None:
+        return
+    with rec._lock:
+        rec.counters[name] = rec.counters.get(name, 0) + n
+
+
+def enabled():
+    return _recorder is not None
+
+
+def start(cprofile_dir=None):
+    """开始收集，返回新的 Recorder；cprofile_dir 非空时每张图纸另存 cProfile 统计"""
+    global _recorder
+    _recorder = Recorder(cprofile_dir)
+    return _recorder
+
+
+def stop():
+    """停止收集，返回收集到的 Recorder"""
+    global _recorder
+    rec, _recorder = _recorder, None
+    return rec
+
+
+def summary(rec, top=15):
+    """按墙钟耗时排序的区间汇总文本（图纸 / 后端 / 阶段）"""
+    stages = rec.stages()
+    lines = [f"  {'区间':28s} {'层级':8s} {'次数':>5s} {'墙钟(s)':>9s} {'CPU(s)':>9s}"]
+    for name, s in sorted(stages.items(), key=lambda kv: -kv[1]["seconds"])[:top]:
+        lines.append(f"  {name:28s} {category(name):8s} {s['count']:5d} "
+                     f"{s['seconds']:9.3f} {s['cpu_seconds']:9.3f}")
+    return "\n".join(lines)
+
+
+def add_profile_arguments(parser):
+    """给命令行加 --profile [TRACE] 与 --cprofile DIR"""
+    parser.add_argument("--profile", nargs="?", const="profile_trace.json", metavar="TRACE",
+                        help="记录分层计时并写出 Chrome trace JSON（默认 profile_trace.json）")
+    parser.add_argument("--cprofile", metavar="DIR",
+                        help="配合 --profile：每张图纸的 cProfile 统计写入 DIR/<图纸>.prof")
+
+
+def start_from_args(args):
+    """按命令行参数开始收集；未指定 --profile 时什么都不做"""
+    if args.profile or args.cprofile:
+        return start(os.path.abspath(args.cprofile) if args.cprofile else None)
+    return None
+
+
+def finish_from_args(args):
+    """停止收集，写出 trace 并打印汇总"""
+    rec = stop()
+    if rec is None:
+        return None
+    path = rec.write_trace(args.profile or "profile_trace.json")
+    print("\n" + summary(rec))
+    print(f"  trace: {os.path.abspath(path)}（chrome://tracing 或 ui.perfetto.dev 打开）")
+    if rec.cprofile_dir:
+        print(f"  cProfile: {rec.cprofile_dir}/*.prof（python -m pstats 查看）")
+    return rec
@@ -0,0 +1,54 @@
+"""
+渲染质量预设 — generate_all.py / generate_render_3d.py 共用
+
+  draft     草图预览：线性 1/4 分辨率，不输出 SVG，不做锐化，用于迭代评审
+  standard  标准输出：与 docs/images/ 现有分辨率一致（150/200 dpi，3D 3600×2400）
+  print     打印输出：1.5 倍分辨率，3D 渲染 2× 超采样后缩小抗锯齿（替代 SHARPEN）
+  poster    海报输出：4 倍分辨率（南立面效果图约 11500 px 宽、3D 14400×9600），不输出 SVG，
+            强制条带渲染（见 memory_budget.py），峰值内存不随整幅画布增长
+
+画布、DPI、纹理分辨率与模糊半径统一按 scale 缩放：
+  matplotlib 图纸只需缩放 dpi（线宽/字号以磅为单位，随 dpi 自动缩放）；
+  3D 渲染中所有绝对像素量通过 generate_render_3d.px() 换算。
+"""
+
+PRESETS = {
+    "draft":    {"scale": 0.25, "supersample": 1, "svg": False, "sharpen": False},
+    "standard": {"scale": 1.0,  "supersample": 1, "svg": True,  "sharpen": True},
+    "print":    {"scale": 1.5,  "supersample": 2, "svg": True,  "sharpen": False},
+    "poster":   {"scale": 4.0,  "supersample": 1, "svg": False, "sharpen": False, "strips": True},
+}
+DEFAULT = "standard"
+
+_current = DEFAULT
+
+
+def set_quality(name):
+    """切换当前质量预设（draft / standard / print）"""
+    global _current
+    if name not in PRESETS:
+        raise ValueError(f"未知质量预设: {name!r}（可选 {', '.join(PRESETS)}）")
+    _current = name
+
+
+def get_quality():
+    return _current
+
+
+def preset():
+    return PRESETS[_current]
+
+
+def dpi(base):
+    """按当前预设缩放 matplotlib 输出 dpi"""
+    return max(1, round(base * PRESETS[_current]["scale"]))
+
+
+def want_svg():
+    return PRESETS[_current]["svg"]
+
+
+def add_quality_argument(parser):
+    """为入口脚本的 argparse 添加 --quality 参数"""
+    parser.add_argument("--quality", choices=list(PRESETS), default=DEFAULT,
+                        help="渲染质量预设：draft 草图 / standard 标准 / print 打印 / poster 海报")
@@ -0,0 +1,384 @@
+"""
+常驻图纸生成服务 — 预热 worker 池 + asyncio 任务队列
+
+每次 shell 调用 generate_all.py 都要付出解释器启动、matplotlib/ezdxf 导入、
+CJK 字体检测与目录创建的开销。本服务启动时一次性完成这些工作，再 fork
+出常驻 worker（继承已导入的模块与字体缓存），单张图纸的延迟只剩实际绘图时间。
+
+  python serve.py                    # stdin/stdout JSON Lines
+  python serve.py --http 8765        # HTTP：POST /render，分块返回 NDJSON；GET /drawings 列出图纸
+                                     #       POST /package，分块返回 ZIP/TAR 图纸包（不落盘）
+                                     #       GET /metrics，Prometheus 文本格式（汇总所有 worker）
+  选项：--workers N（默认 CPU 数）  --out DIR（默认当前目录，每个请求写入 DIR/<id>/）
+        --metrics-file PATH（退出时写出指标）  --metrics-port PORT（stdin 模式下单独提供 /metrics）
+        --memory-budget SIZE（按估计峰值内存限制同时运行的图纸数，见 memory_budget.py）
+
+请求（一行 JSON 或 HTTP 请求体）：
+  {"id": "r1", "spec": {"F1H": 3.4}, "drawings": ["floor1", "perspective_south"], "quality": "draft"}
+  id 用作输出目录/包文件名，只允许字母、数字与 _ . -（不能是 . 或 ..）；省略时自动编号。
+  spec 为 building_config 参数覆盖项（见 spec.py），drawings 省略或 ["all"] 表示全套。
+  受理时先做一致性校验（validate.py），有错误的 spec 直接拒绝；"validate": false 跳过。
+  "package": "zip" | "tar" | "tar.gz" 时 worker 写入内存，由服务端打包：
+  stdin 模式写到 DIR/<id>.zip，HTTP /package 直接流式发送，末尾附 manifest.json。
+
+响应（每张图纸完成即输出一行，顺序按完成先后）：
+  {"id": "r1", "drawing": "floor1", "ok": true, "files": [...], "seconds": 0.81, "peak_mb": 42.5}
+  {"id": "r1", "drawing": "perspective_south", "ok": false, "error": "..."}
+  {"id": "r1", "done": true, "seconds": 2.35}
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import multiprocessing as mp
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import generate_all
+import generate_render_3d
+import memory_budget
+import metrics
+import output_sink
+import render_quality
+import spec as spec_mod
+import validate
+
+# 请求 id 会拼进 --out 下的路径，只接受这些字符
+REQUEST_ID = re.compile(r"[A-Za-z0-9_.-]+")
+
+# 图纸名 → (模块, 生成函数名)
+DRAWINGS = {
+    "floor1":                (generate_all, "gen_floor1"),
+    "floor2":                (generate_all, "gen_floor2"),
+    "elevations":            (generate_all, "gen_elevations"),
+    "section":               (generate_all, "gen_section"),
+    "roof":                  (generate_all, "gen_roof"),
+    "plumbing":              (generate_all, "gen_plumbing"),
+    "electrical":            (generate_all, "gen_electrical"),
+    "render_south":          (generate_all, "gen_render_south"),
+    "render_interior_f1":    (generate_all, "gen_render_interior_f1"),
+    "render_interior_f2":    (generate_all, "gen_render_interior_f2"),
+    "perspective_south":     (generate_render_3d, "generate_south_perspective"),
+    "perspective_southeast": (generate_render_3d, "generate_southeast_perspective"),
+}
+
+
+# ══════════════════════════════════════════════
+#  worker 端
+# ══════════════════════════════════════════════
+
+def _warm():
+    """预热 matplotlib 字体查找缓存与 Pillow 字体（fork 前在父进程执行一次）"""
+    with generate_all._figure((1, 1)) as (fig, ax):
+        ax.text(0.5, 0.5, "预热", fontweight="bold")
+        fig.savefig(io.BytesIO(), format="png")
+    generate_render_3d._get_fonts()
+
+
+def _init_worker():
+    # fork 启动时模块已继承；spawn 平台（Windows/macOS）在此完成导入与预热
+    _warm()
+
+
+def _ping():
+    # 短暂占住 worker，使并发提交的 ping 各自触发一次 fork
+    time.sleep(0.1)
+    return os.getpid()
+
+
+def _run_drawing(name, spec, quality, out):
+    """在 worker 中生成一张图纸；out=None 时写入内存并随结果返回文件内容"""
+    t0 = time.perf_counter()
+    metrics.reset()   # 只带回本任务的指标，由服务进程 merge
+    metrics.reset_peak_rss()
+    rss0 = metrics.current_rss_bytes()
+    spec_mod.apply_spec(spec)
+    render_quality.set_quality(quality)
+    inner = output_sink.MemorySink() if out is None else output_sink.DirectorySink(out)
+    # 多图输出（如四个立面）时 PNG 压缩与下一张的绘制重叠
+    sink = output_sink.BackgroundWriter(inner, workers=1)
+    output_sink.set_sink(sink)
+    mod, fn = DRAWINGS[name]
+    try:
+        # 生成函数的 ✓ 进度输出不能混入 stdout 协议流
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(mod, fn)()
+    finally:
+        sink.close()
+    r = {"files": list(inner.paths), "seconds": round(time.perf_counter() - t0, 3),
+         "peak_mb": round(max(0, metrics.peak_rss_bytes() - rss0) / 2**20, 1),
+         "metrics": metrics.snapshot()}
+    if out is None:
+        r["data"] = inner.files
+    return r
+
+
+# ══════════════════════════════════════════════
+#  服务端
+# ══════════════════════════════════════════════
+
+class Service:
+    """asyncio 任务队列：请求拆成逐图纸任务，由 workers 个消费者分发到进程池
+
+    设置了内存预算时，消费者派发前先向 MemoryGate 申请该图纸的估计峰值内存
+    （初值见 memory_budget.ESTIMATE_MB，之后用 worker 实测的 peak_mb 更新）。
+    """
+
+    def __init__(self, workers, out, memory=None):
+        self.workers = workers
+        self.out = os.path.abspath(out)
+        self.gate = memory_budget.MemoryGate(memory) if memory else None
+        methods = mp.get_all_start_methods()
+        ctx = mp.get_context("fork" if "fork" in methods else None)
+        self.pool = ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker)
+        self.jobs = asyncio.Queue()
+        self._ids = itertools.count(1)
+        self._consumers = []
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        # 预先 fork 全部 worker，避免首个请求承担进程启动开销
+        pids = await asyncio.gather(*[loop.run_in_executor(self.pool, _ping)
+                                      for _ in range(self.workers)])
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+        return sorted(set(pids))
+
+    async def close(self):
+        for t in self._consumers:
+            t.cancel()
+        self.pool.shutdown(cancel_futures=True)
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            rid, name, args, results = await self.jobs.get()
+            quality = args[1]
+            cost = self.gate.cost(name, quality) if self.gate else 0
+            try:
+                if self.gate:
+                    await self.gate.acquire(cost)
+                try:
+                    r = await loop.run_in_executor(self.pool, _run_drawing, name, *args)
+                finally:
+                    if self.gate:
+                        await self.gate.release(cost)
+                if self.gate:
+                    self.gate.observe(name, quality, int(r["peak_mb"] * 2**20))
+                metrics.merge(r.pop("metrics"))
+                results.put_nowait({"id": rid, "drawing": name, "ok": True, **r})
+            except Exception as e:
+                metrics.inc("drawings_total", drawing=DRAWINGS[name][1], status="error")
+                results.put_nowait({"id": rid, "drawing": name, "ok": False,
+                                    "error": f"{type(e).__name__}: {e}"})
+            finally:
+                self.jobs.task_done()
+
+    async def handle(self, req):
+        """处理一个请求，按完成顺序逐条产出结果（package 请求的结果带 data: {路径: bytes}）"""
+        t0 = time.perf_counter()
+        rid = str(req.get("id") or f"r{next(self._ids)}")
+        names = req.get("drawings") or ["all"]
+        if names == ["all"]:
+            names = list(DRAWINGS)
+        try:
+            if not REQUEST_ID.fullmatch(rid) or rid in (".", ".."):
+                raise ValueError(f"非法请求 id: {rid!r}（只允许字母、数字与 _ . -）")
+            unknown = [n for n in names if n not in DRAWINGS]
+            if unknown:
+                raise ValueError(f"未知图纸: {', '.join(unknown)}")
+            resolved = spec_mod.resolve(req.get("spec"))
+            if req.get("validate", True):
+                problems = validate.errors(validate.validate(resolved))
+                if problems:
+                    raise ValueError("一致性校验未通过：" + "；".join(f["message"] for f in problems))
+            quality = req.get("quality", render_quality.DEFAULT)
+            if quality not in render_quality.PRESETS:
+                raise ValueError(f"未知质量预设: {quality!r}")
+            if req.get("package") not in (None, "zip", "tar", "tar.gz"):
+                raise ValueError(f"未知归档格式: {req['package']!r}")
+        except ValueError as e:
+            yield {"id": rid, "done": True, "ok": False, "error": str(e)}
+            return
+        out = None if req.get("package") else os.path.join(self.out, rid)
+        results = asyncio.Queue()
+        for n in names:
+            self.jobs.put_nowait((rid, n, (req.get("spec"), quality, out), results))
+        ok = True
+        for _ in names:
+            r = await results.get()
+            ok = ok and r["ok"]
+            yield r
+        yield {"id": rid, "done": True, "ok": ok, "seconds": round(time.perf_counter() - t0, 3)}
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False) + "\n"
+
+
+async def serve_stdio(service):
+    """stdin 每行一个请求，结果逐行写到 stdout；多个请求并发处理"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    async def run(req):
+        sink = None
+        async for r in service.handle(req):
+            if "data" in r:
+                if sink is None:
+                    pkg = os.path.join(service.out, f"{r['id']}.{req['package']}")
+                    os.makedirs(service.out, exist_ok=True)
+                    sink = output_sink.open_archive(pkg, req["package"])
+                for path, data in r.pop("data").items():
+                    sink.write(path, data)
+            elif r.get("done") and sink is not None:
+                sink.close()
+                r["package"] = pkg
+            sys.stdout.write(_dumps(r))
+            sys.stdout.flush()
+
+    tasks = set()
+    while line := await reader.readline():
+        if not line.strip():
+            continue
+        try:
+            req = json.loads(line)
+        except json.JSONDecodeError as e:
+            sys.stdout.write(_dumps({"ok": False, "error": f"JSON 解析失败: {e}"}))
+            sys.stdout.flush()
+            continue
+        t = asyncio.create_task(run(req))
+        tasks.add(t)
+        t.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+class _ChunkedBody:
+    """同步写入接口 → HTTP chunked 编码；归档 sink 把它当作不可 seek 的文件"""
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def write(self, data):
+        if data:
+            self.writer.write(f"{len(data):X}\r\n".encode() + bytes(data) + b"\r\n")
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+async def _stream_package(service, req, writer):
+    """每张图纸完成即把其文件追加进归档并发送，最后写入 manifest.json"""
+    ctype = "application/zip" if req["package"] == "zip" else "application/x-tar"
+    writer.write(f"HTTP/1.1 200 OK\r\nContent-Type: {ctype}\r\n"
+                 "Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n".encode())
+    sink = output_sink.open_archive(_ChunkedBody(writer), req["package"])
+    manifest = []
+    async for r in service.handle(req):
+        for path, data in r.pop("data", {}).items():
+            sink.write(path, data)
+        manifest.append(r)
+        await writer.drain()
+    sink.write("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    sink.close()
+    writer.write(b"0\r\n\r\n")
+
+
+async def _http_client(service, reader, writer):
+    try:
+        method, path, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+    except (ValueError, asyncio.IncompleteReadError):
+        writer.close()
+        return
+
+    def respond(status, payload):
+        data = _dumps(payload).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data)
+
+    if method == "POST" and path == "/package":
+        try:
+            req = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            respond("400 Bad Request", {"ok": False, "error": f"JSON 解析失败: {e}"})
+        else:
+            req["package"] = req.get("package") or "zip"
+            await _stream_package(service, req, writer)
+    elif method == "GET" and path == "/metrics":
+        data = metrics.render_prometheus().encode("utf-8")
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                     + f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data)
+    elif method == "GET" and path == "/drawings":
+        respond("200 OK", {"drawings": list(DRAWINGS), "qualities": list(render_quality.PRESETS)})
+    elif method == "POST" and path == "/render":
+        try:
+            req = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            respond("400 Bad Request", {"ok": False, "error": f"JSON 解析失败: {e}"})
+        else:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                         b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+            async for r in service.handle(req):
+                data = _dumps(r).encode("utf-8")
+                writer.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+    else:
+        respond("404 Not Found", {"ok": False, "error": f"{method} {path}"})
+    await writer.drain()
+    writer.close()
+
+
+async def serve_http(service, port, host="127.0.0.1"):
+    server = await asyncio.start_server(lambda r, w: _http_client(service, r, w), host, port)
+    print(f"  HTTP 服务: http://{host}:{port}/render", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+async def main(args):
+    service = Service(args.workers, args.out, memory_budget.get_budget())
+    pids = await service.start()
+    print(f"  {len(pids)} 个 worker 已就绪 (pid {', '.join(map(str, pids))})", file=sys.stderr)
+    try:
+        if args.http:
+            await serve_http(service, args.http, args.host)
+        else:
+            await serve_stdio(service)
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="常驻图纸生成服务")
+    parser.add_argument("--http", type=int, metavar="PORT", help="以 HTTP 模式监听端口（默认 stdin/stdout JSON Lines）")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--out", default=os.getcwd(), help="输出根目录，每个请求写入 <out>/<id>/")
+    metrics.add_metrics_arguments(parser)
+    memory_budget.add_budget_argument(parser)
+    args = parser.parse_args()
+    memory_budget.set_budget(args.memory_budget)   # fork 前设置，worker 继承（条带渲染）
+    # fork 前在父进程完成字体缓存预热，worker 直接继承
+    _warm()
+    metrics_server = metrics.start_from_args(args)
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        metrics.finish_from_args(args, metrics_server)
@@ -0,0 +1,251 @@
+"""
+图纸集 PDF — 把平面、立面、剖面、屋顶与设备图排到标准图幅上，输出一份多页矢量 PDF
+
+  python generate_all.py --pdf-set            # 图纸/图纸集_A1.pdf
+  python generate_all.py --pdf-set A3         # A3 图幅（比例自动放大一档）
+
+generate_all._render 在出图的同时把每张图纸的显示列表交给 collect()；全部图纸生成后
+write() 逐页排版并流式写入 PdfPages：
+  - 第 1 页为图纸目录（图号、图名、比例、图幅）
+  - 每页：图框（装订边 25 mm）、右下角标题栏、左下角比例尺；一页可放多张图（同一比例，
+    横排放不下时竖排），比例取能放下的最大标准比例（1:50、1:75、1:100……）
+  - 图纸内容由显示列表直接回放为 PDF 矢量路径与文字（TrueType 子集内嵌，全册共用），
+    不经光栅化，也不重新构建几何
+"""
+
+import os
+import sys
+
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import output_sink
+import perf
+from display_list import DisplayList
+
+PROJECT = "两层轻奢别墅"
+# 标题栏/目录只用内嵌 NotoSansSC 子集里有的字（“比例”“图幅”等以英文表头代替）
+# 图幅（横向）：宽、高、非装订边 c、图名字号 pt、目录行高（mm）
+FORMATS = {
+    "A1": (841, 594, 10, 16, 12),
+    "A3": (420, 297, 5, 10, 8),
+}
+BINDING = 25                    # 装订边 a
+TITLE_BLOCK = (180, 40)         # 标题栏宽、高
+SCALES = (50, 75, 100, 150, 200, 250, 300, 500)
+GAP = 15                        # 同页图纸之间、图纸与图框之间的间距
+C_INK = "#1A1A1A"; C_INK2 = "#666666"
+
+# (图号, 图名, [图纸名（PNG 文件名，不含扩展名）])
+SHEETS = [
+    ("A-01", "一层平面图", ["一层平面图"]),
+    ("A-02", "二层平面图", ["二层平面图"]),
+    ("A-03", "屋顶平面图", ["屋顶平面图"]),
+    ("A-04", "南、北立面图", ["南立面图", "北立面图"]),
+    ("A-05", "东、西立面图", ["东立面图", "西立面图"]),
+    ("A-06", "1-1 剖面图", ["1-1剖面图"]),
+    ("P-01", "一层给排水平面图", ["一层给排水平面图"]),
+    ("P-02", "二层给排水平面图", ["二层给排水平面图"]),
+    ("E-01", "一层电气平面图", ["一层电气平面图"]),
+    ("E-02", "二层电气平面图", ["二层电气平面图"]),
+]
+
+_format = None                  # None：不输出图纸集
+_drawings = {}
+
+
+def set_format(fmt):
+    global _format
+    if fmt is not None and fmt not in FORMATS:
+        raise ValueError(f"未知图幅: {fmt!r}（可选 {' / '.join(FORMATS)}）")
+    _format = fmt
+    _drawings.clear()
+
+
+def get_format():
+    return _format
+
+
+def collect(name, dl):
+    """记录一张图纸的显示列表（未启用图纸集时不保留）"""
+    if _format is not None:
+        _drawings[name] = dl
+
+
+# ── 排版 ──
+
+def _area(fmt):
+    """可排图区域 (x0, y0, x1, y1)：图框内、标题栏以上"""
+    w, h, c = FORMATS[fmt][:3]
+    return BINDING + GAP, c + TITLE_BLOCK[1] + GAP, w - c - GAP, h - c - GAP
+
+
+def _label_h(fmt):
+    return FORMATS[fmt][3] * 25.4 / 72 * 2.2
+
+
+def layout(names, fmt, drawings=None):
+    """按最大可用标准比例排版 → (比例分母, [(名称, x, y, 宽, 高), ...])，单位为图纸 mm"""
+    drawings = _drawings if drawings is None else drawings
+    x0, y0, x1, y1 = _area(fmt)
+    aw, ah = x1 - x0, y1 - y0
+    lh = _label_h(fmt)
+    spans = []
+    for name in names:
+        (a, b), (c, d) = drawings[name].xlim, drawings[name].ylim
+        spans.append((name, b - a, d - c))
+    for n in SCALES:
+        sizes = [(name, dx / n, dy / n) for name, dx, dy in spans]
+        row_w = sum(w for _, w, _ in sizes) + GAP * (len(sizes) - 1)
+        col_h = sum(h + lh for _, _, h in sizes) + GAP * (len(sizes) - 1)
+        if row_w <= aw and max(h for _, _, h in sizes) + lh <= ah:
+            x = x0 + (aw - row_w) / 2
+            cells = []
+            for name, w, h in sizes:
+                cells.append((name, x, y0 + (ah - h - lh) / 2 + lh, w, h))
+                x += w + GAP
+            return n, cells
+        if max(w for _, w, _ in sizes) <= aw and col_h <= ah:
+            y = y1 - (ah - col_h) / 2
+            cells = []
+            for name, w, h in sizes:
+                y -= h
+                cells.append((name, x0 + (aw - w) / 2, y, w, h))
+                y -= lh + GAP
+            return n, cells
+    raise ValueError(f"{' + '.join(names)} 在 {fmt} 图幅上放不下（最小比例 1:{SCALES[-1]}）")
+
+
+def paginate(fmt, drawings=None):
+    """已收集的图纸按 SHEETS 分页 → [(图号, 图名, 比例分母, cells), ...]（缺少的图纸跳过）"""
+    drawings = _drawings if drawings is None else drawings
+    sheets = []
+    for code, title, names in SHEETS:
+        names = [n for n in names if n in drawings]
+        if names:
+            sheets.append((code, title) + layout(names, fmt, drawings))
+    return sheets
+
+
+# ── 图框、标题栏、比例尺、目录（图纸 mm 坐标的显示列表） ──
+
+def frame(fmt, code, title, scale, page, pages, labels=()):
+    """图框、标题栏、比例尺与各图图名（labels = [(图名, x, y, 宽), ...]，图纸 mm）"""
+    w, h, c = FORMATS[fmt][:3]
+    dl = DisplayList()
+    dl.rect(0, 0, w, h, "TITLE", color=C_INK, lw=0.3)                                # 裁切线
+    dl.rect(BINDING, c, w - BINDING - c, h - 2 * c, "TITLE", color=C_INK, lw=1.4)   # 图框线
+    tw, th = TITLE_BLOCK
+    x, y = w - c - tw, c
+    dl.rect(x, y, tw, th, "TITLE", fill="white", color=C_INK, lw=1.0)
+    dl.line(x + 60, y, x + 60, y + th, "TITLE", color=C_INK, lw=0.5)
+    dl.line(x + 60, y + 24, x + tw, y + 24, "TITLE", color=C_INK, lw=0.5)
+    dl.line(x + 60, y + 12, x + tw, y + 12, "TITLE", color=C_INK, lw=0.5)
+    for dx in (80, 120, 140):
+        dl.line(x + dx, y, x + dx, y + 24, "TITLE", color=C_INK, lw=0.5)
+    dl.text(x + 30, y + 24, PROJECT, "TITLE", size=12, weight="bold", color=C_INK)
+    dl.text(x + 30, y + 13, "2主卧+1次卧 现代简约别墅", "TITLE", size=7, color=C_INK2)
+    dl.text(x + 120, y + 32, title, "TITLE", size=13, weight="bold", color=C_INK)
+    for (dx, dy, s, bold) in [(70, 18, "图号", False), (100, 18, code, True),
+                              (130, 18, "Scale", False), (160, 18, f"1:{scale}" if scale else "—", True),
+                              (70, 6, "Size", False), (100, 6, fmt, True),
+                              (130, 6, "张次", False), (160, 6, f"{page} / {pages}", True)]:
+        dl.text(x + dx, y + dy, s, "TITLE", size=7, weight="bold" if bold else "normal",
+                color=C_INK if bold else C_INK2)
+    if scale:
+        _scale_bar(dl, BINDING + GAP, c + GAP, scale)
+    lh = _label_h(fmt)
+    for name, x, y, cw in labels:
+        dl.text(x + cw / 2, y - lh * 0.45, f"{name}    1:{scale}", "TITLE", size=FORMATS[fmt][3],
+                weight="bold", color=C_INK)
+        dl.line(x + cw * 0.3, y - lh * 0.8, x + cw * 0.7, y - lh * 0.8, "TITLE", color=C_INK, lw=1.2)
+    return dl
+
+
+def _scale_bar(dl, x, y, scale, metres=5):
+    """黑白相间的比例尺，每格 1 m"""
+    step = 1000 / scale
+    for i in range(metres):
+        dl.rect(x + i * step, y, step, 2, "TITLE", fill=C_INK if i % 2 == 0 else "white", color=C_INK, lw=0.4)
+        dl.text(x + i * step, y + 3, str(i), "TITLE", size=6, color=C_INK, va="bottom")
+    dl.text(x + metres * step, y + 3, f"{metres} m", "TITLE", size=6, color=C_INK, va="bottom")
+    dl.text(x + metres * step + 6, y + 1, f"1:{scale}", "TITLE", size=7, weight="bold", color=C_INK, ha="left")
+
+
+def index_table(dl, fmt, rows):
+    """图纸目录表画入 dl：rows = [(图号, 图名, 比例分母), ...]"""
+    rh = FORMATS[fmt][4]
+    x0, _, x1, y1 = _area(fmt)
+    cols = [("No.", 20), ("图号", 30), ("图名", 110), ("Scale", 30), ("Size", 25)]
+    tw = sum(cw for _, cw in cols)
+    x = x0 + (x1 - x0 - tw) / 2
+    dl.text(x + tw / 2, y1 - rh, "图纸目录", "TITLE", size=FORMATS[fmt][3] * 1.4, weight="bold", color=C_INK)
+    top = y1 - 3 * rh
+    table = [tuple(name for name, _ in cols)] + [
+        (str(i + 1), code, title, f"1:{scale}", fmt) for i, (code, title, scale) in enumerate(rows)]
+    for r, cells in enumerate(table):
+        y = top - r * rh
+        cx = x
+        for (_, cw), s in zip(cols, cells):
+            dl.text(cx + cw / 2, y - rh / 2, s, "TITLE", size=8, weight="bold" if r == 0 else "normal", color=C_INK)
+            cx += cw
+        dl.line(x, y - rh, x + tw, y - rh, "TITLE", color=C_INK, lw=1.0 if r == 0 else 0.4)
+    bottom = top - len(table) * rh
+    dl.rect(x, bottom, tw, top - bottom, "TITLE", color=C_INK, lw=1.0)
+    cx = x
+    for _, cw in cols[:-1]:
+        cx += cw
+        dl.line(cx, bottom, cx, top, "TITLE", color=C_INK, lw=0.4)
+
+
+# ── 输出 ──
+
+def labels(cells, drawings=None):
+    """frame() 用的图名位置：每张图纸的标题放在其下方"""
+    drawings = _drawings if drawings is None else drawings
+    return [(drawings[name].title, x, y, cw) for name, x, y, cw, _ in cells]
+
+
+def _page(pdf, fmt, sheet_frame, cells=()):
+    """一页：整页 Axes 画图框，每张图纸一个按比例放置的 Axes；写入后立即释放"""
+    w, h = FORMATS[fmt][:2]
+    fig = Figure(figsize=(w / 25.4, h / 25.4), facecolor="white")
+    FigureCanvasAgg(fig)
+    sheet = fig.add_axes((0, 0, 1, 1))
+    sheet.axis("off"); sheet.set_xlim(0, w); sheet.set_ylim(0, h)
+    sheet_frame.to_axes(sheet, unit=1)
+    for name, x, y, cw, ch in cells:
+        dl = _drawings[name]
+        ax = fig.add_axes((x / w, y / h, cw / w, ch / h))
+        ax.axis("off"); ax.set_xlim(*dl.xlim); ax.set_ylim(*dl.ylim)
+        dl.to_axes(ax, unit=1)
+    with perf.span("encode.pdf"):
+        pdf.savefig(fig)
+    fig.clear()
+
+
+def write(path, sink=None):
+    """排版全部已收集的图纸并流式写出一份多页 PDF；返回写出的页数"""
+    sink = sink or output_sink.get_sink()
+    fmt = _format
+    sheets = paginate(fmt)
+    pages = len(sheets) + 1
+    meta = {"Title": f"{PROJECT} 图纸集 ({fmt})", "Creator": PROJECT, "CreationDate": None}
+    with perf.span("pdf"), sink.open(path) as f, \
+            matplotlib.rc_context({"pdf.fonttype": 42, "pdf.compression": 9}), \
+            PdfPages(f, metadata=meta) as pdf:
+        index = frame(fmt, "G-00", "图纸目录", None, 1, pages)
+        index_table(index, fmt, [(code, title, n) for code, title, n, _ in sheets])
+        _page(pdf, fmt, index)
+        for i, (code, title, n, cells) in enumerate(sheets):
+            _page(pdf, fmt, frame(fmt, code, title, n, i + 2, pages, labels(cells)), cells)
+    print(f"  ✓ 图纸集 PDF（{fmt} × {pages} 页）→ {path}")
+    return pages
+
+
+def add_pdf_argument(parser):
+    parser.add_argument("--pdf-set", nargs="?", const="A1", choices=tuple(FORMATS),
+                        help="另外输出一份多页矢量 PDF 图纸集（图框、标题栏、比例尺、目录；默认 A1）")
@@ -0,0 +1,140 @@
+"""
+建筑方案 spec — building_config 参数的字典形式
+
+  default_spec()      building_config 当前的全部主参数（可直接 json.dumps）
+  resolve(overrides)  合并覆盖项（校验键名与值的类型）并按 building_config 的规则推导米制尺寸与标高
+  spec_hash(spec)     规范化 JSON 的 SHA-1，用作缓存键
+  current_hash()      building_config 当前生效参数的哈希（apply_spec 之后即该方案的 spec_hash）
+  apply_spec(spec)    把方案写回 building_config 及已导入的生成模块
+
+生成模块通过 `from building_config import ...` 按名取值，apply_spec 负责
+在进程内重新绑定这些名字（常驻服务的 worker 无需重启即可切换方案）。
+
+注意：窗户列表是绝对坐标（含窗台标高），修改层高时应同时传入新的窗户列表。
+"""
+
+import hashlib
+import json
+import numbers
+import sys
+
+import numpy as np
+
+import building_config
+
+# 由主参数推导的量 —— 与 building_config「标高推导」一节保持一致，不接受覆盖
+DERIVED = ("BW_M", "BD_M", "GL", "F1_FL", "F1_CL", "F2_FL", "F2_CL", "ROOF", "TOP")
+
+# 各生成模块中由 building_config 派生的本地别名：{模块: {本地名: 配置名}}
+MODULE_ALIASES = {
+    "generate_all": {"W_m": "BW_M", "D_m": "BD_M"},
+    "generate_render_3d": {"BW": "BW_M", "BD": "BD_M", "BASE_H": "F1_FL",
+                           "F1_TOP": "F1_CL", "F2_BOT": "F2_FL", "F2_TOP": "F2_CL"},
+}
+
+_NAMES = [n for n in vars(building_config) if n.isupper() and not n.startswith("_")]
+_DEFAULTS = {n: getattr(building_config, n) for n in _NAMES}
+_BOUND = {}   # 模块名 → 该模块从 building_config 导入的名字（首次见到该模块时记录）
+
+
+def _plain(v):
+    """元组转列表，便于 JSON 往返后比较"""
+    if isinstance(v, (list, tuple)):
+        return [_plain(x) for x in v]
+    return v
+
+
+def default_spec():
+    """building_config 默认主参数（不含推导量）"""
+    return {n: _plain(v) for n, v in _DEFAULTS.items() if n not in DERIVED}
+
+
+def _derive(s):
+    s["BW_M"] = s["BW"] / 1000
+    s["BD_M"] = s["BH"] / 1000
+    s["GL"] = 0.0
+    s["F1_FL"] = s["GROUND"]
+    s["F1_CL"] = s["F1_FL"] + s["F1H"]
+    s["F2_FL"] = s["F1_CL"] + s["SLAB"]
+    s["F2_CL"] = s["F2_FL"] + s["F2H"]
+    s["ROOF"] = s["F2_CL"] + s["SLAB"]
+    s["TOP"] = s["ROOF"] + s["PARAPET"]
+    return s
+
+
+def _is_number(v):
+    return isinstance(v, numbers.Real) and not isinstance(v, bool)
+
+
+def _check_value(k, v, default):
+    """覆盖值的类型与默认值一致：数值参数为数（或批量计算用的数值数组），
+    门窗列表为等长数值元组的列表；不符合抛 ValueError"""
+    if isinstance(default, list):
+        width = len(default[0]) if default else None
+        if not isinstance(v, (list, tuple)):
+            raise ValueError(f"{k} 应为列表，得到 {type(v).__name__}")
+        for i, item in enumerate(v):
+            if (not isinstance(item, (list, tuple)) or not all(map(_is_number, item))
+                    or (width is not None and len(item) != width)):
+                raise ValueError(f"{k}[{i}] 应为 {width or ''} 个数值组成的列表，得到 {item!r}")
+    elif isinstance(v, np.ndarray):
+        if v.dtype.kind not in "iuf":
+            raise ValueError(f"{k} 应为数值数组，得到 dtype {v.dtype}")
+    elif not _is_number(v):
+        raise ValueError(f"{k} 应为数值，得到 {v!r}")
+
+
+def resolve(overrides=None):
+    """默认参数 + 覆盖项 + 推导量；覆盖项不是映射、键名未知或为推导量、值的类型不对时抛 ValueError"""
+    s = default_spec()
+    if overrides is not None and not isinstance(overrides, dict):
+        raise ValueError(f"spec 应为 {{参数名: 值}} 映射，得到 {type(overrides).__name__}")
+    for k, v in (overrides or {}).items():
+        if k in DERIVED:
+            raise ValueError(f"{k} 由其他参数推导，不能直接指定")
+        if k not in s:
+            raise ValueError(f"未知建筑参数: {k!r}")
+        _check_value(k, v, s[k])
+        s[k] = _plain(v)
+    return _derive(s)
+
+
+def _hash(s):
+    blob = json.dumps(s, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def spec_hash(spec):
+    """方案的规范化哈希（键排序、元组视同列表）"""
+    return _hash(resolve(spec))
+
+
+def current_hash():
+    """building_config 当前生效参数的哈希，用作渲染种子与渲染缓存键"""
+    return _hash({n: _plain(getattr(building_config, n)) for n in _NAMES})
+
+
+def _as_config(v):
+    """窗户等列表项还原为元组，与 building_config 的写法一致"""
+    if isinstance(v, list):
+        return [tuple(x) if isinstance(x, list) else x for x in v]
+    return v
+
+
+def apply_spec(spec=None):
+    """把方案写回 building_config 和已导入的生成模块；spec=None 恢复默认"""
+    s = resolve(spec)
+    mods = [sys.modules[m] for m in MODULE_ALIASES if m in sys.modules]
+    for mod in mods:
+        # 按对象同一性识别 `from building_config import X` 绑定的名字（同名本地量如 3D 的 BW 不受影响）
+        if mod.__name__ not in _BOUND:
+            ns = vars(mod)
+            _BOUND[mod.__name__] = [n for n in _NAMES if n in ns and ns[n] is getattr(building_config, n)]
+    for n in _NAMES:
+        setattr(building_config, n, _as_config(s[n]))
+    for mod in mods:
+        for n in _BOUND[mod.__name__]:
+            setattr(mod, n, getattr(building_config, n))
+        for local, cfg in MODULE_ALIASES[mod.__name__].items():
+            setattr(mod, local, s[cfg])
+    return s
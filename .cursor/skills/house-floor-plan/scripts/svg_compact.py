@@ -0,0 +1,295 @@
+"""
+紧凑 SVG — 把 matplotlib 的 SVG 输出整理成适合网页的小文件（generate_all.py 的 SVG 写出模式）
+
+  python generate_all.py                       # 默认 compact
+  python generate_all.py --svg-mode matplotlib # matplotlib 原样输出（文字为字形轮廓）
+
+compact 模式以 svg.fonttype=none 导出后再做后处理：
+  - 文字保持为 <text>，@font-face 内嵌 NotoSansSC-Subset 中实际用到字符的子集（WOFF / base64），
+    不依赖浏览器所在系统的字体
+  - 形状与样式相同、仅位置不同的 <path>（插座、灯具、阀门、踏步、标注底框……）
+    按平移归一化后只定义一次 <symbol>，各处用 <use x y> 引用
+  - 重复的 style 合并为 CSS class；删除 metadata、未被引用的 id、零角度 rotate，
+    连续且裁剪相同的元素共用一个 <g clip-path>
+  - 坐标保留 2 位小数（0.01 pt）
+"""
+
+import base64
+import functools
+import io
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+import matplotlib
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", XLINK_NS)
+_S = "{%s}" % SVG_NS
+_HREF = "{%s}href" % XLINK_NS
+
+_FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+FONT_FAMILY = "Noto Sans CJK SC"
+FONTS = {400: os.path.join(_FONT_DIR, "NotoSansSC-Subset.ttf"),
+         700: os.path.join(_FONT_DIR, "NotoSansSC-Subset-Bold.ttf")}
+
+MODES = ("compact", "matplotlib")
+_mode = "compact"
+
+_NUM = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?")
+_PATH_TOKEN = re.compile(r"[MLCQZz]|-?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?")
+_REF = re.compile(r"url\(#([^)]+)\)")
+_MIN_SYMBOL_D = 24      # 归一化后 d 短于此长度时 <use> 并不比原路径短
+
+
+def set_mode(mode):
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"未知 SVG 模式: {mode!r}（可选 {' / '.join(MODES)}）")
+    _mode = mode
+
+
+def get_mode():
+    return _mode
+
+
+# ── 数值 ──
+
+def _h(v):
+    """坐标 → 百分之一单位的整数"""
+    return int(round(float(v) * 100))
+
+
+def _fmt(h):
+    s = f"{h / 100:.2f}".rstrip("0").rstrip(".")
+    return "0" if s in ("-0", "") else s
+
+
+def _round_nums(text):
+    return _NUM.sub(lambda m: _fmt(_h(m.group())), text)
+
+
+def _parse_d(d):
+    """matplotlib 路径只用绝对坐标的 M/L/C/Q/z，坐标成对出现 → [(cmd, [x, y, ...]), ...]
+
+    坐标保留原始精度：平移归一化先相减再取整，同一形状在不同亚像素位置得到相同的 d。
+    """
+    ops = []
+    for tok in _PATH_TOKEN.findall(d):
+        if tok in "MLCQZz":
+            ops.append((tok, []))
+        else:
+            ops[-1][1].append(float(tok))
+    return ops
+
+
+def _format_d(ops, dx=0, dy=0):
+    out = []
+    for cmd, nums in ops:
+        out.append(cmd)
+        for i, v in enumerate(nums):
+            s = _fmt(_h(v - (dx if i % 2 == 0 else dy)))
+            if not s.startswith("-") and out[-1][-1:] not in "MLCQZz":
+                out.append(" ")
+            out.append(s)
+    return "".join(out)
+
+
+# ── 字体子集 ──
+
+@functools.lru_cache(maxsize=64)
+def _font_subset(weight, chars):
+    from fontTools import subset
+    opts = subset.Options()
+    opts.flavor = "woff"
+    opts.layout_features = []
+    opts.name_IDs = [1, 2]
+    opts.glyph_names = False
+    opts.hinting = False
+    opts.notdef_outline = True
+    font = subset.load_font(FONTS[weight], opts)
+    sub = subset.Subsetter(opts)
+    sub.populate(text=chars)
+    sub.subset(font)
+    buf = io.BytesIO()
+    subset.save_font(font, buf, opts)
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def font_face_css(chars_by_weight):
+    """{字重: 字符集} → 内嵌字体子集的 @font-face 规则（native SVG 写出也用）"""
+    rules = []
+    for weight, chars in sorted(chars_by_weight.items()):
+        chars = "".join(sorted(set(chars) - set(" \n\t")))
+        if not chars or weight not in FONTS or not os.path.exists(FONTS[weight]):
+            continue
+        rules.append(f"@font-face{{font-family:'{FONT_FAMILY}';font-weight:{weight};"
+                     f"src:url(data:font/woff;base64,{_font_subset(weight, chars)}) format('woff')}}")
+    return "".join(rules)
+
+
+# ── 后处理 ──
+
+def _style_dict(style):
+    return dict(p.split(":", 1) for p in (s.strip() for s in style.split(";")) if ":" in p)
+
+
+def _compact_text_style(style):
+    """字体族只保留首选 + sans-serif；其他声明原样保留"""
+    d = {k.strip(): v.strip() for k, v in _style_dict(style).items()}
+    if "font-family" in d:
+        d["font-family"] = d["font-family"].split(",")[0].strip() + ",sans-serif"
+    return ";".join(f"{k}:{v}" for k, v in d.items())
+
+
+def _weight(style):
+    w = _style_dict(style).get("font-weight", "400").strip()
+    return 700 if w in ("bold", "700", "800", "900") else 400
+
+
+def _flatten(parent, refs):
+    """展开无属性的分组，连续且 clip-path 相同的子元素合并到一个 <g clip-path>"""
+    children = []
+    for el in list(parent):
+        if el.tag in (_S + "defs", _S + "clipPath", _S + "symbol"):
+            children.append(el)
+            continue
+        _flatten(el, refs)
+        if el.get("id") not in refs:
+            el.attrib.pop("id", None)
+        if el.tag == _S + "g" and not el.attrib:
+            children.extend(el)
+        else:
+            children.append(el)
+    merged, run, run_clip = [], None, None
+    for el in children:
+        # 元素自身有 transform 时 clip-path 在变换后的坐标系里解释，不能上移
+        clip = el.attrib.pop("clip-path", None) if "transform" not in el.attrib else None
+        if clip is None:
+            merged.append(el)
+            run = run_clip = None
+        elif run is not None and clip == run_clip:
+            run.append(el)
+        else:
+            run, run_clip = ET.Element(_S + "g", {"clip-path": clip}), clip
+            run.append(el)
+            merged.append(run)
+    parent[:] = merged
+
+
+def _symbols(root, defs):
+    """形状与样式相同的路径只定义一次：<symbol overflow=visible> + <use x y>"""
+    paths = []
+    for parent in root.iter():
+        if parent.tag in (_S + "defs", _S + "clipPath", _S + "symbol"):
+            continue
+        for i, el in enumerate(parent):
+            if el.tag == _S + "path" and "d" in el.attrib and "id" not in el.attrib:
+                ops = _parse_d(el.get("d"))
+                if not ops or not ops[0][1]:
+                    continue
+                x0, y0 = ops[0][1][:2]
+                key = (_format_d(ops, x0, y0),) + tuple(sorted((k, v) for k, v in el.attrib.items() if k != "d"))
+                paths.append((parent, i, el, ops, x0, y0, key))
+    counts = Counter(p[-1] for p in paths)
+    ids = {}
+    for parent, i, el, ops, x0, y0, key in paths:
+        if counts[key] < 2 or len(key[0]) < _MIN_SYMBOL_D:
+            el.set("d", _format_d(ops))
+            continue
+        if key not in ids:
+            ids[key] = f"s{len(ids)}"
+            sym = ET.SubElement(defs, _S + "symbol", {"id": ids[key], "overflow": "visible"})
+            ET.SubElement(sym, _S + "path", {**dict(key[1:]), "d": key[0]})
+        parent[i] = ET.Element(_S + "use", {_HREF: "#" + ids[key], "x": _fmt(_h(x0)), "y": _fmt(_h(y0))})
+
+
+def _classes(root, style_el):
+    """出现两次以上的 style 改为 CSS class"""
+    counts = Counter(el.get("style") for el in root.iter() if el.get("style"))
+    names = {}
+    for style, n in counts.most_common():
+        if n >= 2:
+            names[style] = _class_name(len(names))
+    for el in root.iter():
+        name = names.get(el.get("style"))
+        if name:
+            del el.attrib["style"]
+            el.set("class", name)
+    style_el.text = (style_el.text or "") + "".join(f".{n}{{{s}}}" for s, n in names.items())
+
+
+def _class_name(i):
+    s = ""
+    while True:
+        s = chr(97 + i % 26) + s
+        i = i // 26 - 1
+        if i < 0:
+            return s
+
+
+def compact(data):
+    """matplotlib SVG（svg.fonttype=none）→ 紧凑 SVG bytes"""
+    root = ET.fromstring(data)
+    for md in root.findall(_S + "metadata"):
+        root.remove(md)
+    defs = root.find(_S + "defs")
+    if defs is None:
+        defs = ET.Element(_S + "defs")
+        root.insert(0, defs)
+    style_el = defs.find(_S + "style")
+    if style_el is None:
+        style_el = ET.SubElement(defs, _S + "style", {"type": "text/css"})
+    style_el.text = re.sub(r"\s+", "", style_el.text or "")
+
+    chars = {}
+    for el in root.iter(_S + "text"):
+        style = el.get("style", "")
+        chars.setdefault(_weight(style), set()).update("".join(el.itertext()))
+        el.set("style", _compact_text_style(style))
+        if re.fullmatch(r"rotate\(-?0 [^)]*\)", el.get("transform", "")):
+            del el.attrib["transform"]
+    for el in root.iter():
+        for attr in ("x", "y", "width", "height", "transform", "points"):
+            if attr in el.attrib and el is not root:
+                el.set(attr, _round_nums(el.get(attr)))
+        if el.get("style"):
+            el.set("style", re.sub(r":\s+", ":", re.sub(r";\s+", ";", el.get("style"))))
+
+    refs = set()
+    for el in root.iter():
+        for v in el.attrib.values():
+            refs.update(_REF.findall(v))
+        href = el.get(_HREF) or el.get("href")
+        if href and href.startswith("#"):
+            refs.add(href[1:])
+    _flatten(root, refs)
+    _symbols(root, defs)
+    _classes(root, style_el)
+    style_el.text = font_face_css({w: "".join(c) for w, c in chars.items()}) + style_el.text
+    for el in root.iter():       # 去掉缩进空白（文字内容与 tspan 之间的文本保留）
+        if el.tail and not el.tail.strip():
+            el.tail = None
+        if el.text and not el.text.strip() and el.tag not in (_S + "text", _S + "tspan"):
+            el.text = None
+    return b'<?xml version="1.0" encoding="utf-8"?>\n' + ET.tostring(root, encoding="utf-8", xml_declaration=False)
+
+
+def savefig(fig, f, **kw):
+    """按当前模式把 fig 写成 SVG（bbox_inches="tight"）；kw 透传给 savefig"""
+    if _mode == "matplotlib":
+        fig.savefig(f, format="svg", bbox_inches="tight", **kw)
+        return
+    buf = io.BytesIO()
+    with matplotlib.rc_context({"svg.fonttype": "none", "svg.hashsalt": "house-floor-plan"}):
+        fig.savefig(buf, format="svg", bbox_inches="tight", metadata={"Date": None}, **kw)
+    f.write(compact(buf.getvalue()))
+
+
+def add_svg_argument(parser):
+    parser.add_argument("--svg-mode", choices=MODES, default=_mode,
+                        help="SVG 写出方式：compact（<text> + 内嵌字体子集 + <symbol>/<use>，默认）"
+                             "或 matplotlib 原样输出")
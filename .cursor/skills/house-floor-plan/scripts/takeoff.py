@@ -0,0 +1,250 @@
+"""
+工程量计算 — 直接由建筑参数批量计算面积、墙体、门窗、混凝土与设备数量（不出图、不依赖绘图后端）
+
+  python takeoff.py                                         # 默认方案，逐项列出
+  python takeoff.py --grid F1_X1=7000:9400:200 --grid F2_X1=4000:6000:100 -o variants.csv
+  python takeoff.py --specs variants.jsonl -o takeoff.parquet   # 每行一个 spec 覆盖项（JSON 列表亦可）
+
+一批方案的参数按名各为一个 NumPy 数组（长度 = 方案数），floor_layout 的房间 / 隔墙公式对数组逐元素
+计算，所以一次计算就得到整批结果；窗户列表按最长的一个补 NaN 成 (方案数, 窗数, 5) 数组。
+
+计算口径（长度 m、面积 m²、体积 m³）：
+  - 房间净面积：floor_layout.rooms 的墙内皮矩形；各层净面积为其和
+  - 建筑面积：每层外墙外皮 BW × BH
+  - 墙体：外墙（厚 OW）按中心线周长，内隔墙（厚 IW）按 floor_layout.walls 的墙段长度；
+    墙面积 = 长度 × 该层层高（F1H / F2H），外墙另给扣除门窗洞口后的净面积，体积 = 面积 × 厚度
+  - 门窗：SOUTH_WIN … WEST_WIN 各朝向的樘数与洞口面积，SOUTH_DOOR 为南向外门
+  - 混凝土：二层楼板（扣除二层楼梯间洞口）与屋面板 × SLAB，女儿墙 = 外墙中心线 × PARAPET × OW
+  - 设备：floor_layout 的灯具 / 插座 / 开关与给排水点位按图块类型计数（点位不随参数变化）
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import floor_layout
+import spec as spec_mod
+
+FACADES = {"南": "SOUTH_WIN", "北": "NORTH_WIN", "东": "EAST_WIN", "西": "WEST_WIN"}
+LISTS = tuple(FACADES.values()) + ("SOUTH_DOOR",)
+STOREY = {"一层": "F1H", "二层": "F2H"}
+DEVICE_NAMES = {
+    "LIGHT-MAIN": "主灯", "DOWNLIGHT": "筒灯", "SOCKET-10A": "插座10A", "SOCKET-16A": "插座16A",
+    "SWITCH": "单控开关", "SWITCH-2WAY": "双控开关",
+    "FAUCET": "给水龙头", "SHOWER": "淋浴", "FLOOR-DRAIN": "地漏",
+}
+
+
+# ══════════════════════════════════════════════
+#  一批方案
+# ══════════════════════════════════════════════
+
+def _padded(lists, width):
+    """各方案的窗户 / 门列表 → (方案数, 最多樘数, width) 数组，空位为 NaN"""
+    k = max((len(x) for x in lists), default=0)
+    out = np.full((len(lists), k, width), np.nan)
+    for i, items in enumerate(lists):
+        if items:
+            out[i, :len(items)] = np.asarray(items, dtype=float)[:, :width]
+    return out
+
+
+def from_specs(specs):
+    """spec 覆盖项列表 → 批参数（每个参数一个数组，窗户为补齐的三维数组）"""
+    resolved = [spec_mod.resolve(s) for s in specs]
+    batch = {}
+    for k, v in resolved[0].items():
+        if k in LISTS:
+            batch[k] = _padded([r[k] for r in resolved], 5 if k != "SOUTH_DOOR" else 4)
+        elif isinstance(v, (int, float)):
+            batch[k] = np.array([r[k] for r in resolved], dtype=float)
+    return batch, len(resolved)
+
+
+def from_grid(axes, base=None):
+    """参数网格（{参数名: 取值序列}，笛卡儿积）→ 批参数；其余参数取 base（默认方案）"""
+    names = list(axes)
+    values = [np.asarray(axes[n], dtype=float) for n in names]
+    grids = np.meshgrid(*values, indexing="ij") if names else []
+    overrides = dict(base or {})
+    overrides.update({n: g.ravel() for n, g in zip(names, grids)})
+    s = spec_mod.resolve(overrides)              # 推导量（标高等）同样按数组计算
+    n = int(np.prod([len(v) for v in values])) if names else 1
+    batch = {}
+    for k, v in s.items():
+        if k in LISTS:
+            batch[k] = _padded([v], 5 if k != "SOUTH_DOOR" else 4)
+        elif isinstance(v, (int, float, np.ndarray)):
+            batch[k] = np.broadcast_to(np.asarray(v, dtype=float), (n,))
+    return batch, n
+
+
+# ══════════════════════════════════════════════
+#  工程量
+# ══════════════════════════════════════════════
+
+def _rect_area(r):
+    return r[3] * r[4] / 1e6
+
+
+def takeoff(b, n):
+    """批参数 → {列名: 长度 n 的数组}"""
+    out = {}
+    BW, BH, OW, IW = b["BW"], b["BH"], b["OW"], b["IW"]
+    perimeter = 2 * ((BW - OW) + (BH - OW)) / 1000             # 外墙中心线
+    ext_len = ext_area = int_len = int_area = 0.0
+    for floor in floor_layout.FLOORS:
+        rooms = floor_layout.rooms(b, floor)
+        net = 0.0
+        for r in rooms:
+            a = _rect_area(r)
+            out[f"{floor}{r[0]}_m2"] = a
+            net = net + a
+        out[f"{floor}净面积_m2"] = net
+        out[f"{floor}建筑面积_m2"] = BW * BH / 1e6
+        h = b[STOREY[floor]]
+        hwalls, vwalls = floor_layout.walls(b, floor)
+        length = sum(w[2] for w in hwalls + vwalls) / 1000
+        ext_len, ext_area = ext_len + perimeter, ext_area + perimeter * h
+        int_len, int_area = int_len + length, int_area + length * h
+    out["净面积_m2"] = out["一层净面积_m2"] + out["二层净面积_m2"]
+    out["建筑面积_m2"] = out["一层建筑面积_m2"] + out["二层建筑面积_m2"]
+
+    openings = 0.0
+    for facade, key in FACADES.items():
+        w = b[key]
+        area = np.nansum(w[:, :, 2] * w[:, :, 3], axis=1)
+        out[f"{facade}窗樘数"] = np.broadcast_to(np.sum(~np.isnan(w[:, :, 2]), axis=1), (n,))
+        out[f"{facade}窗面积_m2"] = np.broadcast_to(area, (n,))
+        openings = openings + out[f"{facade}窗面积_m2"]
+    d = b["SOUTH_DOOR"]
+    out["南门面积_m2"] = np.broadcast_to(np.nansum(d[:, :, 2] * d[:, :, 3], axis=1), (n,))
+    openings = openings + out["南门面积_m2"]
+    out["窗面积_m2"] = openings - out["南门面积_m2"]
+
+    out["外墙长度_m"], out["外墙面积_m2"] = ext_len, ext_area
+    out["外墙净面积_m2"] = ext_area - openings
+    out["外墙体积_m3"] = out["外墙净面积_m2"] * OW / 1000
+    out["内墙长度_m"], out["内墙面积_m2"] = int_len, int_area
+    out["内墙体积_m3"] = int_area * IW / 1000
+
+    stair = next(r for r in floor_layout.rooms(b, "二层") if r[0] == "楼梯间")
+    out["楼板混凝土_m3"] = (2 * BW * BH / 1e6 - _rect_area(stair)) * b["SLAB"]
+    out["女儿墙混凝土_m3"] = perimeter * b["PARAPET"] * OW / 1000
+    out["混凝土_m3"] = out["楼板混凝土_m3"] + out["女儿墙混凝土_m3"]
+
+    for name, count in device_counts().items():
+        out[name] = count
+    return {k: np.broadcast_to(np.asarray(v, dtype=float), (n,)) for k, v in out.items()}
+
+
+def device_counts():
+    """全楼设备数量 {列名: 数量}（按出图时的图块类型分类）"""
+    counts = dict.fromkeys(DEVICE_NAMES.values(), 0)
+    for floor in floor_layout.FLOORS:
+        for kind, points in floor_layout.ELECTRICAL[floor].items():
+            for *_, label in points:
+                counts[DEVICE_NAMES[floor_layout.SYMBOLS[kind](label)]] += 1
+        for _, _, label, _ in floor_layout.PLUMBING[floor]:
+            counts[DEVICE_NAMES[floor_layout.plumbing_symbol(label)]] += 1
+    return counts
+
+
+# ══════════════════════════════════════════════
+#  输出
+# ══════════════════════════════════════════════
+
+def write_table(path, columns):
+    """{列名: 数组} → CSV（UTF-8 BOM，Excel 可直接打开）或 Parquet（需要 pyarrow）"""
+    if path.lower().endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("写 Parquet 需要 pyarrow（pip install pyarrow），或改用 .csv") from None
+        pq.write_table(pa.table({k: np.ascontiguousarray(v) for k, v in columns.items()}), path)
+        return
+    names = list(columns)
+    cells = [_format_column(columns[k]) for k in names]
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        csv.writer(f).writerow(names)
+        f.writelines(row + "\r\n" for row in map(",".join, zip(*cells)))
+
+
+def _format_column(values):
+    """数值列 → 单元格字符串（保留 4 位小数后按 :g 格式化）
+
+    网格方案中大多数列只有几十个不同取值，按唯一值格式化后用下标展开，
+    不必对几十万行 × 几十列逐格调用格式化。
+    """
+    uniq, inverse = np.unique(np.round(values, 4), return_inverse=True)
+    return np.array([f"{v:g}" for v in uniq.tolist()], dtype=object)[inverse.ravel()].tolist()
+
+
+def _axis(text):
+    """NAME=start:stop:step（含 stop）或 NAME=v1,v2,…"""
+    name, _, values = text.partition("=")
+    if ":" in values:
+        start, stop, step = map(float, values.split(":"))
+        return name, np.arange(start, stop + step / 2, step)
+    return name, [float(v) for v in values.split(",")]
+
+
+def _load_specs(path):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="由建筑参数批量计算工程量（面积、墙体、门窗、混凝土、设备）")
+    ap.add_argument("--grid", action="append", default=[], metavar="NAME=A:B:STEP",
+                    help="参数网格（可重复，取笛卡儿积；也可写 NAME=v1,v2,…）")
+    ap.add_argument("--specs", metavar="PATH", help="spec 覆盖项：JSON 列表或 JSON Lines，每项一个方案")
+    ap.add_argument("--base", metavar="PATH", help="网格的基准方案（spec 覆盖项 JSON，默认 building_config）")
+    ap.add_argument("-o", "--output", metavar="PATH", help="结果另存为 .csv 或 .parquet")
+    args = ap.parse_args(argv)
+    if args.specs and args.grid:
+        ap.error("--specs 与 --grid 只能二选一")
+
+    t0 = time.perf_counter()
+    if args.specs:
+        specs = _load_specs(args.specs)
+        batch, n = from_specs(specs)
+        inputs = {"方案": np.arange(n, dtype=float)}
+    else:
+        base = None
+        if args.base:
+            with open(args.base, encoding="utf-8") as f:
+                base = json.load(f)
+        axes = dict(map(_axis, args.grid))
+        batch, n = from_grid(axes, base)
+        inputs = {k: batch[k] for k in axes}
+    columns = {**inputs, **takeoff(batch, n)}
+    seconds = time.perf_counter() - t0
+
+    if args.output:
+        try:
+            write_table(args.output, columns)
+        except RuntimeError as e:
+            sys.exit(f"  ✗ {e}")
+        print(f"  ✓ {n} 个方案 × {len(columns)} 列 → {args.output}（计算 {seconds:.3f} s）")
+    elif n == 1:
+        for k, v in columns.items():
+            print(f"  {k:<16} {v[0]:g}")
+    else:
+        for k, v in columns.items():
+            print(f"  {k:<16} {v.min():g} ~ {v.max():g}")
+        print(f"  {n} 个方案（{seconds:.3f} s）")
+
+
+if __name__ == "__main__":
+    main()
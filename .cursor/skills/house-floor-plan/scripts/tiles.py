@@ -0,0 +1,164 @@
+"""
+深度缩放瓦片 — 把 docs/images 下的大图切成多分辨率瓦片金字塔（DZI），网页查看器按视口加载
+
+  python tiles.py                         # ./docs/images/*.png → ./docs/tiles/
+  python tiles.py -k 透视 --format png     # 只处理名称含“透视”的图，瓦片用 PNG
+  python generate_all.py --tiles           # 出图后立即导出瓦片（generate_render_3d.py 同）
+
+每张图输出（与 OpenSeadragon 等 DZI 查看器兼容）：
+  docs/tiles/<名称>.dzi                    清单：尺寸、瓦片边长、重叠、格式
+  docs/tiles/<名称>_files/<级>/<列>_<行>.webp   256 px 瓦片，相邻瓦片重叠 1 px
+  docs/tiles/<名称>_320.webp / _640.webp   卡片缩略图
+  docs/tiles/manifest.json                 images/<名称>.png → 上述信息，docs/viewer.js 读取
+
+金字塔由原图逐级 2×2 盒式缩小得到（Image.reduce），不重新渲染；
+缩略图取宽度刚好不小于目标的那一级再缩放。查看器只请求当前缩放级别下可见的瓦片，
+页面加载量取决于视口而不是图纸尺寸。瓦片编码经 sink.submit，BackgroundWriter 下并行。
+"""
+
+import io
+import json
+import math
+import os
+import posixpath
+import sys
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import output_sink
+import perf
+
+SRC = "docs/images"
+OUT = "docs/tiles"
+TILE = 256
+OVERLAP = 1
+THUMBS = (320, 640)
+QUALITY = 85            # WebP 有损质量；PNG 瓦片忽略
+MANIFEST = f"{OUT}/manifest.json"
+
+
+def max_level(w, h):
+    """DZI 最高级编号：第 0 级为 1×1，每级边长翻倍，最高级为原图"""
+    return math.ceil(math.log2(max(w, h, 1)))
+
+
+def pyramid(img):
+    """从原图开始逐级缩小，依次产出 (级, 图像)；每级边长为上一级的 ceil(1/2)"""
+    level = max_level(*img.size)
+    while True:
+        yield level, img
+        if level == 0:
+            return
+        img = img.reduce(2)
+        level -= 1
+
+
+def tile_boxes(w, h, tile=TILE, overlap=OVERLAP):
+    """按 DZI 约定产出 (列, 行, 裁剪框)：内部瓦片四周各多取 overlap 像素"""
+    for row in range(math.ceil(h / tile)):
+        for col in range(math.ceil(w / tile)):
+            x0 = col * tile - (overlap if col else 0)
+            y0 = row * tile - (overlap if row else 0)
+            yield col, row, (x0, y0, min(w, (col + 1) * tile + overlap), min(h, (row + 1) * tile + overlap))
+
+
+def encode(img, fmt):
+    with perf.span(f"encode.{fmt}"):
+        buf = io.BytesIO()
+        if fmt == "webp":
+            img.save(buf, format="WEBP", quality=QUALITY, method=4)
+        else:
+            img.save(buf, format="PNG", optimize=False)
+        return buf.getvalue()
+
+
+def dzi(w, h, fmt, tile=TILE, overlap=OVERLAP):
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" Format="{fmt}" '
+            f'Overlap="{overlap}" TileSize="{tile}">\n'
+            f'  <Size Width="{w}" Height="{h}"/>\n'
+            '</Image>\n').encode("utf-8")
+
+
+def export(name, data, sink=None, fmt="webp", tile=TILE, overlap=OVERLAP, thumbs=THUMBS):
+    """把一张 PNG（bytes）导出为瓦片金字塔与缩略图，返回 manifest 条目（路径相对 docs/）"""
+    sink = sink or output_sink.get_sink()
+    with perf.span("tiles"):
+        img = Image.open(io.BytesIO(data))
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+        w, h = img.size
+        base = f"{OUT}/{name}"
+        best = {}                       # 目标宽度 → 宽度不小于它的最小一级
+        for level, im in pyramid(img):
+            for t in thumbs:
+                if im.width >= t or t not in best:
+                    best[t] = im
+            for col, row, box in tile_boxes(*im.size, tile, overlap):
+                piece = im.crop(box)
+                sink.submit(f"{base}_files/{level}/{col}_{row}.{fmt}",
+                            lambda piece=piece: encode(piece, fmt))
+        del img
+        thumb_paths = {}
+        for t, im in best.items():
+            tw = min(t, im.width)
+            th = max(1, round(im.height * tw / im.width))
+            small = im.resize((tw, th), Image.LANCZOS) if tw != im.width else im
+            sink.submit(f"{base}_{t}.{fmt}", lambda small=small: encode(small, fmt))
+            thumb_paths[str(t)] = posixpath.relpath(f"{base}_{t}.{fmt}", "docs")
+        sink.write(f"{base}.dzi", dzi(w, h, fmt, tile, overlap))
+    return {
+        "dzi": posixpath.relpath(f"{base}.dzi", "docs"),
+        "width": w, "height": h, "tile": tile, "overlap": overlap, "format": fmt,
+        "levels": max_level(w, h) + 1, "thumbs": thumb_paths,
+    }
+
+
+def _read_manifest(sink):
+    try:
+        return json.loads(sink.read(MANIFEST))
+    except (FileNotFoundError, NotImplementedError, ValueError):
+        return {}
+
+
+def export_written(sink=None, fmt="webp", names=None):
+    """为 sink 已写出的 docs/images/*.png 导出瓦片并更新 manifest；sink 需支持 read()"""
+    sink = sink or output_sink.get_sink()
+    sink.flush()                        # 后台写出完成后 sink.paths 才完整
+    paths = sorted({p for p in sink.paths
+                    if p.startswith(SRC + "/") and p.endswith(".png")}
+                   if names is None else names)
+    try:
+        manifest = _read_manifest(sink)
+        for path in paths:
+            name = posixpath.splitext(posixpath.basename(path))[0]
+            manifest[posixpath.relpath(path, "docs")] = export(name, sink.read(path), sink, fmt)
+    except NotImplementedError:
+        print(f"  ⚠ {type(sink).__name__} 不能读回已写出的 PNG，跳过瓦片导出")
+        return {}
+    sink.write(MANIFEST, json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True).encode("utf-8"))
+    print(f"  ✓ 瓦片金字塔 ×{len(paths)} → {OUT}/")
+    return manifest
+
+
+def add_tiles_argument(parser):
+    parser.add_argument("--tiles", nargs="?", const="webp", choices=("webp", "png"),
+                        help="出图后把 docs/images 的 PNG 导出为深度缩放瓦片（默认 webp）")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="docs/images → 深度缩放瓦片金字塔")
+    parser.add_argument("--out", default=os.getcwd(), help="项目根目录（含 docs/，默认当前目录）")
+    parser.add_argument("--format", default="webp", choices=("webp", "png"))
+    parser.add_argument("-k", nargs="*", metavar="PATTERN", help="只处理名称包含任一关键字的图")
+    parser.add_argument("--writers", type=int, default=2, help="瓦片编码/写出线程数（0 = 同步）")
+    args = parser.parse_args()
+    sink = output_sink.DirectorySink(args.out)
+    src = os.path.join(sink.root, SRC)
+    names = [f"{SRC}/{f}" for f in sorted(os.listdir(src))
+             if f.endswith(".png") and (not args.k or any(p in f for p in args.k))]
+    if args.writers > 0:
+        sink = output_sink.BackgroundWriter(sink, workers=args.writers)
+    export_written(sink, args.format, names)
+    sink.close()
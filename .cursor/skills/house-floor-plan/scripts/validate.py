@@ -0,0 +1,385 @@
+"""
+一致性校验 — 出图前的快速检查（毫秒级），发现错误即中止，不必等全套渲染后再用眼睛核对
+
+  python validate.py                          # 校验 building_config 当前方案
+  python validate.py --spec '{"F2_Y2": 7600}' # 校验一个 spec 覆盖项（JSON 字符串或文件路径）
+  python validate.py --json                   # 结果以 JSON 输出
+
+generate_all.py / generate_render_3d.py 启动时自动校验当前方案（--no-validate 跳过），
+serve.py 在受理请求时校验请求的 spec；有「错误」级别的问题即拒绝出图。
+
+「错误」是数据不一致（推导量、门窗超出立面或跨楼板、平面与立面对不上），照此出图必然画错；
+「警告」是布置上的冲突（窗户跨隔墙、家具压墙、门扇扫过家具等），属于方案本身的取舍，照常出图，
+由设计确认后在 building_config 里调整。
+
+检查项（门窗、家具、设备与房间都表示为区间 / 矩形数组，两两之间的包含与重叠一次算完）：
+  标高推导    GL → F1_FL → … → TOP 与主参数的推导结果一致（SKILL.md 规则 2、4）
+  东西立面    EAST_WIN 与 WEST_WIN 不能完全相同（规则 5）
+  立面门窗    门窗在立面宽度内、不压外墙转角，不跨越楼板（窗顶不高于本层天花）
+  窗户跨墙    窗户不跨越所在房间的隔墙（立面窗户按中点归属临街房间，阳台窗归属阳台内侧房间；
+              背后没有房间为错误，跨隔墙为警告）
+  平面窗户    平面图 window_h/window_v 与立面窗户位置一致（规则 1，偏差超过 PLAN_TOLERANCE 即为错误）
+  家具洁具    外包矩形落在所属房间内，不压墙、不出房间（警告）
+  设备点位    灯具与给排水点位在房间内；插座、开关为墙装，允许落在墙体厚度内（警告）
+  门扇开启    门扇扫过的四分之一圆不与家具洁具重叠（警告）
+  上下对位    二层楼梯间在一层楼梯间正上方；二层湿区压在一层湿区上的面积占比 ≥ MIN_STACK
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import building_config
+import floor_layout
+import spec as spec_mod
+
+ERROR, WARNING = "错误", "警告"
+FACADES = ("SOUTH_WIN", "NORTH_WIN", "EAST_WIN", "WEST_WIN")
+FACADE_NAMES = {"SOUTH_WIN": "南", "NORTH_WIN": "北", "EAST_WIN": "东", "WEST_WIN": "西"}
+# 阳台窗开在阳台内侧房间的南墙上，判断窗户所属房间时越过阳台
+OPEN_ROOMS = {"南向大阳台"}
+WALL_MOUNTED = ("sockets", "switches")     # 墙装设备，可落在墙体厚度内
+PLAN_TOLERANCE = 50                        # 平面窗户与立面窗户的允许偏差 mm
+
+
+def _finding(level, check, message):
+    return {"level": level, "check": check, "message": message}
+
+
+def _floor_of(p, y):
+    """立面标高 y (m) 所在楼层：(层名, 地面标高, 天花标高)；不在任何一层内返回 None"""
+    for name, fl, cl in (("一层", p["F1_FL"], p["F1_CL"]), ("二层", p["F2_FL"], p["F2_CL"])):
+        if fl - 1e-9 <= y < cl:
+            return name, fl, cl
+    return None
+
+
+def facade_span(rect, facade):
+    """房间沿立面方向的净宽范围 (mm)；四个立面的窗户 x 都取平面坐标（南北立面为 x，东西立面为 y）"""
+    x, y, w, h = rect
+    return (x, x + w) if facade in ("SOUTH_WIN", "NORTH_WIN") else (y, y + h)
+
+
+def window_rooms(p):
+    """每个立面窗户所属的房间：[(立面, 层, 房间名或 None, 窗左 mm, 窗右 mm, 是否在房间范围内)]
+
+    窗户中点落在哪些临街房间的立面范围内，就取其中离该立面最近的一间（跨过阳台）。
+    """
+    table = floor_layout.room_table(p)
+    keys = [k for k in table if k[1] not in OPEN_ROOMS]
+    R = np.array([table[k] for k in keys], dtype=float)          # (房间数, 4)
+    floors = np.array([k[0] for k in keys])
+    depth = {"SOUTH_WIN": R[:, 1], "NORTH_WIN": p["BH"] - R[:, 1] - R[:, 3],
+             "WEST_WIN": R[:, 0], "EAST_WIN": p["BW"] - R[:, 0] - R[:, 2]}
+    out = []
+    for facade in FACADES:
+        wins = [(w[0], w[1], w[2]) for w in p[facade]]
+        if not wins:
+            continue
+        W = np.array(wins, dtype=float)
+        lo, hi = W[:, 0] * 1000, (W[:, 0] + W[:, 2]) * 1000
+        wfloor = np.array([(_floor_of(p, y) or ("",))[0] for y in W[:, 1]])
+        a, b = facade_span(R.T, facade)
+        mid = (lo + hi) / 2
+        hit = (wfloor[:, None] == floors[None, :]) & (a[None, :] <= mid[:, None]) & (mid[:, None] <= b[None, :])
+        d = np.where(hit, depth[facade][None, :], np.inf)
+        best = d.argmin(axis=1)
+        found = np.isfinite(d[np.arange(len(W)), best])
+        fits = found & (a[best] <= lo) & (hi <= b[best])
+        for i in range(len(W)):
+            name = keys[best[i]][1] if found[i] else None
+            out.append((facade, wfloor[i], name, lo[i], hi[i], bool(fits[i])))
+    return out
+
+
+# ══════════════════════════════════════════════
+#  检查项
+# ══════════════════════════════════════════════
+
+def check_derived(p):
+    """推导标高与主参数一致（手改 building_config 推导量时出错）"""
+    ref = spec_mod.resolve({k: p[k] for k in spec_mod.default_spec()})
+    return [_finding(ERROR, "标高推导", f"{n} = {p[n]:g}，按主参数推导应为 {ref[n]:g}")
+            for n in spec_mod.DERIVED if abs(p[n] - ref[n]) > 1e-6]
+
+
+def check_east_west(p):
+    east = sorted(tuple(w[:4]) for w in p["EAST_WIN"])
+    west = sorted(tuple(w[:4]) for w in p["WEST_WIN"])
+    if east and east == west:
+        return [_finding(ERROR, "东西立面", "EAST_WIN 与 WEST_WIN 完全相同（东西立面下的房间不同，不应镜像）")]
+    return []
+
+
+def check_openings(p):
+    """门窗在立面宽度内、不压外墙转角、不跨越楼板"""
+    out = []
+    ow = p["OW"] / 1000
+    width = {"SOUTH_WIN": p["BW_M"], "NORTH_WIN": p["BW_M"], "EAST_WIN": p["BD_M"], "WEST_WIN": p["BD_M"]}
+    items = [(f, "窗", w[:4]) for f in FACADES for w in p[f]] + [("SOUTH_WIN", "门", d[:4]) for d in p["SOUTH_DOOR"]]
+    if not items:
+        return out
+    O = np.array([it[2] for it in items], dtype=float)
+    W = np.array([width[it[0]] for it in items])
+    x0, y0, x1, y1 = O[:, 0], O[:, 1], O[:, 0] + O[:, 2], O[:, 1] + O[:, 3]
+    bad_x = (x0 < ow - 1e-9) | (x1 > W - ow + 1e-9)
+    for i in np.flatnonzero(bad_x):
+        facade, kind, _ = items[i]
+        out.append(_finding(ERROR, "立面门窗", f"{FACADE_NAMES[facade]}立面{kind} x {x0[i]:g}~{x1[i]:g} m "
+                                            f"超出立面或压外墙转角（可用 {ow:g}~{W[i] - ow:g} m）"))
+    for i, (facade, kind, _) in enumerate(items):
+        floor = _floor_of(p, y0[i])
+        if floor is None:
+            out.append(_finding(ERROR, "立面门窗", f"{FACADE_NAMES[facade]}立面{kind}底标高 {y0[i]:g} m 不在任何楼层内"))
+        elif y1[i] > floor[2] + 1e-9:
+            out.append(_finding(ERROR, "立面门窗", f"{FACADE_NAMES[facade]}立面{kind} {x0[i]:g} m 处顶标高 {y1[i]:g} m "
+                                                f"高于{floor[0]}天花 {floor[2]:g} m（跨越楼板）"))
+    return out
+
+
+def check_window_rooms(p):
+    out = []
+    for facade, floor, room, lo, hi, fits in window_rooms(p):
+        where = f"{FACADE_NAMES[facade]}立面{floor or ''}窗 {lo / 1000:g}~{hi / 1000:g} m"
+        if room is None:
+            out.append(_finding(ERROR, "窗户跨墙", f"{where} 背后没有房间"))
+        elif not fits:
+            out.append(_finding(WARNING, "窗户跨墙", f"{where} 超出「{room}」的范围，跨越隔墙"))
+    return out
+
+
+def _plan_facade(p, floor, x, y, axis):
+    """平面窗户所在立面（南向二层窗户画在阳台内墙上，仍属南立面）"""
+    if axis == "v":
+        return "WEST_WIN" if x <= 0 else "EAST_WIN"
+    return "NORTH_WIN" if y >= p["BH"] else "SOUTH_WIN"
+
+
+def check_plan_windows(p):
+    """平面图窗户与立面窗户逐一对位（plan_windows 由立面窗表推导，这里拦截推导时楼层、立面或坐标的映射错误）"""
+    out = []
+    for floor in floor_layout.FLOORS:
+        plan = floor_layout.plan_windows(p, floor)
+        for facade in FACADES:
+            P = np.array([(w[0] if w[3] == "h" else w[1], w[2]) for w in plan
+                          if _plan_facade(p, floor, w[0], w[1], w[3]) == facade], dtype=float).reshape(-1, 2)
+            labels = [w[4] for w in plan if _plan_facade(p, floor, w[0], w[1], w[3]) == facade]
+            E = np.array([(w[0] * 1000, w[2] * 1000) for w in p[facade]
+                          if (_floor_of(p, w[1]) or ("",))[0] == floor], dtype=float).reshape(-1, 2)
+            if not len(P) and not len(E):
+                continue
+            # 重叠长度矩阵：每个平面窗户配重叠最多的立面窗户
+            ov = (np.minimum(P[:, None, 0] + P[:, None, 1], E[None, :, 0] + E[None, :, 1])
+                  - np.maximum(P[:, None, 0], E[None, :, 0]))
+            matched = set()
+            for i in range(len(P)):
+                j = int(ov[i].argmax()) if len(E) else -1
+                if j < 0 or ov[i, j] <= 0:
+                    out.append(_finding(ERROR, "平面窗户", f"{floor}平面「{labels[i]}」在{FACADE_NAMES[facade]}立面上没有对应窗户"))
+                    continue
+                matched.add(j)
+                d0, d1 = P[i, 0] - E[j, 0], P[i, 0] + P[i, 1] - E[j, 0] - E[j, 1]
+                if max(abs(d0), abs(d1)) > PLAN_TOLERANCE:
+                    out.append(_finding(ERROR, "平面窗户",
+                                        f"{floor}平面「{labels[i]}」{P[i, 0]:g}~{P[i, 0] + P[i, 1]:g} mm 与{FACADE_NAMES[facade]}立面窗 "
+                                        f"{E[j, 0]:g}~{E[j, 0] + E[j, 1]:g} mm 不一致"))
+            for j in sorted(set(range(len(E))) - matched):
+                out.append(_finding(ERROR, "平面窗户", f"{FACADE_NAMES[facade]}立面{floor}窗 "
+                                                      f"{E[j, 0] / 1000:g} m 在平面图上没有画出"))
+    return out
+
+
+def _columns(values):
+    """标量或 (方案数,) 数组的列表 → (个数, 方案数) 数组；参数全为标量时方案数为 1"""
+    return np.array(np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float)) for v in values)))
+
+
+def _rects(rects):
+    """[(x0, y0, x1, y1)] → (4, 个数, 方案数)"""
+    return np.array(np.broadcast_arrays(*(_columns([r[k] for r in rects]) for k in range(4))))
+
+
+def _rooms_array(p, floor):
+    """房间名与墙内皮矩形 (x0, y0, x1, y1)，形状 (4, 房间数, 方案数)"""
+    rooms = floor_layout.rooms(p, floor)
+    return [r[0] for r in rooms], _rects([(r[1], r[2], r[1] + r[3], r[2] + r[4]) for r in rooms])
+
+
+# 以下三个函数的参数可以是一批方案（参数为 (方案数,) 数组，optimize_layout 用作可行性约束），
+# 结果最后一维为方案；单个方案时该维长度为 1
+
+def furniture_rooms(p, floor):
+    """家具 / 洁具与房间：(中心所在, 整件落在内)，均为 (件数, 房间数, 方案数)"""
+    _, R = _rooms_array(p, floor)
+    F = _rects([floor_layout.footprint(it) for it in floor_layout.furniture(p, floor)])
+    cx, cy = (F[0] + F[2])[:, None] / 2, (F[1] + F[3])[:, None] / 2
+    home = (R[0][None] <= cx) & (cx <= R[2][None]) & (R[1][None] <= cy) & (cy <= R[3][None])
+    inside = ((R[0][None] <= F[0][:, None]) & (F[2][:, None] <= R[2][None])
+              & (R[1][None] <= F[1][:, None]) & (F[3][:, None] <= R[3][None]))
+    return home, inside
+
+
+def device_rooms(p, floor):
+    """各组设备点位是否落在某个房间内（墙装设备可在墙体厚度内）：[(类别, 点位, (点数, 方案数))]"""
+    _, R = _rooms_array(p, floor)
+    groups = list(floor_layout.ELECTRICAL[floor].items())
+    groups.append(("plumbing", [(x, y, label) for x, y, label, _ in floor_layout.PLUMBING[floor]]))
+    out = []
+    for kind, pts in groups:
+        P = np.array([pt[:2] for pt in pts], dtype=float)[:, :, None, None]
+        grow = p["IW"] if kind in WALL_MOUNTED else 0
+        inside = ((R[0][None] - grow <= P[:, 0]) & (P[:, 0] <= R[2][None] + grow)
+                  & (R[1][None] - grow <= P[:, 1]) & (P[:, 1] <= R[3][None] + grow))
+        out.append((kind, pts, inside.any(axis=1)))
+    return out
+
+
+def door_swing_hits(p, floor):
+    """门扇扫过的四分之一圆与家具外包矩形是否相交：(门数, 件数, 方案数)
+
+    先求矩形与门扇方框的交集，再看交集到铰点的最近距离是否小于门宽；逐扇门计算，控制批量时的内存。
+    """
+    F = _rects([floor_layout.footprint(it) for it in floor_layout.furniture(p, floor)])
+    hits = []
+    for door in floor_layout.doors(p, floor):
+        box, (hx, hy), r = floor_layout.door_swing(door)
+        (bx0, by0, bx1, by1), (hx, hy, r) = _columns(box), _columns((hx, hy, r))
+        ix0, iy0 = np.maximum(bx0, F[0]), np.maximum(by0, F[1])
+        ix1, iy1 = np.minimum(bx1, F[2]), np.minimum(by1, F[3])
+        dx, dy = np.clip(hx, ix0, ix1) - hx, np.clip(hy, iy0, iy1) - hy
+        hits.append((ix0 < ix1) & (iy0 < iy1) & (np.hypot(dx, dy) < r))
+    return np.array(hits)
+
+
+def check_furniture(p):
+    out = []
+    for floor in floor_layout.FLOORS:
+        names, R = _rooms_array(p, floor)
+        items = floor_layout.furniture(p, floor)
+        home, inside = (a[..., 0] for a in furniture_rooms(p, floor))
+        for i in np.flatnonzero(~(home & inside).any(axis=1)):
+            x0, y0, x1, y1 = floor_layout.footprint(items[i])
+            where = f"超出「{names[int(home[i].argmax())]}」或压墙" if home[i].any() else "不在任何房间内"
+            out.append(_finding(WARNING, "家具洁具", f"{floor} {items[i][0]} ({x0:g}, {y0:g})~({x1:g}, {y1:g}) "
+                                               f"{where}"))
+    return out
+
+
+def check_devices(p):
+    out = []
+    for floor in floor_layout.FLOORS:
+        for _, pts, inside in device_rooms(p, floor):
+            for i in np.flatnonzero(~inside[:, 0]):
+                x, y, label = pts[i][:3]
+                out.append(_finding(WARNING, "设备点位", f"{floor}「{label}」({x:g}, {y:g}) 不在任何房间内（压墙或在室外）"))
+    return out
+
+
+def check_door_swings(p):
+    out = []
+    for floor in floor_layout.FLOORS:
+        doors = floor_layout.doors(p, floor)
+        items = floor_layout.furniture(p, floor)
+        for i, j in zip(*np.nonzero(door_swing_hits(p, floor)[..., 0])):
+            out.append(_finding(WARNING, "门扇开启", f"{floor}「{doors[i][5]}」门扇扫过 {items[j][0]}"))
+    return out
+
+
+def check_stacking(p):
+    out = []
+    table = floor_layout.room_table(p)
+    (ax, ay, aw, ah), (bx, by, bw, bh) = table["一层", "楼梯间"], table["二层", "楼梯间"]
+    if not (bx >= ax and by >= ay and bx + bw <= ax + aw and by + bh <= ay + ah):
+        out.append(_finding(ERROR, "上下对位", f"二层楼梯间 ({bx:g}, {by:g}) {bw:g}×{bh:g} 不在一层楼梯间 "
+                                           f"({ax:g}, {ay:g}) {aw:g}×{ah:g} 正上方"))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stack = float(floor_layout.wet_stack(table))
+    if not stack >= floor_layout.MIN_STACK:
+        out.append(_finding(ERROR, "上下对位", f"二层湿区压在一层湿区上的面积占比 {stack:.0%}，"
+                                           f"低于 {floor_layout.MIN_STACK:.0%}"))
+    for room in floor_layout.WET_ROOMS["二层"]:
+        if not any(floor_layout.overlap(table["二层", room], table["一层", r]) > 0
+                   for r in floor_layout.WET_ROOMS["一层"]):
+            out.append(_finding(WARNING, "上下对位", f"二层「{room}」下方没有一层湿区（排水需横向转换）"))
+    return out
+
+
+CHECKS = (check_derived, check_east_west, check_openings, check_window_rooms, check_plan_windows,
+          check_furniture, check_devices, check_door_swings, check_stacking)
+
+
+def validate(p=None):
+    """全部检查项 → [{"level", "check", "message"}]；p 为 spec.resolve() 的结果，默认 building_config 当前方案"""
+    p = vars(building_config) if p is None else p
+    return [f for check in CHECKS for f in check(p)]
+
+
+def errors(findings):
+    return [f for f in findings if f["level"] == ERROR]
+
+
+def report(findings):
+    return "\n".join(f"  {'✗' if f['level'] == ERROR else '⚠'} [{f['check']}] {f['message']}" for f in findings)
+
+
+# ══════════════════════════════════════════════
+#  生成器入口
+# ══════════════════════════════════════════════
+
+def add_validate_argument(parser):
+    parser.add_argument("--no-validate", action="store_true", help="跳过出图前的一致性校验")
+
+
+def check_from_args(args):
+    """生成器启动时校验当前方案：有错误则打印并退出（--no-validate 跳过）；警告只计数"""
+    if args.no_validate:
+        return
+    t0 = time.perf_counter()
+    findings = validate()
+    ms = (time.perf_counter() - t0) * 1000
+    bad = errors(findings)
+    if bad:
+        print(report(bad))
+        sys.exit(f"  ✗ 一致性校验发现 {len(bad)} 个错误（{ms:.1f} ms），已中止出图；加 --no-validate 可跳过")
+    warned = f"，{len(findings)} 个警告（python validate.py 查看）" if findings else ""
+    print(f"  ✓ 一致性校验通过（{ms:.1f} ms{warned}）")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="出图前的一致性校验（门窗、家具、设备、上下层对位）")
+    ap.add_argument("--spec", metavar="JSON", help="spec 覆盖项：JSON 字符串或文件路径（默认 building_config 当前方案）")
+    ap.add_argument("--json", action="store_true", help="以 JSON 输出检查结果")
+    args = ap.parse_args(argv)
+
+    if args.spec:
+        text = args.spec
+        if os.path.exists(text):
+            with open(text, encoding="utf-8") as f:
+                text = f.read()
+        try:
+            p = spec_mod.resolve(json.loads(text))
+        except (ValueError, json.JSONDecodeError) as e:
+            ap.error(str(e))
+    else:
+        p = None
+    t0 = time.perf_counter()
+    findings = validate(p)
+    ms = (time.perf_counter() - t0) * 1000
+    if args.json:
+        print(json.dumps({"ok": not errors(findings), "ms": round(ms, 2), "findings": findings},
+                         ensure_ascii=False, indent=2))
+    else:
+        if findings:
+            print(report(findings))
+        n_err = len(errors(findings))
+        print(f"  {'✗' if n_err else '✓'} {n_err} 个错误，{len(findings) - n_err} 个警告（{ms:.1f} ms）")
+    return 1 if errors(findings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""测试直接导入 scripts/ 下的模块（与脚本互相导入的方式一致）"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
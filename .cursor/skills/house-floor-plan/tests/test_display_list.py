@@ -0,0 +1,37 @@
+"""符号展开中的圆弧变换：旋转后的椭圆长短轴互换，不支持的角度直接报错"""
+
+import pytest
+
+from display_list import DisplayList
+
+
+def _expanded(rot, rx=300, ry=100, start=0, end=360):
+    dl = DisplayList()
+    with dl.define("S") as sym:
+        sym.arc(0, 0, rx, ry, start, end, "FURN")
+    dl.insert("S", 1000, 2000, "FURN", rotation=rot)
+    (kind, geom, _, _), = dl._expand((0.0, 0.0, 1.0, 0.0))
+    assert kind == "arc"
+    return geom
+
+
+@pytest.mark.parametrize("rot, axes", [(0, (300, 100)), (90, (100, 300)), (180, (300, 100)),
+                                       (270, (100, 300)), (-90, (100, 300))])
+def test_full_ellipse_rotation_swaps_axes(rot, axes):
+    cx, cy, rx, ry, a0, a1 = _expanded(rot)
+    assert (cx, cy) == pytest.approx((1000, 2000))
+    assert (rx, ry) == axes
+    assert (a0, a1) == (0, 360)
+
+
+def test_elliptical_arc_rotation_shifts_angles():
+    assert _expanded(90, start=0, end=90)[2:] == (100, 300, 90, 180)
+
+
+def test_circle_any_rotation():
+    assert _expanded(30, rx=200, ry=200, start=0, end=90)[2:] == (200, 200, 30, 120)
+
+
+def test_ellipse_oblique_rotation_raises():
+    with pytest.raises(ValueError):
+        _expanded(45)
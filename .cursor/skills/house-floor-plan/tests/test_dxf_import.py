@@ -0,0 +1,58 @@
+"""dxf_import 往返：出图 → 导入 → 按导入结果重新出图 → 再导入，spec 不再变化"""
+
+import pytest
+
+import dxf_import
+import generate_all
+import output_sink
+import spec
+
+
+@pytest.fixture
+def plans(tmp_path):
+    """按 spec 覆盖项出一、二层平面图，返回两张 DXF 的路径"""
+    previous = output_sink.get_sink()
+
+    def generate(overrides, name):
+        spec.apply_spec(overrides)
+        output_sink.set_sink(output_sink.DirectorySink(tmp_path / name))
+        generate_all.gen_floor1()
+        generate_all.gen_floor2()
+        root = tmp_path / name / generate_all.DIRS["平面图"]
+        return [str(root / "一层平面图.dxf"), str(root / "二层平面图.dxf")]
+
+    yield generate
+    spec.apply_spec(None)
+    output_sink.set_sink(previous)
+
+
+def _widened_south_window():
+    wins = [list(w) for w in spec.default_spec()["SOUTH_WIN"]]
+    wins[0][2] = 5.6
+    return {"SOUTH_WIN": wins}
+
+
+@pytest.mark.parametrize("overrides", [{}, {"F1_X1": 8600}, _widened_south_window()],
+                         ids=["default", "F1_X1", "SOUTH_WIN"])
+def test_unedited_plans_import_unchanged(plans, overrides):
+    result = dxf_import.import_plans(plans(overrides, "out"), base=overrides)
+    assert result["changes"] == []
+    assert result["spec"] == overrides
+
+
+def test_moved_partition_does_not_move_front_door(plans):
+    # 大门画在 F1_X1+IW+1200 处，随隔墙移动；SOUTH_DOOR 不应因此被改写
+    result = dxf_import.import_plans(plans({"F1_X1": 8600}, "out"))
+    assert result["spec"] == {"F1_X1": 8600}
+
+
+def test_import_regenerate_reimport_is_stable(plans):
+    # 绘图员在 CAD 里把一层客厅落地窗右移 500 mm（用改过窗表的方案出图模拟）
+    wins = [list(w) for w in spec.default_spec()["SOUTH_WIN"]]
+    wins[0][0] = 1.5
+    first = dxf_import.import_plans(plans({"SOUTH_WIN": wins}, "edited"))
+    assert first["changes"] == ["SOUTH_WIN[0]（一层）: x 1.0 → 1.5"]
+
+    second = dxf_import.import_plans(plans(first["spec"], "regenerated"), base=first["spec"])
+    assert second["changes"] == []
+    assert second["spec"] == first["spec"]
@@ -0,0 +1,57 @@
+"""spec.resolve 的覆盖项校验：形状不对的 spec 一律抛 ValueError（serve.py 据此返回错误行）"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+import serve
+import spec
+
+
+@pytest.mark.parametrize("overrides", [
+    [1],                                    # 不是映射
+    "BW=14000",
+    {"BW": "abc"},                          # 数值参数给了字符串
+    {"BW": None},
+    {"BW": True},
+    {"BW": [14000]},
+    {"EAST_WIN": 5},                        # 窗表不是列表
+    {"EAST_WIN": [5]},                      # 条目不是元组
+    {"EAST_WIN": [[2.7, 1.35, 3.5]]},       # 条目长度不对
+    {"EAST_WIN": [[2.7, "1.35", 3.5, 1.5, 3]]},
+    {"SOUTH_DOOR": [[9.5, 0.45, 1.2, 2.6, 1]]},
+    {"SOUTH_DOOR": {"x": 9.5}},
+    {"F2_FL": 4.0},                         # 推导量
+    {"NOPE": 1},                            # 未知参数
+])
+def test_resolve_rejects_bad_shapes(overrides):
+    with pytest.raises(ValueError):
+        spec.resolve(overrides)
+
+
+def test_resolve_accepts_valid_overrides():
+    s = spec.resolve({"BW": 15000, "F1H": 3.5, "EAST_WIN": [[2.7, 1.35, 3.5, 1.5, 3]], "SOUTH_DOOR": []})
+    assert s["BW_M"] == 15.0
+    assert s["F1_CL"] == pytest.approx(s["GROUND"] + 3.5)
+    assert spec.resolve(None) == spec.resolve({})
+
+
+def test_resolve_accepts_numeric_arrays():
+    s = spec.resolve({"F1_X1": np.array([7000, 8000])})      # takeoff / optimize_layout 的批量参数
+    assert s["F1_X1"].tolist() == [7000, 8000]
+    with pytest.raises(ValueError):
+        spec.resolve({"F1_X1": np.array(["a", "b"])})
+
+
+@pytest.mark.parametrize("bad", [{"BW": "abc"}, [1], {"EAST_WIN": 5}])
+def test_service_answers_bad_spec_with_done_line(bad, tmp_path):
+    async def run():
+        service = serve.Service(1, tmp_path)
+        try:
+            return [r async for r in service.handle({"id": "t", "spec": bad, "drawings": ["floor1"]})]
+        finally:
+            service.pool.shutdown()
+
+    lines = asyncio.run(run())
+    assert len(lines) == 1 and lines[0]["done"] and not lines[0]["ok"]
@@ -9,11 +9,59 @@
   let scale=1, tx=0, ty=0, dragging=false, lastX=0, lastY=0;
   const MIN_SCALE=0.2, MAX_SCALE=8;
 
+  // 深度缩放瓦片（scripts/tiles.py 导出）：images/X.png → {dzi,width,height,tile,overlap,format,levels,thumbs}
+  let manifest={}, tiles=null, tileFrame=0;
+
   function setTransform(animate){
     if(!animate) content.classList.add('no-transition');
     else content.classList.remove('no-transition');
     content.style.transform=`translate(${tx}px,${ty}px) scale(${scale})`;
     showZoom();
+    if(tiles && !tileFrame) tileFrame=requestAnimationFrame(updateTiles);
+  }
+
+  // 只加载当前缩放级别下与视口相交的瓦片；新瓦片加载完之前保留上一级瓦片与缩略底图
+  function updateTiles(){
+    tileFrame=0;
+    if(!tiles) return;
+    const info=tiles.info, maxL=info.levels-1, T=info.tile, O=info.overlap;
+    const want=scale*(window.devicePixelRatio||1);
+    const level=Math.max(0,Math.min(maxL,maxL+Math.ceil(Math.log2(want))));
+    const f=2**(maxL-level);
+    const lw=Math.ceil(info.width/f), lh=Math.ceil(info.height/f);
+    const cw=container.clientWidth, ch=container.clientHeight;
+    const x0=Math.max(0,-tx/scale)/f, y0=Math.max(0,-ty/scale)/f;
+    const x1=Math.min(info.width,(cw-tx)/scale)/f, y1=Math.min(info.height,(ch-ty)/scale)/f;
+    tiles.want=new Set();
+    if(x1<=x0||y1<=y0) return;
+    for(let r=Math.floor(y0/T); r<=Math.min(Math.ceil(lh/T)-1,Math.floor(y1/T)); r++){
+      for(let c=Math.floor(x0/T); c<=Math.min(Math.ceil(lw/T)-1,Math.floor(x1/T)); c++){
+        const key=level+'/'+c+'_'+r;
+        tiles.want.add(key);
+        if(tiles.shown.has(key)) continue;
+        const px=c*T-(c?O:0), py=r*T-(r?O:0);
+        const im=document.createElement('img');
+        im.className='viewer-tile';
+        im.style.left=px*f+'px'; im.style.top=py*f+'px';
+        im.style.width=(Math.min(lw,(c+1)*T+O)-px)*f+'px';
+        im.style.height=(Math.min(lh,(r+1)*T+O)-py)*f+'px';
+        im.style.zIndex=level+1;
+        im.addEventListener('load',pruneTiles);
+        im.addEventListener('error',pruneTiles);
+        im.src=tiles.prefix+key+'.'+info.format;
+        tiles.plane.appendChild(im);
+        tiles.shown.set(key,im);
+      }
+    }
+    pruneTiles();
+  }
+
+  function pruneTiles(){
+    if(!tiles) return;
+    for(const key of tiles.want){ const im=tiles.shown.get(key); if(!im||!im.complete) return; }
+    for(const [key,im] of tiles.shown){
+      if(!tiles.want.has(key)){ im.remove(); tiles.shown.delete(key); }
+    }
   }
 
   function showZoom(){
@@ -37,7 +85,31 @@
     setTransform(true);
   }
 
+  function openTiled(info, alt){
+    content.innerHTML='';
+    const plane=document.createElement('div');
+    plane.className='viewer-tiles';
+    plane.style.width=info.width+'px';
+    plane.style.height=info.height+'px';
+    const thumbs=Object.keys(info.thumbs).sort((a,b)=>b-a);
+    if(thumbs.length){
+      const base=document.createElement('img');
+      base.className='viewer-tile-base';
+      base.src=info.thumbs[thumbs[0]];
+      base.alt=alt||'';
+      plane.appendChild(base);
+    }
+    content.appendChild(plane);
+    tiles={info, plane, prefix:info.dzi.replace(/\.dzi$/,'_files/'), shown:new Map(), want:new Set()};
+    title.textContent=alt||'';
+    overlay.classList.add('active');
+    document.body.style.overflow='hidden';
+    scale=1;tx=0;ty=0;
+    fitToView();
+  }
+
   function open(src, alt, isSvg){
+    tiles=null;
     content.innerHTML='';
     if(isSvg){
       const obj=document.createElement('object');
@@ -64,6 +136,7 @@
     overlay.classList.remove('active');
     document.body.style.overflow='';
     content.innerHTML='';
+    tiles=null;
   }
 
   overlay.querySelector('.btn-close').addEventListener('click',close);
@@ -139,14 +212,28 @@
 
   document.querySelectorAll('[data-viewer]').forEach(el=>{
     el.addEventListener('click',()=>{
-      const src=el.dataset.viewerSrc||el.querySelector('img,object')?.src||'';
+      const src=el.dataset.viewerSrc||el.querySelector('img,object')?.getAttribute('src')||'';
       const svgSrc=el.dataset.viewerSvg||'';
       const alt=el.dataset.viewerAlt||el.querySelector('img')?.alt||'';
       if(svgSrc){ open(svgSrc,alt,true); }
+      else if(manifest[src]){ openTiled(manifest[src],alt); }
       else{ open(src,alt,false); }
     });
   });
 
+  // 有瓦片清单时：卡片改用缩略图（srcset，原图作为最大一档，桌面与高分屏仍取原图），
+  // 位图查看改为按视口加载瓦片；没有清单则保持原图
+  fetch('tiles/manifest.json').then(r=>r.ok?r.json():{}).then(m=>{
+    manifest=m||{};
+    document.querySelectorAll('[data-viewer] img').forEach(img=>{
+      const src=img.getAttribute('src'), info=manifest[src];
+      if(!info) return;
+      const candidates=Object.entries(info.thumbs).filter(([w])=>+w<info.width).map(([w,u])=>u+' '+w+'w');
+      img.sizes='(max-width: 800px) 100vw, 50vw';
+      img.srcset=candidates.concat(src+' '+info.width+'w').join(', ');
+    });
+  }).catch(()=>{});
+
   const obs=new IntersectionObserver(entries=>{
     entries.forEach(e=>{if(e.isIntersecting){e.target.classList.add('visible');obs.unobserve(e.target)}});
   },{threshold:0.08});